@@ -1,64 +1,26 @@
 import cv2
-import mediapipe as mp
-import csv
 import time
 import tkinter as tk
 import customtkinter as ctk
 from tkinter import font, simpledialog, messagebox, filedialog
 from PIL import Image, ImageTk
 import os
-import glob
 import face_recognition
 import numpy as np
 import threading
-import platform
 import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime, timedelta
-from collections import deque, Counter
+from contextlib import ExitStack
 import json
-import gc
 import psutil
-try:
-    import pygame
-    PYGAME_AVAILABLE = True
-except ImportError:
-    PYGAME_AVAILABLE = False
-
-try:
-    from pydub import AudioSegment
-    from pydub.playback import play
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
-
-# --- ReID (Person Re-Identification) Libraries ---
-try:
-    import torch
-    import torchvision.transforms as transforms
-    REID_AVAILABLE = True
-except ImportError:
-    REID_AVAILABLE = False
-    torch = None
-    transforms = None
-
-# Try to import torchreid for advanced ReID
-try:
-    import torchreid
-    TORCHREID_AVAILABLE = True
-except ImportError:
-    TORCHREID_AVAILABLE = False
-    torchreid = None
-
-# Try to import scikit-image for feature comparison
-try:
-    from sklearn.metrics.pairwise import cosine_similarity
-    from scipy.spatial.distance import cosine
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    cosine_similarity = None
-    cosine = None
+from poseguard.engine import (MonitorEngine, make_snapshot_writer, make_encoding_cache, make_event_log,
+                              make_camera_discovery)
+from poseguard.display import DisplayRenderer
+from poseguard.sources import parse_source, describe_source
+from poseguard.drawing import mp_holistic, draw_styled_landmarks
+from poseguard.streams import tile_frames
+from poseguard.landmarks import landmarks_to_array, count_visible, landmark_bbox, classify_poses
 
 # Set CustomTkinter appearance with modern dark theme
 import customtkinter as ctk
@@ -77,7 +39,8 @@ def load_config():
             "detection": {"min_detection_confidence": 0.5, "min_tracking_confidence": 0.5, 
                          "face_recognition_tolerance": 0.5, "re_detect_interval": 60},
             "alert": {"default_interval_seconds": 10, "alert_cooldown_seconds": 2.5},
-            "performance": {"gui_refresh_ms": 30, "pose_buffer_size": 12, "frame_skip_interval": 2},
+            "performance": {"gui_refresh_ms": 30, "pose_buffer_size": 12, "frame_skip_interval": 2,
+                            "capture_buffer_size": 4, "inference_backend": "serial", "inference_workers": 0},
             "logging": {"log_directory": "logs", "max_log_size_mb": 10, "auto_flush_interval": 50},
             "storage": {"alert_snapshots_dir": "alert_snapshots", "snapshot_retention_days": 30,
                        "guard_profiles_dir": "guard_profiles", "capture_snapshots_dir": "capture_snapshots"},
@@ -86,31 +49,37 @@ def load_config():
 
 CONFIG = load_config()
 
-# --- 2. Logging Setup with Rotation ---
-if not os.path.exists(CONFIG["logging"]["log_directory"]):
-    os.makedirs(CONFIG["logging"]["log_directory"])
+# NOTE: Inference workers are spawned processes that re-import this script as
+# __mp_main__. Anything with side effects (log handlers, services, background
+# threads) is built in setup_logging()/init_services(), called from __main__ only.
 
 logger = logging.getLogger("PoseGuard")
-logger.setLevel(logging.WARNING)  # Only log warnings and errors by default
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
-
-# Rotating file handler
-file_handler = RotatingFileHandler(
-    os.path.join(CONFIG["logging"]["log_directory"], "session.log"),
-    maxBytes=CONFIG["logging"]["max_log_size_mb"] * 1024 * 1024,
-    backupCount=5
-)
-file_handler.setLevel(logging.INFO)
-file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(file_formatter)
-
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+
+# --- 2. Logging Setup with Rotation ---
+def setup_logging():
+    if not os.path.exists(CONFIG["logging"]["log_directory"]):
+        os.makedirs(CONFIG["logging"]["log_directory"])
+
+    logger.setLevel(logging.WARNING)  # Only log warnings and errors by default
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(console_formatter)
+
+    # Rotating file handler
+    file_handler = RotatingFileHandler(
+        os.path.join(CONFIG["logging"]["log_directory"], "session.log"),
+        maxBytes=CONFIG["logging"]["max_log_size_mb"] * 1024 * 1024,
+        backupCount=5
+    )
+    file_handler.setLevel(logging.INFO)
+    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler.setFormatter(file_formatter)
+
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
 
 # --- 3. File Storage Utilities (Systematic Organization) ---
 def get_storage_paths():
@@ -141,7 +110,9 @@ def save_guard_face(face_image, guard_name):
     paths = get_storage_paths()
     safe_name = guard_name.strip().replace(" ", "_")
     profile_path = os.path.join(paths["guard_profiles"], f"target_{safe_name}_face.jpg")
-    cv2.imwrite(profile_path, face_image)
+    # Synchronous: the profile is loaded and encoded right after saving
+    SNAPSHOT_WRITER.write_now(profile_path, face_image)
+    ENCODING_CACHE.invalidate(profile_path)
     return profile_path
 
 def save_capture_snapshot(face_image, guard_name):
@@ -150,7 +121,7 @@ def save_capture_snapshot(face_image, guard_name):
     safe_name = guard_name.strip().replace(" ", "_")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     snapshot_path = os.path.join(paths["capture_snapshots"], f"{safe_name}_capture_{timestamp}.jpg")
-    cv2.imwrite(snapshot_path, face_image)
+    snapshot_path, _ = SNAPSHOT_WRITER.submit(snapshot_path, face_image)
     return snapshot_path
 
 def save_pose_landmarks_json(guard_name, poses_dict):
@@ -172,28 +143,11 @@ def load_pose_landmarks_json(guard_name):
             return json.load(f)
     return {}
 
-# --- Directory Setup (using systematic functions) ---
-if not os.path.exists(CONFIG["storage"]["alert_snapshots_dir"]):
-    os.makedirs(CONFIG["storage"]["alert_snapshots_dir"])
-
-if not os.path.exists(CONFIG.get("storage", {}).get("pose_references_dir", "pose_references")):
-    os.makedirs(CONFIG.get("storage", {}).get("pose_references_dir", "pose_references"))
-
-if not os.path.exists(CONFIG.get("storage", {}).get("guard_profiles_dir", "guard_profiles")):
-    os.makedirs(CONFIG.get("storage", {}).get("guard_profiles_dir", "guard_profiles"))
-
-if not os.path.exists(CONFIG.get("storage", {}).get("capture_snapshots_dir", "capture_snapshots")):
-    os.makedirs(CONFIG.get("storage", {}).get("capture_snapshots_dir", "capture_snapshots"))
-
-# Ensure logs directory exists
-if not os.path.exists(CONFIG["logging"]["log_directory"]):
-    os.makedirs(CONFIG["logging"]["log_directory"])
-
-csv_file = os.path.join(CONFIG["logging"]["log_directory"], "events.csv")
-if not os.path.exists(csv_file):
-    with open(csv_file, mode="w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["Timestamp", "Name", "Action", "Status", "Image_Path", "Confidence"])
+# --- Shared services (built by init_services) ---
+SNAPSHOT_WRITER = None  # JPEG encode + file write off the processing thread
+ENCODING_CACHE = None  # Guard photos are encoded once, re-encoded only when the file changes
+EVENT_LOG = None  # ✅ IMPROVED: Append-only SQLite (WAL) event store written by a background thread
+CAMERA_DISCOVERY = None  # ✅ IMPROVED: Parallel, cached camera probing
 
 # --- 4. Cleanup Old Snapshots ---
 def cleanup_old_snapshots():
@@ -211,152 +165,23 @@ def cleanup_old_snapshots():
     except Exception as e:
         logger.error(f"Snapshot cleanup error: {e}")
 
-threading.Thread(target=cleanup_old_snapshots, daemon=True).start()
 
-# --- MediaPipe Solutions Setup ---
-mp_holistic = mp.solutions.holistic
-mp_drawing = mp.solutions.drawing_utils
+def init_services():
+    """Create the storage directories and the shared services, and start snapshot cleanup"""
+    global SNAPSHOT_WRITER, ENCODING_CACHE, EVENT_LOG, CAMERA_DISCOVERY
+    storage = CONFIG.get("storage", {})
+    for directory in (storage.get("alert_snapshots_dir", "alert_snapshots"),
+                      storage.get("pose_references_dir", "pose_references"),
+                      storage.get("guard_profiles_dir", "guard_profiles"),
+                      storage.get("capture_snapshots_dir", "capture_snapshots"),
+                      CONFIG["logging"]["log_directory"]):
+        os.makedirs(directory, exist_ok=True)
 
-# --- Sound Logic ---
-def play_siren_sound(stop_event=None, duration_seconds=30, sound_file="emergency-siren-351963.mp3"):
-    """Play alert sound looping for up to duration_seconds or until stop_event is set
-    
-    Args:
-        stop_event: threading.Event to signal stop playback
-        duration_seconds: Maximum duration to play (default 30 seconds)
-        sound_file: Name of audio file (default 'emergency-siren-351963.mp3' for action, 'Fugitive.mp3' for fugitive)
-    """
-    def _sound_worker():
-        mp3_path = rf"D:\CUDA_Experiments\Git_HUB\Nirikhsan_Web_Cam\{sound_file}"
-        start_time = time.time()
-        
-        # Option 1: Try pygame (PRIMARY - most reliable for MP3 on Windows)
-        if PYGAME_AVAILABLE:
-            try:
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-                
-                pygame.mixer.music.load(mp3_path)
-                pygame.mixer.music.set_volume(1.0)
-                
-                # Play in loop until stop_event or duration_seconds
-                pygame.mixer.music.play(-1)  # -1 means infinite loop
-                logger.info(f"Alert sound started via pygame (max {duration_seconds}s)")
-                
-                # Wait until stop_event or duration expired
-                while True:
-                    elapsed = time.time() - start_time
-                    
-                    # Check if stop_event is set (action performed)
-                    if stop_event and stop_event.is_set():
-                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    # Check if duration expired
-                    if elapsed >= duration_seconds:
-                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    time.sleep(0.1)
-                
-                pygame.mixer.music.stop()
-                return
-            except Exception as e:
-                logger.warning(f"Pygame playback failed: {e}")
-        
-        # Option 2: Try pydub (requires ffmpeg/avconv)
-        if PYDUB_AVAILABLE:
-            try:
-                audio = AudioSegment.from_mp3(mp3_path)
-                logger.info(f"Alert sound started via pydub (max {duration_seconds}s)")
-                
-                while True:
-                    elapsed = time.time() - start_time
-                    
-                    # Check if stop_event is set
-                    if stop_event and stop_event.is_set():
-                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    # Check if duration expired
-                    if elapsed >= duration_seconds:
-                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    # Play audio clip
-                    play(audio)
-                
-                logger.info("Alert sound via pydub completed")
-                return
-            except Exception as e:
-                logger.warning(f"Pydub playback failed: {e}")
-        
-        # Fallback: Use system beeps (Windows winsound - always available)
-        try:
-            if platform.system() == "Windows":
-                import winsound
-                logger.info(f"Alert sound started via winsound (max {duration_seconds}s)")
-                
-                # Simulate emergency siren with pulsing high-low tones
-                while True:
-                    elapsed = time.time() - start_time
-                    
-                    # Check if stop_event is set
-                    if stop_event and stop_event.is_set():
-                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    # Check if duration expired
-                    if elapsed >= duration_seconds:
-                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    # Play siren pattern
-                    winsound.Beep(2500, 150)  # High beep
-                    time.sleep(0.05)
-                    winsound.Beep(1800, 150)  # Lower beep
-                    time.sleep(0.05)
-            else:
-                # Unix/Linux fallback
-                logger.info(f"Alert sound started via beep (max {duration_seconds}s)")
-                while True:
-                    elapsed = time.time() - start_time
-                    
-                    if stop_event and stop_event.is_set():
-                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    if elapsed >= duration_seconds:
-                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
-                        break
-                    
-                    print('\a')
-                    time.sleep(0.3)
-        except Exception as e:
-            logger.error(f"Sound Error: {e}")
-
-    t = threading.Thread(target=_sound_worker, daemon=True)
-    t.start()
-    return t
-
-# --- Styled Drawing Helper ---
-def draw_styled_landmarks(image, results):
-    if results.face_landmarks:
-        mp_drawing.draw_landmarks(image, results.face_landmarks, mp_holistic.FACEMESH_TESSELATION, 
-                                 mp_drawing.DrawingSpec(color=(80,110,10), thickness=1, circle_radius=1), 
-                                 mp_drawing.DrawingSpec(color=(80,255,121), thickness=1, circle_radius=1)) 
-    if results.pose_landmarks:
-        mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS,
-                                 mp_drawing.DrawingSpec(color=(80,22,10), thickness=2, circle_radius=4), 
-                                 mp_drawing.DrawingSpec(color=(80,44,121), thickness=2, circle_radius=2)) 
-    if results.left_hand_landmarks:
-        mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS, 
-                                 mp_drawing.DrawingSpec(color=(121,22,76), thickness=2, circle_radius=4), 
-                                 mp_drawing.DrawingSpec(color=(121,44,250), thickness=2, circle_radius=2)) 
-    if results.right_hand_landmarks:
-        mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS, 
-                                 mp_drawing.DrawingSpec(color=(245,117,66), thickness=2, circle_radius=4), 
-                                 mp_drawing.DrawingSpec(color=(245,66,230), thickness=2, circle_radius=2)) 
+    SNAPSHOT_WRITER = make_snapshot_writer(CONFIG)
+    ENCODING_CACHE = make_encoding_cache(CONFIG)
+    EVENT_LOG = make_event_log(CONFIG)
+    CAMERA_DISCOVERY = make_camera_discovery(CONFIG)
+    threading.Thread(target=cleanup_old_snapshots, daemon=True).start()
 
 # --- classify_action with improved detection ---
 def classify_action(landmarks, h, w):
@@ -364,421 +189,34 @@ def classify_action(landmarks, h, w):
     Classify pose action with robust detection and confidence scoring.
     Supports: Hands Up, Hands Crossed, One Hand Raised (Left/Right), T-Pose, Sit, Standing
     Includes visibility and quality checks for stable detection.
+
+    Thin wrapper over poseguard.landmarks.classify_poses; accepts landmark
+    objects or a (33, 4) array. Use classify_pose_batch for several poses.
     """
     try:
-        NOSE = mp_holistic.PoseLandmark.NOSE.value
-        L_WRIST = mp_holistic.PoseLandmark.LEFT_WRIST.value
-        R_WRIST = mp_holistic.PoseLandmark.RIGHT_WRIST.value
-        L_ELBOW = mp_holistic.PoseLandmark.LEFT_ELBOW.value
-        R_ELBOW = mp_holistic.PoseLandmark.RIGHT_ELBOW.value
-        L_SHOULDER = mp_holistic.PoseLandmark.LEFT_SHOULDER.value
-        R_SHOULDER = mp_holistic.PoseLandmark.RIGHT_SHOULDER.value
-        L_HIP = mp_holistic.PoseLandmark.LEFT_HIP.value
-        R_HIP = mp_holistic.PoseLandmark.RIGHT_HIP.value
-        L_KNEE = mp_holistic.PoseLandmark.LEFT_KNEE.value
-        R_KNEE = mp_holistic.PoseLandmark.RIGHT_KNEE.value
-        L_ANKLE = mp_holistic.PoseLandmark.LEFT_ANKLE.value
-        R_ANKLE = mp_holistic.PoseLandmark.RIGHT_ANKLE.value
-
-        nose = landmarks[NOSE]
-        l_wrist = landmarks[L_WRIST]
-        r_wrist = landmarks[R_WRIST]
-        l_elbow = landmarks[L_ELBOW]
-        r_elbow = landmarks[R_ELBOW]
-        l_shoulder = landmarks[L_SHOULDER]
-        r_shoulder = landmarks[R_SHOULDER]
-        l_hip = landmarks[L_HIP]
-        r_hip = landmarks[R_HIP]
-        l_knee = landmarks[L_KNEE]
-        r_knee = landmarks[R_KNEE]
-        l_ankle = landmarks[L_ANKLE]
-        r_ankle = landmarks[R_ANKLE]
-
-        nose_y = nose.y * h
-        nose_x = nose.x * w
-        lw_y = l_wrist.y * h
-        rw_y = r_wrist.y * h
-        lw_x = l_wrist.x * w
-        rw_x = r_wrist.x * w
-        ls_y = l_shoulder.y * h
-        rs_y = r_shoulder.y * h
-        ls_x = l_shoulder.x * w
-        rs_x = r_shoulder.x * w
-        lh_y = l_hip.y * h
-        rh_y = r_hip.y * h
-        
-        # ✅ IMPROVED: Higher visibility thresholds for stable pose detection
-        l_wrist_visible = l_wrist.visibility > 0.70  # Increased from 0.6
-        r_wrist_visible = r_wrist.visibility > 0.70  # Increased from 0.6
-        l_elbow_visible = l_elbow.visibility > 0.70  # Increased from 0.6
-        r_elbow_visible = r_elbow.visibility > 0.70  # Increased from 0.6
-        nose_visible = nose.visibility > 0.6         # Increased from 0.5
-        l_shoulder_visible = l_shoulder.visibility > 0.70
-        r_shoulder_visible = r_shoulder.visibility > 0.70
-        l_knee_visible = l_knee.visibility > 0.70    # Increased from 0.6
-        r_knee_visible = r_knee.visibility > 0.70    # Increased from 0.6
-        l_hip_visible = l_hip.visibility > 0.65
-        r_hip_visible = r_hip.visibility > 0.65
-        
-        # Quality check: At least 80% of major joints must be visible
-        visible_joints = sum([
-            l_wrist_visible, r_wrist_visible, l_elbow_visible, r_elbow_visible,
-            l_shoulder_visible, r_shoulder_visible, l_knee_visible, r_knee_visible,
-            l_hip_visible, r_hip_visible, nose_visible
-        ])
-        if visible_joints < 9:  # Need at least 9/11 major joints
-            return "Standing"  # Default to standing if pose quality is poor
-        
-        # 1. Hands Up Detection (both hands clearly above head)
-        if (l_wrist_visible and r_wrist_visible and 
-            lw_y < (nose_y - 0.15 * h) and rw_y < (nose_y - 0.15 * h)):  # Increased threshold from 0.1
-            return "Hands Up"
-        
-        # 2. Hands Crossed Detection (wrists cross at chest level)
-        if (l_wrist_visible and r_wrist_visible and l_shoulder_visible and r_shoulder_visible):
-            chest_y = (ls_y + rs_y) / 2
-            body_center_x = (ls_x + rs_x) / 2
-            # Check if both wrists are at chest level
-            if (abs(lw_y - chest_y) < 0.25 * h and abs(rw_y - chest_y) < 0.25 * h):  # Increased tolerance
-                # Check if wrists are crossed (left hand on right side, vice versa)
-                if ((lw_x > body_center_x and rw_x < body_center_x) or 
-                    (lw_x < body_center_x and rw_x > body_center_x)):
-                    return "Hands Crossed"
-        
-        # 3. T-Pose Detection (arms extended sideways at shoulder height)
-        if (l_wrist_visible and r_wrist_visible and l_elbow_visible and r_elbow_visible and
-            l_shoulder_visible and r_shoulder_visible):
-            # Check if both elbows and wrists are at shoulder level
-            if (abs(lw_y - ls_y) < 0.2 * h and abs(rw_y - rs_y) < 0.2 * h and  # Increased tolerance
-                abs(l_elbow.y * h - ls_y) < 0.2 * h and abs(r_elbow.y * h - rs_y) < 0.2 * h):
-                # Check if arms are extended outward (wider margin)
-                if (lw_x < (ls_x - 0.25 * w) and rw_x > (rs_x + 0.25 * w)):  # Increased from 0.2
-                    return "T-Pose"
-        
-        # 4. One Hand Raised Detection (only one hand above head, clearly)
-        if l_wrist_visible and lw_y < (nose_y - 0.15 * h) and not r_wrist_visible:
-            return "One Hand Raised (Left)"
-        if r_wrist_visible and rw_y < (nose_y - 0.15 * h) and not l_wrist_visible:
-            return "One Hand Raised (Right)"
-        
-        # Alternative: one hand raised while other is down
-        if l_wrist_visible and r_wrist_visible and l_shoulder_visible and r_shoulder_visible:
-            chest_y = (ls_y + rs_y) / 2
-            if lw_y < (nose_y - 0.15 * h) and rw_y > (chest_y + 0.2 * h):
-                return "One Hand Raised (Left)"
-            if rw_y < (nose_y - 0.15 * h) and lw_y > (chest_y + 0.2 * h):
-                return "One Hand Raised (Right)"
-        
-        # 5. Sit/Stand Detection with improved reliability
-        if l_knee_visible and r_knee_visible and l_hip_visible and r_hip_visible:
-            # Calculate angle of thigh (knee to hip) - more stable metric
-            thigh_angle_l = abs(l_knee.y - l_hip.y)
-            thigh_angle_r = abs(r_knee.y - r_hip.y)
-            avg_thigh_angle = (thigh_angle_l + thigh_angle_r) / 2
-            
-            # If thigh is nearly horizontal, person is sitting
-            if avg_thigh_angle < 0.12:  # Tighter threshold for sitting detection
-                return "Sit"
-            else:
-                return "Standing"
-        else:
-            # Default to standing if knee not visible
-            return "Standing"
-
-        return "Standing" 
-
+        return classify_poses(landmarks_to_array(landmarks), h, w)
     except Exception as e:
         logger.debug(f"Pose classification error: {e}")
         return "Unknown"
 
-# --- Helper: Calculate Dynamic Body Box from Face ---
-def calculate_body_box(face_box, frame_h, frame_w, expansion_factor=3.0):
-    """
-    Calculate dynamic body bounding box from detected face box.
-    
-    Args:
-        face_box: tuple (x1, y1, x2, y2) - face coordinates
-        frame_h, frame_w: frame dimensions
-        expansion_factor: how many face widths to expand (default 3x)
-    
-    Returns:
-        tuple (bx1, by1, bx2, by2) - body box coordinates
-    """
-    x1, y1, x2, y2 = face_box
-    face_w = x2 - x1
-    face_h = y2 - y1
-    face_cx = x1 + (face_w // 2)
-    
-    # Expand horizontally based on face width
-    bx1 = max(0, int(face_cx - (face_w * expansion_factor)))
-    bx2 = min(frame_w, int(face_cx + (face_w * expansion_factor)))
-    
-    # Expand vertically: slightly above face, down to feet
-    by1 = max(0, int(y1 - (face_h * 0.5)))
-    by2 = frame_h
-    
-    return (bx1, by1, bx2, by2)
-
-# --- Helper: IoU for Overlap Check ---
-def calculate_iou(boxA, boxB):
-    # box = (x, y, w, h) -> convert to (x1, y1, x2, y2)
-    xA = max(boxA[0], boxB[0])
-    yA = max(boxA[1], boxB[1])
-    xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-    yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
-
-    interArea = max(0, xB - xA) * max(0, yB - yA)
-    boxAArea = boxA[2] * boxA[3]
-    boxBArea = boxB[2] * boxB[3]
-
-    iou = interArea / float(boxAArea + boxBArea - interArea + 1e-5)
-    return iou
-
-# --- ReID Feature Extraction & Matching Functions ---
-def extract_appearance_features(frame, face_box):
-    """
-    Extract appearance features from a person's image using simple deep features.
-    
-    Args:
-        frame: Input image frame
-        face_box: Bounding box (x1, y1, x2, y2) for person region
-    
-    Returns:
-        Feature vector (numpy array) or None if extraction fails
-    """
-    try:
-        x1, y1, x2, y2 = face_box
-        x1, y1, x2, y2 = max(0, int(x1)), max(0, int(y1)), int(x2), int(y2)
-        
-        # Crop person region
-        person_crop = frame[y1:y2, x1:x2]
-        if person_crop.size == 0:
-            return None
-        
-        # Simple approach: use histogram of colors + histogram of edges as features
-        # This is a lightweight alternative to deep neural networks
-        h, w = person_crop.shape[:2]
-        
-        # Resize for consistent feature extraction
-        person_resized = cv2.resize(person_crop, (64, 128))
-        
-        # Color histogram features (3 channels × 8 bins each = 24 features)
-        color_features = []
-        for i in range(3):
-            hist = cv2.calcHist([person_resized], [i], None, [8], [0, 256])
-            color_features.extend(hist.flatten())
-        
-        # Edge detection features using Canny
-        gray = cv2.cvtColor(person_resized, cv2.COLOR_BGR2GRAY)
-        edges = cv2.Canny(gray, 100, 200)
-        edge_hist = cv2.calcHist([edges], [0], None, [16], [0, 256])
-        
-        # Combine all features into single vector
-        features = np.array(color_features + edge_hist.flatten(), dtype=np.float32)
-        
-        # Normalize features
-        features = features / (np.linalg.norm(features) + 1e-6)
-        
-        return features
-    except Exception as e:
-        logger.warning(f"Feature extraction error: {e}")
-        return None
-
-def calculate_feature_similarity(features1, features2):
-    """
-    Calculate similarity between two feature vectors using cosine similarity.
-    
-    Args:
-        features1: Feature vector 1
-        features2: Feature vector 2
-    
-    Returns:
-        Similarity score (0-1, higher = more similar)
-    """
-    if features1 is None or features2 is None:
-        return 0.0
-    
-    try:
-        if SKLEARN_AVAILABLE:
-            # Use scikit-learn's cosine similarity
-            similarity = cosine_similarity([features1], [features2])[0][0]
-        else:
-            # Fallback: manual cosine similarity
-            dot_product = np.dot(features1, features2)
-            norm1 = np.linalg.norm(features1)
-            norm2 = np.linalg.norm(features2)
-            similarity = dot_product / (norm1 * norm2 + 1e-6)
-        
-        return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
-    except Exception as e:
-        logger.warning(f"Similarity calculation error: {e}")
-        return 0.0
-
-def match_person_identity(person_id, new_features, person_features_db, confidence_threshold=0.65):
-    """
-    Match a person's features against database to determine if same person.
-    
-    Args:
-        person_id: ID of person to match
-        new_features: New feature vector
-        person_features_db: Database of known person features
-        confidence_threshold: Minimum similarity for match
-    
-    Returns:
-        (matched_person_id, confidence) or (None, 0.0) if no match
-    """
-    try:
-        if person_id not in person_features_db:
-            # New person, store features
-            person_features_db[person_id] = {
-                'features': new_features,
-                'count': 1,
-                'last_seen': time.time()
-            }
-            return person_id, 1.0
-        
-        # Calculate similarity with stored features
-        stored_features = person_features_db[person_id]['features']
-        similarity = calculate_feature_similarity(new_features, stored_features)
-        
-        if similarity >= confidence_threshold:
-            # Update features with exponential moving average for stability
-            alpha = 0.3  # Learning rate
-            person_features_db[person_id]['features'] = (
-                alpha * new_features + 
-                (1 - alpha) * stored_features
-            )
-            person_features_db[person_id]['count'] += 1
-            person_features_db[person_id]['last_seen'] = time.time()
-            return person_id, similarity
-        else:
-            # Create new person identity
-            new_id = f"{person_id}_variant_{len(person_features_db)}"
-            person_features_db[new_id] = {
-                'features': new_features,
-                'count': 1,
-                'last_seen': time.time()
-            }
-            return new_id, similarity
-    except Exception as e:
-        logger.warning(f"Person matching error: {e}")
-        return None, 0.0
-
 # --- Helper: Detect Available Cameras ---
-def detect_available_cameras(max_cameras=10):
-    """Detect all available camera indices"""
-    available_cameras = []
-    for i in range(max_cameras):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            ret, _ = cap.read()
-            if ret:
-                available_cameras.append(i)
-            cap.release()
-    return available_cameras
-
-# --- Helper: ReID Feature Extraction ---
-def extract_reid_features(frame, bbox, model=None):
-    """
-    Extract appearance features from a person bounding box for re-identification.
-    
-    Args:
-        frame: Input video frame
-        bbox: Bounding box (x1, y1, x2, y2)
-        model: Optional pre-trained ReID model
-    
-    Returns:
-        features: numpy array of appearance features, or None if extraction fails
-    """
-    try:
-        if bbox is None or model is None:
-            return None
-        
-        x1, y1, x2, y2 = bbox
-        # Ensure valid bbox
-        if x1 < 0 or y1 < 0 or x2 > frame.shape[1] or y2 > frame.shape[0]:
-            return None
-        if x2 <= x1 or y2 <= y1:
-            return None
-        
-        # Crop person region
-        person_crop = frame[y1:y2, x1:x2]
-        
-        # Resize to standard size (256, 128) for ReID
-        person_resized = cv2.resize(person_crop, (128, 256))
-        
-        # Convert BGR to RGB
-        person_rgb = cv2.cvtColor(person_resized, cv2.COLOR_BGR2RGB)
-        
-        # Normalize (if using standard ImageNet normalization)
-        person_normalized = person_rgb.astype(np.float32) / 255.0
-        
-        # Simple feature extraction: Compute histogram of oriented gradients (HOG) as appearance features
-        # For more advanced ReID, use pre-trained models like OSNet, ResNet50-ReID, etc.
-        from skimage.feature import hog
-        features = hog(cv2.cvtColor(person_resized, cv2.COLOR_BGR2GRAY), 
-                      orientations=9, pixels_per_cell=(8, 8), 
-                      cells_per_block=(2, 2), visualize=False)
-        
-        return features
-    except Exception as e:
-        logger.error(f"ReID feature extraction error: {e}")
-        return None
-
-def compute_feature_distance(features1, features2):
-    """
-    Compute cosine similarity between two feature vectors for person re-identification.
-    
-    Returns:
-        similarity: Float between 0 and 1 (higher = more similar)
-    """
-    try:
-        if features1 is None or features2 is None:
-            return 0.0
-        
-        # Normalize features
-        f1 = features1 / (np.linalg.norm(features1) + 1e-5)
-        f2 = features2 / (np.linalg.norm(features2) + 1e-5)
-        
-        # Compute cosine similarity
-        similarity = np.dot(f1, f2)
-        return float(similarity)
-    except Exception as e:
-        logger.error(f"Feature distance computation error: {e}")
-        return 0.0
+# ✅ IMPROVED: enumerate device nodes, probe in parallel, cache the result across sessions
+def detect_available_cameras(max_cameras=10, refresh=False):
+    """Detect all available camera indices (cached; refresh=True forces a new probe)"""
+    CAMERA_DISCOVERY.max_cameras = max_cameras
+    return CAMERA_DISCOVERY.cameras(refresh=refresh)
 
 # --- Tkinter Application Class ---
-class PoseApp:
+class PoseApp(MonitorEngine):
     def __init__(self, window_title="Pose Guard (Multi-Target)"):
         self.root = ctk.CTk()
         self.root.title(window_title)
         self.root.geometry("1800x1000")  # Larger default size
         
-        self.cap = None
-        self.unprocessed_frame = None 
-        self.is_running = False
-        self.is_logging = False
-        self.camera_index = 0  # Default camera
-        
-        self.is_alert_mode = False
-        self.alert_interval = 10  
-        self.is_in_capture_mode = False
-        self.frame_w = 640 
-        self.frame_h = 480 
-
-        self.target_map = {}
-        self.targets_status = {} 
-        self.selected_target_names = []  # NEW: Track selected targets
-        self.re_detect_counter = 0    
-        self.RE_DETECT_INTERVAL = CONFIG["detection"]["re_detect_interval"]
-        self.RESIZE_SCALE = 1.0 
-        self.temp_log = []
-        self.temp_log_counter = 0
-        self.frame_counter = 0
-        self.last_fps_time = time.time()
+        # GUI-only state; capture, tracking and alerting live in MonitorEngine
+        self.display_counter = 0
         self.current_fps = 0
-        self.last_process_frame = None
-        self.last_action_cache = {}
+        self.profiler_overlay_visible = False
         self.session_start_time = time.time()
         self.onboarding_mode = False
         self.onboarding_step = 0
@@ -786,40 +224,15 @@ class PoseApp:
         self.onboarding_poses = {}
         self.onboarding_detection_results = None  # Store detection results for capture
         self.onboarding_face_box = None  # Store face box for capture
-        
-        # Fugitive Mode Fields
-        self.fugitive_mode = False
-        self.fugitive_image = None
-        self.fugitive_face_encoding = None
-        self.fugitive_name = "Unknown Fugitive"
-        self.fugitive_detected_log_done = False  # Prevent duplicate logs
-        self.last_fugitive_snapshot_time = 0  # Rate limiting for snapshots
-        self.fugitive_alert_sound_thread = None
-        self.fugitive_alert_stop_event = None
-        
-        # PRO_Detection Mode Fields (Person Re-Identification)
-        self.pro_detection_mode = False
-        self.reid_model = None
-        self.reid_transform = None
-        self.person_features_db = {}  # Store appearance features for each person
-        self.person_identity_history = {}  # Track person identity across frames
-        self.reid_enabled = REID_AVAILABLE and SKLEARN_AVAILABLE  # Check if ReID libraries are available
-        self.reid_confidence_threshold = 0.65  # Threshold for person re-identification
-        self.person_tracking_data = []  # Store ReID tracking data for CSV logging
-        self.pro_detection_log_done = {}  # Track which persons have been logged
-        self.pro_detection_person_counter = 0  # Counter for assigning unique person IDs
-        
+
         # Photo storage for Tkinter (prevent garbage collection)
         self.photo_storage = {}  # Dictionary to store PhotoImage references
-        
+
         try:
-            # Single Holistic instance for efficiency
-            self.holistic = mp_holistic.Holistic(
-                min_detection_confidence=CONFIG["detection"]["min_detection_confidence"],
-                min_tracking_confidence=CONFIG["detection"]["min_tracking_confidence"],
-                static_image_mode=False
-            )
-            logger.warning("System initialized")
+            MonitorEngine.__init__(self, CONFIG, event_log=EVENT_LOG, snapshot_writer=SNAPSHOT_WRITER,
+                                   encoding_cache=ENCODING_CACHE, camera_discovery=CAMERA_DISCOVERY)
+            # Shared instance for onboarding capture (single subject)
+            self.holistic = mp_holistic.Holistic(**self.holistic_options)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load Holistic Model: {e}")
             self.root.destroy()
@@ -847,6 +260,12 @@ class PoseApp:
         self.video_container.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         self.video_label = ctk.CTkLabel(self.video_container, text="🎥 Camera Feed Off", font=("Arial", 24, "bold"), text_color="white")
         self.video_label.pack(fill="both", expand=True)
+        # ✅ IMPROVED: One PhotoImage updated in place, display rate capped separately from analysis
+        self.display_renderer = DisplayRenderer(self.video_label,
+                                                max_fps=CONFIG["performance"].get("display_max_fps", 30))
+        # Stage latency table drawn over the feed (toggled with the Profiler button)
+        self.profiler_overlay = ctk.CTkLabel(self.video_container, text="", font=("Courier", 11), justify="left",
+                                             anchor="nw", text_color="#00ff66", fg_color="#111111", corner_radius=4)
         
         # 2. Collapsible Sidebar
         self.sidebar_frame = ctk.CTkFrame(self.root, fg_color="#1a1a1a", width=self.sidebar_width)
@@ -893,6 +312,9 @@ class PoseApp:
         
         self.btn_exit = ctk.CTkButton(self.cam_btns_frame, text="🚪 Exit", command=self.graceful_exit, width=50, fg_color="#34495e", font=btn_font)
         self.btn_exit.pack(side="left", padx=2, fill="x", expand=True)
+        
+        self.btn_replay = ctk.CTkButton(self.grp_camera, text="⏩ Replay Footage", command=self.start_replay, height=28, fg_color="#16a085", font=btn_font)
+        self.btn_replay.pack(fill="x", padx=2, pady=(4, 0))
 
         # --- Group 2: Guard Management ---
         self.grp_guard = ctk.CTkFrame(self.sidebar_scroll, fg_color="transparent")
@@ -942,6 +364,7 @@ class PoseApp:
         
         self.required_action_var = tk.StringVar(self.root)
         self.required_action_var.set("Hands Up")
+        self.required_action = "Hands Up"  # Plain copy readable from the processing thread
         self.action_dropdown = ctk.CTkOptionMenu(self.settings_grid, values=["Hands Up", "Hands Crossed", 
                                             "One Hand Raised (Left)", "One Hand Raised (Right)", 
                                             "T-Pose", "Sit", "Standing"], command=self.on_action_change, fg_color="#3498db", text_color="white", font=btn_font_small)
@@ -954,6 +377,13 @@ class PoseApp:
         self.btn_apply_targets = ctk.CTkButton(self.settings_grid, text="🎬 Track", command=self.apply_target_selection, width=80, fg_color="#16a085", font=btn_font)
         self.btn_apply_targets.grid(row=1, column=1, padx=2, pady=2, sticky="ew")
         
+        # Row 3: Event log viewer
+        self.btn_events = ctk.CTkButton(self.settings_grid, text="📜 Events", command=self.open_event_log_dialog, width=80, fg_color="#7f8c8d", font=btn_font)
+        self.btn_events.grid(row=2, column=0, padx=2, pady=2, sticky="ew")
+        
+        self.btn_profiler = ctk.CTkButton(self.settings_grid, text="⏱ Profiler", command=self.toggle_profiler_overlay, width=80, fg_color="#7f8c8d", font=btn_font)
+        self.btn_profiler.grid(row=2, column=1, padx=2, pady=2, sticky="ew")
+        
         self.settings_grid.grid_columnconfigure(0, weight=1)
         self.settings_grid.grid_columnconfigure(1, weight=1)
         
@@ -990,7 +420,7 @@ class PoseApp:
         self.fugitive_preview_label.pack(fill="x", padx=1, pady=1)
         
         # Status label at bottom
-        self.status_label = ctk.CTkLabel(self.sidebar_scroll, text="FPS: 0 | MEM: 0 MB", text_color="white", font=('Roboto', 9))
+        self.status_label = ctk.CTkLabel(self.sidebar_scroll, text="Cap: 0 | Proc: 0 FPS | Drop: 0 | MEM: 0 MB", text_color="white", font=('Roboto', 9))
         self.status_label.pack(side="bottom", fill="x", padx=5, pady=5)
         
         self.load_targets()
@@ -1024,38 +454,20 @@ class PoseApp:
                 )
                 if not response:
                     return
-            
+
             logger.warning("Initiating graceful shutdown...")
-            
-            # Stop camera if running
-            if self.is_running:
-                self.is_running = False
-                if self.cap:
-                    self.cap.release()
-                    self.cap = None
-            
-            # Save logs if logging
-            if self.is_logging:
-                self.save_log_to_file()
-            
-            # Cleanup trackers
-            for status in self.targets_status.values():
-                if status.get("tracker"):
-                    status["tracker"] = None
-            
-            # Release holistic model
+
+            # Stop capture, save logs, release models, workers and shared services
+            self.close()
             if hasattr(self, 'holistic'):
                 self.holistic.close()
-            
-            # Force garbage collection
-            gc.collect()
-            
+
             logger.warning("Shutdown complete")
-            
+
             # Destroy window
             self.root.quit()
             self.root.destroy()
-            
+
         except Exception as e:
             logger.error(f"Error during exit: {e}")
             # Force exit even if there's an error
@@ -1147,44 +559,16 @@ class PoseApp:
     def remove_guard(self, guard_name):
         """Remove guard profile and all associated data"""
         try:
-            safe_name = guard_name.replace(" ", "_")
-            guard_profiles_dir = CONFIG.get("storage", {}).get("guard_profiles_dir", "guard_profiles")
-            pose_references_dir = CONFIG.get("storage", {}).get("pose_references_dir", "pose_references")
-            
-            deleted_items = []
-            
-            # Remove face image from guard_profiles directory ONLY
-            profile_image = os.path.join(guard_profiles_dir, f"target_{safe_name}_face.jpg")
-            if os.path.exists(profile_image):
-                os.remove(profile_image)
-                deleted_items.append("Face image (profiles)")
-            
-            # Remove pose references
-            pose_file = os.path.join(pose_references_dir, f"{safe_name}_poses.json")
-            if os.path.exists(pose_file):
-                os.remove(pose_file)
-                deleted_items.append("Pose references")
-            
-            # Remove from tracking if currently tracked
-            if guard_name in self.targets_status:
-                if self.targets_status[guard_name].get("tracker"):
-                    self.targets_status[guard_name]["tracker"] = None
-                del self.targets_status[guard_name]
-                deleted_items.append("Active tracking")
-            
-            # Reload targets list
-            self.load_targets()
-            
-            logger.warning(f"Guard removed: {guard_name} ({', '.join(deleted_items)})")
+            deleted_items = super().remove_guard(guard_name)
             messagebox.showinfo(
                 "Guard Removed",
                 f"'{guard_name}' has been successfully removed.\n\nDeleted: {', '.join(deleted_items)}"
             )
-            
+
         except Exception as e:
             logger.error(f"Error removing guard {guard_name}: {e}")
             messagebox.showerror("Error", f"Failed to remove guard: {e}")
-    
+
     def upload_guard_image(self):
         """Upload an existing image for guard onboarding"""
         if not self.is_running: return
@@ -1214,6 +598,7 @@ class PoseApp:
             # Copy image
             import shutil
             shutil.copy(filepath, target_path)
+            self.encoding_cache.invalidate(target_path)
             
             # Also copy to root for backward compatibility
             shutil.copy(filepath, f"target_{safe_name}_face.jpg")
@@ -1225,20 +610,6 @@ class PoseApp:
             messagebox.showerror("Error", f"Failed to upload image: {e}")
             logger.error(f"Upload error: {e}")
     
-    def load_pose_references(self, guard_name):
-        """Load saved pose references for a guard"""
-        try:
-            pose_dir = CONFIG.get("storage", {}).get("pose_references_dir", "pose_references")
-            safe_name = guard_name.replace(" ", "_")
-            pose_file = os.path.join(pose_dir, f"{safe_name}_poses.json")
-            
-            if os.path.exists(pose_file):
-                with open(pose_file, 'r') as f:
-                    return json.load(f)
-        except Exception as e:
-            logger.warning(f"Could not load pose references for {guard_name}: {e}")
-        return {}
-    
     def save_pose_references(self, guard_name, poses_data):
         """Save pose references for a guard using systematic storage"""
         try:
@@ -1248,37 +619,10 @@ class PoseApp:
             logger.error(f"Failed to save pose references: {e}")
 
     def load_targets(self):
-        self.target_map = {}
-        # Search ONLY in guard_profiles directory
-        guard_profiles_dir = CONFIG.get("storage", {}).get("guard_profiles_dir", "guard_profiles")
-        if not os.path.exists(guard_profiles_dir):
-            os.makedirs(guard_profiles_dir)
-        target_files = glob.glob(os.path.join(guard_profiles_dir, "target_*.jpg"))
-        display_names = []
-        for f in target_files:
-            try:
-                # Parse filename: target_[Name]_face.jpg or target_[First_Last]_face.jpg
-                base_name = os.path.basename(f).replace(".jpg", "")
-                parts = base_name.split('_')
-                
-                # Remove 'target' prefix and 'face' suffix
-                if len(parts) >= 3 and parts[-1] == "face":
-                    # Join all parts between 'target' and 'face' as the name
-                    display_name = " ".join(parts[1:-1])
-                    self.target_map[display_name] = f
-                    display_names.append(display_name)
-            except Exception as e:
-                logger.error(f"Error parsing {f}: {e}")
-
-        if not display_names:
-             logger.warning("No target files found")
-        else:
-             logger.warning(f"Loaded {len(set(display_names))} guards")
-        
-        # Update selected targets list
-        self.selected_target_names = [name for name in self.selected_target_names if name in self.target_map]
+        names = super().load_targets()
         self.update_selected_preview()
-    
+        return names
+
     def select_all_targets(self):
         """Select all targets"""
         self.selected_target_names = list(self.target_map.keys())
@@ -1351,51 +695,38 @@ class PoseApp:
                     self.guard_preview_label.configure(text=f"Error: {first_name}")
 
     def apply_target_selection(self):
-        self.targets_status = {} 
-        if not self.selected_target_names:
-            # No targets selected, tracking disabled
-            return
-        count = 0
-        # ✅ IMPROVED: Increased pose buffer size for better multi-guard stability
-        pose_buffer_size = max(CONFIG["performance"].get("pose_buffer_size", 5), 12)
-        
-        for name in self.selected_target_names:
-            filename = self.target_map.get(name)
-            if filename:
-                try:
-                    target_image_file = face_recognition.load_image_file(filename)
-                    encodings = face_recognition.face_encodings(target_image_file)
-                    if encodings:
-                        self.targets_status[name] = {
-                            "encoding": encodings[0],
-                            "tracker": None,
-                            "face_box": None, 
-                            "visible": False,
-                            "last_action_time": time.time(),  # Renamed from last_wave_time
-                            "alert_cooldown": 0,
-                            "alert_triggered_state": False,
-                            "last_logged_action": None,
-                            "pose_buffer": deque(maxlen=pose_buffer_size),  # ✅ Larger buffer for stability
-                            "missing_pose_counter": 0,
-                            "face_confidence": 0.0,
-                            "pose_confidence": 0.0,  # ✅ NEW: Track pose detection quality
-                            "face_encoding_history": deque(maxlen=5),  # ✅ NEW: Track face encoding changes
-                            "last_valid_pose": None,  # ✅ NEW: Store last valid pose for continuity
-                            "pose_references": self.load_pose_references(name),
-                            "last_snapshot_time": 0,  # Rate limiting: one snapshot per minute
-                            "last_log_time": 0,  # Rate limiting: one log entry per minute
-                            "alert_sound_thread": None,  # Track current alert sound thread
-                            "alert_stop_event": None,  # Event to signal sound to stop when action performed
-                            "alert_logged_timeout": False,  # Track if timeout alert was logged
-                            "missing_logged": False  # Track if missing event was logged
-                        }
-                        count += 1
-                except Exception as e:
-                    logger.error(f"Error loading {name}: {e}")
+        count = self.track_targets(self.selected_target_names)
         if count > 0:
-            logger.warning(f"Tracking initialized for {count} targets (Pose Buffer: {pose_buffer_size} frames).")
             messagebox.showinfo("Tracking Updated", f"Now scanning for {count} selected targets.")
 
+    def open_event_log_dialog(self):
+        """Show recent events and today's status counts from the event log"""
+        self.event_log.flush()
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Event Log")
+        dialog.geometry("720x500")
+        
+        guard_var = tk.StringVar(value="All guards")
+        guards = ["All guards"] + sorted(self.targets_status.keys())
+        text = ctk.CTkTextbox(dialog, font=("Courier", 11))
+        
+        def refresh(*_):
+            guard = None if guard_var.get() == "All guards" else guard_var.get()
+            midnight = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            counts = self.event_log.counts(by="status", since=midnight)
+            text.configure(state="normal")
+            text.delete("1.0", "end")
+            text.insert("end", "Today: " + (", ".join(f"{k}: {v}" for k, v in counts.items()) or "no events") + "\n\n")
+            for event in self.event_log.query(guard=guard, limit=200):
+                text.insert("end", f"{event['timestamp']}  {event['guard']:<20} {event['action'] or '':<24} "
+                                   f"{event['status'] or '':<32} {event['confidence']:.2f}\n")
+            text.configure(state="disabled")
+        
+        ctk.CTkOptionMenu(dialog, values=guards, variable=guard_var, command=refresh).pack(pady=10)
+        text.pack(pady=5, padx=10, fill="both", expand=True)
+        ctk.CTkButton(dialog, text="Refresh", command=refresh).pack(pady=10)
+        refresh()
+
     def open_target_selection_dialog(self):
         """Open dialog for selecting targets"""
         dialog = ctk.CTkToplevel(self.root)
@@ -1492,27 +823,11 @@ class PoseApp:
         ctk.CTkButton(dialog, text="Set", command=confirm, fg_color="green").pack(pady=15, padx=20, fill="x")
 
     def toggle_alert_mode(self):
-        self.is_alert_mode = not self.is_alert_mode
+        self.set_alert_mode(not self.is_alert_mode)
         if self.is_alert_mode:
             self.btn_toggle_alert.configure(text="Stop Alert Mode", fg_color="#c0392b")
-            # Auto-start logging
-            if not self.is_logging:
-                self.is_logging = True
-                self.temp_log.clear()
-                self.temp_log_counter = 0
-                logger.warning("Alert mode started - logging enabled")
-            
-            current_time = time.time()
-            for name in self.targets_status:
-                self.targets_status[name]["last_action_time"] = current_time
-                self.targets_status[name]["alert_triggered_state"] = False
         else:
             self.btn_toggle_alert.configure(text="Start Alert Mode", fg_color="#e67e22")
-            # Auto-stop logging and save
-            if self.is_logging:
-                self.save_log_to_file()
-                self.is_logging = False
-                logger.warning("Alert mode stopped - logging saved")
 
     def set_alert_interval(self):
         val = simpledialog.askinteger("Set Interval", "Enter seconds:", minvalue=1, maxvalue=3600, initialvalue=self.alert_interval)
@@ -1521,11 +836,8 @@ class PoseApp:
             self.btn_set_interval.configure(text=f"Set Interval ({self.alert_interval}s)")
             
     def on_action_change(self, value):
-        if self.is_alert_mode:
-            current_time = time.time()
-            for name in self.targets_status:
-                self.targets_status[name]["last_action_time"] = current_time
-                self.targets_status[name]["alert_triggered_state"] = False
+        self.required_action_var.set(value)
+        self.set_required_action(value)
 
     def toggle_fugitive_mode(self):
         """Toggle Fugitive Mode - Search for a specific person in live feed"""
@@ -1535,62 +847,41 @@ class PoseApp:
                 title="Select Fugitive Image",
                 filetypes=[("Image files", "*.jpg *.jpeg *.png"), ("All files", "*.*")]
             )
-            
+
             if not file_path:
                 return
-            
+
             try:
-                # Load and display fugitive image
-                self.fugitive_image = cv2.imread(file_path)
-                if self.fugitive_image is None:
-                    messagebox.showerror("Error", "Failed to load image")
-                    return
-                
-                # Extract face encoding from fugitive image
-                rgb_image = cv2.cvtColor(self.fugitive_image, cv2.COLOR_BGR2RGB)
-                face_locations = face_recognition.face_locations(rgb_image)
-                
-                if not face_locations:
-                    messagebox.showerror("Error", "No face detected in selected image")
-                    return
-                
-                face_encodings = face_recognition.face_encodings(rgb_image, face_locations)
-                if not face_encodings:
-                    messagebox.showerror("Error", "Failed to extract face encoding")
+                # Load the image and its face encoding (cached by path/mtime/size)
+                try:
+                    image, encoding = self.load_fugitive_image(file_path)
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
                     return
-                
-                self.fugitive_face_encoding = face_encodings[0]
-                self.fugitive_name = simpledialog.askstring("Fugitive Name", "Enter fugitive name:") or "Unknown Fugitive"
-                
-                # Start Fugitive Mode
-                self.fugitive_mode = True
-                self.fugitive_detected_log_done = False
+
+                name = simpledialog.askstring("Fugitive Name", "Enter fugitive name:")
+                self.start_fugitive(image, encoding, name)
                 self.btn_fugitive.configure(text="Disable Fugitive Mode", fg_color="#ff6b6b")
-                
+
                 # Show fugitive preview frame
                 self.fugitive_preview_frame.pack(side="left", fill="both", expand=True, padx=2, pady=2)
-                
+
                 # Display fugitive image in preview
                 self._update_fugitive_preview()
-                
-                logger.warning(f"Fugitive Mode Started - Searching for: {self.fugitive_name}")
+
                 messagebox.showinfo("Fugitive Mode", f"Searching for: {self.fugitive_name}")
-                
+
             except Exception as e:
                 logger.error(f"Fugitive Mode Error: {e}")
                 messagebox.showerror("Error", f"Failed to process image: {e}")
         else:
             # Stop Fugitive Mode
-            self.fugitive_mode = False
-            self.fugitive_image = None
-            self.fugitive_face_encoding = None
-            self.fugitive_detected_log_done = False
+            self.stop_fugitive()
             self.btn_fugitive.configure(text="Enable Fugitive Mode", fg_color="#8b0000")
-            
+
             # Hide fugitive preview frame
             self.fugitive_preview_frame.pack_forget()
-            
-            logger.warning("Fugitive Mode Stopped")
+
             messagebox.showinfo("Fugitive Mode", "Fugitive Mode Stopped")
 
     def _update_fugitive_preview(self):
@@ -1639,15 +930,8 @@ class PoseApp:
                 return
             
             try:
-                self.pro_detection_mode = True
-                self.person_features_db = {}  # Reset feature database
-                self.person_identity_history = {}  # Reset identity tracking
-                self.person_tracking_data = []  # Reset tracking data
-                self.pro_detection_log_done = {}
-                self.pro_detection_person_counter = 0
-                
+                self.start_pro_detection()
                 self.btn_pro_detection.configure(text="Disable PRO_Detection", fg_color="#00d9ff", text_color="black")
-                logger.warning("🚀 PRO_Detection Mode Started - Person Re-Identification Enabled")
                 messagebox.showinfo("PRO_Detection - Onboarding Required", 
                     "🎯 PRO_Detection Mode Activated!\n\n"
                     "⚠️  IMPORTANT: Add new guards for PRO mode\n\n"
@@ -1671,43 +955,25 @@ class PoseApp:
                 messagebox.showerror("Error", f"Failed to start PRO_Detection: {e}")
                 self.pro_detection_mode = False
         else:
-            # Stop PRO_Detection Mode
-            self.pro_detection_mode = False
-            self.person_features_db = {}
-            self.person_identity_history = {}
+            # Stop PRO_Detection Mode (this session's ReID events are exported to CSV)
+            self.stop_pro_detection()
             self.btn_pro_detection.configure(text="Enable PRO_Detection", fg_color="#004a7f", text_color="white")
-            
-            # Auto-save tracking data to CSV
-            if self.person_tracking_data:
-                self._save_pro_detection_log()
-            
-            logger.warning("🛑 PRO_Detection Mode Stopped")
-            messagebox.showinfo("PRO_Detection", "PRO_Detection Mode Stopped")
 
-    def _save_pro_detection_log(self):
-        """Save person re-identification tracking data to CSV file"""
-        try:
-            if not self.person_tracking_data:
-                return
-            
-            log_dir = os.path.join(os.path.dirname(__file__), "logs")
-            os.makedirs(log_dir, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            log_file = os.path.join(log_dir, f"pro_detection_{timestamp}.csv")
-            
-            with open(log_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'Person_ID', 'Person_Name', 'Action', 'Status', 'Features_Available', 'Confidence'])
-                writer.writerows(self.person_tracking_data)
-            
-            logger.warning(f"📊 PRO_Detection log saved: {log_file}")
-        except Exception as e:
-            logger.error(f"Failed to save PRO_Detection log: {e}")
+            messagebox.showinfo("PRO_Detection", "PRO_Detection Mode Stopped")
 
     def start_camera(self):
         if not self.is_running:
             try:
+                camera_cfg = CONFIG.get("camera", {})
+                if camera_cfg.get("mode", "single") == "multi":
+                    self._start_multi_camera(camera_cfg.get("sources") or detect_available_cameras())
+                    return
+                
+                # A configured source (device index, RTSP/HTTP URL or video file) skips detection
+                if camera_cfg.get("source") not in (None, ""):
+                    self._open_source(parse_source(camera_cfg["source"]), replay=camera_cfg.get("replay", False))
+                    return
+                
                 # Detect available cameras
                 available_cameras = detect_available_cameras()
                 
@@ -1745,172 +1011,79 @@ class PoseApp:
                     self.camera_index = available_cameras[0]
                 
                 # Open selected camera
-                self.cap = cv2.VideoCapture(self.camera_index)
-                if not self.cap.isOpened():
-                    messagebox.showerror("Camera Error", f"Failed to open camera {self.camera_index}")
-                    return
-                    
-                self.frame_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                self.frame_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                self.is_running = True
-                self.btn_start.configure(state="disabled")
-                self.btn_stop.configure(state="normal")
-                self.btn_add_guard.configure(state="normal")
-                self.btn_toggle_alert.configure(state="normal")
-                self.btn_fugitive.configure(state="normal")
-                self.btn_pro_detection.configure(state="normal")
-                logger.warning(f"Camera {self.camera_index} started successfully")
-                self.update_video_feed()
+                self._open_source(self.camera_index)
             except Exception as e:
                 logger.error(f"Camera start error: {e}")
                 messagebox.showerror("Error", f"Failed to start camera: {e}")
 
+    def start_replay(self):
+        """Replay recorded footage through the full tracking pipeline as fast as it can be processed"""
+        if self.is_running:
+            return
+        file_path = filedialog.askopenfilename(
+            title="Select Footage to Replay",
+            filetypes=[("Video files", "*.mp4 *.avi *.mkv *.mov"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        try:
+            self._open_source(file_path, replay=True)
+        except Exception as e:
+            logger.error(f"Replay start error: {e}")
+            messagebox.showerror("Error", f"Failed to start replay: {e}")
+
+    def _open_source(self, source, replay=False):
+        """
+        Open a device index, stream URL or video file and start capture/processing.
+
+        Args:
+            source: value accepted by poseguard.sources.open_capture
+            replay: file sources only - process every frame, unthrottled
+        """
+        if not self.open_source(source, replay=replay):
+            messagebox.showerror("Camera Error", f"Failed to open {describe_source(source)}")
+            return
+        self._enable_camera_controls()
+        self.update_video_feed()
+
+    def _enable_camera_controls(self):
+        self.btn_start.configure(state="disabled")
+        self.btn_replay.configure(state="disabled")
+        self.btn_stop.configure(state="normal")
+        self.btn_add_guard.configure(state="normal")
+        self.btn_toggle_alert.configure(state="normal")
+        self.btn_fugitive.configure(state="normal")
+        self.btn_pro_detection.configure(state="normal")
+
+    def _start_multi_camera(self, sources):
+        """Open every source as its own CameraStream (capture + processing thread per camera)"""
+        if not self.open_multi_camera(sources):
+            messagebox.showerror("Camera Error", "No cameras could be opened!")
+            return
+        self._enable_camera_controls()
+        self.update_video_feed()
+
     def stop_camera(self):
         if self.is_running:
-            self.is_running = False
-            if self.cap:
-                self.cap.release()
-                self.cap = None
-            if self.is_logging:
-                self.save_log_to_file()
-            
-            # Stop Fugitive Mode if running
-            if self.fugitive_mode:
-                self.fugitive_mode = False
-                self.fugitive_image = None
-                self.fugitive_face_encoding = None
-                self.fugitive_detected_log_done = False
+            fugitive_was_on, pro_was_on = self.fugitive_mode, self.pro_detection_mode
+            self.stop()
+
+            if fugitive_was_on:
                 self.btn_fugitive.configure(text="Enable Fugitive Mode", fg_color="#8b0000")
                 self.fugitive_preview_label.configure(image='', text="No Fugitive Selected")
-            
-            # Stop PRO_Detection Mode if running
-            if self.pro_detection_mode:
-                self.pro_detection_mode = False
-                if self.person_tracking_data:
-                    self._save_pro_detection_log()
-                self.person_features_db = {}
-                self.person_identity_history = {}
+            if pro_was_on:
                 self.btn_pro_detection.configure(text="Enable PRO_Detection", fg_color="#004a7f", text_color="white")
-                logger.warning("PRO_Detection Mode Stopped on camera close")
-            
+
             # Clear guard preview
             self.guard_preview_label.configure(image='', text="No Guard Selected")
-            
-            # Cleanup
-            for status in self.targets_status.values():
-                if status["tracker"]:
-                    status["tracker"] = None
-            
-            gc.collect()
-            
+
             self.btn_start.configure(state="normal")
+            self.btn_replay.configure(state="normal")
             self.btn_stop.configure(state="disabled")
             self.btn_add_guard.configure(state="disabled")
             self.btn_fugitive.configure(state="disabled")
             self.btn_pro_detection.configure(state="disabled")
-            self.video_label.configure(image='')
-
-    def auto_flush_logs(self):
-        """Automatically flush logs when threshold reached"""
-        if self.is_logging and len(self.temp_log) >= CONFIG["logging"]["auto_flush_interval"]:
-            self.save_log_to_file()
-        
-        # Optimize memory periodically
-        if self.frame_counter % 300 == 0:  # Every ~10 seconds at 30fps
-            self.optimize_memory()
-    
-    def optimize_memory(self):
-        """Clear old cache entries and collect garbage to free memory"""
-        try:
-            # Clear old action cache - keep last 50 entries
-            if len(self.last_action_cache) > 50:
-                keys_to_remove = list(self.last_action_cache.keys())[:-50]
-                for key in keys_to_remove:
-                    del self.last_action_cache[key]
-            
-            # Force garbage collection
-            import gc
-            gc.collect()
-            logger.debug("Memory optimized - caches cleared, garbage collected")
-        except Exception as e:
-            logger.error(f"Memory optimization error: {e}")
-
-    def save_log_to_file(self):
-        if self.temp_log:
-            try:
-                log_dir = CONFIG["logging"]["log_directory"]
-                os.makedirs(log_dir, exist_ok=True)
-                csv_path = os.path.join(log_dir, "events.csv")
-                
-                file_exists = os.path.exists(csv_path)
-                with open(csv_path, mode="a", newline="") as f:
-                    writer = csv.writer(f)
-                    if not file_exists:
-                        writer.writerow(["Timestamp", "Guard Name", "Action", "Status", "Image Path", "Confidence"])
-                    writer.writerows(self.temp_log)
-                logger.warning(f"Saved {len(self.temp_log)} log entries to {csv_path}")
-                self.temp_log.clear()
-                self.temp_log_counter = 0
-            except Exception as e:
-                logger.error(f"Log save error: {e}")
-
-    def log_action_performed(self, guard_name, action, image_path, confidence):
-        """Log when a guard performs the required action"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.temp_log.append((timestamp, guard_name, action, "Action Performed", image_path, f"{confidence:.2f}"))
-        self.temp_log_counter += 1
-        logger.info(f"✓ {guard_name}: {action} performed (conf: {confidence:.2f})")
-        
-    def log_action_not_performed(self, guard_name, expected_action, image_path, confidence):
-        """Log when a guard does NOT perform the required action during interval"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.temp_log.append((timestamp, guard_name, expected_action, "Action Not Performed", image_path, f"{confidence:.2f}"))
-        self.temp_log_counter += 1
-        logger.warning(f"✗ {guard_name}: {expected_action} NOT performed (conf: {confidence:.2f})")
-        
-    def log_guard_missing(self, guard_name, image_path="N/A"):
-        """Log when a guard is missing from the frame"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.temp_log.append((timestamp, guard_name, "N/A", "Guard Missing", image_path, "0.00"))
-        self.temp_log_counter += 1
-        logger.warning(f"⚠ {guard_name}: MISSING from frame")
-            
-    def capture_alert_snapshot(self, frame, target_name, check_rate_limit=False):
-        """
-        Capture alert snapshot with optional rate limiting (1 per minute).
-        
-        Args:
-            frame: Image frame to save
-            target_name: Name of the target
-            check_rate_limit: If True, only capture if 60+ seconds since last snapshot
-        
-        Returns:
-            filename if saved, None if rate limited, "Error" if failed
-        """
-        current_time = time.time()
-        
-        # Rate limiting check: only one snapshot per minute per target
-        if check_rate_limit and target_name in self.targets_status:
-            last_snap_time = self.targets_status[target_name].get("last_snapshot_time", 0)
-            if (current_time - last_snap_time) < 60:  # Less than 60 seconds
-                return None  # Skip snapshot due to rate limit
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = target_name.replace(" ", "_")
-        snapshot_dir = CONFIG["storage"]["alert_snapshots_dir"]
-        filename = os.path.join(snapshot_dir, f"alert_{safe_name}_{timestamp}.jpg")
-        try:
-            bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            cv2.imwrite(filename, bgr_frame)
-            
-            # Update last snapshot time for this target
-            if target_name in self.targets_status:
-                self.targets_status[target_name]["last_snapshot_time"] = current_time
-            
-            return filename
-        except Exception as e:
-            logger.error(f"Snapshot error: {e}")
-            return "Error"
+            self.display_renderer.clear()
 
     def enter_onboarding_mode(self):
         if not self.is_running: return
@@ -1937,11 +1110,12 @@ class PoseApp:
         self.onboarding_face_box = None
 
     def snap_photo(self):
-        if self.unprocessed_frame is None: return
+        unprocessed = self.unprocessed_slot.snapshot()
+        if unprocessed is None: return
         
         if not self.onboarding_mode:
             # Legacy simple capture - now with dynamic detection
-            rgb_frame = cv2.cvtColor(self.unprocessed_frame, cv2.COLOR_BGR2RGB)
+            rgb_frame = cv2.cvtColor(unprocessed, cv2.COLOR_BGR2RGB)
             face_locations = face_recognition.face_locations(rgb_frame)
             if len(face_locations) == 1:
                 name = simpledialog.askstring("Name", "Enter Name:")
@@ -1953,11 +1127,11 @@ class PoseApp:
                     
                     # Expand to include shoulders/upper body
                     crop_top = max(0, top - int(face_h * 0.3))
-                    crop_bottom = min(self.unprocessed_frame.shape[0], bottom + int(face_h * 0.5))
+                    crop_bottom = min(unprocessed.shape[0], bottom + int(face_h * 0.5))
                     crop_left = max(0, left - int(face_w * 0.3))
-                    crop_right = min(self.unprocessed_frame.shape[1], right + int(face_w * 0.3))
+                    crop_right = min(unprocessed.shape[1], right + int(face_w * 0.3))
                     
-                    cropped_face = self.unprocessed_frame[crop_top:crop_bottom, crop_left:crop_right]
+                    cropped_face = unprocessed[crop_top:crop_bottom, crop_left:crop_right]
                     
                     # Save using systematic helpers
                     save_guard_face(cropped_face, name)
@@ -1965,7 +1139,7 @@ class PoseApp:
                     
                     # Backward compatibility
                     safe_name = name.strip().replace(" ", "_")
-                    cv2.imwrite(f"target_{safe_name}_face.jpg", cropped_face)
+                    self.snapshot_writer.submit(f"target_{safe_name}_face.jpg", cropped_face, overwrite=True)
                     
                     self.load_targets()
                     self.exit_onboarding_mode()
@@ -1980,7 +1154,7 @@ class PoseApp:
                 messagebox.showwarning("Error", "No face detected. Please stand in front of camera and wait for green box.")
                 return
             
-            rgb_frame = cv2.cvtColor(self.unprocessed_frame, cv2.COLOR_BGR2RGB)
+            rgb_frame = cv2.cvtColor(unprocessed, cv2.COLOR_BGR2RGB)
             face_locations = face_recognition.face_locations(rgb_frame)
             
             if len(face_locations) != 1:
@@ -1993,7 +1167,7 @@ class PoseApp:
             face_w = right - left
             
             # Check if face is large enough (person is close)
-            frame_h, frame_w = self.unprocessed_frame.shape[:2]
+            frame_h, frame_w = unprocessed.shape[:2]
             face_area_ratio = (face_h * face_w) / (frame_h * frame_w)
             
             if face_area_ratio < 0.02:  # Face is too small
@@ -2006,7 +1180,7 @@ class PoseApp:
             crop_left = max(0, left - int(face_w * 0.3))
             crop_right = min(frame_w, right + int(face_w * 0.3))
             
-            cropped_face = self.unprocessed_frame[crop_top:crop_bottom, crop_left:crop_right]
+            cropped_face = unprocessed[crop_top:crop_bottom, crop_left:crop_right]
             
             # Save using systematic helpers
             if self.onboarding_name:
@@ -2015,7 +1189,7 @@ class PoseApp:
                 
                 # Backward compatibility - save to root
                 safe_name = self.onboarding_name.replace(" ", "_")
-                cv2.imwrite(f"target_{safe_name}_face.jpg", cropped_face)
+                self.snapshot_writer.submit(f"target_{safe_name}_face.jpg", cropped_face, overwrite=True)
             
             self.onboarding_step = 1
             messagebox.showinfo("Step 2", "Good! Now perform: ONE HAND RAISED LEFT (raise your left hand) and click Snap")
@@ -2030,15 +1204,16 @@ class PoseApp:
             
             # Verify pose quality
             results = self.onboarding_detection_results
-            visible_landmarks = sum(1 for lm in results.pose_landmarks.landmark if lm.visibility > 0.5)
+            pose_arr = landmarks_to_array(results.pose_landmarks)
+            visible_landmarks = int(count_visible(pose_arr))
             
             if visible_landmarks < 20:  # Need at least 20 visible landmarks for good pose
                 messagebox.showwarning("Error", f"Pose not clear enough. Ensure full body is visible and well-lit. ({visible_landmarks}/33 landmarks visible)")
                 return
             
             # Verify the action matches what we're capturing
-            rgb_frame = cv2.cvtColor(self.unprocessed_frame, cv2.COLOR_BGR2RGB)
-            current_action = classify_action(results.pose_landmarks.landmark, self.frame_h, self.frame_w)
+            rgb_frame = cv2.cvtColor(unprocessed, cv2.COLOR_BGR2RGB)
+            current_action = classify_poses(pose_arr, self.frame_h, self.frame_w)
             
             if current_action != action:
                 messagebox.showwarning("Pose Mismatch", f"Please perform {action.upper()}. Currently detecting: {current_action}")
@@ -2063,61 +1238,111 @@ class PoseApp:
                 messagebox.showinfo("Complete", f"{self.onboarding_name} onboarding complete with {len(self.onboarding_poses)} poses!")
                 messagebox.showinfo("Complete", f"{self.onboarding_name} onboarding complete with {len(self.onboarding_poses)} poses!")
 
+    def _snapshot_queue_summary(self):
+        """Snapshot writer back-pressure for the status bar (empty while the queue keeps up)."""
+        stats = self.snapshot_writer.stats()
+        if not stats["pending"] and not stats["dropped"]:
+            return ""
+        return f" | Snap Q: {stats['pending']}/{self.snapshot_writer.max_queue} Drop: {stats['dropped']}"
+
+    def toggle_profiler_overlay(self):
+        """Show/hide the per-stage latency table (p50/p95/p99) over the camera feed"""
+        self.profiler_overlay_visible = not self.profiler_overlay_visible
+        if self.profiler_overlay_visible:
+            self._refresh_profiler_overlay()
+            self.profiler_overlay.place(x=8, y=8)
+            self.profiler_overlay.lift()
+            self.btn_profiler.configure(fg_color="#27ae60")
+            if not self.profiler.enabled:
+                logger.warning("Profiling is disabled in config.json (profiling.enabled)")
+        else:
+            self.profiler_overlay.place_forget()
+            self.btn_profiler.configure(fg_color="#7f8c8d")
+
+    def _refresh_profiler_overlay(self):
+        per_guard = CONFIG.get("profiling", {}).get("overlay_per_guard", True)
+        self.profiler_overlay.configure(text=self.profiler.summary_text(per_guard=per_guard))
+
+    def _detection_summary(self):
+        """Status-bar suffix with face detector/encoder calls per processed frame"""
+        stats = self.detection_stats
+        if not stats.frames:
+            return ""
+        return (f" | Face det: {stats.detector_calls / stats.frames:.2f}/frame (max {stats.max_detector_calls_per_frame})"
+                f" enc: {stats.encoder_calls / stats.frames:.2f}/frame hits: {stats.cache_hits / stats.frames:.2f}/frame")
+
+    def _motion_skip_summary(self):
+        """Status-bar suffix with per-guard motion-gate skip ratios"""
+        gates = [s.motion_gate for s in self.streams] if self.streams else [self.motion_gate]
+        gates = [gate for gate in gates if gate]
+        if not gates:
+            return ""
+        # Multi-camera: average each guard's skip ratio over the cameras
+        per_guard = {}
+        for gate in gates:
+            for name, ratio in gate.skip_ratios().items():
+                per_guard.setdefault(name, []).append(ratio)
+        ratios = {name: sum(values) / len(values) for name, values in per_guard.items()}
+        if not ratios:
+            return ""
+        return "\nSkip: " + " ".join(f"{name}:{ratio:.0%}" for name, ratio in sorted(ratios.items()))
+
     def update_video_feed(self):
+        """Display loop on the Tk thread; capture and processing run on their own threads"""
         if not self.is_running: return
         
         try:
-            if not self.cap or not self.cap.isOpened():
+            # Lost live sources reconnect with back-off on their capture threads
+            source_state = self.check_source()
+            if source_state == "failed":
                 logger.error("Camera not available")
                 self.stop_camera()
+                messagebox.showerror("Camera Error", "Camera disconnected")
                 return
-            
-            ret, frame = self.cap.read()
-            if not ret:
-                logger.error("Failed to read frame, attempting reconnect...")
-                # Try to reconnect camera
-                self.cap.release()
-                time.sleep(0.5)
-                self.cap = cv2.VideoCapture(0)
-                if not self.cap.isOpened():
-                    self.stop_camera()
-                    messagebox.showerror("Camera Error", "Camera disconnected")
+            elif source_state == "finished":
+                self._on_source_finished()
                 return
         except Exception as e:
             logger.error(f"Camera read error: {e}")
             self.stop_camera()
             return
         
-        self.unprocessed_frame = frame.copy()
-        
-        # Frame skipping for performance
-        self.frame_counter += 1
-        skip_interval = CONFIG["performance"]["frame_skip_interval"]
+        self.display_counter += 1
         
-        if self.is_in_capture_mode:
-            self.process_capture_frame(frame)
-        else:
-            # Skip processing every N frames when enabled
-            if CONFIG["performance"]["enable_frame_skipping"] and self.frame_counter % skip_interval != 0:
-                # Use cached frame
-                if self.last_process_frame is not None:
-                    frame = self.last_process_frame.copy()
-            else:
-                self.process_tracking_frame_optimized(frame)
-                self.last_process_frame = frame.copy()
-        
-        # FPS calculation
-        if self.frame_counter % 30 == 0:
+        # Stats: capture and processing rates are measured on their own threads
+        if self.display_counter % 30 == 0:
             current_time = time.time()
-            elapsed = current_time - self.last_fps_time
-            if elapsed > 0:
-                self.current_fps = 30 / elapsed
-            self.last_fps_time = current_time
+            self.current_fps = self.processing_meter.rate
             
             # Memory monitoring
             process = psutil.Process()
             mem_mb = process.memory_info().rss / 1024 / 1024
-            self.status_label.configure(text=f"FPS: {self.current_fps:.1f} | MEM: {mem_mb:.0f} MB")
+            if self.streams:
+                # Aggregate over cameras: total capture/processing rate and drops
+                grabbers = [s.frame_grabber for s in self.streams if s.frame_grabber]
+                cap_fps = sum(g.capture_fps for g in grabbers)
+                proc_fps = sum(s.processing_meter.rate for s in self.streams)
+                dropped = sum(g.dropped_frames for g in grabbers)
+                prefix = f"{len(self.streams)} cams | "
+                if any(g.reconnecting for g in grabbers):
+                    prefix += "Reconnecting... | "
+            else:
+                cap_fps = self.frame_grabber.capture_fps
+                proc_fps = self.processing_meter.rate
+                dropped = self.frame_grabber.dropped_frames
+                prefix = "Reconnecting... | " if self.frame_grabber.reconnecting else ""
+                if self.replay_mode:
+                    prefix = f"Replay {self.last_processed_index + 1} frames | "
+            self.status_label.configure(
+                text=f"{prefix}Cap: {cap_fps:.1f} | Proc: {proc_fps:.1f} FPS | "
+                     f"Drop: {dropped} | MEM: {mem_mb:.0f} MB"
+                     + f" | {self.alloc_meter.summary()}"
+                     + self._snapshot_queue_summary()
+                     + self._detection_summary()
+                     + self._motion_skip_summary()
+            )
+            if self.profiler_overlay_visible:
+                self._refresh_profiler_overlay()
             
             # Session time check
             session_hours = (current_time - self.session_start_time) / 3600
@@ -2132,39 +1357,43 @@ class PoseApp:
                 else:
                     self.session_start_time = current_time
         
-        # Auto flush logs
-        self.auto_flush_logs()
-        
-        if self.video_label.winfo_exists():
-            try:
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # --- Full Fill Resize Logic ---
-                lbl_w = self.video_label.winfo_width()
-                lbl_h = self.video_label.winfo_height()
-                if lbl_w > 10 and lbl_h > 10:
-                    h, w = frame.shape[:2]
-                    # Maintain aspect ratio
-                    scale = min(lbl_w/w, lbl_h/h)
-                    new_w, new_h = int(w*scale), int(h*scale)
-                    frame_rgb = cv2.resize(frame_rgb, (new_w, new_h))
-                
-                img = Image.fromarray(frame_rgb)
-                imgtk = ImageTk.PhotoImage(image=img)
-                self.video_label.imgtk = imgtk
-                self.video_label.configure(image=imgtk, text="")
-            except Exception as e:
-                logger.error(f"Frame display error: {e}")
+        # Only new frames are drawn, at most display_max_fps times per second
+        key = tuple(s.display_slot.version for s in self.streams) if self.streams else self.display_slot.version
+        if self.video_label.winfo_exists() and self.display_renderer.wants(key):
+            # Borrowed frames stay valid (not recycled by the capture thread) until the block ends
+            display_timer = self.profiler.stopwatch()
+            with ExitStack() as borrowed:
+                try:
+                    if self.streams:
+                        # Tiled view: every stream is downscaled into its tile at label size
+                        lbl_w, lbl_h = self.display_renderer.label_size or (0, 0)
+                        frame = tile_frames([borrowed.enter_context(s.display_slot.borrow()) for s in self.streams],
+                                            max(320, lbl_w), max(240, lbl_h),
+                                            labels=[s.stream_id for s in self.streams])
+                    else:
+                        frame = borrowed.enter_context(self.display_slot.borrow())
+                    # Resized only when the label size changes; the PhotoImage is updated in place
+                    self.display_renderer.render(frame, key)
+                    display_timer.lap("display")
+                except Exception as e:
+                    logger.error(f"Frame display error: {e}")
         
         refresh_ms = CONFIG["performance"]["gui_refresh_ms"]
         self.root.after(refresh_ms, self.update_video_feed)
 
+    def _on_source_finished(self):
+        """Footage ended and every delivered frame was processed: report throughput and stop"""
+        summary = self.replay_summary()
+        logger.warning(f"Footage finished - {summary}")
+        self.stop_camera()
+        messagebox.showinfo("Footage Finished", summary)
+
     def process_capture_frame(self, frame):
         """Process frame during onboarding capture mode with dynamic detection"""
         h, w = frame.shape[:2]
         
         # Detect face and pose from entire frame
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = self.frame_pool.convert("rgb_capture", frame, cv2.COLOR_BGR2RGB)
         rgb_frame.flags.writeable = False
         
         # Use holistic model to detect both face and pose
@@ -2213,18 +1442,17 @@ class PoseApp:
                 draw_styled_landmarks(frame, results)
                 
                 # Count visible landmarks
-                visible_landmarks = sum(1 for lm in results.pose_landmarks.landmark if lm.visibility > 0.5)
+                pose_arr = landmarks_to_array(results.pose_landmarks)
+                visible_landmarks = int(count_visible(pose_arr))
                 
                 # Classify current action
-                current_action = classify_action(results.pose_landmarks.landmark, h, w)
+                current_action = classify_poses(pose_arr, h, w)
                 
                 # Draw bounding box around detected pose
-                x_coords = [lm.x * w for lm in results.pose_landmarks.landmark if lm.visibility > 0.5]
-                y_coords = [lm.y * h for lm in results.pose_landmarks.landmark if lm.visibility > 0.5]
+                pose_box = landmark_bbox(pose_arr, w, h, min_visibility=0.5)
                 
-                if x_coords and y_coords:
-                    x_min, x_max = int(min(x_coords)), int(max(x_coords))
-                    y_min, y_max = int(min(y_coords)), int(max(y_coords))
+                if np.isfinite(pose_box).all():
+                    x_min, y_min, x_max, y_max = (int(v) for v in pose_box)
                     
                     # Add padding
                     padding = 20
@@ -2263,510 +1491,7 @@ class PoseApp:
         
         return frame
 
-    # --- TRACKING LOGIC ---
-    def process_tracking_frame_optimized(self, frame):
-        if not self.targets_status:
-            cv2.putText(frame, "SELECT TARGETS TO START", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            return frame
-
-        self.re_detect_counter += 1
-        if self.re_detect_counter > self.RE_DETECT_INTERVAL:
-            self.re_detect_counter = 0
-        
-        rgb_full_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_h, frame_w = frame.shape[:2]
-        
-        # ==================== FUGITIVE MODE ====================
-        # Search for Fugitive in frame (always active when enabled, regardless of alert mode)
-        if self.fugitive_mode and self.fugitive_face_encoding is not None:
-            face_locations = face_recognition.face_locations(rgb_full_frame)
-            if face_locations:
-                face_encodings = face_recognition.face_encodings(rgb_full_frame, face_locations)
-                
-                for face_encoding, face_location in zip(face_encodings, face_locations):
-                    # Compare with fugitive face
-                    match = face_recognition.compare_faces([self.fugitive_face_encoding], face_encoding, tolerance=0.5)
-                    face_distance = face_recognition.face_distance([self.fugitive_face_encoding], face_encoding)
-                    
-                    if match[0]:  # If face matches
-                        # Draw bounding box
-                        top, right, bottom, left = face_location
-                        cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 3)
-                        cv2.putText(frame, f"FUGITIVE: {self.fugitive_name}", (left, top - 10), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
-                        
-                        # Execute all three operations simultaneously (once per detection, regardless of logging status)
-                        if not self.fugitive_detected_log_done:
-                            # 1. Play Fugitive Alert Sound (always)
-                            if self.fugitive_alert_stop_event is None:
-                                self.fugitive_alert_stop_event = threading.Event()
-                            self.fugitive_alert_stop_event.clear()
-                            self.fugitive_alert_sound_thread = play_siren_sound(
-                                stop_event=self.fugitive_alert_stop_event,
-                                sound_file="Fugitive.mp3", 
-                                duration_seconds=15
-                            )
-                            
-                            # 2. Capture snapshot (always)
-                            snapshot_path = self.capture_alert_snapshot(frame, f"FUGITIVE_{self.fugitive_name}", check_rate_limit=False)
-                            img_path = snapshot_path if snapshot_path else "N/A"
-                            
-                            # 3. Create CSV log entry (always, regardless of logging enabled/disabled)
-                            confidence = 1.0 - face_distance[0]
-                            self.temp_log.append((
-                                time.strftime("%Y-%m-%d %H:%M:%S"),
-                                f"FUGITIVE_{self.fugitive_name}",
-                                "FUGITIVE_DETECTED",
-                                "FUGITIVE ALERT",
-                                img_path,
-                                f"{confidence:.2f}"
-                            ))
-                            self.temp_log_counter += 1
-                            
-                            # Log all three actions
-                            logger.warning(f"🚨 FUGITIVE DETECTED - All operations executed:")
-                            logger.warning(f"   ├─ 🔊 Alert Sound: Fugitive.mp3 (30s)")
-                            logger.warning(f"   ├─ 📸 Snapshot: {img_path}")
-                            logger.warning(f"   └─ 📋 CSV Logged: {self.fugitive_name} (Confidence: {confidence:.2f})")
-                            
-                            self.fugitive_detected_log_done = True
-                            self.last_fugitive_snapshot_time = time.time()
-                    else:
-                        # Reset flag when fugitive not in frame
-                        self.fugitive_detected_log_done = False
-        # ===================================================
-
-        # ==================== PRO_DETECTION MODE ====================
-        # Extract and match person features across multiple angles
-        if self.pro_detection_mode and self.targets_status:
-            face_locations = face_recognition.face_locations(rgb_full_frame)
-            
-            if face_locations:
-                for i, face_location in enumerate(face_locations):
-                    top, right, bottom, left = face_location
-                    face_box = (left, top, right, bottom)
-                    
-                    # Extract appearance features from detected person
-                    features = extract_appearance_features(frame, face_box)
-                    
-                    if features is not None:
-                        # Create a base ID for this detection
-                        # Use detection index as stable identifier within this frame
-                        detection_id = f"det_{i}_{int(self.frame_counter)}"
-                        
-                        # Check if this detection matches any known person in our database
-                        best_match_id = None
-                        best_match_confidence = 0.0
-                        
-                        # Compare against all stored persons
-                        for stored_person_id in list(self.person_features_db.keys()):
-                            stored_features = self.person_features_db[stored_person_id]['features']
-                            similarity = calculate_feature_similarity(features, stored_features)
-                            
-                            if similarity > best_match_confidence:
-                                best_match_confidence = similarity
-                                best_match_id = stored_person_id
-                        
-                        # Decide whether to match to existing person or create new one
-                        if best_match_confidence >= self.reid_confidence_threshold:
-                            # MATCH: Update existing person
-                            matched_id = best_match_id
-                            alpha = 0.3
-                            self.person_features_db[matched_id]['features'] = (
-                                alpha * features + (1 - alpha) * self.person_features_db[matched_id]['features']
-                            )
-                            self.person_features_db[matched_id]['count'] += 1
-                            self.person_features_db[matched_id]['last_seen'] = time.time()
-                            confidence = best_match_confidence
-                        else:
-                            # NEW PERSON: Create new identity
-                            self.pro_detection_person_counter += 1
-                            matched_id = f"Person_{self.pro_detection_person_counter:03d}"
-                            self.person_features_db[matched_id] = {
-                                'features': features,
-                                'count': 1,
-                                'last_seen': time.time()
-                            }
-                            confidence = 0.5  # Default confidence for new persons
-                        
-                        # Draw bounding box with person ID and confidence
-                        color = (0, 255, 0) if confidence >= 0.7 else (0, 255, 255)  # Green for high conf, cyan for new
-                        cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
-                        
-                        person_label = f"{matched_id} ({confidence:.2f})"
-                        cv2.putText(frame, person_label, (left, top - 10), 
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-                        
-                        # Log high confidence matches
-                        log_key = f"{matched_id}_{int(time.time() * 1000)}"
-                        if log_key not in self.pro_detection_log_done and confidence >= 0.65:
-                            self.person_tracking_data.append((
-                                time.strftime("%Y-%m-%d %H:%M:%S"),
-                                matched_id,
-                                "ReID_Detected",
-                                "PRO_DETECTION",
-                                "N/A",
-                                f"{confidence:.3f}"
-                            ))
-                            self.pro_detection_log_done[log_key] = True
-                            
-                            logger.info(f"🎯 {matched_id} detected (confidence: {confidence:.2f})")
-        # ===================================================
-
-        # 1. Update Trackers (With Stability Check for Multi-Guard Robustness)
-        for name, status in self.targets_status.items():
-            if status["tracker"]:
-                success, box = status["tracker"].update(frame)
-                if success:
-                    x, y, w, h = [int(v) for v in box]
-                    new_box = (x, y, x + w, y + h)
-                    
-                    # Stability check: ensure box movement is reasonable (prevent jitter)
-                    if status["face_box"] is not None:
-                        old_x1, old_y1, old_x2, old_y2 = status["face_box"]
-                        new_x1, new_y1, new_x2, new_y2 = new_box
-                        
-                        # Calculate movement (prevent extreme jumps)
-                        dx = abs(new_x1 - old_x1) + abs(new_x2 - old_x2)
-                        dy = abs(new_y1 - old_y1) + abs(new_y2 - old_y2)
-                        old_w = old_x2 - old_x1
-                        old_h = old_y2 - old_y1
-                        new_w = new_x2 - new_x1
-                        new_h = new_y2 - new_y1
-                        
-                        # Check if movement is within reasonable bounds (allow 20% change per frame)
-                        size_change = abs(new_w - old_w) + abs(new_h - old_h)
-                        max_movement = max(old_w, old_h) * 0.2
-                        max_size_change = (old_w + old_h) * 0.2
-                        
-                        if dx > max_movement * 4 or dy > max_movement * 4 or size_change > max_size_change * 4:
-                            # Movement too large - likely lost tracker
-                            status["visible"] = False
-                            status["tracker"] = None
-                            logger.debug(f"{name}: Tracker movement too large (dx:{dx}, dy:{dy}) - resetting")
-                        else:
-                            status["face_box"] = new_box
-                            status["visible"] = True
-                    else:
-                        status["face_box"] = new_box
-                        status["visible"] = True
-                else:
-                    status["visible"] = False
-                    status["tracker"] = None
-
-        # 2. Detection (PARALLEL MATCHING) - Fixes Multiple Target Detection
-        untracked_targets = [name for name, s in self.targets_status.items() if not s["visible"]]
-        
-        if untracked_targets and self.re_detect_counter == 0:
-            face_locations = face_recognition.face_locations(rgb_full_frame)
-            if face_locations:
-                face_encodings = face_recognition.face_encodings(rgb_full_frame, face_locations)
-                
-                # Build cost matrix for all targets vs all detected faces
-                cost_matrix = []  # List of (cost, target_idx, face_idx) tuples
-                
-                for target_idx, name in enumerate(untracked_targets):
-                    target_encoding = self.targets_status[name]["encoding"]
-                    
-                    for face_idx, unknown_encoding in enumerate(face_encodings):
-                        dist = face_recognition.face_distance([target_encoding], unknown_encoding)[0]
-                        confidence = 1.0 - dist
-                        
-                        # Only consider matches within tolerance
-                        if dist < CONFIG["detection"]["face_recognition_tolerance"]:
-                            cost_matrix.append((dist, target_idx, face_idx, name, confidence))
-                
-                # Sort by distance (best matches first)
-                cost_matrix.sort(key=lambda x: x[0])
-                
-                # Greedy assignment: assign each face to best matching target
-                assigned_faces = set()
-                assigned_targets = set()
-                
-                for dist, target_idx, face_idx, name, confidence in cost_matrix:
-                    # Skip if already assigned
-                    if face_idx in assigned_faces or name in assigned_targets:
-                        continue
-                    
-                    # Assign this face to this target
-                    assigned_faces.add(face_idx)
-                    assigned_targets.add(name)
-                    
-                    (top, right, bottom, left) = face_locations[face_idx]
-                    
-                    # Initialize tracker for this target
-                    tracker = cv2.legacy.TrackerCSRT_create()
-                    tracker.init(frame, (left, top, right-left, bottom-top))
-                    self.targets_status[name]["tracker"] = tracker
-                    self.targets_status[name]["face_box"] = (left, top, right, bottom)
-                    self.targets_status[name]["visible"] = True
-                    self.targets_status[name]["missing_pose_counter"] = 0
-                    self.targets_status[name]["face_confidence"] = confidence
-                    
-                    logger.debug(f"Detected and matched: {name} (confidence: {confidence:.2f})")
-
-        # 3. Overlap Check (Fixes Merging Targets) - Enhanced with Confidence & Temporal Consistency
-        active_names = [n for n, s in self.targets_status.items() if s["visible"]]
-        for i in range(len(active_names)):
-            for j in range(i + 1, len(active_names)):
-                nameA = active_names[i]
-                nameB = active_names[j]
-                
-                # Check Face Box IoU
-                boxA = self.targets_status[nameA]["face_box"]
-                boxB = self.targets_status[nameB]["face_box"]
-                # Convert to x,y,w,h format for IoU check
-                rectA = (boxA[0], boxA[1], boxA[2]-boxA[0], boxA[3]-boxA[1])
-                rectB = (boxB[0], boxB[1], boxB[2]-boxB[0], boxB[3]-boxB[1])
-                
-                iou = calculate_iou(rectA, rectB)
-                if iou > 0.35:
-                    # Multi-factor conflict resolution: confidence + temporal consistency
-                    conf_a = self.targets_status[nameA].get("face_confidence", 0.5)
-                    conf_b = self.targets_status[nameB].get("face_confidence", 0.5)
-                    
-                    # Get cached actions for temporal consistency
-                    action_a = self.last_action_cache.get(nameA, "Unknown")
-                    action_b = self.last_action_cache.get(nameB, "Unknown")
-                    
-                    # Weighted score: 60% confidence, 30% consistency, 10% IoU severity
-                    score_a = (conf_a * 0.6) + (0.3 if action_a != "Unknown" else 0.0) + (0.1 * (1 - iou))
-                    score_b = (conf_b * 0.6) + (0.3 if action_b != "Unknown" else 0.0) + (0.1 * (1 - iou))
-                    
-                    if score_a > score_b:
-                        # Keep A, remove B
-                        self.targets_status[nameB]["tracker"] = None
-                        self.targets_status[nameB]["visible"] = False
-                        logger.debug(f"Overlap resolved: keeping {nameA} (score: {score_a:.2f}) over {nameB} (score: {score_b:.2f}), IoU: {iou:.2f}")
-                    else:
-                        # Keep B, remove A
-                        self.targets_status[nameA]["tracker"] = None
-                        self.targets_status[nameA]["visible"] = False
-                        logger.debug(f"Overlap resolved: keeping {nameB} (score: {score_b:.2f}) over {nameA} (score: {score_a:.2f}), IoU: {iou:.2f}")
-
-        # 4. Processing & Drawing
-        required_act = self.required_action_var.get()
-        current_time = time.time()
-
-        for name, status in self.targets_status.items():
-            if status["visible"]:
-                fx1, fy1, fx2, fy2 = status["face_box"]
-                
-                # --- USE DYNAMIC BODY BOX HELPER (consistent across all modes) ---
-                bx1, by1, bx2, by2 = calculate_body_box((fx1, fy1, fx2, fy2), frame_h, frame_w, expansion_factor=3.0)
-
-                # Ghost Box Check: Only draw if tracker is confident AND pose is found
-                pose_found_in_box = False
-                
-                if bx1 < bx2 and by1 < by2:
-                    crop = frame[by1:by2, bx1:bx2]
-                    if crop.size != 0:
-                        rgb_crop = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
-                        rgb_crop.flags.writeable = False
-                        results_crop = self.holistic.process(rgb_crop)
-                        rgb_crop.flags.writeable = True
-                        
-                        current_action = "Unknown"
-                        if results_crop.pose_landmarks:
-                            pose_found_in_box = True
-                            status["missing_pose_counter"] = 0 # Reset
-                            
-                            # ✅ IMPROVED: Calculate pose quality/confidence
-                            pose_landmarks = results_crop.pose_landmarks.landmark
-                            visible_count = sum(1 for lm in pose_landmarks if lm.visibility > 0.5)
-                            avg_visibility = sum(lm.visibility for lm in pose_landmarks) / len(pose_landmarks)
-                            pose_quality = min(1.0, visible_count / 20.0)  # 20 landmarks = 100% quality
-                            status["pose_confidence"] = pose_quality
-                            
-                            # Only process pose if quality is acceptable
-                            if pose_quality >= 0.6:  # At least 60% joints visible
-                                draw_styled_landmarks(crop, results_crop)
-                                raw_action = classify_action(pose_landmarks, (by2-by1), (bx2-bx1))
-                                
-                                # ✅ IMPROVED: Filter out "Unknown" from buffer (more stable)
-                                if raw_action != "Unknown":
-                                    status["pose_buffer"].append(raw_action)
-                                    status["last_valid_pose"] = raw_action
-                                
-                                min_buffer = CONFIG["performance"]["min_buffer_for_classification"]
-                                if len(status["pose_buffer"]) >= min_buffer:
-                                    # ✅ IMPROVED: Use mode but require consistency
-                                    counts = Counter(status["pose_buffer"])
-                                    most_common = counts.most_common(1)[0][0]
-                                    confidence_pct = counts[most_common] / len(status["pose_buffer"])
-                                    
-                                    # Accept action only if consistent (>50% agreement)
-                                    if confidence_pct > 0.5:
-                                        current_action = most_common
-                                    else:
-                                        # Low confidence - use last valid
-                                        current_action = status["last_valid_pose"] or "Standing"
-                                else:
-                                    current_action = status["last_valid_pose"] or "Unknown"
-                            else:
-                                # Poor pose quality - use last valid pose
-                                current_action = status["last_valid_pose"] or "Standing"
-                            
-                            # Cache action for logging
-                            self.last_action_cache[name] = current_action
-
-                            if current_action == required_act:
-                                if self.is_alert_mode:
-                                    status["last_action_time"] = current_time
-                                    status["alert_triggered_state"] = False
-                                    # STOP ALERT SOUND when action is performed
-                                    if status["alert_stop_event"] is not None:
-                                        status["alert_stop_event"].set()  # Signal sound to stop
-                                        logger.info(f"Alert sound stopped for {name} - action performed: {required_act}")
-                                if self.is_logging and status["last_logged_action"] != required_act:
-                                    # Rate limiting: only log once per minute per target
-                                    time_since_last_log = current_time - status["last_log_time"]
-                                    if time_since_last_log > 60:
-                                        self.temp_log.append((time.strftime("%Y-%m-%d %H:%M:%S"), name, current_action, "Action Performed", "N/A", f"{status['face_confidence']:.2f}"))
-                                        status["last_log_time"] = current_time
-                                        self.temp_log_counter += 1
-                                    status["last_logged_action"] = required_act
-                            elif status["last_logged_action"] == required_act:
-                                status["last_logged_action"] = None
-                            
-                            # --- Dynamic Bounding Box Logic ---
-                            h_c, w_c = crop.shape[:2]
-                            p_lms = results_crop.pose_landmarks.landmark
-                            
-                            lx = [lm.x * w_c for lm in p_lms]
-                            ly = [lm.y * h_c for lm in p_lms]
-                            
-                            d_x1 = int(min(lx)) + bx1
-                            d_y1 = int(min(ly)) + by1
-                            d_x2 = int(max(lx)) + bx1
-                            d_y2 = int(max(ly)) + by1
-                            
-                            # Add padding
-                            d_x1 = max(0, d_x1 - 15)
-                            d_y1 = max(0, d_y1 - 15)
-                            d_x2 = min(frame_w, d_x2 + 15)
-                            d_y2 = min(frame_h, d_y2 + 15)
-                            
-                            # Draw Dynamic Box
-                            cv2.rectangle(frame, (d_x1, d_y1), (d_x2, d_y2), (0, 255, 0), 2)
-                            
-                            # ✅ IMPROVED: Show identification confidence with guard name
-                            face_conf = status.get("face_confidence", 0.0)
-                            pose_conf = status.get("pose_confidence", 0.0)
-                            
-                            # Color code based on identification confidence
-                            if face_conf > 0.85:
-                                id_color = (0, 255, 0)  # Green - high confidence
-                            elif face_conf > 0.65:
-                                id_color = (0, 165, 255)  # Orange - medium confidence
-                            else:
-                                id_color = (0, 0, 255)  # Red - low confidence
-                            
-                            # Display guard name with confidence
-                            info_text = f"{name} ({face_conf:.2f})"
-                            action_text = f"{current_action} (P:{pose_conf:.1%})"
-                            
-                            cv2.putText(frame, info_text, (d_x1, d_y1 - 25), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, id_color, 2)
-                            cv2.putText(frame, action_text, (d_x1, d_y1 - 8), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (100, 200, 255), 1)
-
-                # Ghost Box Removal Logic
-                if not pose_found_in_box:
-                    status["missing_pose_counter"] += 1
-                else:
-                    # Cache for later use
-                    if name not in self.last_action_cache:
-                        self.last_action_cache[name] = "Unknown"
-                    # If tracker says visible, but no pose for 30 frames (approx 1 sec) -> Kill Tracker
-                    if status["missing_pose_counter"] > 30:
-                        status["tracker"] = None
-                        status["visible"] = False
-            
-            # --- Log Missing Guard Event (Independent of Alert Mode) ---
-            if status["visible"] == False and not status.get("missing_logged", False):
-                # Guard just became missing (transitioned from visible to not visible)
-                if self.is_logging:
-                    self.log_guard_missing(name, "N/A")
-                    status["missing_logged"] = True
-                    logger.warning(f"🚨 {name} MISSING from frame - logged to CSV")
-            elif status["visible"] == True and status.get("missing_logged", False):
-                # Guard reappeared after being missing
-                status["missing_logged"] = False
-                logger.info(f"✓ {name} reappeared in frame")
-
-            # Alert Logic
-            if self.is_alert_mode:
-                time_diff = current_time - status["last_action_time"]
-                time_left = max(0, self.alert_interval - time_diff)
-                y_offset = 50 + (list(self.targets_status.keys()).index(name) * 30)
-                color = (0, 255, 0) if time_left > 3 else (0, 0, 255)
-                
-                # Only show status on screen if target is genuinely lost or safe
-                status_txt = "OK" if status["visible"] else "MISSING"
-                cv2.putText(frame, f"{name} ({status_txt}): {time_left:.1f}s", (frame_w - 300, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
-
-                if time_diff > self.alert_interval:
-                    if (current_time - status["alert_cooldown"]) > 2.5:
-                        # ✅ ONLY play alert sound if Alert Mode is actually enabled
-                        if status["alert_stop_event"] is None:
-                            status["alert_stop_event"] = threading.Event()
-                        status["alert_stop_event"].clear()  # Reset stop flag
-                        # Play siren ONLY when alert mode is ON
-                        status["alert_sound_thread"] = play_siren_sound(
-                            stop_event=status["alert_stop_event"], 
-                            duration_seconds=30
-                        )
-                        status["alert_cooldown"] = current_time
-                        
-                        img_path = "N/A"
-                        if status["visible"]:
-                            # Snapshot logic with rate limiting (use calculate_body_box helper)
-                            fx1, fy1, fx2, fy2 = status["face_box"]
-                            bx1, by1, bx2, by2 = calculate_body_box((fx1, fy1, fx2, fy2), frame_h, frame_w, expansion_factor=3.0)
-                            if bx1 < bx2:
-                                snapshot_result = self.capture_alert_snapshot(frame[by1:by2, bx1:bx2], name, check_rate_limit=True)
-                                img_path = snapshot_result if snapshot_result else "N/A"
-                        else:
-                            snapshot_result = self.capture_alert_snapshot(frame, name, check_rate_limit=True)
-                            img_path = snapshot_result if snapshot_result else "N/A"
-
-                        if self.is_logging:
-                            # Determine log status based on visibility and action
-                            if not status["visible"]:
-                                log_s = "ALERT TRIGGERED - TARGET MISSING"
-                                log_a = "MISSING"
-                            else:
-                                log_s = "ALERT CONTINUED" if status["alert_triggered_state"] else "ALERT TRIGGERED"
-                                log_a = self.last_action_cache.get(name, "Unknown")
-                            
-                            confidence = status.get("face_confidence", 0.0)
-                            self.temp_log.append((time.strftime("%Y-%m-%d %H:%M:%S"), name, log_a, log_s, img_path, f"{confidence:.2f}"))
-                            status["alert_triggered_state"] = True
-                            self.temp_log_counter += 1
-                
-                # LOG: Action NOT performed within alert interval
-                elif time_diff > (self.alert_interval - 1) and time_diff <= self.alert_interval:
-                    # Log when approaching or at the end of alert interval without action
-                    if self.is_logging and not status.get("alert_logged_timeout", False):
-                        if status["visible"]:
-                            log_s = "ACTION NOT PERFORMED (TIMEOUT)"
-                            log_a = self.last_action_cache.get(name, "Unknown")
-                            confidence = status.get("face_confidence", 0.0)
-                        else:
-                            log_s = "MISSING - NO ACTION"
-                            log_a = "MISSING"
-                            confidence = 0.0
-                        
-                        self.temp_log.append((time.strftime("%Y-%m-%d %H:%M:%S"), name, log_a, log_s, "N/A", f"{confidence:.2f}"))
-                        status["alert_logged_timeout"] = True
-                        self.temp_log_counter += 1
-                
-                # RESET: When action is performed or target reset
-                if time_diff <= 0:
-                    status["alert_logged_timeout"] = False
-
-        return frame 
-
 if __name__ == "__main__":
+    setup_logging()
+    init_services()
     app = PoseApp()
\ No newline at end of file
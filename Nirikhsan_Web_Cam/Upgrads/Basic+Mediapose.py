@@ -18,6 +18,7 @@ from datetime import datetime, timedelta
 from collections import deque, Counter
 import json
 import gc
+import sys
 import psutil
 try:
     import pygame
@@ -32,6 +33,10 @@ try:
 except ImportError:
     PYDUB_AVAILABLE = False
 
+# Shared helpers from the poseguard package one directory up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from poseguard.boxes import overlap_conflicts
+
 # --- ReID (Person Re-Identification) Libraries ---
 try:
     import torch
@@ -573,43 +578,18 @@ def resolve_overlapping_poses(targets_status, iou_threshold=0.3):
         Updated targets_status with resolved conflicts
     """
     try:
-        target_names = list(targets_status.keys())
-        
-        for i, name_a in enumerate(target_names):
-            if not targets_status[name_a].get("visible"):
-                continue
-            
-            box_a = targets_status[name_a].get("face_box")
-            if not box_a:
-                continue
-            
-            # Check overlap with other guards
-            for name_b in target_names[i+1:]:
-                if not targets_status[name_b].get("visible"):
-                    continue
-                
-                box_b = targets_status[name_b].get("face_box")
-                if not box_b:
-                    continue
-                
-                # Calculate IoU
-                iou = calculate_iou(
-                    (box_a[0], box_a[1], box_a[2] - box_a[0], box_a[3] - box_a[1]),
-                    (box_b[0], box_b[1], box_b[2] - box_b[0], box_b[3] - box_b[1])
-                )
-                
-                # If overlap is significant, boost confidence of higher-quality detection
-                if iou > iou_threshold:
-                    conf_a = targets_status[name_a].get("pose_confidence", 0.0)
-                    conf_b = targets_status[name_b].get("pose_confidence", 0.0)
-                    
-                    # Prefer the guard with better pose quality
-                    if conf_a < conf_b:
-                        targets_status[name_a]["visible"] = False
-                        logger.debug(f"Overlap: Disabled {name_a} (conf:{conf_a:.2f}) - kept {name_b} (conf:{conf_b:.2f})")
-                    elif conf_b < conf_a:
-                        targets_status[name_b]["visible"] = False
-                        logger.debug(f"Overlap: Disabled {name_b} (conf:{conf_b:.2f}) - kept {name_a} (conf:{conf_a:.2f})")
+        names = [n for n, s in targets_status.items() if s.get("visible") and s.get("face_box")]
+        if len(names) < 2:
+            return targets_status
+        
+        # If overlap is significant, prefer the guard with better pose quality (ties keep both).
+        # Pairs are judged in loop order, so a guard hidden earlier no longer hides others
+        conf = [targets_status[n].get("pose_confidence", 0.0) for n in names]
+        _, conflicts = overlap_conflicts([targets_status[n]["face_box"] for n in names], conf,
+                                         iou_threshold, keep_ties=True, sequential=True)
+        for loser, winner, _iou, loser_conf, winner_conf in conflicts:
+            targets_status[names[loser]]["visible"] = False
+            logger.debug(f"Overlap: Disabled {names[loser]} (conf:{loser_conf:.2f}) - kept {names[winner]} (conf:{winner_conf:.2f})")
     except Exception as e:
         logger.debug(f"Pose conflict resolution error: {e}")
     
@@ -452,6 +452,12 @@ class PoseApp:
         self.video_container.pack(fill="both", expand=True, padx=0, pady=0)
         self.video_label = tk.Label(self.video_container, bg="black", text="Camera Feed Off", fg="white")
         self.video_label.pack(fill="both", expand=True)
+        # Display: one PhotoImage per label size, updated in place; size tracked from <Configure>
+        self.video_photo = None
+        self.video_photo_size = None
+        self.video_label_size = None
+        self.last_display_time = 0.0
+        self.video_label.bind("<Configure>", self._on_video_label_configure, add="+")
         
         self.guard_preview_frame = tk.Frame(self.video_container, bg="darkgreen", bd=2, relief="raised")
         self.guard_preview_frame.place(in_=self.video_container, relx=0.02, rely=0.02, anchor="nw")
@@ -875,6 +881,7 @@ class PoseApp:
             self.btn_add_guard.config(state="disabled")
             self.btn_fugitive.config(state="disabled")
             self.video_label.config(image='')
+            self.video_photo = None
 
     def auto_flush_logs(self):
         if self.is_logging and len(self.temp_log) >= CONFIG["logging"]["auto_flush_interval"]:
@@ -1003,19 +1010,40 @@ class PoseApp:
         self.auto_flush_logs()
         
         if self.video_label.winfo_exists():
-            img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            # Resize logic
-            w, h = self.video_label.winfo_width(), self.video_label.winfo_height()
-            if w > 10:
-                img_w, img_h = img.size
-                scale = min(w/img_w, h/img_h)
-                img = img.resize((int(img_w*scale), int(img_h*scale)))
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.video_label.imgtk = imgtk
-            self.video_label.config(image=imgtk)
+            self._render_video_frame(frame)
         
         self.root.after(CONFIG["performance"]["gui_refresh_ms"], self.update_video_feed)
 
+    def _on_video_label_configure(self, event):
+        self.video_label_size = (event.width, event.height)
+
+    def _render_video_frame(self, frame):
+        """Show a BGR frame: resize with OpenCV, paste into the existing PhotoImage, at most display_max_fps"""
+        max_fps = CONFIG["performance"].get("display_max_fps", 30)
+        now = time.monotonic()
+        if max_fps and now - self.last_display_time < 1.0 / max_fps:
+            return
+        self.last_display_time = now
+        
+        if self.video_label_size is None:
+            self.video_label_size = (self.video_label.winfo_width(), self.video_label.winfo_height())
+        w, h = self.video_label_size
+        img_h, img_w = frame.shape[:2]
+        if w > 10 and h > 10:
+            scale = min(w/img_w, h/img_h)
+            size = (max(1, int(img_w*scale)), max(1, int(img_h*scale)))
+            if size != (img_w, img_h):
+                frame = cv2.resize(frame, size)
+        img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        
+        if self.video_photo is None or self.video_photo_size != img.size:
+            self.video_photo = ImageTk.PhotoImage(image=img)
+            self.video_photo_size = img.size
+            self.video_label.imgtk = self.video_photo
+            self.video_label.config(image=self.video_photo)
+        else:
+            self.video_photo.paste(img)
+
     def process_capture_frame(self, frame):
         # Onboarding logic (simplified for brevity, same as before)
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
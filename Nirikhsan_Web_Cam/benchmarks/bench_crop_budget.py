@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Landmark accuracy versus latency for performance.pose_crop_max_side.
+
+Replays recorded clips through the tracking pose model once at full crop
+resolution (the reference) and once per pixel budget, and reports per budget:
+latency per crop, how often a pose was found, the mean landmark displacement
+from the reference in original-crop pixels, and how often the classified
+action agrees with the reference.
+
+Usage:
+    python benchmarks/bench_crop_budget.py --video site_a.mp4 site_b.mp4
+    python benchmarks/bench_crop_budget.py --video clip.mp4 --box 600 0 1400 1080 --budgets 960 640 480 320
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from poseguard.landmarks import VIS, classify_poses, landmarks_to_array
+from poseguard.pose_models import POSE_MODEL_MODES, make_pose_model
+from poseguard.roi import CropResizer, rescale_landmarks
+
+
+def load_crops(paths, box, max_frames):
+    """RGB crops (box, or the whole frame) from every clip, in order."""
+    crops = []
+    for path in paths:
+        cap = cv2.VideoCapture(path)
+        count = 0
+        while count < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if box:
+                x1, y1, x2, y2 = box
+                rgb = rgb[y1:y2, x1:x2]
+            crops.append(np.ascontiguousarray(rgb))
+            count += 1
+        cap.release()
+    return crops
+
+
+def run_budget(crops, budget, mode, complexity):
+    """Pose landmarks (None when not found) and per-crop latency for one budget."""
+    options = {"min_detection_confidence": 0.5, "min_tracking_confidence": 0.5, "static_image_mode": False}
+    model = make_pose_model(mode, options, complexity)
+    resizer = CropResizer(budget)
+    poses, timings = [], []
+    try:
+        for crop in crops:
+            h, w = crop.shape[:2]
+            start = time.perf_counter()
+            image, _ = resizer.prepare("bench", crop, (0, 0, w, h))
+            results = model.process(image)
+            timings.append((time.perf_counter() - start) * 1000.0)
+            poses.append(landmarks_to_array(results.pose_landmarks) if results.pose_landmarks else None)
+    finally:
+        model.close()
+    return poses, np.asarray(timings)
+
+
+def compare(reference, poses, crops, min_visibility=0.5):
+    """Mean landmark error (original-crop px) and action agreement against the reference run."""
+    errors, agree, both = [], 0, 0
+    for ref, pose, crop in zip(reference, poses, crops):
+        if ref is None or pose is None:
+            continue
+        h, w = crop.shape[:2]
+        both += 1
+        visible = (ref[:, VIS] > min_visibility) & (pose[:, VIS] > min_visibility)
+        if visible.any():
+            diff = rescale_landmarks(pose, w, h)[visible, :2] - rescale_landmarks(ref, w, h)[visible, :2]
+            errors.append(float(np.linalg.norm(diff, axis=1).mean()))
+        agree += classify_poses(pose, h, w) == classify_poses(ref, h, w)
+    mean_error = float(np.mean(errors)) if errors else float("nan")
+    agreement = 100.0 * agree / both if both else float("nan")
+    return mean_error, agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pose crop pixel budget: accuracy loss vs latency gain")
+    parser.add_argument("--video", nargs="+", required=True, help="Recorded clips of a guard")
+    parser.add_argument("--box", type=int, nargs=4, metavar=("X1", "Y1", "X2", "Y2"),
+                        help="Guard crop in the clip (default: whole frame)")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[1280, 960, 640, 480, 320])
+    parser.add_argument("--frames", type=int, default=300, help="Frames per clip")
+    parser.add_argument("--mode", default="pose_only", choices=POSE_MODEL_MODES)
+    parser.add_argument("--model-complexity", type=int, default=1)
+    parser.add_argument("--csv", help="Also write results to this CSV file")
+    args = parser.parse_args()
+
+    crops = load_crops(args.video, args.box, args.frames)
+    if not crops:
+        sys.exit("No frames loaded")
+    h, w = crops[0].shape[:2]
+    print("=" * 72)
+    print(f"Crop budget benchmark: {len(crops)} crops of {w}x{h} ({args.mode})")
+    print("=" * 72)
+
+    reference, ref_timings = run_budget(crops, 0, args.mode, args.model_complexity)
+    rows = [{"budget": "full", "mean_ms": float(ref_timings.mean()), "p95_ms": float(np.percentile(ref_timings, 95)),
+             "pose_found_pct": 100.0 * sum(p is not None for p in reference) / len(crops),
+             "landmark_err_px": 0.0, "action_agree_pct": 100.0}]
+    for budget in args.budgets:
+        poses, timings = run_budget(crops, budget, args.mode, args.model_complexity)
+        error, agreement = compare(reference, poses, crops)
+        rows.append({"budget": budget, "mean_ms": float(timings.mean()), "p95_ms": float(np.percentile(timings, 95)),
+                     "pose_found_pct": 100.0 * sum(p is not None for p in poses) / len(crops),
+                     "landmark_err_px": error, "action_agree_pct": agreement})
+
+    print(f"{'budget':<8}{'mean ms':>10}{'p95 ms':>10}{'speedup':>9}{'found':>8}{'err px':>9}{'agree':>8}")
+    for row in rows:
+        speedup = rows[0]["mean_ms"] / row["mean_ms"] if row["mean_ms"] else float("nan")
+        print(f"{row['budget']!s:<8}{row['mean_ms']:>10.2f}{row['p95_ms']:>10.2f}{speedup:>8.2f}x"
+              f"{row['pose_found_pct']:>7.0f}%{row['landmark_err_px']:>9.1f}{row['action_agree_pct']:>7.0f}%")
+
+    if args.csv:
+        import csv
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nSaved: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
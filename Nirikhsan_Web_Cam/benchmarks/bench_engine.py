@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+End-to-end tracking benchmark: MonitorEngine without Tk.
+
+Replays the same frames through MonitorEngine.process_frame (replay mode,
+every frame analysed) for each guard count and reports frames/sec, frame
+latency, per-stage p50/p95/p99 (poseguard.profiling) and peak RSS. Results
+go to JSON (and optionally CSV) with the git commit and library versions, so
+runs from two commits can be compared with --compare.
+
+Scenes:
+  --synthetic (default)  deterministic stick figures, one per guard, drifting
+                         and switching poses on a fixed schedule (--seed).
+                         Faces come from the scene's ground truth instead of
+                         face_recognition, so face detection cost is excluded.
+  --video clip.mp4       recorded footage decoded up front (decode time is not
+                         measured); guards are the --targets profiles in
+                         guard_profiles/ and faces use the real detector.
+
+Each case runs in a fresh process so its peak RSS is its own (--no-isolate
+to run in-process). Alert mode is on with a very long interval: countdown
+overlays are drawn but no siren or snapshot fires mid-run.
+
+--kernels adds micro-benchmarks of the per-frame helpers at each guard count
+(classify_poses per guard vs classify_pose_batch, face matching, overlap
+resolution).
+
+Usage:
+    python benchmarks/bench_engine.py --guards 1 4 8 16 32 --json results.json
+    python benchmarks/bench_engine.py --video guards.mp4 --targets KD Rud --csv stages.csv
+    python benchmarks/bench_engine.py --set performance.tracker_backend=sort --compare results.json
+"""
+import os
+import sys
+import csv
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+SKIN_TONES = [(141, 85, 36), (198, 134, 66), (224, 172, 105), (241, 194, 125), (255, 219, 172)]
+POSTURES = ("standing", "hands_up", "t_pose", "left_up")
+
+
+# --- Scenes ---
+class SyntheticScene:
+    """
+    Deterministic stick-figure guards on a textured background.
+
+    Guard i stands in cell i of a grid, sways on a fixed sinusoid and changes
+    posture every `posture_frames` frames. face_locations(t) is the ground
+    truth in face_recognition's (top, right, bottom, left) order and
+    encodings[i] is guard i's 128-d face encoding.
+    """
+
+    def __init__(self, guards, num_frames, width=1280, height=720, seed=0, posture_frames=45):
+        rng = np.random.default_rng(seed)
+        self.guards = guards
+        self.num_frames = num_frames
+        self.width = width
+        self.height = height
+        self.posture_frames = posture_frames
+        self.background = cv2.GaussianBlur(rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+        self.cols = int(np.ceil(np.sqrt(guards * width / float(height))))
+        self.rows = int(np.ceil(guards / float(self.cols)))
+        self.cell_w = width // self.cols
+        self.cell_h = height // self.rows
+        self.phase = rng.uniform(0, 2 * np.pi, guards)
+        self.skin = [SKIN_TONES[i % len(SKIN_TONES)] for i in range(guards)]
+        self.shirt = [tuple(int(c) for c in rng.integers(30, 230, 3)) for _ in range(guards)]
+        self.encodings = rng.normal(0.0, 0.1, (guards, 128))
+        self.names = [f"guard{i + 1:02d}" for i in range(guards)]
+
+    def _figure(self, i, t):
+        """Head box, anchor point and scale of guard i at frame t."""
+        scale = min(self.cell_w / 120.0, self.cell_h / 200.0)
+        cx = (i % self.cols) * self.cell_w + self.cell_w // 2 + int(6 * scale * np.sin(t / 15.0 + self.phase[i]))
+        top = (i // self.cols) * self.cell_h + int(self.cell_h * 0.12)
+        head = int(14 * scale)
+        return cx, top, head, scale
+
+    def face_locations(self, t):
+        locations = []
+        for i in range(self.guards):
+            cx, top, head, _ = self._figure(i, t)
+            locations.append((top, cx + head, top + 2 * head, cx - head))
+        return locations
+
+    def frame(self, t):
+        frame = self.background.copy()
+        for i in range(self.guards):
+            cx, top, head, scale = self._figure(i, t)
+            posture = POSTURES[(i + t // self.posture_frames) % len(POSTURES)]
+            thick = max(2, int(5 * scale))
+            neck = (cx, top + 2 * head)
+            hip = (cx, top + int(95 * scale))
+            shoulders = [(cx - int(22 * scale), neck[1] + int(8 * scale)), (cx + int(22 * scale), neck[1] + int(8 * scale))]
+            cv2.rectangle(frame, (shoulders[0][0], shoulders[0][1]), (shoulders[1][0], hip[1]), self.shirt[i], -1)
+            for side, (sx, sy) in zip((-1, 1), shoulders):
+                raised = posture == "hands_up" or (posture == "left_up" and side < 0)
+                if raised:
+                    elbow, hand = (sx + side * int(6 * scale), sy - int(28 * scale)), (sx + side * int(4 * scale), sy - int(58 * scale))
+                elif posture == "t_pose":
+                    elbow, hand = (sx + side * int(28 * scale), sy), (sx + side * int(56 * scale), sy)
+                else:
+                    elbow, hand = (sx + side * int(8 * scale), sy + int(30 * scale)), (sx + side * int(10 * scale), sy + int(58 * scale))
+                cv2.line(frame, (sx, sy), elbow, self.skin[i], thick)
+                cv2.line(frame, elbow, hand, self.skin[i], thick)
+                knee = (cx + side * int(12 * scale), hip[1] + int(40 * scale))
+                foot = (cx + side * int(14 * scale), hip[1] + int(80 * scale))
+                cv2.line(frame, (cx + side * int(10 * scale), hip[1]), knee, (60, 60, 60), thick + 2)
+                cv2.line(frame, knee, foot, (60, 60, 60), thick + 2)
+            cv2.ellipse(frame, (cx, top + head), (head, head), 0, 0, 360, self.skin[i], -1)
+            cv2.circle(frame, (cx - head // 3, top + int(head * 0.8)), max(1, head // 6), (20, 20, 20), -1)
+            cv2.circle(frame, (cx + head // 3, top + int(head * 0.8)), max(1, head // 6), (20, 20, 20), -1)
+        return frame
+
+    def frames(self):
+        return [self.frame(t) for t in range(self.num_frames)]
+
+
+def load_video(path, max_frames, width):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if width and frame.shape[1] != width:
+            scale = width / float(frame.shape[1])
+            frame = cv2.resize(frame, (width, int(frame.shape[0] * scale)))
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+# --- Engine setup ---
+def bench_config(config_path, work_dir, overrides, frames):
+    """config.json with storage/logging redirected into work_dir and the given key=value overrides."""
+    with open(config_path, "r") as f:
+        config = json.load(f)
+    storage = config.setdefault("storage", {})
+    storage["alert_snapshots_dir"] = os.path.join(work_dir, "alert_snapshots")
+    storage["pose_references_dir"] = os.path.join(work_dir, "pose_references")
+    config.setdefault("logging", {})["log_directory"] = os.path.join(work_dir, "logs")
+    config.setdefault("alert", {})["play_sound"] = False
+    config["profiling"] = dict(config.get("profiling", {}), enabled=True, window=max(frames, 1),
+                               export_csv_on_stop=False)
+    for key, value in overrides:
+        section = config
+        parts = key.split(".")
+        for part in parts[:-1]:
+            section = section.setdefault(part, {})
+        section[parts[-1]] = value
+    return config
+
+
+def parse_override(text):
+    if "=" not in text:
+        raise argparse.ArgumentTypeError(f"expected section.key=value, got {text!r}")
+    key, value = text.split("=", 1)
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+def make_scene_engine(config, scene, work_dir):
+    """MonitorEngine tracking the scene's guards, faces found from ground truth."""
+    from poseguard.encoding_cache import EncodingCache
+    from poseguard.engine import MonitorEngine
+
+    class SceneEngine(MonitorEngine):
+        scene_index = 0
+
+        def _detect_faces(self, rgb_frame, frame_ref, encode=True, deadline=None):
+            with self.profiler.measure("face_detection"):
+                locations = scene.face_locations(self.scene_index)
+                return locations, (list(scene.encodings) if encode else [])
+
+        def _encode_faces(self, rgb_frame, frame_ref, face_locations, deadline=None):
+            truth = scene.face_locations(self.scene_index)
+            return [scene.encodings[truth.index(tuple(location))] for location in face_locations]
+
+    # Profile images only need to exist; their encodings are seeded into the cache
+    profiles_dir = os.path.join(work_dir, "guard_profiles")
+    os.makedirs(profiles_dir, exist_ok=True)
+    config["storage"]["guard_profiles_dir"] = profiles_dir
+    cache = EncodingCache(os.path.join(profiles_dir, "encodings.npz"))
+    placeholder = np.zeros((8, 8, 3), dtype=np.uint8)
+    for name, encoding in zip(scene.names, scene.encodings):
+        path = os.path.join(profiles_dir, f"target_{name}_face.jpg")
+        cv2.imwrite(path, placeholder)
+        cache.put(path, encoding)
+
+    engine = SceneEngine(config, encoding_cache=cache)
+    engine.load_targets()
+    engine.track_targets(scene.names)
+    return engine
+
+
+def make_video_engine(config, targets):
+    from poseguard.engine import MonitorEngine
+
+    engine = MonitorEngine(config)
+    names = engine.load_targets()
+    engine.track_targets(targets or names)
+    return engine
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+    except ImportError:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024.0 * 1024.0)
+
+
+# --- One case ---
+def run_case(case):
+    """
+    Process one scene with one guard count.
+
+    Args:
+        case: dict with source, guards, frames, warmup, width, height, seed,
+              config, overrides, targets, work_dir
+
+    Returns:
+        result dict (see --json output)
+    """
+    import logging
+    logging.getLogger("PoseGuard").setLevel(logging.ERROR)
+
+    work_dir = tempfile.mkdtemp(prefix="poseguard_bench_", dir=case.get("work_dir"))
+    config = bench_config(case["config"], work_dir, case["overrides"], case["frames"])
+    engine = None
+    try:
+        if case["source"] == "synthetic":
+            scene = SyntheticScene(case["guards"], case["frames"] + case["warmup"], case["width"], case["height"],
+                                   seed=case["seed"])
+            frames = scene.frames()
+            engine = make_scene_engine(config, scene, work_dir)
+        else:
+            frames = load_video(case["source"], case["frames"] + case["warmup"], case["width"])
+            if len(frames) <= case["warmup"]:
+                raise RuntimeError(f"{case['source']}: not enough frames for --warmup {case['warmup']}")
+            engine = make_video_engine(config, case["targets"])
+
+        guards = len(engine.targets_status)
+        engine.replay_mode = True
+        engine.alert_interval = 1e9
+        engine.set_alert_mode(True)
+        # Look for faces on the first frame instead of after re_detect_interval frames
+        engine.re_detect_counter = engine.RE_DETECT_INTERVAL
+
+        timings = []
+        for t, source_frame in enumerate(frames):
+            if t == case["warmup"]:
+                engine.profiler.reset()
+            frame = source_frame.copy()  # process_frame draws on it
+            engine.scene_index = t
+            start = time.perf_counter()
+            engine.process_frame(frame)
+            elapsed = time.perf_counter() - start
+            if t >= case["warmup"]:
+                timings.append(elapsed)
+
+        timings = np.asarray(timings)
+        h, w = frames[0].shape[:2]
+        return {
+            "source": case["source"] if case["source"] == "synthetic" else os.path.basename(case["source"]),
+            "guards": guards,
+            "frame_size": [w, h],
+            "frames": len(timings),
+            "seconds": round(float(timings.sum()), 4),
+            "fps": round(len(timings) / float(timings.sum()), 3) if timings.size else 0.0,
+            "frame_ms": {
+                "mean": round(float(timings.mean()) * 1000, 3),
+                "p50": round(float(np.percentile(timings, 50)) * 1000, 3),
+                "p95": round(float(np.percentile(timings, 95)) * 1000, 3),
+                "p99": round(float(np.percentile(timings, 99)) * 1000, 3),
+            },
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "stages": [
+                {"stage": row["stage"], "guard": row["guard"], "count": row["count"],
+                 "mean_ms": round(row["mean"] * 1000, 3), "p50_ms": round(row["p50"] * 1000, 3),
+                 "p95_ms": round(row["p95"] * 1000, 3), "p99_ms": round(row["p99"] * 1000, 3)}
+                for row in engine.profiler.snapshot()
+            ],
+        }
+    finally:
+        if engine is not None:
+            engine.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_isolated(case):
+    """run_case in a fresh spawned process, so peak RSS and model state do not carry over."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_case, (case,))
+
+
+# --- Micro-benchmarks ---
+def time_call(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_kernels(guard_counts, repeat, seed=0):
+    """us per call of the per-frame helpers at each guard count."""
+    from poseguard.boxes import overlap_conflicts
+    from poseguard.face_matching import assign_faces, face_distance_matrix
+    from poseguard.landmarks import classify_pose_batch, classify_poses
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    for g in guard_counts:
+        poses = rng.uniform(0.0, 1.0, (g, 33, 4))
+        h = np.full(g, 480)
+        w = np.full(g, 320)
+        known = rng.normal(0.0, 0.1, (g, 128))
+        faces = known + rng.normal(0.0, 0.01, (g, 128))
+        corners = rng.uniform(0, 1200, (g, 2))
+        boxes = np.hstack([corners, corners + rng.uniform(40, 120, (g, 2))])
+        scores = rng.uniform(0, 1, g)
+        rows.append({
+            "guards": g,
+            "classify_per_guard_us": round(time_call(lambda: [classify_poses(p, 480, 320) for p in poses], repeat), 2),
+            "classify_batch_us": round(time_call(lambda: classify_pose_batch(poses, h, w), repeat), 2),
+            "face_matching_us": round(time_call(lambda: assign_faces(face_distance_matrix(known, faces), 0.5), repeat), 2),
+            "overlap_us": round(time_call(lambda: overlap_conflicts(boxes, scores, 0.35, iou_weight=0.1), repeat), 2),
+        })
+    return rows
+
+
+# --- Reporting ---
+def environment():
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+    }
+    try:
+        import mediapipe
+        info["mediapipe"] = mediapipe.__version__
+    except Exception:
+        info["mediapipe"] = None
+    return info
+
+
+def git_revision():
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BASE_DIR, text=True,
+                                         stderr=subprocess.DEVNULL).strip()
+        dirty = bool(subprocess.check_output(["git", "status", "--porcelain", "--", "."], cwd=BASE_DIR, text=True,
+                                             stderr=subprocess.DEVNULL).strip())
+        return {"commit": commit, "dirty": dirty}
+    except Exception:
+        return {"commit": None, "dirty": None}
+
+
+def write_csv(path, results):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source", "guards", "fps", "frame_p95_ms", "peak_rss_mb",
+                         "stage", "guard", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+        for case in results["cases"]:
+            for row in case["stages"]:
+                writer.writerow([case["source"], case["guards"], case["fps"], case["frame_ms"]["p95"],
+                                 case["peak_rss_mb"], row["stage"], row["guard"] or "", row["count"],
+                                 row["mean_ms"], row["p50_ms"], row["p95_ms"], row["p99_ms"]])
+
+
+def compare(baseline_path, results, tolerance):
+    """Print FPS / p95 changes against an earlier --json file; returns the number of regressions."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    before = {(c["source"], c["guards"]): c for c in baseline.get("cases", [])}
+    print(f"\nAgainst {baseline_path} ({(baseline.get('git') or {}).get('commit') or 'unknown commit'}):")
+    print(f"{'source':<16}{'guards':>7}{'fps was':>10}{'fps now':>10}{'change':>9}{'p95 was':>10}{'p95 now':>10}")
+    regressions = 0
+    for case in results["cases"]:
+        old = before.get((case["source"], case["guards"]))
+        if old is None:
+            print(f"{case['source']:<16}{case['guards']:>7}{'-':>10}{case['fps']:>10.2f}   (new case)")
+            continue
+        change = case["fps"] / old["fps"] - 1.0 if old["fps"] else 0.0
+        flag = ""
+        if change < -tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{case['source']:<16}{case['guards']:>7}{old['fps']:>10.2f}{case['fps']:>10.2f}{change:>+9.1%}"
+              f"{old['frame_ms']['p95']:>10.1f}{case['frame_ms']['p95']:>10.1f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MonitorEngine FPS, stage latency and peak RSS against guard count")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--video", help="Recorded footage (guards from --targets, real face detection)")
+    src.add_argument("--synthetic", action="store_true", help="Deterministic stick-figure scene (default)")
+    parser.add_argument("--guards", type=int, nargs="+", default=[1, 2, 4, 8], help="Synthetic guard counts (1-32)")
+    parser.add_argument("--targets", nargs="+", metavar="NAME", help="--video: guards to track (default: all profiles)")
+    parser.add_argument("--frames", type=int, default=120, help="Measured frames per case")
+    parser.add_argument("--warmup", type=int, default=10, help="Frames processed before measuring")
+    parser.add_argument("--width", type=int, default=1280, help="Frame width (footage is resized to it)")
+    parser.add_argument("--height", type=int, default=720, help="Synthetic frame height")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--config", default=os.path.join(BASE_DIR, "config.json"))
+    parser.add_argument("--set", dest="overrides", type=parse_override, action="append", default=[],
+                        metavar="SECTION.KEY=VALUE", help="Override a config value (JSON-parsed), repeatable")
+    parser.add_argument("--no-isolate", action="store_true", help="Run every case in this process")
+    parser.add_argument("--kernels", action="store_true", help="Also time the per-frame helper functions")
+    parser.add_argument("--kernel-repeat", type=int, default=200)
+    parser.add_argument("--json", default="bench_engine.json", help="Results file (default: %(default)s)")
+    parser.add_argument("--csv", help="Also write per-stage rows to this CSV file")
+    parser.add_argument("--compare", metavar="BASELINE_JSON", help="Compare against an earlier --json file")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="FPS drop counted as a regression")
+    args = parser.parse_args()
+
+    # Cases run from the app directory (see below); resolve the user's paths first
+    args.json = os.path.abspath(args.json)
+    args.csv = os.path.abspath(args.csv) if args.csv else None
+    args.compare = os.path.abspath(args.compare) if args.compare else None
+    if any(g < 1 or g > 32 for g in args.guards):
+        sys.exit("--guards must be between 1 and 32")
+    if args.video:
+        try:
+            import face_recognition  # noqa: F401
+        except ImportError:
+            sys.exit("--video needs face_recognition (guards are matched by face)")
+
+    base_case = {
+        "frames": args.frames, "warmup": args.warmup, "width": args.width, "height": args.height,
+        "seed": args.seed, "config": os.path.abspath(args.config), "overrides": args.overrides,
+        "targets": args.targets,
+    }
+    if args.video:
+        cases = [dict(base_case, source=os.path.abspath(args.video), guards=len(args.targets or []))]
+    else:
+        cases = [dict(base_case, source="synthetic", guards=g) for g in args.guards]
+
+    print("=" * 72)
+    print(f"Engine benchmark: {args.frames} frames (+{args.warmup} warm-up) per case, "
+          f"{'in-process' if args.no_isolate else 'one process per case'}")
+    print("=" * 72)
+    results = {
+        "benchmark": "engine",
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "environment": environment(),
+        "settings": {key: value for key, value in base_case.items() if key != "config"},
+        "cases": [],
+    }
+    for case in cases:
+        # Run from the app directory so relative paths in config.json resolve as they do for the app
+        os.chdir(BASE_DIR)
+        result = run_case(case) if args.no_isolate else run_isolated(case)
+        results["cases"].append(result)
+        print(f"{result['source']:<16}{result['guards']:>3} guards  {result['fps']:>8.2f} FPS  "
+              f"p95 {result['frame_ms']['p95']:>8.1f} ms  peak RSS {result['peak_rss_mb']:>7.1f} MB")
+
+    print(f"\n{'stage':<24}" + "".join(f"{c['guards']:>9}g" for c in results["cases"]) + "   (p95 ms)")
+    # Whole-frame stages, then per-guard stages as the slowest guard's p95
+    stages = []
+    for case in results["cases"]:
+        for row in case["stages"]:
+            key = (row["stage"], row["guard"] is not None)
+            if key not in stages:
+                stages.append(key)
+    stages.sort(key=lambda key: key[1])
+    for stage, per_guard in stages:
+        cells = []
+        for case in results["cases"]:
+            p95 = [r["p95_ms"] for r in case["stages"] if r["stage"] == stage and (r["guard"] is not None) == per_guard]
+            cells.append(f"{max(p95):>10.2f}" if p95 else f"{'-':>10}")
+        print(f"{stage + (' (worst guard)' if per_guard else ''):<24}" + "".join(cells))
+
+    if args.kernels:
+        results["kernels"] = bench_kernels(args.guards, args.kernel_repeat, args.seed)
+        print(f"\n{'guards':>7}{'classify x G':>14}{'classify batch':>16}{'face match':>12}{'overlap':>10}   (us)")
+        for row in results["kernels"]:
+            print(f"{row['guards']:>7}{row['classify_per_guard_us']:>14.1f}{row['classify_batch_us']:>16.1f}"
+                  f"{row['face_matching_us']:>12.1f}{row['overlap_us']:>10.1f}")
+
+    with open(args.json, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved: {args.json}")
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"Saved: {args.csv}")
+
+    if args.compare:
+        regressions = compare(args.compare, results, args.tolerance)
+        if regressions:
+            sys.exit(f"{regressions} case(s) slower than the baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
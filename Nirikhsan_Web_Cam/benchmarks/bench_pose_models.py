@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Per-crop latency of the tracking pose models (detection.model modes).
+
+Feeds the same sequence of person crops through holistic, pose_only and
+pose_lite in tracking mode and reports mean / p50 / p95 latency per crop
+plus how often a pose was found.
+
+Usage:
+    python benchmarks/bench_pose_models.py --video clip.mp4
+    python benchmarks/bench_pose_models.py --image guard.jpg --crops 200
+    python benchmarks/bench_pose_models.py --synthetic          # no person, detector-path cost only
+
+Note: MediaPipe downloads pose_landmark_lite/heavy.tflite on first use of
+model_complexity 0/2, so run pose_lite once with network access.
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from poseguard.pose_models import POSE_MODEL_MODES, make_pose_model
+
+
+def load_crops(args):
+    """Return a list of RGB crops to replay through every model."""
+    crops = []
+    if args.video:
+        cap = cv2.VideoCapture(args.video)
+        while len(crops) < args.crops:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            crops.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        cap.release()
+    elif args.image:
+        img = cv2.imread(args.image)
+        if img is None:
+            sys.exit(f"Cannot read image: {args.image}")
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        crops = [rgb] * args.crops
+    else:
+        rng = np.random.default_rng(0)
+        crops = [rng.integers(0, 255, (480, 320, 3), dtype=np.uint8) for _ in range(args.crops)]
+
+    if args.width:
+        resized = []
+        for crop in crops:
+            h, w = crop.shape[:2]
+            scale = args.width / float(w)
+            resized.append(cv2.resize(crop, (args.width, int(h * scale))))
+        crops = resized
+    return crops
+
+
+def bench_mode(mode, crops, complexity, warmup):
+    options = {"min_detection_confidence": 0.5, "min_tracking_confidence": 0.5, "static_image_mode": False}
+    model = make_pose_model(mode, options, complexity)
+    try:
+        for crop in crops[:warmup]:
+            model.process(crop)
+
+        timings = []
+        found = 0
+        for crop in crops:
+            start = time.perf_counter()
+            results = model.process(crop)
+            timings.append((time.perf_counter() - start) * 1000.0)
+            if results.pose_landmarks:
+                found += 1
+    finally:
+        model.close()
+
+    timings = np.asarray(timings)
+    return {
+        "mode": mode,
+        "mean_ms": float(timings.mean()),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "pose_found_pct": 100.0 * found / len(crops),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-crop latency for each detection.model mode")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--video", help="Video file of a single guard (frames are used as crops)")
+    src.add_argument("--image", help="Single crop image replayed --crops times")
+    src.add_argument("--synthetic", action="store_true", help="Random-noise crops (default)")
+    parser.add_argument("--crops", type=int, default=150, help="Number of crops per mode")
+    parser.add_argument("--width", type=int, default=0, help="Resize crops to this width first")
+    parser.add_argument("--modes", nargs="+", default=list(POSE_MODEL_MODES), choices=POSE_MODEL_MODES)
+    parser.add_argument("--model-complexity", type=int, default=1, help="model_complexity for pose_only")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--csv", help="Also write results to this CSV file")
+    args = parser.parse_args()
+
+    crops = load_crops(args)
+    if not crops:
+        sys.exit("No crops loaded")
+    h, w = crops[0].shape[:2]
+    print("=" * 64)
+    print(f"Pose model benchmark: {len(crops)} crops of {w}x{h}")
+    print("=" * 64)
+
+    rows = [bench_mode(mode, crops, args.model_complexity, args.warmup) for mode in args.modes]
+
+    print(f"{'mode':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'pose found':>12}")
+    for row in rows:
+        print(f"{row['mode']:<12}{row['mean_ms']:>10.2f}{row['p50_ms']:>10.2f}"
+              f"{row['p95_ms']:>10.2f}{row['pose_found_pct']:>11.0f}%")
+
+    if args.csv:
+        import csv
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nSaved: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tracker backend cost versus guard count (performance.tracker_backend).
+
+Runs every backend over the same frames with 1, 2, 4, ... tracked boxes and
+reports ms per frame (all guards) and how many tracks survived to the end.
+
+On recorded footage the start boxes are the faces found in the first frame
+(face_recognition if installed, else OpenCV's Haar cascade); when the clip
+has fewer faces than the guard count the boxes are reused at small offsets.
+The sort backend is corrected against those same detections every
+--detection-interval frames; detection time is reported separately because
+the app shares that pass with re-detection.
+
+Usage:
+    python benchmarks/bench_trackers.py --video guards.mp4
+    python benchmarks/bench_trackers.py --synthetic --guards 1 4 8 16
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from poseguard.trackers import TRACKER_BACKENDS, TrackerBackend
+
+
+def load_video(path, max_frames, width):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if width and frame.shape[1] != width:
+            scale = width / float(frame.shape[1])
+            frame = cv2.resize(frame, (width, int(frame.shape[0] * scale)))
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def synthetic_scene(num_frames, guards, width=1280, height=720, seed=0):
+    """Textured background with `guards` textured patches drifting across it."""
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(0, 255, (height, width, 3), dtype=np.uint8), (7, 7), 0)
+    patches = [rng.integers(0, 255, (60, 50, 3), dtype=np.uint8) for _ in range(guards)]
+    cols = int(np.ceil(np.sqrt(guards)))
+    starts = [(80 + (i % cols) * (width - 200) // max(1, cols), 80 + (i // cols) * (height - 200) // max(1, cols))
+              for i in range(guards)]
+    velocity = rng.uniform(-1.5, 1.5, (guards, 2))
+
+    frames, truth = [], []
+    for t in range(num_frames):
+        frame = background.copy()
+        boxes = []
+        for (x0, y0), (vx, vy), patch in zip(starts, velocity, patches):
+            x = int(np.clip(x0 + vx * t, 0, width - 50))
+            y = int(np.clip(y0 + vy * t, 0, height - 60))
+            frame[y:y + 60, x:x + 50] = patch
+            boxes.append((x, y, x + 50, y + 60))
+        frames.append(frame)
+        truth.append(boxes)
+    return frames, truth
+
+
+def detect_face_boxes(frame):
+    """(x1, y1, x2, y2) faces of one frame."""
+    try:
+        import face_recognition
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return [(left, top, right, bottom) for top, right, bottom, left in face_recognition.face_locations(rgb)]
+    except ImportError:
+        cascade = cv2.CascadeClassifier(os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml"))
+        if cascade.empty():
+            sys.exit("No face detector: install face_recognition or an OpenCV build with Haar cascades")
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return [(x, y, x + w, y + h) for x, y, w, h in cascade.detectMultiScale(gray, 1.1, 5)]
+
+
+def start_boxes(boxes, guards):
+    """`guards` start boxes, reusing detected ones at small offsets when there are too few."""
+    result = []
+    for i in range(guards):
+        x1, y1, x2, y2 = boxes[i % len(boxes)]
+        shift = 4 * (i // len(boxes))
+        result.append((x1 + shift, y1 + shift, x2 + shift, y2 + shift))
+    return result
+
+
+def bench_backend(kind, frames, boxes, detections, detection_interval, warmup):
+    backend = TrackerBackend(kind, detection_interval=detection_interval)
+    if backend.kind != kind:
+        return None  # not available in this OpenCV build
+    tracks = {f"guard{i}": backend.create(frames[0], box) for i, box in enumerate(boxes)}
+    timings = []
+    for t, frame in enumerate(frames[1:], start=1):
+        start = time.perf_counter()
+        updates = backend.update(frame, tracks, lambda: detections(t))
+        elapsed = (time.perf_counter() - start) * 1000.0
+        for name, box in updates.items():
+            if box is None:
+                del tracks[name]
+        if t > warmup:
+            timings.append(elapsed)
+    timings = np.asarray(timings) if timings else np.zeros(1)
+    return {
+        "backend": kind,
+        "guards": len(boxes),
+        "mean_ms": float(timings.mean()),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "tracks_kept": len(tracks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracker backend ms/frame against guard count")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--video", help="Recorded footage with visible faces")
+    src.add_argument("--synthetic", action="store_true", help="Moving textured patches (default)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--width", type=int, default=1280, help="Resize footage to this width")
+    parser.add_argument("--guards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--backends", nargs="+", default=list(TRACKER_BACKENDS), choices=TRACKER_BACKENDS)
+    parser.add_argument("--detection-interval", type=int, default=5, help="sort: frames between corrections")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--csv", help="Also write results to this CSV file")
+    args = parser.parse_args()
+
+    rows = []
+    detect_ms = []
+    if args.video:
+        frames = load_video(args.video, args.frames, args.width)
+        if len(frames) < 2:
+            sys.exit(f"Cannot read footage: {args.video}")
+        found = detect_face_boxes(frames[0])
+        if not found:
+            sys.exit("No face in the first frame to start tracking from")
+        # Detections are computed up front so sort's timings exclude the detector
+        detections = {}
+        if "sort" in args.backends:
+            for t in range(args.detection_interval, len(frames), args.detection_interval):
+                start = time.perf_counter()
+                detections[t] = detect_face_boxes(frames[t])
+                detect_ms.append((time.perf_counter() - start) * 1000.0)
+        detect = lambda t: detections[t] if t in detections else detect_face_boxes(frames[t])
+        scenes = {g: (frames, start_boxes(found, g), detect) for g in args.guards}
+    else:
+        scenes = {}
+        for g in args.guards:
+            frames, truth = synthetic_scene(args.frames, g)
+            scenes[g] = (frames, truth[0], lambda t, truth=truth: truth[t])
+
+    h, w = next(iter(scenes.values()))[0][0].shape[:2]
+    print("=" * 64)
+    print(f"Tracker benchmark: {args.frames} frames of {w}x{h}")
+    print("=" * 64)
+    for g, (frames, boxes, detect) in scenes.items():
+        for kind in args.backends:
+            row = bench_backend(kind, frames, boxes, detect, args.detection_interval, args.warmup)
+            if row is None:
+                print(f"{kind}: not available in this OpenCV build, skipped")
+                continue
+            rows.append(row)
+
+    print(f"{'backend':<10}{'guards':>8}{'mean ms':>10}{'p95 ms':>10}{'kept':>8}")
+    for row in rows:
+        print(f"{row['backend']:<10}{row['guards']:>8}{row['mean_ms']:>10.2f}"
+              f"{row['p95_ms']:>10.2f}{row['tracks_kept']:>8}")
+    if detect_ms:
+        print(f"\nFace detection (sort corrections, not included above): "
+              f"{np.mean(detect_ms):.1f} ms per detection frame")
+
+    if args.csv and rows:
+        import csv
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nSaved: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
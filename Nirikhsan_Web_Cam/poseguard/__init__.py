@@ -0,0 +1,9 @@
+"""
+PoseGuard runtime helpers.
+
+Building blocks shared by the Tk monitoring app (Basic+Mediapose.py):
+threaded capture, inference back-ends and other performance utilities.
+MonitorEngine (engine.py) runs the whole pipeline without a GUI; the Tk app
+builds on it, and `python -m poseguard serve` exposes it over a local
+HTTP/WebSocket API (server.py).
+"""
@@ -0,0 +1,116 @@
+"""
+Headless monitoring: `python -m poseguard serve`.
+
+Runs a MonitorEngine without Tk and exposes it through poseguard.server.
+Run from the Nirikhsan_Web_Cam directory (guard_profiles/, logs/ and the
+other storage paths in config.json are relative to it), e.g.
+
+    python -m poseguard serve --targets "KD" "Rud" --alert
+    python -m poseguard serve --source footage.mp4 --replay --port 9000
+"""
+import os
+import sys
+import json
+import signal
+import logging
+import argparse
+import threading
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+logger = logging.getLogger("PoseGuard")
+
+
+def setup_logging(config):
+    log_dir = config.get("logging", {}).get("log_directory", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+    file_handler = RotatingFileHandler(
+        os.path.join(log_dir, "session.log"),
+        maxBytes=config.get("logging", {}).get("max_log_size_mb", 10) * 1024 * 1024,
+        backupCount=5
+    )
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+    logger.setLevel(logging.WARNING)
+    logger.addHandler(console_handler)
+    logger.addHandler(file_handler)
+
+
+def serve(args):
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+    setup_logging(config)
+    server_cfg = config.get("server", {})
+    if args.no_sound:
+        config.setdefault("alert", {})["play_sound"] = False
+
+    # Imported here so `--help` works without the vision stack
+    from poseguard.engine import MonitorEngine, make_camera_discovery
+    from poseguard.server import MonitorServer
+
+    discovery = make_camera_discovery(config) if args.source is None else None
+    engine = MonitorEngine(config, camera_discovery=discovery)
+    engine.load_targets()
+    if args.targets:
+        count = engine.track_targets(args.targets)
+        logger.warning(f"Tracking {count} of {len(args.targets)} requested guards")
+    if args.alert:
+        engine.set_alert_mode(True)
+
+    server = MonitorServer(engine, host=args.host or server_cfg.get("host", "127.0.0.1"),
+                           port=args.port or server_cfg.get("port", 8765), config=server_cfg)
+    server.serve_in_thread()
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+
+    if not engine.start(args.source, args.replay or None):
+        logger.error("No video source could be opened; the API stays up (POST /api/start to retry)")
+
+    # Supervisor: end of footage or a lost device stops capture; the API keeps serving
+    exit_code = 0
+    while not stop.wait(0.5):
+        state = engine.check_source()
+        if state == "finished":
+            logger.warning(f"Footage finished - {engine.replay_summary()}")
+            engine.stop()
+            if args.exit_on_finish:
+                break
+        elif state == "failed":
+            logger.error("Camera not available")
+            engine.stop()
+            exit_code = 1
+
+    logger.warning("Shutting down...")
+    server.close()
+    engine.close()
+    return exit_code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m poseguard", description="PoseGuard without the Tk window")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_cmd = commands.add_parser("serve", help="run the engine and the local HTTP/WebSocket API")
+    serve_cmd.add_argument("--config", default=DEFAULT_CONFIG, help="config.json (default: %(default)s)")
+    serve_cmd.add_argument("--host", help="bind address (default: server.host or 127.0.0.1)")
+    serve_cmd.add_argument("--port", type=int, help="port (default: server.port or 8765)")
+    serve_cmd.add_argument("--source", help="device index, stream URL or video file (default: camera config)")
+    serve_cmd.add_argument("--replay", action="store_true", help="process every frame of a video file, unthrottled")
+    serve_cmd.add_argument("--exit-on-finish", action="store_true", help="exit when a video file ends")
+    serve_cmd.add_argument("--targets", nargs="+", metavar="NAME", help="guards to track from guard_profiles/")
+    serve_cmd.add_argument("--alert", action="store_true", help="start in alert mode")
+    serve_cmd.add_argument("--no-sound", action="store_true", help="never play the alert siren")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        return serve(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+Alert sound.
+
+play_siren_sound() loops an MP3 on a daemon thread (pygame, then pydub,
+then system beeps) until a stop event is set or the duration runs out, so
+the processing thread never waits on audio.
+"""
+import time
+import platform
+import logging
+import threading
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+try:
+    from pydub import AudioSegment
+    from pydub.playback import play
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+logger = logging.getLogger("PoseGuard")
+
+
+def play_siren_sound(stop_event=None, duration_seconds=30, sound_file="emergency-siren-351963.mp3"):
+    """Play alert sound looping for up to duration_seconds or until stop_event is set
+    
+    Args:
+        stop_event: threading.Event to signal stop playback
+        duration_seconds: Maximum duration to play (default 30 seconds)
+        sound_file: Name of audio file (default 'emergency-siren-351963.mp3' for action, 'Fugitive.mp3' for fugitive)
+    """
+    def _sound_worker():
+        mp3_path = rf"D:\CUDA_Experiments\Git_HUB\Nirikhsan_Web_Cam\{sound_file}"
+        start_time = time.time()
+        
+        # Option 1: Try pygame (PRIMARY - most reliable for MP3 on Windows)
+        if PYGAME_AVAILABLE:
+            try:
+                if not pygame.mixer.get_init():
+                    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+                
+                pygame.mixer.music.load(mp3_path)
+                pygame.mixer.music.set_volume(1.0)
+                
+                # Play in loop until stop_event or duration_seconds
+                pygame.mixer.music.play(-1)  # -1 means infinite loop
+                logger.info(f"Alert sound started via pygame (max {duration_seconds}s)")
+                
+                # Wait until stop_event or duration expired
+                while True:
+                    elapsed = time.time() - start_time
+                    
+                    # Check if stop_event is set (action performed)
+                    if stop_event and stop_event.is_set():
+                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    # Check if duration expired
+                    if elapsed >= duration_seconds:
+                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    time.sleep(0.1)
+                
+                pygame.mixer.music.stop()
+                return
+            except Exception as e:
+                logger.warning(f"Pygame playback failed: {e}")
+        
+        # Option 2: Try pydub (requires ffmpeg/avconv)
+        if PYDUB_AVAILABLE:
+            try:
+                audio = AudioSegment.from_mp3(mp3_path)
+                logger.info(f"Alert sound started via pydub (max {duration_seconds}s)")
+                
+                while True:
+                    elapsed = time.time() - start_time
+                    
+                    # Check if stop_event is set
+                    if stop_event and stop_event.is_set():
+                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    # Check if duration expired
+                    if elapsed >= duration_seconds:
+                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    # Play audio clip
+                    play(audio)
+                
+                logger.info("Alert sound via pydub completed")
+                return
+            except Exception as e:
+                logger.warning(f"Pydub playback failed: {e}")
+        
+        # Fallback: Use system beeps (Windows winsound - always available)
+        try:
+            if platform.system() == "Windows":
+                import winsound
+                logger.info(f"Alert sound started via winsound (max {duration_seconds}s)")
+                
+                # Simulate emergency siren with pulsing high-low tones
+                while True:
+                    elapsed = time.time() - start_time
+                    
+                    # Check if stop_event is set
+                    if stop_event and stop_event.is_set():
+                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    # Check if duration expired
+                    if elapsed >= duration_seconds:
+                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    # Play siren pattern
+                    winsound.Beep(2500, 150)  # High beep
+                    time.sleep(0.05)
+                    winsound.Beep(1800, 150)  # Lower beep
+                    time.sleep(0.05)
+            else:
+                # Unix/Linux fallback
+                logger.info(f"Alert sound started via beep (max {duration_seconds}s)")
+                while True:
+                    elapsed = time.time() - start_time
+                    
+                    if stop_event and stop_event.is_set():
+                        logger.info(f"Alert sound stopped - action performed (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    if elapsed >= duration_seconds:
+                        logger.info(f"Alert sound stopped - duration expired (elapsed: {elapsed:.1f}s)")
+                        break
+                    
+                    print('\a')
+                    time.sleep(0.3)
+        except Exception as e:
+            logger.error(f"Sound Error: {e}")
+
+    t = threading.Thread(target=_sound_worker, daemon=True)
+    t.start()
+    return t
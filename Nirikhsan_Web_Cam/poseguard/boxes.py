@@ -0,0 +1,166 @@
+"""
+Box geometry on arrays.
+
+Boxes are (x1, y1, x2, y2) in pixels. Functions take (N, 4) arrays (or lists
+of boxes) and work on all pairs at once.
+"""
+import numpy as np
+
+
+def as_boxes(boxes):
+    """(N, 4) float64 array of (x1, y1, x2, y2) boxes."""
+    boxes = np.asarray(boxes, dtype=np.float64)
+    return boxes.reshape(-1, 4)
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """
+    Intersection-over-union of every box in `boxes_a` with every box in `boxes_b`.
+
+    Returns:
+        (A, B) float64 matrix
+    """
+    a, b = as_boxes(boxes_a), as_boxes(boxes_b)
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float64)
+    ix1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    iy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    ix2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    iy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-5)
+
+
+def calculate_body_box(face_box, frame_h, frame_w, expansion_factor=3.0):
+    """
+    Calculate dynamic body bounding box from detected face box.
+
+    Args:
+        face_box: tuple (x1, y1, x2, y2) - face coordinates
+        frame_h, frame_w: frame dimensions
+        expansion_factor: how many face widths to expand (default 3x)
+
+    Returns:
+        tuple (bx1, by1, bx2, by2) - body box coordinates
+    """
+    x1, y1, x2, y2 = face_box
+    face_w = x2 - x1
+    face_h = y2 - y1
+    face_cx = x1 + (face_w // 2)
+
+    # Expand horizontally based on face width
+    bx1 = max(0, int(face_cx - (face_w * expansion_factor)))
+    bx2 = min(frame_w, int(face_cx + (face_w * expansion_factor)))
+
+    # Expand vertically: slightly above face, down to feet
+    by1 = max(0, int(y1 - (face_h * 0.5)))
+    by2 = frame_h
+
+    return (bx1, by1, bx2, by2)
+
+
+def quantize_size(size, quantum, limit):
+    """Round `size` up to a multiple of `quantum`, capped at `limit`."""
+    if quantum <= 1:
+        return int(min(size, limit))
+    return int(min(limit, max(quantum, -(-int(size) // quantum) * quantum)))
+
+
+def stable_crop_box(box, frame_w, frame_h, quantum=32, prev_size=None):
+    """
+    Crop box with a quantized, sticky size centred on `box`.
+
+    The width/height are rounded up to multiples of `quantum`. A crop grows as
+    soon as the region no longer fits, but only shrinks once the region is
+    more than one quantum smaller, so small size jitter never changes the crop
+    size. Near the frame edges the box is shifted (not shrunk) to stay inside
+    the frame.
+
+    Args:
+        box: (x1, y1, x2, y2) region to cover
+        frame_w, frame_h: frame size
+        quantum: size step in pixels (<= 1 disables quantization)
+        prev_size: (w, h) returned for this guard last time, or None
+
+    Returns:
+        ((x1, y1, x2, y2), (w, h))
+    """
+    x1, y1, x2, y2 = box
+    w = quantize_size(x2 - x1, quantum, frame_w)
+    h = quantize_size(y2 - y1, quantum, frame_h)
+    if prev_size is not None:
+        prev_w, prev_h = prev_size
+        if w <= prev_w <= w + quantum and prev_w <= frame_w:
+            w = prev_w
+        if h <= prev_h <= h + quantum and prev_h <= frame_h:
+            h = prev_h
+
+    cx, cy = (x1 + x2) / 2.0, (y1 + y2) / 2.0
+    left = int(round(cx - w / 2.0))
+    top = int(round(cy - h / 2.0))
+    left = min(max(0, left), frame_w - w)
+    top = min(max(0, top), frame_h - h)
+    return (left, top, left + w, top + h), (w, h)
+
+
+def overlap_conflicts(boxes, scores, iou_threshold, iou_weight=0.0, keep_ties=False, sequential=False):
+    """
+    Resolve every overlapping pair of boxes in one pass over the IoU matrix.
+
+    For each pair i < j with IoU above `iou_threshold`, both boxes are scored
+    as scores[k] + iou_weight * (1 - IoU) and the lower-scoring one loses; on
+    a tie box i loses, or neither when `keep_ties` is set. Pairs are judged
+    independently, so a box can lose to several others.
+
+    With `sequential`, pairs are replayed in (i, j) order as a nested loop
+    that hides losers as it goes would see them: pairs whose box j is already
+    hidden are skipped, and box i is skipped once it was hidden before its
+    row started. In a chain A > B > C only B is hidden, and C survives.
+
+    Args:
+        boxes: (N, 4) boxes (x1, y1, x2, y2)
+        scores: (N,) per-box scores
+        iou_threshold: minimum IoU treated as a conflict
+        iou_weight: weight of the overlap-severity term added to both scores
+        keep_ties: tied pairs hide neither box
+        sequential: judge pairs in loop order against the boxes still shown
+
+    Returns:
+        (losers, conflicts): sorted list of losing indices and a list of
+        (loser, winner, iou, loser_score, winner_score) for logging
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    ious = iou_matrix(boxes, boxes)
+    pairs_i, pairs_j = np.nonzero(np.triu(ious > iou_threshold, k=1))
+    if len(pairs_i) == 0:
+        return [], []
+
+    pair_iou = ious[pairs_i, pairs_j]
+    severity = iou_weight * (1.0 - pair_iou)
+    score_i = scores[pairs_i] + severity
+    score_j = scores[pairs_j] + severity
+    i_wins = score_i > score_j
+    decided = i_wins | (score_i < score_j) | (not keep_ties)
+    loser = np.where(i_wins, pairs_j, pairs_i)
+    winner = np.where(i_wins, pairs_i, pairs_j)
+    loser_score = np.where(i_wins, score_j, score_i)
+    winner_score = np.where(i_wins, score_i, score_j)
+
+    judged = [((int(l), int(w), float(o), float(ls), float(ws)), bool(d))
+              for l, w, o, ls, ws, d in zip(loser, winner, pair_iou, loser_score, winner_score, decided)]
+    if not sequential:
+        conflicts = [conflict for conflict, d in judged if d]
+    else:
+        # np.nonzero yields the pairs row by row, i.e. in nested-loop order
+        conflicts, hidden, row_hidden, row = [], set(), set(), -1
+        for i, j, (conflict, d) in zip(pairs_i.tolist(), pairs_j.tolist(), judged):
+            if i != row:
+                row, row_hidden = i, set(hidden)
+            if not d or i in row_hidden or j in hidden:
+                continue
+            hidden.add(conflict[0])
+            conflicts.append(conflict)
+    losers = sorted({c[0] for c in conflicts})
+    return losers, conflicts
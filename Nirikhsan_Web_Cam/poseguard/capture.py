@@ -0,0 +1,324 @@
+"""
+Threaded camera capture.
+
+A FrameGrabber owns a cv2.VideoCapture and reads it on a dedicated thread,
+pushing timestamped frames into a bounded, drop-oldest ring buffer. Consumers
+(processing, display) pull the newest frame independently, so camera I/O never
+blocks the Tk event loop.
+
+Lost live sources are reopened on the capture thread with exponential
+back-off. Recorded footage can be replayed losslessly (the reader waits for
+the consumer instead of dropping frames) as fast as the pipeline allows.
+
+With a FramePool, frames are decoded into recycled buffers: the ring buffer
+holds a reference to each frame it stores, and next_frame() hands the
+consumer one more, which it gives back with CapturedFrame.release().
+"""
+import threading
+import time
+import logging
+from collections import deque, namedtuple
+
+logger = logging.getLogger("PoseGuard")
+
+class CapturedFrame(namedtuple("CapturedFrame", ["index", "timestamp", "image", "pooled"])):
+    """
+    index: monotonically increasing capture counter, timestamp: time.monotonic(),
+    pooled: the PooledFrame behind `image` (None without a frame pool)
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, index, timestamp, image, pooled=None):
+        return super().__new__(cls, index, timestamp, image, pooled)
+
+    def retain(self):
+        if self.pooled is not None:
+            self.pooled.retain()
+        return self
+
+    def release(self):
+        if self.pooled is not None:
+            self.pooled.release()
+
+
+class RateMeter:
+    """Events-per-second meter, recomputed once per `window` seconds."""
+
+    def __init__(self, window=1.0):
+        self.window = window
+        self.rate = 0.0
+        self._count = 0
+        self._window_start = time.monotonic()
+
+    def tick(self):
+        self._count += 1
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            self.rate = self._count / elapsed
+            self._count = 0
+            self._window_start = now
+
+
+class Backoff:
+    """Exponential back-off delays: initial, initial * factor, ... capped at maximum."""
+
+    def __init__(self, initial=0.5, maximum=30.0, factor=2.0):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self._delay = initial
+
+    def next_delay(self):
+        delay = self._delay
+        self._delay = min(self.maximum, self._delay * self.factor)
+        return delay
+
+    def reset(self):
+        self._delay = self.initial
+
+
+class FrameRingBuffer:
+    """
+    Bounded ring buffer of CapturedFrame entries.
+
+    When full, the oldest frame is overwritten. Frames that are overwritten or
+    skipped over before a consumer reads them are counted as dropped.
+
+    Args:
+        capacity: frames kept
+        lossless: never overwrite an undelivered frame; push() waits for the
+                  consumer and wait_next() hands out frames in order (replay)
+    """
+
+    def __init__(self, capacity=4, lossless=False):
+        self._frames = deque(maxlen=max(1, int(capacity)))
+        self._cond = threading.Condition()
+        self._last_delivered = -1
+        self.lossless = lossless
+        self.dropped = 0
+
+    def push(self, captured, stop_event=None):
+        """Store a frame, taking over the caller's reference to it."""
+        evicted = None
+        with self._cond:
+            if self.lossless:
+                while not self._cond.wait_for(self._has_room, timeout=0.5):
+                    if stop_event is not None and stop_event.is_set():
+                        captured.release()
+                        return
+            if len(self._frames) == self._frames.maxlen:
+                evicted = self._frames[0]
+            self._frames.append(captured)
+            self._cond.notify_all()
+        if evicted is not None:
+            evicted.release()
+
+    def _has_room(self):
+        return len(self._frames) < self._frames.maxlen or self._frames[0].index <= self._last_delivered
+
+    def latest(self):
+        """Return the newest frame without waiting (or None if empty)."""
+        with self._cond:
+            return self._frames[-1] if self._frames else None
+
+    def wait_latest(self, after_index=-1, timeout=None):
+        """
+        Block until a frame newer than `after_index` is available.
+
+        Returns:
+            Newest CapturedFrame (retained for the caller, who must
+            release() it), or None on timeout
+        """
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._frames and self._frames[-1].index > after_index,
+                timeout=timeout
+            )
+            if not ready:
+                return None
+            captured = self._frames[-1]
+            if self._last_delivered >= 0 and captured.index > self._last_delivered + 1:
+                self.dropped += captured.index - self._last_delivered - 1
+            self._last_delivered = max(self._last_delivered, captured.index)
+            return captured.retain()
+
+    def wait_next(self, after_index=-1, timeout=None):
+        """
+        Next frame for a consumer: the newest one for live sources, the
+        oldest undelivered one (no skipping) for lossless buffers.
+        """
+        if not self.lossless:
+            return self.wait_latest(after_index, timeout)
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._frames and self._frames[-1].index > after_index,
+                timeout=timeout
+            )
+            if not ready:
+                return None
+            captured = next(f for f in self._frames if f.index > after_index)
+            self._last_delivered = max(self._last_delivered, captured.index)
+            self._cond.notify_all()  # wake a producer waiting for room
+            return captured.retain()
+
+    def clear(self):
+        with self._cond:
+            frames = list(self._frames)
+            self._frames.clear()
+        for captured in frames:
+            captured.release()
+
+
+class FrameGrabber:
+    """
+    Reads frames from an opened capture on a background thread.
+
+    Args:
+        cap: opened cv2.VideoCapture (or anything with read()/isOpened())
+        buffer_size: ring buffer capacity in frames
+        reopen: callable returning a new opened capture; when set, a failed
+                read triggers reconnection with exponential back-off on the
+                capture thread instead of stopping
+        end_of_stream: a failed read means the footage ended (file sources)
+        lossless: deliver every frame in order (replay); the reader waits for
+                  the consumer instead of dropping frames
+        pace_fps: if > 0, read no faster than this rate (real-time file playback)
+        backoff: Backoff used between reconnect attempts
+        pool: optional FramePool; frames are decoded into its buffers
+        profiler: optional StageProfiler; each read is recorded as "capture"
+    """
+
+    def __init__(self, cap, buffer_size=4, reopen=None, end_of_stream=False, lossless=False,
+                 pace_fps=0.0, backoff=None, pool=None, profiler=None):
+        self.cap = cap
+        self.buffer = FrameRingBuffer(buffer_size, lossless=lossless)
+        self.capture_meter = RateMeter()
+        self.frames_captured = 0
+        self.read_failed = False
+        self.finished = False
+        self.reconnecting = False
+        self.reconnects = 0
+        self.reopen = reopen
+        self.end_of_stream = end_of_stream
+        self.pace_fps = pace_fps
+        self.backoff = backoff or Backoff()
+        self.pool = pool
+        self.profiler = profiler
+        self._frame_shape = None  # pooled buffers are acquired once the frame size is known
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self.read_failed = False
+        self.finished = False
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def capture_fps(self):
+        return self.capture_meter.rate
+
+    @property
+    def dropped_frames(self):
+        return self.buffer.dropped
+
+    def next_frame(self, after_index=-1, timeout=None):
+        """Frame for the consumer (see FrameRingBuffer.wait_next; release() it when done), None on timeout."""
+        return self.buffer.wait_next(after_index, timeout)
+
+    def _run(self):
+        pace_start = time.monotonic()
+        paced_frames = 0
+        while not self._stop_event.is_set():
+            if self.pace_fps > 0:
+                due = pace_start + paced_frames / self.pace_fps
+                if self._stop_event.wait(max(0.0, due - time.monotonic())):
+                    break
+                paced_frames += 1
+
+            pooled = None
+            if self.pool is not None and self._frame_shape is not None:
+                pooled = self.pool.acquire(self._frame_shape)
+            read_start = time.perf_counter()
+            try:
+                ret, frame = self.cap.read(pooled.array) if pooled is not None else self.cap.read()
+            except Exception as e:
+                logger.error(f"Capture thread read error: {e}")
+                ret, frame = False, None
+            if self.profiler is not None and ret:
+                self.profiler.record("capture", time.perf_counter() - read_start)
+
+            if not ret or frame is None:
+                if pooled is not None:
+                    pooled.release()
+                if self.end_of_stream:
+                    self.finished = True
+                    logger.warning(f"Capture thread: end of footage after {self.frames_captured} frames")
+                    break
+                if self.reopen is None or not self._reconnect():
+                    # Leave reconnection to the owner; just report and exit
+                    self.read_failed = True
+                    logger.error("Capture thread: failed to read frame")
+                    break
+                pace_start, paced_frames = time.monotonic(), 0
+                continue
+
+            if self.pool is not None and (pooled is None or frame is not pooled.array):
+                # First frame, or the source changed size: OpenCV allocated a new array
+                if pooled is not None:
+                    pooled.release()
+                pooled = self.pool.adopt(frame)
+                self._frame_shape = frame.shape
+            self.buffer.push(CapturedFrame(self.frames_captured, time.monotonic(), frame, pooled), self._stop_event)
+            self.frames_captured += 1
+            self.capture_meter.tick()
+
+    def _reconnect(self):
+        """Reopen the source with exponential back-off until it works or stop() is called."""
+        self.reconnecting = True
+        self.backoff.reset()
+        try:
+            try:
+                self.cap.release()
+            except Exception:
+                pass
+            while not self._stop_event.is_set():
+                delay = self.backoff.next_delay()
+                logger.error(f"Capture thread: source lost, reconnecting in {delay:.1f}s")
+                if self._stop_event.wait(delay):
+                    return False
+                try:
+                    cap = self.reopen()
+                except Exception as e:
+                    logger.error(f"Capture thread: reopen failed: {e}")
+                    continue
+                if cap is not None and cap.isOpened():
+                    self.cap = cap
+                    self.reconnects += 1
+                    logger.warning(f"Capture thread: reconnected (attempt {self.reconnects})")
+                    return True
+                if cap is not None:
+                    cap.release()
+            return False
+        finally:
+            self.reconnecting = False
+
+    def release(self):
+        """Stop reading and release the current capture (which may differ from the one passed in)."""
+        self.stop()
+        self.buffer.clear()
+        if self.cap is not None:
+            self.cap.release()
@@ -0,0 +1,106 @@
+"""
+Per-frame face detection context.
+
+Fugitive mode, PRO_Detection and untracked re-detection all need the faces of
+the same frame. A FaceDetectionContext is created once per processed frame and
+runs the detector (and the encoder) lazily, at most once each, handing the
+cached results to every consumer.
+"""
+
+
+class FaceDetectionContext:
+    """
+    Lazily computed face locations/encodings for one frame.
+
+    Args:
+        detect_fn: callable(encode) -> (locations, encodings); encodings is []
+                   when encode is False
+        encode_fn: callable(locations) -> encodings, used when locations were
+                   computed without encodings and a later consumer needs them
+    """
+
+    def __init__(self, detect_fn, encode_fn):
+        self._detect_fn = detect_fn
+        self._encode_fn = encode_fn
+        self._locations = None
+        self._encodings = None
+        self.detector_calls = 0
+        self.encoder_calls = 0
+        self.cache_hits = 0  # lookups answered from this frame's earlier detection
+
+    def faces(self, encode=True):
+        """
+        Face locations (and encodings) of this frame.
+
+        Returns:
+            (locations, encodings) - encodings is [] when encode=False
+        """
+        if self._locations is None:
+            locations, encodings = self._detect_fn(encode)
+            self.detector_calls += 1
+            self._locations = list(locations)
+            if encode:
+                self.encoder_calls += 1 if self._locations else 0
+                self._encodings = list(encodings)
+        else:
+            self.cache_hits += 1
+            if encode and self._encodings is None:
+                self._encodings = list(self._encode_fn(self._locations)) if self._locations else []
+                self.encoder_calls += 1 if self._locations else 0
+
+        return self._locations, (self._encodings if encode else [])
+
+    def locations(self):
+        return self.faces(encode=False)[0]
+
+
+class DetectionStats:
+    """Running totals of detector/encoder invocations across frames."""
+
+    def __init__(self):
+        self.frames = 0
+        self.detector_calls = 0
+        self.encoder_calls = 0
+        self.cache_hits = 0
+        self.max_detector_calls_per_frame = 0
+        self.last_detector_calls = 0
+        self.last_encoder_calls = 0
+        self.last_cache_hits = 0
+
+    def record(self, context):
+        self.frames += 1
+        self.detector_calls += context.detector_calls
+        self.encoder_calls += context.encoder_calls
+        self.cache_hits += context.cache_hits
+        self.last_detector_calls = context.detector_calls
+        self.last_encoder_calls = context.encoder_calls
+        self.last_cache_hits = context.cache_hits
+        self.max_detector_calls_per_frame = max(self.max_detector_calls_per_frame, context.detector_calls)
+
+    def as_dict(self):
+        return {
+            "frames": self.frames,
+            "detector_calls": self.detector_calls,
+            "encoder_calls": self.encoder_calls,
+            "cache_hits": self.cache_hits,
+            "max_detector_calls_per_frame": self.max_detector_calls_per_frame,
+            "last_detector_calls": self.last_detector_calls,
+            "last_encoder_calls": self.last_encoder_calls,
+            "last_cache_hits": self.last_cache_hits,
+        }
+
+    def to_prometheus(self, prefix="poseguard"):
+        """Prometheus text exposition of the running totals (counters)."""
+        lines = []
+        for name, value, help_text in (
+            ("frames", self.frames, "Frames that went through the tracking pipeline."),
+            ("face_detector_calls", self.detector_calls, "Face detector invocations."),
+            ("face_encoder_calls", self.encoder_calls, "Face encoder invocations."),
+            ("face_detection_cache_hits", self.cache_hits, "Face lookups served from the frame's cached detection."),
+        ):
+            metric = f"{prefix}_{name}_total"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter", f"{metric} {value}"]
+        metric = f"{prefix}_face_detector_calls_per_frame_max"
+        lines += [f"# HELP {metric} Most face detector invocations seen in one frame.",
+                  f"# TYPE {metric} gauge", f"{metric} {self.max_detector_calls_per_frame}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,228 @@
+"""
+Camera discovery.
+
+Opening cv2.VideoCapture on an index with no device behind it can block for
+seconds, so probing 0..9 one after another makes Start slow. Discovery instead
+enumerates the device nodes that exist (/dev/video* on Linux, keeping only
+V4L2 capture interfaces), probes them in parallel threads with a per-probe
+timeout and caches the result in a small JSON state file. The cache is reused
+while the set of device nodes is unchanged; a background re-probe picks up
+hot-plugged cameras.
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import threading
+import logging
+
+import cv2
+
+logger = logging.getLogger("PoseGuard")
+
+_VIDEO_NODE = re.compile(r"video(\d+)$")
+
+
+def list_video_devices(max_cameras=10):
+    """
+    Candidate camera indices.
+
+    On Linux these are the /dev/videoN nodes that are capture interfaces (UVC
+    cameras also expose a metadata node, sysfs index != 0, which cannot
+    deliver frames). Elsewhere there is no cheap enumeration, so 0..max_cameras-1.
+    """
+    if not sys.platform.startswith("linux"):
+        return list(range(max_cameras))
+
+    indices = []
+    for node in glob.glob("/dev/video*"):
+        match = _VIDEO_NODE.search(node)
+        if not match:
+            continue
+        index = int(match.group(1))
+        sys_index = f"/sys/class/video4linux/video{index}/index"
+        try:
+            with open(sys_index) as f:
+                if int(f.read().strip() or 0) != 0:
+                    continue
+        except (OSError, ValueError):
+            pass  # no sysfs (containers): keep the node and let the probe decide
+        indices.append(index)
+    return sorted(indices)
+
+
+def device_name(index):
+    """Human-readable V4L2 device name, or None when unavailable."""
+    try:
+        with open(f"/sys/class/video4linux/video{index}/name") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def probe_camera(index):
+    """True if camera `index` opens and delivers a frame."""
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return False
+        ret, _ = cap.read()
+        return bool(ret)
+    except Exception as e:
+        logger.debug(f"Camera {index} probe error: {e}")
+        return False
+    finally:
+        cap.release()
+
+
+def probe_cameras(indices, timeout=2.0):
+    """
+    Probe cameras in parallel.
+
+    Each probe runs on its own daemon thread, so a device that hangs in the
+    driver cannot hold up the others or block interpreter exit; probes still
+    running after `timeout` seconds count as unavailable.
+
+    Returns:
+        Sorted list of working indices
+    """
+    results = {}
+
+    def run(index):
+        results[index] = probe_camera(index)
+
+    threads = [threading.Thread(target=run, args=(i,), name=f"CameraProbe-{i}", daemon=True) for i in indices]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + timeout
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    timed_out = [i for i in indices if i not in results]
+    if timed_out:
+        logger.warning(f"Camera probe timed out for indices {timed_out}")
+    return sorted(i for i, ok in list(results.items()) if ok)
+
+
+class CameraDiscovery:
+    """
+    Cached, optionally self-refreshing list of working cameras.
+
+    Args:
+        cache_path: JSON state file shared across sessions
+        probe_timeout: seconds allowed for one parallel probe round
+        max_cameras: indices tried on platforms without device enumeration
+        cache_ttl: seconds a cached result stays valid when the device nodes are unchanged
+    """
+
+    def __init__(self, cache_path="camera_cache.json", probe_timeout=2.0, max_cameras=10, cache_ttl=86400):
+        self.cache_path = cache_path
+        self.probe_timeout = probe_timeout
+        self.max_cameras = max_cameras
+        self.cache_ttl = cache_ttl
+        self.on_change = None  # callable(cameras), called from the re-probe thread
+        self._lock = threading.Lock()
+        self._cameras = None
+        self._devices = None
+        self._probed_at = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as f:
+                state = json.load(f)
+            self._cameras = [int(i) for i in state["cameras"]]
+            self._devices = [int(i) for i in state["devices"]]
+            self._probed_at = float(state.get("probed_at", 0.0))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable camera cache {self.cache_path}: {e}")
+
+    def _save(self):
+        state = {"cameras": self._cameras, "devices": self._devices, "probed_at": self._probed_at}
+        tmp_path = self.cache_path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write camera cache {self.cache_path}: {e}")
+
+    def cameras(self, refresh=False):
+        """
+        Working camera indices.
+
+        The cached list is returned without touching any device when the
+        device nodes match the cached ones and the entry is younger than
+        cache_ttl; otherwise the candidates are probed again.
+        """
+        devices = list_video_devices(self.max_cameras)
+        with self._lock:
+            fresh = (self._cameras is not None and self._devices == devices
+                     and time.time() - self._probed_at < self.cache_ttl)
+            if fresh and not refresh:
+                return list(self._cameras)
+        return self.probe(devices)
+
+    def probe(self, devices=None):
+        """Probe the candidates now, update the cache and return the working indices."""
+        if devices is None:
+            devices = list_video_devices(self.max_cameras)
+        started = time.monotonic()
+        cameras = probe_cameras(devices, self.probe_timeout)
+        logger.info(f"Camera discovery: {cameras} of candidates {devices} in {time.monotonic() - started:.2f}s")
+        self._update(cameras, devices)
+        return cameras
+
+    def _update(self, cameras, devices):
+        with self._lock:
+            changed = cameras != self._cameras
+            self._cameras, self._devices, self._probed_at = cameras, devices, time.time()
+            self._save()
+        if changed and self.on_change:
+            self.on_change(list(cameras))
+
+    def invalidate(self):
+        """Forget the cached result (e.g. a cached camera failed to open)."""
+        with self._lock:
+            self._cameras = None
+
+    def start_background(self, interval=10.0):
+        """
+        Watch for hot-plugged devices.
+
+        Every `interval` seconds the device nodes are listed (cheap); only a
+        change in that list triggers a probe, and only of the new nodes, so a
+        camera that is already open is never re-opened. Platforms without
+        device enumeration need an explicit cameras(refresh=True).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                devices = list_video_devices(self.max_cameras)
+                with self._lock:
+                    known = list(self._devices or [])
+                    cached = list(self._cameras or [])
+                if devices == known:
+                    continue
+                try:
+                    added = [i for i in devices if i not in known]
+                    kept = [i for i in cached if i in devices]
+                    self._update(sorted(kept + probe_cameras(added, self.probe_timeout)), devices)
+                except Exception as e:
+                    logger.error(f"Camera re-probe failed: {e}")
+
+        self._thread = threading.Thread(target=run, name="CameraDiscovery", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
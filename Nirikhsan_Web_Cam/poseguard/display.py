@@ -0,0 +1,129 @@
+"""
+Tk video display.
+
+The display loop used to convert, resize and wrap every frame in a brand-new
+ImageTk.PhotoImage, querying the label size each time. On large monitors that
+work (and Tk's image allocation) made the Tk thread the bottleneck. A
+DisplayRenderer keeps one PhotoImage per displayed size and paste()s new
+frames into it, resizes into a preallocated buffer whose size changes only
+when the label or the frame does (the label size comes from <Configure>
+events), skips frames it has already shown, and caps the display rate
+independently of the analysis rate.
+"""
+import time
+import tkinter as tk
+
+import cv2
+import numpy as np
+from PIL import Image, ImageTk
+
+
+def fit_size(frame_w, frame_h, box_w, box_h):
+    """Largest (w, h) with the frame's aspect ratio that fits in box_w x box_h."""
+    scale = min(box_w / float(frame_w), box_h / float(frame_h))
+    return max(1, int(frame_w * scale)), max(1, int(frame_h * scale))
+
+
+class DisplayRenderer:
+    """
+    Renders BGR frames into a Tk (or CTk) label.
+
+    Args:
+        label: label widget showing the video
+        max_fps: display rate cap (0 = render every new frame)
+        min_size: label sizes at or below this (not laid out yet) show frames unscaled
+    """
+
+    def __init__(self, label, max_fps=30.0, min_size=10):
+        self.label = label
+        self.max_fps = float(max_fps or 0)
+        self.min_size = min_size
+        self.label_size = None
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+        self._photo = None
+        self._photo_size = None
+        self._resized = None  # BGR buffer at display size
+        self._rgb = None  # RGB buffer at display size
+        self._last_key = None
+        self._last_render = 0.0
+        # Bind on the widget itself: CTk widgets forward bind() to their inner canvas/label
+        tk.Misc.bind(label, "<Configure>", self._on_configure, "+")
+
+    def _on_configure(self, event):
+        self.label_size = (event.width, event.height)
+
+    def _target_size(self, frame_w, frame_h):
+        if self.label_size is None:
+            # No <Configure> yet: ask once
+            self.label_size = (self.label.winfo_width(), self.label.winfo_height())
+        box_w, box_h = self.label_size
+        if box_w <= self.min_size or box_h <= self.min_size:
+            return frame_w, frame_h
+        return fit_size(frame_w, frame_h, box_w, box_h)
+
+    def due(self, now=None):
+        """True when the display rate cap allows another frame."""
+        if self.max_fps <= 0:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self._last_render >= 1.0 / self.max_fps
+
+    def wants(self, key=None):
+        """False while the rate cap says wait or `key` is already shown at the current label size."""
+        return self.due() and (key is None or (key, self.label_size) != self._last_key)
+
+    def render(self, frame, key=None):
+        """
+        Show a BGR frame.
+
+        Args:
+            frame: BGR image (not modified)
+            key: identifies the frame's content (e.g. a slot version); a
+                 frame with the key last shown is skipped unless the label
+                 was resized
+
+        Returns:
+            True if the label was updated
+        """
+        if frame is None:
+            return False
+        now = time.monotonic()
+        frame_h, frame_w = frame.shape[:2]
+        size = self._target_size(frame_w, frame_h)
+        if (key is not None and (key, self.label_size) == self._last_key) or not self.due(now):
+            self.frames_skipped += 1
+            return False
+
+        if size != (frame_w, frame_h):
+            if self._resized is None or self._resized.shape[:2] != (size[1], size[0]):
+                self._resized = np.empty((size[1], size[0], 3), dtype=np.uint8)
+            cv2.resize(frame, size, dst=self._resized)
+            source = self._resized
+        else:
+            source = frame
+        if self._rgb is None or self._rgb.shape != source.shape:
+            self._rgb = np.empty_like(source)
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+        image = Image.fromarray(self._rgb)
+        if self._photo is None or self._photo_size != size:
+            # New size: one new PhotoImage, then paste() into it until the size changes again
+            self._photo = ImageTk.PhotoImage(image=image)
+            self._photo_size = size
+            self.label.configure(image=self._photo, text="")
+        else:
+            self._photo.paste(image)
+        self.label.imgtk = self._photo  # keep a reference for Tk
+
+        self._last_key = (key, self.label_size) if key is not None else None
+        self._last_render = now
+        self.frames_rendered += 1
+        return True
+
+    def clear(self):
+        """Blank the label and drop the cached image (e.g. when the camera stops)."""
+        self._photo = None
+        self._photo_size = None
+        self._last_key = None
+        self.label.configure(image="")
@@ -0,0 +1,140 @@
+"""
+On-disk face-encoding cache.
+
+Encoding a guard photo costs a full HOG/CNN face detection plus the ResNet
+embedding. Results are stored in one uncompressed .npz (by default
+guard_profiles/encodings.npz) keyed by absolute path, file mtime, file size
+and encoder version, so selecting targets only re-encodes images that
+changed since the last run.
+"""
+import os
+import threading
+import logging
+
+import numpy as np
+
+logger = logging.getLogger("PoseGuard")
+
+# Bump when the encoder (model, jitters, detector) changes; old entries are ignored
+ENCODING_MODEL_VERSION = "face_recognition/resnet_v1/hog/jitter1"
+
+
+class EncodingCache:
+    """
+    Path -> 128-d face encoding store, persisted to an .npz file.
+
+    Args:
+        path: cache file location
+        model_version: encoder identifier; entries from another version are dropped
+    """
+
+    def __init__(self, path, model_version=ENCODING_MODEL_VERSION):
+        self.path = path
+        self.model_version = model_version
+        self._entries = {}  # abspath -> (mtime_ns, size, encoding)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    @staticmethod
+    def _key(image_path):
+        return os.path.abspath(image_path)
+
+    @staticmethod
+    def _stat(image_path):
+        st = os.stat(image_path)
+        return st.st_mtime_ns, st.st_size
+
+    def load(self):
+        """Read the whole cache file in one np.load; a missing or corrupt file starts empty."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model_version"]) != self.model_version:
+                    logger.warning("Encoding cache built with another model version - ignoring")
+                    return
+                paths, mtimes, sizes, encodings = data["paths"], data["mtimes"], data["sizes"], data["encodings"]
+                with self._lock:
+                    self._entries = {
+                        str(p): (int(m), int(s), np.array(e))
+                        for p, m, s, e in zip(paths, mtimes, sizes, encodings)
+                    }
+            logger.info(f"Encoding cache loaded: {len(self._entries)} entries")
+        except Exception as e:
+            logger.warning(f"Could not read encoding cache {self.path}: {e}")
+
+    def save(self):
+        """Write the cache atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            items = list(self._entries.items())
+            self._dirty = False
+        paths = np.array([k for k, _ in items], dtype=str)
+        mtimes = np.array([v[0] for _, v in items], dtype=np.int64)
+        sizes = np.array([v[1] for _, v in items], dtype=np.int64)
+        encodings = (np.vstack([v[2] for _, v in items]) if items
+                     else np.empty((0, 128), dtype=np.float64))
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, model_version=np.array(self.model_version), paths=paths,
+                         mtimes=mtimes, sizes=sizes, encodings=encodings)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Could not write encoding cache {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def get(self, image_path):
+        """Cached encoding for `image_path`, or None if missing or the file changed."""
+        key = self._key(image_path)
+        try:
+            mtime, size = self._stat(image_path)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime and entry[1] == size:
+                self.hits += 1
+                return entry[2]
+        self.misses += 1
+        return None
+
+    def put(self, image_path, encoding):
+        try:
+            mtime, size = self._stat(image_path)
+        except OSError:
+            return
+        with self._lock:
+            self._entries[self._key(image_path)] = (mtime, size, np.asarray(encoding, dtype=np.float64))
+            self._dirty = True
+
+    def invalidate(self, image_path):
+        """Forget `image_path` (photo re-captured or guard removed) and persist."""
+        with self._lock:
+            if self._entries.pop(self._key(image_path), None) is None:
+                return
+            self._dirty = True
+        self.save()
+
+    def get_or_compute(self, image_path, compute):
+        """
+        Cached encoding, or compute(image_path) on a miss.
+
+        Args:
+            image_path: image file
+            compute: callable returning an encoding or None (no face); None is not cached
+
+        Returns:
+            encoding or None
+        """
+        encoding = self.get(image_path)
+        if encoding is None:
+            encoding = compute(image_path)
+            if encoding is not None:
+                self.put(image_path, encoding)
+        return encoding
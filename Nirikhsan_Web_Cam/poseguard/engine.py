@@ -0,0 +1,1818 @@
+"""
+GUI-free monitoring engine.
+
+MonitorEngine owns everything between the camera and the event log:
+capture threads, face detection and matching, trackers, pose inference,
+action classification, alerts, snapshots and events. It never touches a
+window or a dialog, so it runs the same under the Tk app (PoseApp builds on
+it and adds widgets, dialogs and onboarding) and headless under
+`python -m poseguard serve` (poseguard.server exposes it over HTTP).
+
+Front-ends read state through status()/guard_status(), the latest annotated
+frames through preview_slots(), and get every logged event pushed to
+listeners registered with add_listener().
+"""
+import os
+import gc
+import glob
+import json
+import time
+import logging
+import threading
+from collections import deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import cv2
+import numpy as np
+import psutil
+
+from poseguard.alerts import play_siren_sound
+from poseguard.boxes import calculate_body_box, overlap_conflicts, stable_crop_box
+from poseguard.capture import Backoff, FrameGrabber, RateMeter
+from poseguard.detection_context import FaceDetectionContext, DetectionStats
+from poseguard.discovery import CameraDiscovery
+from poseguard.drawing import draw_styled_landmarks
+from poseguard.encoding_cache import EncodingCache
+from poseguard.eventlog import EventLog
+from poseguard.face_detection import detect_faces, encode_faces, compute_face_encoding, resolve_detection_scale
+from poseguard.face_matching import encoding_matrix, face_distance_matrix, assign_faces
+from poseguard.framepool import FramePool, FrameSlot, AllocationMeter
+from poseguard.inference import InferenceEngine
+from poseguard.landmarks import ACTION_LABELS, landmarks_to_array, count_visible, landmark_bbox, classify_pose_batch
+from poseguard.motion import MotionGate
+from poseguard.multipose import MultiPoseEngine
+from poseguard.pose_models import PoseModelPool, make_pose_model, resolve_pose_model_mode
+from poseguard.profiling import StageProfiler
+from poseguard.reid import REID_AVAILABLE, SKLEARN_AVAILABLE, extract_appearance_features, calculate_feature_similarity
+from poseguard.roi import CropResizer
+from poseguard.snapshots import SnapshotWriter
+from poseguard.sources import parse_source, is_file_source, describe_source, open_capture, source_fps
+from poseguard.streams import CameraStream, visible_anywhere
+from poseguard.trackers import KalmanBoxFilter, TrackerBackend
+
+logger = logging.getLogger("PoseGuard")
+
+# Actions a guard can be asked to perform
+REQUIRED_ACTIONS = ["Hands Up", "Hands Crossed", "One Hand Raised (Left)", "One Hand Raised (Right)",
+                    "T-Pose", "Sit", "Standing"]
+
+
+# --- Services built from config.json (shared by the Tk app and the server) ---
+def make_snapshot_writer(config):
+    storage = config.get("storage", {})
+    return SnapshotWriter(
+        max_queue=storage.get("snapshot_queue_size", 32),
+        workers=storage.get("snapshot_workers", 2),
+        jpeg_quality=storage.get("snapshot_jpeg_quality", 90),
+    )
+
+
+def make_encoding_cache(config):
+    return EncodingCache(os.path.join(config.get("storage", {}).get("guard_profiles_dir", "guard_profiles"),
+                                      "encodings.npz"))
+
+
+def make_event_log(config):
+    logging_cfg = config.get("logging", {})
+    return EventLog(
+        os.path.join(logging_cfg.get("log_directory", "logs"), logging_cfg.get("event_db", "events.db")),
+        flush_interval=logging_cfg.get("flush_interval_seconds", 1.0),
+        flush_rows=logging_cfg.get("auto_flush_interval", 50),
+        fsync=logging_cfg.get("fsync", "normal"),
+    )
+
+
+def make_camera_discovery(config):
+    return CameraDiscovery(
+        config.get("camera", {}).get("discovery_cache", "camera_cache.json"),
+        probe_timeout=config.get("camera", {}).get("probe_timeout", 2.0),
+    )
+
+
+class MonitorEngine:
+    """
+    Capture, tracking and alerting for one site (one or several cameras).
+
+    Args:
+        config: parsed config.json
+        event_log, snapshot_writer, encoding_cache, camera_discovery: shared
+            services; built from config when omitted
+    """
+
+    def __init__(self, config, event_log=None, snapshot_writer=None, encoding_cache=None, camera_discovery=None):
+        self.config = config
+        self.event_log = event_log or make_event_log(config)
+        self.snapshot_writer = snapshot_writer or make_snapshot_writer(config)
+        self.encoding_cache = encoding_cache or make_encoding_cache(config)
+        self.camera_discovery = camera_discovery
+        os.makedirs(config.get("storage", {}).get("alert_snapshots_dir", "alert_snapshots"), exist_ok=True)
+
+        self.cap = None
+        self.unprocessed_slot = FrameSlot()  # Raw (un-annotated) copy of the newest frame for the snap button
+        self.is_running = False
+
+        # Threaded capture/processing (front-ends only display)
+        self.frame_grabber = None
+        self.processing_thread = None
+        self.display_slot = FrameSlot()  # Latest processed frame for display/previews
+        # ✅ IMPROVED: Frames are decoded into recycled buffers instead of fresh allocations
+        perf_cfg = config.get("performance", {})
+        self.frame_pool = FramePool(max_free=perf_cfg.get("frame_pool_size", 8))
+        self.use_frame_pool = perf_cfg.get("enable_frame_pool", True)
+        self.alloc_meter = AllocationMeter(self.frame_pool, trace=perf_cfg.get("trace_allocations", False))
+        self.last_processed_index = -1  # Capture index of the last frame the processing thread finished
+        self.replay_mode = False  # Recorded footage: every frame, no pacing, no frame skipping
+        self.replay_started = time.monotonic()
+        self.state_lock = threading.RLock()  # Guards targets_status across threads
+        self.processing_meter = RateMeter()
+        self.detection_stats = DetectionStats()  # Face detector/encoder calls per processed frame
+        # Rolling per-stage / per-guard latency percentiles (overlay, /metrics, CSV)
+        profiling_cfg = config.get("profiling", {})
+        self.profiler = StageProfiler(window=profiling_cfg.get("window", 1000),
+                                      enabled=profiling_cfg.get("enabled", True))
+
+        # Motion gate: skip pose inference for guards whose body box did not change
+        self.motion_gate = self._make_motion_gate()
+
+        # Multi-camera mode (camera.mode = "multi"): one CameraStream per source, empty otherwise
+        self.streams = []
+
+        # Hot-plugged cameras are picked up in the background; start() reads the cached list
+        if self.camera_discovery is not None:
+            self.camera_discovery.on_change = lambda cameras: logger.warning(f"Available cameras changed: {cameras}")
+            self.camera_discovery.start_background(config.get("camera", {}).get("reprobe_interval", 10.0))
+
+        # Inference back-end: worker-process pool (optional) + threads for tracker updates
+        self.inference_engine = None
+        self.tracker_executor = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2),
+                                                   thread_name_prefix="TrackerUpdate")
+        self.tracker_backend = TrackerBackend(
+            config["performance"].get("tracker_backend", "csrt"),
+            executor=self.tracker_executor,
+            detection_interval=config["performance"].get("tracker_detection_interval", 5),
+            iou_threshold=config["performance"].get("tracker_iou_threshold", 0.3),
+        )
+        self.is_logging = False
+        self.camera_index = 0  # Default camera
+
+        self.is_alert_mode = False
+        self.alert_interval = config.get("alert", {}).get("default_interval_seconds", 10)
+        self.required_action = "Hands Up"
+        self.sound_enabled = config.get("alert", {}).get("play_sound", True)
+        self.is_in_capture_mode = False  # Onboarding (front-ends that capture new guards set this)
+        self.frame_w = 640
+        self.frame_h = 480
+
+        self.target_map = {}
+        self.targets_status = {}
+        self.selected_target_names = []
+        # Contiguous (G, 128) encodings of the tracked guards, row i = guard_names[i]
+        self.guard_names = []
+        self.guard_index = {}
+        self.guard_encodings = encoding_matrix(())
+        self.re_detect_counter = 0
+        self.RE_DETECT_INTERVAL = config["detection"]["re_detect_interval"]
+        # Face detection runs on a downscaled copy (fixed scale or target width); boxes are mapped back
+        self.RESIZE_SCALE = config["detection"].get("detection_scale", 1.0)
+        self.detection_target_width = config["detection"].get("detection_target_width", 0)
+        self.upsample_on_miss = config["detection"].get("upsample_on_miss", False)
+        self.frame_counter = 0
+        self.tracker_tick = 0  # Processed frames; trackers run every tracker_update_interval of them
+        self.last_process_slot = FrameSlot()
+        self.last_action_cache = {}
+
+        # Fugitive Mode Fields
+        self.fugitive_mode = False
+        self.fugitive_image = None
+        self.fugitive_face_encoding = None
+        self.fugitive_name = "Unknown Fugitive"
+        self.fugitive_detected_log_done = False  # Prevent duplicate logs
+        self.last_fugitive_snapshot_time = 0  # Rate limiting for snapshots
+        self.fugitive_alert_sound_thread = None
+        self.fugitive_alert_stop_event = None
+
+        # PRO_Detection Mode Fields (Person Re-Identification)
+        self.pro_detection_mode = False
+        self.person_features_db = {}  # Store appearance features for each person
+        self.person_identity_history = {}  # Track person identity across frames
+        self.reid_enabled = REID_AVAILABLE and SKLEARN_AVAILABLE  # Check if ReID libraries are available
+        self.reid_confidence_threshold = 0.65  # Threshold for person re-identification
+        self.pro_detection_started = None  # ReID events since then are exported to CSV on stop
+        self.pro_detection_log_done = {}  # Track which persons have been logged
+        self.pro_detection_person_counter = 0  # Counter for assigning unique person IDs
+
+        # Front-end callbacks: each receives every event dict passed to log_event()
+        self.listeners = []
+
+        self.holistic_options = {
+            "min_detection_confidence": config["detection"]["min_detection_confidence"],
+            "min_tracking_confidence": config["detection"]["min_tracking_confidence"],
+            "static_image_mode": False
+        }
+        # Tracking crops only need pose landmarks unless a face/hand feature is on
+        self.pose_model_mode = resolve_pose_model_mode(
+            config["detection"].get("model", "holistic"),
+            needs_face_or_hands=(config["detection"].get("enable_sleep_detection", False) or
+                                 config["detection"].get("enable_hand_gestures", False))
+        )
+        self.pose_model_complexity = config["detection"].get("model_complexity", 1)
+        # One tracking-mode instance per guard so MediaPipe's temporal tracking holds
+        self.pose_models = PoseModelPool(
+            lambda: make_pose_model(self.pose_model_mode, self.holistic_options, self.pose_model_complexity),
+            max_size=config["detection"].get("max_pose_instances", 16),
+            idle_seconds=config["detection"].get("pose_instance_idle_seconds", 30)
+        )
+        self.multi_pose = self._make_multi_pose_engine()
+        # Crops above the pixel budget are downscaled into per-guard buffers before pose inference
+        self.crop_resizer = CropResizer(config["performance"].get("pose_crop_max_side", 640))
+        logger.warning(f"System initialized (tracking pose model: "
+                       f"{'multi_pose' if self.multi_pose else self.pose_model_mode})")
+
+    # --- GUARD ROSTER ---
+    def load_targets(self):
+        """Scan guard_profiles for target_<Name>_face.jpg files; returns the guard names found"""
+        self.target_map = {}
+        # Search ONLY in guard_profiles directory
+        guard_profiles_dir = self.config.get("storage", {}).get("guard_profiles_dir", "guard_profiles")
+        if not os.path.exists(guard_profiles_dir):
+            os.makedirs(guard_profiles_dir)
+        target_files = glob.glob(os.path.join(guard_profiles_dir, "target_*.jpg"))
+        display_names = []
+        for f in target_files:
+            try:
+                # Parse filename: target_[Name]_face.jpg or target_[First_Last]_face.jpg
+                base_name = os.path.basename(f).replace(".jpg", "")
+                parts = base_name.split('_')
+
+                # Remove 'target' prefix and 'face' suffix
+                if len(parts) >= 3 and parts[-1] == "face":
+                    # Join all parts between 'target' and 'face' as the name
+                    display_name = " ".join(parts[1:-1])
+                    self.target_map[display_name] = f
+                    display_names.append(display_name)
+            except Exception as e:
+                logger.error(f"Error parsing {f}: {e}")
+
+        if not display_names:
+            logger.warning("No target files found")
+        else:
+            logger.warning(f"Loaded {len(set(display_names))} guards")
+
+        # Update selected targets list
+        self.selected_target_names = [name for name in self.selected_target_names if name in self.target_map]
+        return sorted(self.target_map)
+
+    def load_pose_references(self, guard_name):
+        """Load saved pose references for a guard"""
+        try:
+            pose_dir = self.config.get("storage", {}).get("pose_references_dir", "pose_references")
+            safe_name = guard_name.replace(" ", "_")
+            pose_file = os.path.join(pose_dir, f"{safe_name}_poses.json")
+
+            if os.path.exists(pose_file):
+                with open(pose_file, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load pose references for {guard_name}: {e}")
+        return {}
+
+    def track_targets(self, names):
+        """
+        Start tracking exactly these guards (names from target_map).
+
+        Returns:
+            number of guards whose face encoding loaded
+        """
+        self.selected_target_names = [name for name in names if name in self.target_map]
+        # Build the new status map off to the side; the processing thread keeps
+        # using the old one until it is swapped in below
+        targets_status = {}
+        if not self.selected_target_names:
+            # No targets selected, tracking disabled
+            with self.state_lock:
+                self.targets_status = targets_status
+                self._rebuild_guard_encodings()
+                for stream in self.streams:
+                    stream.sync_targets(targets_status)
+                self.pose_models.retain(())
+            return 0
+        count = 0
+        # ✅ IMPROVED: Increased pose buffer size for better multi-guard stability
+        pose_buffer_size = max(self.config["performance"].get("pose_buffer_size", 5), 12)
+
+        for name in self.selected_target_names:
+            filename = self.target_map.get(name)
+            if filename:
+                try:
+                    encoding = self.encoding_cache.get_or_compute(filename, compute_face_encoding)
+                    if encoding is not None:
+                        targets_status[name] = {
+                            "encoding": encoding,
+                            "tracker": None,
+                            "face_box": None,
+                            "visible": False,
+                            "last_action_time": time.time(),  # Renamed from last_wave_time
+                            "alert_cooldown": 0,
+                            "alert_triggered_state": False,
+                            "last_logged_action": None,
+                            "pose_buffer": deque(maxlen=pose_buffer_size),  # ✅ Larger buffer for stability
+                            "missing_pose_counter": 0,
+                            "face_confidence": 0.0,
+                            "pose_confidence": 0.0,  # ✅ NEW: Track pose detection quality
+                            "face_encoding_history": deque(maxlen=5),  # ✅ NEW: Track face encoding changes
+                            "last_valid_pose": None,  # ✅ NEW: Store last valid pose for continuity
+                            "pose_references": self.load_pose_references(name),
+                            "last_snapshot_time": 0,  # Rate limiting: one snapshot per minute
+                            "last_log_time": 0,  # Rate limiting: one log entry per minute
+                            "alert_sound_thread": None,  # Track current alert sound thread
+                            "alert_stop_event": None,  # Event to signal sound to stop when action performed
+                            "alert_logged_timeout": False,  # Track if timeout alert was logged
+                            "missing_logged": False,  # Track if missing event was logged
+                            "alert_lock": threading.Lock(),  # Serializes missing/alert transitions across streams
+                            "last_pose": None,  # (pose results, pose stats) reused while the motion gate skips
+                            "box_filter": None,  # Kalman filter over the face box (smoothed/predicted box)
+                            "crop_size": None  # Quantized body-crop size, kept stable across frames
+                        }
+                        count += 1
+                except Exception as e:
+                    logger.error(f"Error loading {name}: {e}")
+        self.encoding_cache.save()
+        with self.state_lock:
+            if self.inference_engine:
+                for old_key in self._pose_model_keys(set(self.targets_status) - set(targets_status)):
+                    self.inference_engine.forget(old_key)
+            self.targets_status = targets_status
+            self._rebuild_guard_encodings()
+            if self.motion_gate:
+                self.motion_gate.retain(targets_status)
+            for stream in self.streams:
+                stream.sync_targets(targets_status)
+            # Per-guard Holistic instances: drop deselected guards, create the new ones
+            # (worker processes create their own on first use)
+            self.pose_models.retain(self._pose_model_keys(targets_status))
+            self.crop_resizer.retain(self._pose_model_keys(targets_status))
+            if not self.inference_engine:
+                self.pose_models.ensure(self._pose_model_keys(targets_status))
+        if count > 0:
+            logger.warning(f"Tracking initialized for {count} targets (Pose Buffer: {pose_buffer_size} frames).")
+        return count
+
+    def _pose_model_keys(self, names):
+        """Pose model pool keys: the guard name, or "<stream>:<name>" per camera in multi-camera mode"""
+        if not self.streams:
+            return list(names)
+        return [f"{stream.stream_id}:{name}" for stream in self.streams for name in names]
+
+    def _rebuild_guard_encodings(self):
+        """Refresh the (G, 128) guard encoding matrix from targets_status (hold state_lock)"""
+        self.guard_names = list(self.targets_status)
+        self.guard_index = {name: i for i, name in enumerate(self.guard_names)}
+        self.guard_encodings = encoding_matrix(self.targets_status[name]["encoding"] for name in self.guard_names)
+
+    def remove_guard(self, guard_name):
+        """
+        Delete a guard's profile image and pose references and stop tracking it.
+
+        Returns:
+            list of what was deleted
+        """
+        safe_name = guard_name.replace(" ", "_")
+        guard_profiles_dir = self.config.get("storage", {}).get("guard_profiles_dir", "guard_profiles")
+        pose_references_dir = self.config.get("storage", {}).get("pose_references_dir", "pose_references")
+
+        deleted_items = []
+
+        # Remove face image from guard_profiles directory ONLY
+        profile_image = os.path.join(guard_profiles_dir, f"target_{safe_name}_face.jpg")
+        if os.path.exists(profile_image):
+            os.remove(profile_image)
+            deleted_items.append("Face image (profiles)")
+        self.encoding_cache.invalidate(profile_image)
+
+        # Remove pose references
+        pose_file = os.path.join(pose_references_dir, f"{safe_name}_poses.json")
+        if os.path.exists(pose_file):
+            os.remove(pose_file)
+            deleted_items.append("Pose references")
+
+        # Remove from tracking if currently tracked
+        with self.state_lock:
+            if guard_name in self.targets_status:
+                if self.targets_status[guard_name].get("tracker"):
+                    self.targets_status[guard_name]["tracker"] = None
+                del self.targets_status[guard_name]
+                self._rebuild_guard_encodings()
+                deleted_items.append("Active tracking")
+            if self.motion_gate:
+                self.motion_gate.forget(guard_name)
+            for stream in self.streams:
+                stream.remove_target(guard_name)
+            for key in self._pose_model_keys([guard_name]):
+                self.pose_models.discard(key)
+                self.crop_resizer.forget(key)
+        if self.inference_engine:
+            for key in self._pose_model_keys([guard_name]):
+                self.inference_engine.forget(key)
+
+        # Reload targets list
+        self.load_targets()
+
+        logger.warning(f"Guard removed: {guard_name} ({', '.join(deleted_items)})")
+        return deleted_items
+
+    # --- MODES ---
+    def set_alert_mode(self, enabled):
+        """Alert mode on/off; turning it on restarts every guard's timer and enables logging"""
+        self.is_alert_mode = bool(enabled)
+        if self.is_alert_mode:
+            # Auto-start logging
+            if not self.is_logging:
+                self.is_logging = True
+                logger.warning("Alert mode started - logging enabled")
+
+            current_time = time.time()
+            for name in self.targets_status:
+                self.targets_status[name]["last_action_time"] = current_time
+                self.targets_status[name]["alert_triggered_state"] = False
+        else:
+            # Auto-stop logging and save
+            if self.is_logging:
+                self.save_log_to_file()
+                self.is_logging = False
+                logger.warning("Alert mode stopped - logging saved")
+
+    def set_required_action(self, action):
+        if action not in REQUIRED_ACTIONS:
+            raise ValueError(f"Unknown action {action!r}")
+        self.required_action = action
+        if self.is_alert_mode:
+            current_time = time.time()
+            for name in self.targets_status:
+                self.targets_status[name]["last_action_time"] = current_time
+                self.targets_status[name]["alert_triggered_state"] = False
+
+    def load_fugitive_image(self, file_path):
+        """
+        Read a fugitive photo and its face encoding (cached by path/mtime/size).
+
+        Returns:
+            (BGR image, encoding)
+
+        Raises:
+            ValueError if the image cannot be read or has no face
+        """
+        image = cv2.imread(file_path)
+        if image is None:
+            raise ValueError("Failed to load image")
+
+        encoding = self.encoding_cache.get(file_path)
+        if encoding is None:
+            import face_recognition
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            face_locations = face_recognition.face_locations(rgb_image)
+
+            if not face_locations:
+                raise ValueError("No face detected in selected image")
+
+            face_encodings = face_recognition.face_encodings(rgb_image, face_locations)
+            if not face_encodings:
+                raise ValueError("Failed to extract face encoding")
+
+            encoding = face_encodings[0]
+            self.encoding_cache.put(file_path, encoding)
+            self.encoding_cache.save()
+        return image, encoding
+
+    def start_fugitive(self, image, encoding, name=None):
+        """Search every frame for the face with this encoding"""
+        self.fugitive_image = image
+        self.fugitive_face_encoding = encoding
+        self.fugitive_name = name or "Unknown Fugitive"
+        self.fugitive_mode = True
+        self.fugitive_detected_log_done = False
+        for stream in self.streams:
+            stream.fugitive_detected_log_done = False
+        logger.warning(f"Fugitive Mode Started - Searching for: {self.fugitive_name}")
+
+    def stop_fugitive(self):
+        self.fugitive_mode = False
+        self.fugitive_image = None
+        self.fugitive_face_encoding = None
+        self.fugitive_detected_log_done = False
+        for stream in self.streams:
+            stream.fugitive_detected_log_done = False
+        logger.warning("Fugitive Mode Stopped")
+
+    def start_pro_detection(self):
+        """Start person re-identification; False when the ReID libraries are missing"""
+        if not self.reid_enabled:
+            return False
+        self.pro_detection_mode = True
+        self.person_features_db = {}  # Reset feature database
+        self.person_identity_history = {}  # Reset identity tracking
+        self.pro_detection_started = time.time()
+        self.pro_detection_log_done = {}
+        self.pro_detection_person_counter = 0
+        logger.warning("🚀 PRO_Detection Mode Started - Person Re-Identification Enabled")
+        return True
+
+    def stop_pro_detection(self):
+        self.pro_detection_mode = False
+        self.person_features_db = {}
+        self.person_identity_history = {}
+        # Auto-save tracking data to CSV
+        self._save_pro_detection_log()
+        logger.warning("🛑 PRO_Detection Mode Stopped")
+
+    def _save_pro_detection_log(self):
+        """Export this session's person re-identification events from the event log to a CSV file"""
+        try:
+            if self.pro_detection_started is None:
+                return
+            started, self.pro_detection_started = self.pro_detection_started, None
+            self.event_log.flush()
+            if not self.event_log.query(kind="pro_detection", since=started, limit=1):
+                return
+
+            log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+            os.makedirs(log_dir, exist_ok=True)
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            log_file = os.path.join(log_dir, f"pro_detection_{timestamp}.csv")
+            rows = self.event_log.export_csv(log_file, kind="pro_detection", since=started)
+
+            logger.warning(f"📊 PRO_Detection log saved: {log_file} ({rows} events)")
+        except Exception as e:
+            logger.error(f"Failed to save PRO_Detection log: {e}")
+
+    # --- SOURCES ---
+    def start(self, source=None, replay=None):
+        """
+        Start monitoring without asking anyone: the given source, else the
+        configured one (camera.mode/sources/source), else the first camera found.
+
+        Returns:
+            True if capture started
+        """
+        if self.is_running:
+            return True
+        camera_cfg = self.config.get("camera", {})
+        if source is None and camera_cfg.get("mode", "single") == "multi":
+            return self.open_multi_camera(camera_cfg.get("sources") or self._available_cameras())
+        if source is None and camera_cfg.get("source") not in (None, ""):
+            source = camera_cfg["source"]
+        if replay is None:
+            replay = camera_cfg.get("replay", False)
+        if source is None:
+            cameras = self._available_cameras()
+            if not cameras:
+                logger.error("No cameras detected!")
+                return False
+            source = cameras[0]
+        return self.open_source(parse_source(source), replay=replay)
+
+    def _available_cameras(self):
+        if self.camera_discovery is None:
+            return [self.config.get("camera", {}).get("device_index", 0)]
+        return self.camera_discovery.cameras()
+
+    def open_source(self, source, replay=False):
+        """
+        Open a device index, stream URL or video file and start capture/processing.
+
+        Args:
+            source: value accepted by poseguard.sources.open_capture
+            replay: file sources only - process every frame, unthrottled
+
+        Returns:
+            True if the source opened
+        """
+        replay = bool(replay) and is_file_source(source)
+        self.camera_index = source
+        self.cap = open_capture(source)
+        if not self.cap.isOpened():
+            self.cap.release()
+            self.cap = None
+            if isinstance(source, int) and self.camera_discovery is not None:
+                self.camera_discovery.invalidate()  # cached list is stale; probe again next start
+            logger.error(f"Failed to open {describe_source(source)}")
+            return False
+
+        self.frame_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.replay_mode = replay
+        self.replay_started = time.monotonic()
+        self.is_running = True
+        self._start_inference_engine()
+        self._start_capture_threads()
+        if replay:
+            logger.warning(f"Replaying {describe_source(source)} ({self.frame_w}x{self.frame_h}, "
+                           f"{source_fps(self.cap):.1f} FPS source) through the tracking pipeline")
+        else:
+            logger.warning(f"{describe_source(source)} started successfully")
+        return True
+
+    def open_multi_camera(self, sources):
+        """Open every source as its own CameraStream (capture + processing thread per camera)"""
+        streams = []
+        for i, source in enumerate(sources):
+            source = parse_source(source)
+            cap = open_capture(source)
+            if not cap.isOpened():
+                logger.error(f"Failed to open camera source {describe_source(source)}")
+                cap.release()
+                continue
+            streams.append(CameraStream(f"cam{i}", source, cap))
+
+        if not streams:
+            logger.error("No cameras could be opened!")
+            return False
+
+        # The first stream is the primary one (onboarding, frame size)
+        self.cap = streams[0].cap
+        self.frame_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.frame_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.is_running = True
+        self._start_inference_engine()
+        with self.state_lock:
+            self.streams = streams
+            for stream in streams:
+                stream.motion_gate = self._make_motion_gate()
+                stream.sync_targets(self.targets_status)
+            self.pose_models.retain(self._pose_model_keys(self.targets_status) if not self.inference_engine else ())
+        self._start_stream_threads()
+        logger.warning(f"Multi-camera monitoring started on {len(streams)} streams: "
+                       f"{[describe_source(s.source) for s in streams]}")
+        return True
+
+    def _make_multi_pose_engine(self):
+        """Full-frame multi-person pose engine when detection.pose_engine = "multi_pose", else None"""
+        det = self.config["detection"]
+        if det.get("pose_engine", "per_guard") != "multi_pose":
+            return None
+        if self.pose_model_mode == "holistic" and (det.get("enable_sleep_detection", False) or
+                                                   det.get("enable_hand_gestures", False)):
+            logger.warning("Multi-pose engine has no face/hand landmarks; keeping per-guard Holistic")
+            return None
+        try:
+            return MultiPoseEngine(
+                det.get("multi_pose_model", "models/pose_landmarker_full.task"),
+                max_poses=det.get("max_poses", 8),
+                min_detection_confidence=det["min_detection_confidence"],
+                min_tracking_confidence=det["min_tracking_confidence"],
+                min_iou=det.get("multi_pose_min_iou", 0.1),
+            )
+        except Exception as e:
+            logger.error(f"Multi-pose engine unavailable, using per-guard pose models: {e}")
+            return None
+
+    def _make_motion_gate(self):
+        perf = self.config["performance"]
+        if not perf.get("enable_motion_gate", False):
+            return None
+        return MotionGate(width=perf.get("motion_gate_width", 160),
+                          pixel_threshold=perf.get("motion_pixel_threshold", 15),
+                          min_fraction=perf.get("motion_min_fraction", 0.01),
+                          refresh_frames=perf.get("motion_refresh_frames", 15))
+
+    def _start_inference_engine(self):
+        """Start the worker-process inference pool when configured (kept alive until close)"""
+        if self.inference_engine is not None:
+            return
+        if self.config["performance"].get("inference_backend", "serial") != "process_pool":
+            return
+        try:
+            self.inference_engine = InferenceEngine(
+                num_workers=self.config["performance"].get("inference_workers", 0),
+                holistic_options=self.holistic_options,
+                max_models_per_worker=self.config["detection"].get("max_pose_instances", 16),
+                model_idle_seconds=self.config["detection"].get("pose_instance_idle_seconds", 30),
+                pose_model=self.pose_model_mode,
+                model_complexity=self.pose_model_complexity
+            ).start()
+            # Local per-guard instances are not needed while workers own them
+            with self.state_lock:
+                self.pose_models.retain(())
+        except Exception as e:
+            logger.error(f"Inference pool unavailable, using in-process inference: {e}")
+            self.inference_engine = None
+
+    def _make_frame_grabber(self, cap, source, replay=False):
+        """
+        Capture thread for any source type.
+
+        Live sources (devices, URLs) reconnect with back-off on the capture thread;
+        files end at end-of-stream and play at their own frame rate unless replayed,
+        in which case every frame is delivered as fast as processing keeps up.
+        """
+        buffer_size = self.config["performance"].get("capture_buffer_size", 4)
+        camera_cfg = self.config.get("camera", {})
+        pool = self.frame_pool if self.use_frame_pool else None
+        if is_file_source(source):
+            return FrameGrabber(cap, buffer_size=buffer_size, end_of_stream=True, lossless=replay,
+                                pace_fps=0.0 if replay else source_fps(cap), pool=pool, profiler=self.profiler)
+        backoff = Backoff(camera_cfg.get("reconnect_initial_delay", 0.5),
+                          camera_cfg.get("reconnect_max_delay", 30.0))
+        return FrameGrabber(cap, buffer_size=buffer_size, reopen=lambda: open_capture(source), backoff=backoff,
+                            pool=pool, profiler=self.profiler)
+
+    def _start_capture_threads(self):
+        """Start the capture thread (camera -> ring buffer) and the processing thread"""
+        self.frame_grabber = self._make_frame_grabber(self.cap, self.camera_index, self.replay_mode).start()
+        self.last_processed_index = -1
+        self.display_slot.clear()
+        self.processing_meter = RateMeter()
+        self.processing_thread = threading.Thread(target=self._processing_loop, name="FrameProcessing", daemon=True)
+        self.processing_thread.start()
+
+    def _start_stream_threads(self):
+        """Multi-camera: one capture thread and one processing thread per stream"""
+        self.display_slot.clear()
+        self.processing_meter = RateMeter()
+        for stream in self.streams:
+            stream.frame_grabber = self._make_frame_grabber(stream.cap, stream.source).start()
+            stream.processing_thread = threading.Thread(target=self._stream_processing_loop, args=(stream,),
+                                                        name=f"FrameProcessing-{stream.stream_id}", daemon=True)
+            stream.processing_thread.start()
+
+    def _stop_capture_threads(self):
+        """Stop capture and processing threads (call after clearing is_running)"""
+        if self.frame_grabber:
+            # The grabber may have swapped in a reconnected capture; release that one
+            self.frame_grabber.release()
+            self.cap = None
+        if self.processing_thread and self.processing_thread is not threading.current_thread():
+            self.processing_thread.join(timeout=2.0)
+        self.processing_thread = None
+
+        streams, self.streams = self.streams, []
+        for stream in streams:
+            if stream.processing_thread and stream.processing_thread is not threading.current_thread():
+                stream.processing_thread.join(timeout=2.0)
+            with stream.lock:
+                stream.release()
+
+    def stop(self):
+        """Stop capture and processing, flush events and end fugitive/PRO_Detection searches"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._stop_capture_threads()
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        if self.is_logging:
+            self.save_log_to_file()
+        if self.config.get("profiling", {}).get("export_csv_on_stop", False):
+            self.export_profile()
+
+        # Stop Fugitive Mode if running
+        if self.fugitive_mode:
+            self.stop_fugitive()
+
+        # Stop PRO_Detection Mode if running
+        if self.pro_detection_mode:
+            self.pro_detection_mode = False
+            self._save_pro_detection_log()
+            self.person_features_db = {}
+            self.person_identity_history = {}
+            logger.warning("PRO_Detection Mode Stopped on camera close")
+
+        # Cleanup
+        for status in self.targets_status.values():
+            if status["tracker"]:
+                status["tracker"] = None
+
+        gc.collect()
+        self.replay_mode = False
+
+    def check_source(self):
+        """
+        Capture health, polled by front-ends.
+
+        Returns:
+            None while running normally, "failed" when the camera is gone,
+            "finished" when footage ended and every delivered frame was processed
+        """
+        if not self.is_running or self.streams:
+            # Lost live sources reconnect with back-off on their capture threads
+            return None
+        if self.frame_grabber is None or self.frame_grabber.read_failed:
+            return "failed"
+        if self.frame_grabber.finished and self.last_processed_index >= self.frame_grabber.frames_captured - 1:
+            return "finished"
+        return None
+
+    def replay_summary(self):
+        """Throughput of the footage processed since open_source(), e.g. for the 'finished' message"""
+        frames = self.last_processed_index + 1
+        elapsed = max(1e-6, time.monotonic() - self.replay_started)
+        fps = frames / elapsed
+        source_rate = source_fps(self.frame_grabber.cap) if self.frame_grabber else 0.0
+        summary = f"{describe_source(self.camera_index)}: {frames} frames in {elapsed:.1f}s ({fps:.1f} FPS"
+        if source_rate > 0:
+            summary += f", {fps / source_rate:.1f}x real time"
+        return summary + ")"
+
+    def close(self):
+        """Stop everything and release models, worker processes and shared services"""
+        if self.is_running:
+            self.is_running = False
+            self._stop_capture_threads()
+            if self.cap:
+                self.cap.release()
+                self.cap = None
+
+        # Save logs if logging
+        if self.is_logging:
+            self.save_log_to_file()
+
+        # Cleanup trackers
+        for status in self.targets_status.values():
+            if status.get("tracker"):
+                status["tracker"] = None
+
+        # Release pose models and inference workers
+        self.pose_models.close_all()
+        if self.multi_pose:
+            self.multi_pose.close()
+        if self.inference_engine:
+            self.inference_engine.close()
+            self.inference_engine = None
+        self.tracker_executor.shutdown(wait=False)
+        if self.camera_discovery is not None:
+            self.camera_discovery.stop()
+        self.snapshot_writer.close(wait=True)  # finish queued alert snapshots
+        self.event_log.close()
+        self.alloc_meter.close()
+        gc.collect()
+
+    # --- EVENTS ---
+    def add_listener(self, callback):
+        """Call callback(event) for every event logged from now on (on the logging thread; keep it short)"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def log_event(self, guard, action, status, image_path="N/A", confidence=0.0, kind="guard"):
+        """Persist an event and hand it to the listeners"""
+        ts = time.time()
+        self.event_log.log(guard, action, status, image_path, confidence, kind=kind, ts=ts)
+        if self.listeners:
+            event = {"ts": ts, "guard": str(guard), "action": action, "status": status,
+                     "image_path": image_path or "N/A", "confidence": float(confidence or 0.0), "kind": kind}
+            for callback in list(self.listeners):
+                try:
+                    callback(event)
+                except Exception as e:
+                    logger.error(f"Event listener error: {e}")
+
+    def periodic_maintenance(self):
+        """Periodic housekeeping on the processing thread (events are flushed by the event log writer)"""
+        # Optimize memory periodically
+        if self.frame_counter % 300 == 0:  # Every ~10 seconds at 30fps
+            self.optimize_memory()
+
+    def optimize_memory(self):
+        """Clear old cache entries and collect garbage to free memory"""
+        try:
+            # Clear old action cache - keep last 50 entries
+            if len(self.last_action_cache) > 50:
+                keys_to_remove = list(self.last_action_cache.keys())[:-50]
+                for key in keys_to_remove:
+                    del self.last_action_cache[key]
+
+            # Close Holistic instances of guards missing for a while
+            with self.state_lock:
+                evicted = self.pose_models.evict_idle()
+            if evicted:
+                logger.debug(f"Evicted idle pose models: {', '.join(evicted)}")
+
+            # Force garbage collection
+            gc.collect()
+            logger.debug("Memory optimized - caches cleared, garbage collected")
+        except Exception as e:
+            logger.error(f"Memory optimization error: {e}")
+
+    def save_log_to_file(self):
+        """Commit every event logged so far (the writer also flushes on its own by time and size)"""
+        if self.event_log.flush():
+            logger.warning(f"Event log flushed ({self.event_log.written} events written this session)")
+        else:
+            logger.error("Event log flush timed out")
+
+    def export_profile(self, path=None):
+        """Write the stage latency percentiles to CSV (default: logs/latency_<timestamp>.csv); returns the path"""
+        try:
+            if path is None:
+                log_dir = self.config.get("logging", {}).get("log_directory", "logs")
+                os.makedirs(log_dir, exist_ok=True)
+                path = os.path.join(log_dir, f"latency_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+            self.profiler.export_csv(path)
+            return path
+        except Exception as e:
+            logger.error(f"Failed to export latency profile: {e}")
+            return None
+
+    def log_action_performed(self, guard_name, action, image_path, confidence):
+        """Log when a guard performs the required action"""
+        self.log_event(guard_name, action, "Action Performed", image_path, confidence)
+        logger.info(f"✓ {guard_name}: {action} performed (conf: {confidence:.2f})")
+
+    def log_action_not_performed(self, guard_name, expected_action, image_path, confidence):
+        """Log when a guard does NOT perform the required action during interval"""
+        self.log_event(guard_name, expected_action, "Action Not Performed", image_path, confidence)
+        logger.warning(f"✗ {guard_name}: {expected_action} NOT performed (conf: {confidence:.2f})")
+
+    def log_guard_missing(self, guard_name, image_path="N/A"):
+        """Log when a guard is missing from the frame"""
+        self.log_event(guard_name, "N/A", "Guard Missing", image_path, 0.0)
+        logger.warning(f"⚠ {guard_name}: MISSING from frame")
+
+    def capture_alert_snapshot(self, frame, target_name, check_rate_limit=False):
+        """
+        Capture alert snapshot with optional rate limiting (1 per minute).
+
+        Args:
+            frame: Image frame to save
+            target_name: Name of the target
+            check_rate_limit: If True, only capture if 60+ seconds since last snapshot
+
+        Returns:
+            reserved filename (written asynchronously), None if rate limited,
+            "Error" if failed or dropped because the snapshot queue is full
+        """
+        current_time = time.time()
+
+        # Rate limiting check: only one snapshot per minute per target
+        if check_rate_limit and target_name in self.targets_status:
+            last_snap_time = self.targets_status[target_name].get("last_snapshot_time", 0)
+            if (current_time - last_snap_time) < 60:  # Less than 60 seconds
+                return None  # Skip snapshot due to rate limit
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_name = target_name.replace(" ", "_")
+        snapshot_dir = self.config["storage"]["alert_snapshots_dir"]
+        filename = os.path.join(snapshot_dir, f"alert_{safe_name}_{timestamp}.jpg")
+        try:
+            # Copied and queued; conversion and JPEG encoding run on the writer threads
+            filename, _ = self.snapshot_writer.submit(filename, frame, convert=cv2.COLOR_RGB2BGR)
+            if filename is None:
+                return "Error"
+
+            # Update last snapshot time for this target
+            if target_name in self.targets_status:
+                self.targets_status[target_name]["last_snapshot_time"] = current_time
+
+            return filename
+        except Exception as e:
+            logger.error(f"Snapshot error: {e}")
+            return "Error"
+
+    def _play_siren(self, stop_event, **kwargs):
+        """Alert sound unless alert.play_sound is off (e.g. on a headless server); returns the sound thread"""
+        if not self.sound_enabled:
+            return None
+        return play_siren_sound(stop_event=stop_event, **kwargs)
+
+    # --- STATUS ---
+    def preview_slots(self):
+        """[(camera id, FrameSlot)] holding the latest annotated frame of each camera"""
+        if self.streams:
+            return [(stream.stream_id, stream.display_slot) for stream in self.streams]
+        return [("cam0", self.display_slot)]
+
+    def guard_status(self):
+        """{name: JSON-ready state} for every tracked guard"""
+        now = time.time()
+        action_caches = [s.last_action_cache for s in self.streams] if self.streams else [self.last_action_cache]
+        guards = {}
+        for name, status in list(self.targets_status.items()):
+            since_action = now - status["last_action_time"]
+            action = next((cache[name] for cache in action_caches if name in cache), "Unknown")
+            guards[name] = {
+                "visible": bool(visible_anywhere(status)) if self.streams else bool(status["visible"]),
+                "cameras": sorted(status.get("visible_streams", ())),
+                "action": action,
+                "face_confidence": round(float(status.get("face_confidence", 0.0)), 3),
+                "pose_confidence": round(float(status.get("pose_confidence", 0.0)), 3),
+                "seconds_since_action": round(since_action, 1),
+                "time_left": round(max(0.0, self.alert_interval - since_action), 1) if self.is_alert_mode else None,
+                "alerting": bool(status["alert_triggered_state"]),
+                "missing_logged": bool(status.get("missing_logged", False)),
+            }
+        return guards
+
+    def status(self):
+        """Engine state for front-ends and the HTTP API (JSON-ready)"""
+        if self.streams:
+            grabbers = [s.frame_grabber for s in self.streams if s.frame_grabber]
+            proc_fps = sum(s.processing_meter.rate for s in self.streams)
+        else:
+            grabbers = [self.frame_grabber] if self.frame_grabber else []
+            proc_fps = self.processing_meter.rate
+        return {
+            "running": self.is_running,
+            "source": describe_source(self.camera_index) if self.is_running else None,
+            "cameras": [camera_id for camera_id, _ in self.preview_slots()] if self.is_running else [],
+            "replay": self.replay_mode,
+            "frame_size": [self.frame_w, self.frame_h],
+            "capture_fps": round(sum(g.capture_fps for g in grabbers), 1),
+            "processing_fps": round(proc_fps, 1),
+            "dropped_frames": sum(g.dropped_frames for g in grabbers),
+            "reconnecting": any(g.reconnecting for g in grabbers),
+            "memory_mb": round(psutil.Process().memory_info().rss / 1024 / 1024, 1),
+            "alert_mode": self.is_alert_mode,
+            "logging": self.is_logging,
+            "alert_interval": self.alert_interval,
+            "required_action": self.required_action,
+            "fugitive_mode": self.fugitive_mode,
+            "fugitive_name": self.fugitive_name if self.fugitive_mode else None,
+            "pro_detection_mode": self.pro_detection_mode,
+            "snapshots": self.snapshot_writer.stats(),
+            "events_written": self.event_log.written,
+            "detection": self.detection_stats.as_dict(),
+            "guards": self.guard_status(),
+        }
+
+    # --- PROCESSING ---
+    def _processing_loop(self):
+        """Processing thread: analyse the newest captured frame as soon as it arrives"""
+        grabber = None
+        last_index = -1
+        while self.is_running:
+            # A reconnect swaps in a new grabber whose frame indices restart at 0
+            if self.frame_grabber is not grabber:
+                grabber = self.frame_grabber
+                last_index = -1
+            if grabber is None:
+                time.sleep(0.05)
+                continue
+
+            captured = grabber.next_frame(last_index, timeout=0.5)
+            if captured is None:
+                continue
+            last_index = captured.index
+
+            try:
+                self.process_frame(captured.image, captured.pooled)
+            except Exception as e:
+                logger.error(f"Frame processing error: {e}")
+            finally:
+                captured.release()
+            self.last_processed_index = last_index
+
+    def _stream_processing_loop(self, stream):
+        """Processing thread of one camera stream (multi-camera mode)"""
+        grabber = None
+        last_index = -1
+        while self.is_running and stream in self.streams:
+            if stream.frame_grabber is not grabber:
+                grabber = stream.frame_grabber
+                last_index = -1
+            if grabber is None:
+                time.sleep(0.05)
+                continue
+
+            captured = grabber.next_frame(last_index, timeout=0.5)
+            if captured is None:
+                continue
+            last_index = captured.index
+
+            try:
+                self.process_stream_frame(stream, captured.image, captured.pooled)
+            except Exception as e:
+                logger.error(f"[{stream.stream_id}] Frame processing error: {e}")
+            finally:
+                captured.release()
+
+    def process_stream_frame(self, stream, frame, pooled=None):
+        """Multi-camera counterpart of process_frame: tracker state comes from the stream"""
+        primary = bool(self.streams) and stream is self.streams[0]
+        if primary:
+            self._publish_unprocessed(frame)
+
+        stream.frame_counter += 1
+        skip_interval = self.config["performance"]["frame_skip_interval"]
+
+        # The pooled buffer (or the plain frame without a pool) is what the slots hold
+        shown = pooled if pooled is not None else frame
+        if self.is_in_capture_mode:
+            # Onboarding runs on the primary camera only
+            if primary:
+                with self.state_lock:
+                    self.process_capture_frame(frame)
+            stream.display_slot.put(shown)
+        else:
+            with stream.lock:
+                if self.config["performance"].get("enable_frame_skipping", False) and stream.frame_counter % skip_interval != 0:
+                    self._predict_boxes(stream.targets_status)
+                    if not stream.display_slot.share(stream.last_process_slot):
+                        stream.display_slot.put(shown)
+                else:
+                    self.process_tracking_frame_optimized(frame, stream)
+                    stream.last_process_slot.put(shown)
+                    stream.display_slot.put(shown)
+
+        self.periodic_maintenance()
+
+        stream.processing_meter.tick()
+        self.alloc_meter.tick()
+        if primary:
+            self.processing_meter.tick()
+
+    def _publish_unprocessed(self, frame):
+        """Keep a clean copy of the frame (in a pooled buffer) before annotations are drawn on it"""
+        if self.use_frame_pool:
+            raw = self.frame_pool.copy_of(frame)
+            self.unprocessed_slot.put(raw)
+            raw.release()
+        else:
+            self.unprocessed_slot.put(frame.copy())
+
+    def process_frame(self, frame, pooled=None):
+        """
+        Run capture/tracking analysis on one frame and publish it for display.
+
+        Args:
+            frame: BGR frame; annotations are drawn onto it
+            pooled: the PooledFrame owning `frame` (None without a frame pool)
+        """
+        self._publish_unprocessed(frame)
+        shown = pooled if pooled is not None else frame
+
+        # Frame skipping for performance
+        self.frame_counter += 1
+        skip_interval = self.config["performance"]["frame_skip_interval"]
+
+        with self.state_lock:
+            if self.is_in_capture_mode:
+                self.process_capture_frame(frame)
+                self.display_slot.put(shown)
+            else:
+                # Skip processing every N frames when enabled (replay analyses every frame)
+                frame_skipping = self.config["performance"].get("enable_frame_skipping", False) and not self.replay_mode
+                if frame_skipping and self.frame_counter % skip_interval != 0:
+                    # Keep box filters in step with real frames; keep showing the last processed frame
+                    self._predict_boxes(self.targets_status)
+                    if not self.display_slot.share(self.last_process_slot):
+                        self.display_slot.put(shown)
+                else:
+                    self.process_tracking_frame_optimized(frame)
+                    self.last_process_slot.put(shown)
+                    self.display_slot.put(shown)
+
+        self.periodic_maintenance()
+
+        self.processing_meter.tick()
+        self.alloc_meter.tick()
+
+    def process_capture_frame(self, frame):
+        """Onboarding overlay while is_in_capture_mode is set; front-ends that onboard guards override this"""
+        return frame
+
+    # --- INFERENCE HELPERS ---
+    def _frame_deadline(self):
+        """Wall-clock time by which every worker result of a frame must be back"""
+        return time.time() + self.config["performance"].get("inference_timeout_seconds", 2.0)
+
+    @staticmethod
+    def _await(future, deadline):
+        return future.result(timeout=max(0.0, deadline - time.time()))
+
+    def _detect_faces(self, rgb_frame, frame_ref, encode=True, deadline=None):
+        """
+        Face locations (and encodings) in full-frame coordinates.
+
+        Detection runs on a copy downscaled by RESIZE_SCALE / detection_target_width.
+        Uses the worker pool when frame_ref is set (results due by `deadline`,
+        the frame's deadline), otherwise runs in-process.
+
+        Returns:
+            (face_locations, face_encodings) - encodings is [] when encode=False
+        """
+        scale = resolve_detection_scale(rgb_frame.shape[1], self.RESIZE_SCALE, self.detection_target_width)
+        with self.profiler.measure("face_detection"):
+            if frame_ref is not None:
+                try:
+                    deadline = deadline or self._frame_deadline()
+                    future = self.inference_engine.submit_faces(frame_ref, encode=encode, scale=scale,
+                                                                upsample_on_miss=self.upsample_on_miss,
+                                                                deadline=deadline)
+                    return self._await(future, deadline)
+                except Exception as e:
+                    logger.error(f"Worker face detection failed, running in-process: {e}")
+
+            return detect_faces(rgb_frame, scale=scale, upsample_on_miss=self.upsample_on_miss, encode=encode)
+
+    def _encode_faces(self, rgb_frame, frame_ref, face_locations, deadline=None):
+        """Encodings for face locations found earlier in the same frame"""
+        if frame_ref is not None:
+            try:
+                deadline = deadline or self._frame_deadline()
+                future = self.inference_engine.submit_encodings(frame_ref, face_locations, deadline=deadline)
+                return self._await(future, deadline)
+            except Exception as e:
+                logger.error(f"Worker face encoding failed, running in-process: {e}")
+        return encode_faces(rgb_frame, face_locations)
+
+    def _update_trackers(self, frame, targets_status, faces, predicted=None):
+        """
+        Advance all active trackers by one frame (see poseguard.trackers).
+
+        Args:
+            predicted: {name: Kalman-predicted box}; jumps are measured against the prediction
+
+        Returns:
+            {name: (x1, y1, x2, y2) or None when the tracker lost the guard}
+        """
+        tracks = {name: status["tracker"] for name, status in targets_status.items() if status["tracker"]}
+        # SORT corrects its predictions with this frame's face boxes (shared detection pass)
+        detect = lambda: [(left, top, right, bottom) for (top, right, bottom, left) in faces.locations()]
+        return self.tracker_backend.update(frame, tracks, detect, reference=predicted)
+
+    def _predict_boxes(self, targets_status):
+        """
+        Advance every tracked guard's box filter by one frame.
+
+        Returns:
+            {name: predicted face box}
+        """
+        predicted = {}
+        for name, status in targets_status.items():
+            if status["tracker"] and status.get("box_filter") is not None:
+                predicted[name] = status["box_filter"].predict()
+        return predicted
+
+    def _crop_box(self, status, frame_h, frame_w):
+        """Body crop for a guard: from the filtered face box, with a quantized size that only changes on real growth"""
+        body_box = calculate_body_box(status["face_box"], frame_h, frame_w, expansion_factor=3.0)
+        quantum = self.config["performance"].get("crop_size_quantum", 32)
+        if quantum <= 1:
+            return body_box
+        crop_box, status["crop_size"] = stable_crop_box(body_box, frame_w, frame_h, quantum, status.get("crop_size"))
+        return crop_box
+
+    def _estimate_poses(self, rgb_frame, frame_ref, crop_boxes, stream_id=None, face_boxes=None, deadline=None):
+        """
+        Pose estimation (Holistic or Pose, per detection.model) for every guard crop.
+
+        Args:
+            rgb_frame: full RGB frame
+            frame_ref: shared-memory frame reference (None = in-process)
+            crop_boxes: {name: (bx1, by1, bx2, by2)} in targets_status order
+            stream_id: camera stream in multi-camera mode (each camera keeps its own models)
+            face_boxes: {name: tracked face box}, used by the multi-pose engine to associate skeletons
+            deadline: time.time() by which worker results are due (default: inference_timeout_seconds from now)
+
+        Returns:
+            {name: holistic results or None} (landmarks normalized to each guard's crop)
+        """
+        if self.multi_pose is not None:
+            # One full-frame pass regardless of guard count
+            if not crop_boxes:
+                return {}
+            try:
+                return self.multi_pose.estimate(rgb_frame, face_boxes or {}, crop_boxes, key=stream_id)
+            except Exception as e:
+                logger.error(f"Multi-pose estimation failed: {e}")
+                return {name: None for name in crop_boxes}
+
+        results = {}
+        model_key = (lambda name: name) if stream_id is None else (lambda name: f"{stream_id}:{name}")
+        if frame_ref is not None:
+            # One deadline for the whole frame: a stuck worker costs the frame at most
+            # inference_timeout_seconds, not that much per guard
+            deadline = deadline or self._frame_deadline()
+            futures = {name: self.inference_engine.submit_pose(frame_ref, model_key(name), box,
+                                                               max_side=self.crop_resizer.max_side,
+                                                               deadline=deadline)
+                       for name, box in crop_boxes.items()}
+            # Wait for the whole frame before merging so results stay in frame order
+            for name, future in futures.items():
+                try:
+                    results[name] = self._await(future, deadline)
+                except Exception as e:
+                    logger.error(f"Worker pose estimation failed for {name}: {e}")
+                    results[name] = None
+            return results
+
+        for name, box in crop_boxes.items():
+            with self.profiler.measure("pose", guard=name):
+                # Normalized landmarks of the downscaled crop map onto the original crop unchanged
+                rgb_crop, _ = self.crop_resizer.prepare(model_key(name), rgb_frame, box)
+                results[name] = self.pose_models.get(model_key(name)).process(rgb_crop)
+        return results
+
+    # --- TRACKING LOGIC ---
+    def process_tracking_frame_optimized(self, frame, stream=None):
+        """
+        Track, pose-classify and alert on one frame.
+        
+        Args:
+            frame: BGR frame (annotated in place)
+            stream: CameraStream in multi-camera mode; None uses the app's own tracker state
+        """
+        # Per-camera tracker state lives on the stream; single-camera mode keeps it on the app
+        ctx = stream if stream is not None else self
+        if not ctx.targets_status:
+            cv2.putText(frame, "SELECT TARGETS TO START", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            return frame
+
+        ctx.re_detect_counter += 1
+        if ctx.re_detect_counter > self.RE_DETECT_INTERVAL:
+            ctx.re_detect_counter = 0
+        stopwatch = self.profiler.stopwatch()
+        
+        # Converted into a per-stream scratch buffer; it is only used while this frame is processed
+        rgb_full_frame = self.frame_pool.convert(("rgb", stream.stream_id if stream is not None else None),
+                                                 frame, cv2.COLOR_BGR2RGB)
+        frame_h, frame_w = frame.shape[:2]
+        
+        # Publish the clean RGB frame once for the worker pool (None = in-process inference)
+        frame_ref = None
+        frame_deadline = None
+        if self.inference_engine:
+            try:
+                frame_ref = self.inference_engine.publish_frame(
+                    rgb_full_frame, channel=stream.stream_id if stream is not None else 0)
+                frame_deadline = self._frame_deadline()
+            except Exception as e:
+                logger.error(f"Failed to publish frame to inference workers: {e}")
+        # The motion gate differences clean frames: feed it before any mode draws on `frame`
+        if ctx.motion_gate:
+            ctx.motion_gate.update(frame)
+        stopwatch.lap("color_conversion")
+        
+        # Faces are detected (and encoded) at most once per frame, on first use by any mode below
+        faces = FaceDetectionContext(
+            lambda encode: self._detect_faces(rgb_full_frame, frame_ref, encode=encode, deadline=frame_deadline),
+            lambda locations: self._encode_faces(rgb_full_frame, frame_ref, locations, deadline=frame_deadline)
+        )
+        
+        # ==================== FUGITIVE MODE ====================
+        # Search for Fugitive in frame (always active when enabled, regardless of alert mode)
+        if self.fugitive_mode and self.fugitive_face_encoding is not None:
+            face_locations, face_encodings = faces.faces()
+            if face_locations:
+                # Distances to the fugitive's face for every detected face at once
+                fugitive_distances = face_distance_matrix(encoding_matrix([self.fugitive_face_encoding]), face_encodings)[0]
+                for face_distance, face_location in zip(fugitive_distances, face_locations):
+                    if face_distance <= 0.5:  # If face matches
+                        # Draw bounding box
+                        top, right, bottom, left = face_location
+                        cv2.rectangle(frame, (left, top), (right, bottom), (0, 0, 255), 3)
+                        cv2.putText(frame, f"FUGITIVE: {self.fugitive_name}", (left, top - 10), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
+                        
+                        # Execute all three operations simultaneously (once per detection, regardless of logging status)
+                        if not ctx.fugitive_detected_log_done:
+                            # 1. Play Fugitive Alert Sound (always)
+                            if self.fugitive_alert_stop_event is None:
+                                self.fugitive_alert_stop_event = threading.Event()
+                            self.fugitive_alert_stop_event.clear()
+                            self.fugitive_alert_sound_thread = self._play_siren(
+                                stop_event=self.fugitive_alert_stop_event,
+                                sound_file="Fugitive.mp3", 
+                                duration_seconds=15
+                            )
+                            
+                            # 2. Capture snapshot (always)
+                            snapshot_path = self.capture_alert_snapshot(frame, f"FUGITIVE_{self.fugitive_name}", check_rate_limit=False)
+                            img_path = snapshot_path if snapshot_path else "N/A"
+                            
+                            # 3. Create event log entry (always, regardless of logging enabled/disabled)
+                            confidence = 1.0 - float(face_distance)
+                            self.log_event(f"FUGITIVE_{self.fugitive_name}", "FUGITIVE_DETECTED", "FUGITIVE ALERT",
+                                           img_path, confidence, kind="fugitive")
+                            
+                            # Log all three actions
+                            logger.warning(f"🚨 FUGITIVE DETECTED - All operations executed:")
+                            logger.warning(f"   ├─ 🔊 Alert Sound: Fugitive.mp3 (30s)")
+                            logger.warning(f"   ├─ 📸 Snapshot: {img_path}")
+                            logger.warning(f"   └─ 📋 CSV Logged: {self.fugitive_name} (Confidence: {confidence:.2f})")
+                            
+                            ctx.fugitive_detected_log_done = True
+                            self.last_fugitive_snapshot_time = time.time()
+                    else:
+                        # Reset flag when fugitive not in frame
+                        ctx.fugitive_detected_log_done = False
+        if self.fugitive_mode:
+            stopwatch.lap("fugitive_scan")
+        # ===================================================
+
+        # ==================== PRO_DETECTION MODE ====================
+        # Extract and match person features across multiple angles
+        if self.pro_detection_mode and ctx.targets_status:
+            face_locations = faces.locations()
+            
+            if face_locations:
+                for i, face_location in enumerate(face_locations):
+                    top, right, bottom, left = face_location
+                    face_box = (left, top, right, bottom)
+                    
+                    # Extract appearance features from detected person
+                    features = extract_appearance_features(frame, face_box)
+                    
+                    if features is not None:
+                        # Create a base ID for this detection
+                        # Use detection index as stable identifier within this frame
+                        detection_id = f"det_{i}_{int(self.frame_counter)}"
+                        
+                        # Check if this detection matches any known person in our database
+                        best_match_id = None
+                        best_match_confidence = 0.0
+                        
+                        # Compare against all stored persons
+                        for stored_person_id in list(self.person_features_db.keys()):
+                            stored_features = self.person_features_db[stored_person_id]['features']
+                            similarity = calculate_feature_similarity(features, stored_features)
+                            
+                            if similarity > best_match_confidence:
+                                best_match_confidence = similarity
+                                best_match_id = stored_person_id
+                        
+                        # Decide whether to match to existing person or create new one
+                        if best_match_confidence >= self.reid_confidence_threshold:
+                            # MATCH: Update existing person
+                            matched_id = best_match_id
+                            alpha = 0.3
+                            self.person_features_db[matched_id]['features'] = (
+                                alpha * features + (1 - alpha) * self.person_features_db[matched_id]['features']
+                            )
+                            self.person_features_db[matched_id]['count'] += 1
+                            self.person_features_db[matched_id]['last_seen'] = time.time()
+                            confidence = best_match_confidence
+                        else:
+                            # NEW PERSON: Create new identity
+                            self.pro_detection_person_counter += 1
+                            matched_id = f"Person_{self.pro_detection_person_counter:03d}"
+                            self.person_features_db[matched_id] = {
+                                'features': features,
+                                'count': 1,
+                                'last_seen': time.time()
+                            }
+                            confidence = 0.5  # Default confidence for new persons
+                        
+                        # Draw bounding box with person ID and confidence
+                        color = (0, 255, 0) if confidence >= 0.7 else (0, 255, 255)  # Green for high conf, cyan for new
+                        cv2.rectangle(frame, (left, top), (right, bottom), color, 2)
+                        
+                        person_label = f"{matched_id} ({confidence:.2f})"
+                        cv2.putText(frame, person_label, (left, top - 10), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                        
+                        # Log high confidence matches
+                        log_key = f"{matched_id}_{int(time.time() * 1000)}"
+                        if log_key not in self.pro_detection_log_done and confidence >= 0.65:
+                            self.log_event(matched_id, "ReID_Detected", "PRO_DETECTION", "N/A", confidence,
+                                           kind="pro_detection")
+                            self.pro_detection_log_done[log_key] = True
+                            
+                            logger.info(f"🎯 {matched_id} detected (confidence: {confidence:.2f})")
+            stopwatch.lap("pro_scan")
+        # ===================================================
+
+        # 1. Update Trackers (jump rejection for multi-guard robustness lives in the backend)
+        # Box filters predict every frame; between tracker runs the prediction stands in for the tracker.
+        # SORT tracks already carry their own Kalman filter, so a second one would only add lag
+        use_box_filter = (self.config["performance"].get("enable_box_filter", True)
+                          and self.tracker_backend.kind != "sort")
+        predicted = self._predict_boxes(ctx.targets_status) if use_box_filter else {}
+        ctx.tracker_tick += 1
+        tracker_interval = max(1, self.config["performance"].get("tracker_update_interval", 1)) if use_box_filter else 1
+        if ctx.tracker_tick % tracker_interval == 0:
+            tracker_updates = self._update_trackers(frame, ctx.targets_status, faces, predicted)
+        else:
+            tracker_updates = dict(predicted)
+            predicted = {}  # nothing measured, nothing to correct
+        for name, new_box in tracker_updates.items():
+            status = ctx.targets_status[name]
+            if new_box is not None:
+                if name in predicted:
+                    new_box = status["box_filter"].correct(new_box)
+                status["face_box"] = new_box
+                status["visible"] = True
+            else:
+                status["visible"] = False
+                status["tracker"] = None
+                status["box_filter"] = None
+        stopwatch.lap("tracker_update")
+
+        # 2. Detection (PARALLEL MATCHING) - Fixes Multiple Target Detection
+        untracked_targets = [name for name, s in ctx.targets_status.items() if not s["visible"]]
+        
+        if untracked_targets and ctx.re_detect_counter == 0:
+            face_locations, face_encodings = faces.faces()
+            if face_locations:
+                # (G, F) distances for all untracked targets vs all detected faces in one call
+                rows = [self.guard_index[name] for name in untracked_targets]
+                distances = face_distance_matrix(self.guard_encodings[rows], face_encodings)
+                
+                # Optimal (Hungarian) assignment within tolerance, best matches first
+                for target_idx, face_idx, dist in assign_faces(distances, self.config["detection"]["face_recognition_tolerance"]):
+                    name = untracked_targets[target_idx]
+                    confidence = 1.0 - dist
+                    
+                    (top, right, bottom, left) = face_locations[face_idx]
+                    
+                    # Initialize tracker for this target
+                    tracker = self.tracker_backend.create(frame, (left, top, right, bottom))
+                    ctx.targets_status[name]["tracker"] = tracker
+                    ctx.targets_status[name]["box_filter"] = KalmanBoxFilter((left, top, right, bottom)) if use_box_filter else None
+                    ctx.targets_status[name]["face_box"] = (left, top, right, bottom)
+                    ctx.targets_status[name]["visible"] = True
+                    ctx.targets_status[name]["missing_pose_counter"] = 0
+                    ctx.targets_status[name]["face_confidence"] = confidence
+                    
+                    logger.debug(f"Detected and matched: {name} (confidence: {confidence:.2f})")
+        stopwatch.lap("redetection")
+
+        # 3. Overlap Check (Fixes Merging Targets) - Enhanced with Confidence & Temporal Consistency
+        active_names = [n for n, s in ctx.targets_status.items() if s["visible"]]
+        if len(active_names) > 1:
+            # Multi-factor conflict resolution over the (N, N) face-box IoU matrix:
+            # 60% confidence, 30% consistency (a cached action), 10% IoU severity
+            confidences = np.array([ctx.targets_status[n].get("face_confidence", 0.5) for n in active_names])
+            consistent = np.array([ctx.last_action_cache.get(n, "Unknown") != "Unknown" for n in active_names])
+            losers, conflicts = overlap_conflicts(
+                [ctx.targets_status[n]["face_box"] for n in active_names],
+                confidences * 0.6 + consistent * 0.3,
+                iou_threshold=0.35, iou_weight=0.1
+            )
+            for loser, winner, iou, loser_score, winner_score in conflicts:
+                logger.debug(f"Overlap resolved: keeping {active_names[winner]} (score: {winner_score:.2f}) over "
+                             f"{active_names[loser]} (score: {loser_score:.2f}), IoU: {iou:.2f}")
+            for loser in losers:
+                ctx.targets_status[active_names[loser]]["tracker"] = None
+                ctx.targets_status[active_names[loser]]["visible"] = False
+
+        # Share this camera's sightings so missing/alert logic sees "visible on any camera"
+        if stream is not None:
+            stream.publish_visibility()
+        stopwatch.lap("overlap")
+
+        # 4. Pose Estimation for all visible guards (parallel across workers when enabled)
+        crop_boxes = {}
+        for name, status in ctx.targets_status.items():
+            if status["visible"]:
+                # --- USE DYNAMIC BODY BOX HELPER (consistent across all modes), stabilised crop size ---
+                bx1, by1, bx2, by2 = self._crop_box(status, frame_h, frame_w)
+                if bx1 < bx2 and by1 < by2:
+                    crop_boxes[name] = (bx1, by1, bx2, by2)
+        
+        # Motion gate: guards with a cached pose and a static body box reuse it
+        motion_skipped = set()
+        if ctx.motion_gate:
+            for name, box in crop_boxes.items():
+                if ctx.targets_status[name]["last_pose"] is not None and not ctx.motion_gate.should_process(name, box):
+                    motion_skipped.add(name)
+        pose_results = self._estimate_poses(
+            rgb_full_frame, frame_ref,
+            {name: box for name, box in crop_boxes.items() if name not in motion_skipped},
+            stream_id=stream.stream_id if stream is not None else None,
+            face_boxes={name: ctx.targets_status[name]["face_box"] for name in crop_boxes},
+            deadline=frame_deadline
+        )
+        stopwatch.lap("pose")
+
+        # Landmarks -> (N, 33, 4) once; visibility, boxes and actions for all guards in one pass
+        posed = [name for name, res in pose_results.items() if res is not None and res.pose_landmarks]
+        pose_stats = {}
+        if posed:
+            pose_batch = np.stack([landmarks_to_array(pose_results[name].pose_landmarks) for name in posed])
+            crop_h = np.array([crop_boxes[name][3] - crop_boxes[name][1] for name in posed])
+            crop_w = np.array([crop_boxes[name][2] - crop_boxes[name][0] for name in posed])
+            visible_counts = count_visible(pose_batch)
+            raw_actions = ACTION_LABELS[classify_pose_batch(pose_batch, crop_h, crop_w)]
+            pose_boxes = landmark_bbox(pose_batch, crop_w, crop_h)
+            for i, name in enumerate(posed):
+                pose_stats[name] = (int(visible_counts[i]), str(raw_actions[i]), pose_boxes[i])
+        for name in crop_boxes:
+            if name in motion_skipped:
+                pose_results[name], pose_stats[name] = ctx.targets_status[name]["last_pose"]
+            else:
+                ctx.targets_status[name]["last_pose"] = (pose_results[name], pose_stats[name]) if name in pose_stats else None
+        stopwatch.lap("classify")
+
+        # 5. Processing & Drawing (results merged in targets_status order)
+        required_act = self.required_action
+        current_time = time.time()
+
+        for name, status in ctx.targets_status.items():
+            if status["visible"]:
+                # Ghost Box Check: Only draw if tracker is confident AND pose is found
+                pose_found_in_box = False
+                
+                if name in crop_boxes:
+                    bx1, by1, bx2, by2 = crop_boxes[name]
+                    crop = frame[by1:by2, bx1:bx2]
+                    if crop.size != 0:
+                        results_crop = pose_results.get(name)
+                        
+                        current_action = "Unknown"
+                        if name in pose_stats:
+                            pose_found_in_box = True
+                            status["missing_pose_counter"] = 0 # Reset
+                            
+                            # ✅ IMPROVED: Calculate pose quality/confidence
+                            visible_count, raw_action, pose_box = pose_stats[name]
+                            pose_quality = min(1.0, visible_count / 20.0)  # 20 landmarks = 100% quality
+                            status["pose_confidence"] = pose_quality
+                            
+                            # Only process pose if quality is acceptable
+                            if pose_quality >= 0.6:  # At least 60% joints visible
+                                draw_styled_landmarks(crop, results_crop)
+                                
+                                if name in motion_skipped:
+                                    # No motion in the body box - keep the cached action
+                                    current_action = ctx.last_action_cache.get(name, status["last_valid_pose"] or "Unknown")
+                                else:
+                                    # ✅ IMPROVED: Filter out "Unknown" from buffer (more stable)
+                                    if raw_action != "Unknown":
+                                        status["pose_buffer"].append(raw_action)
+                                        status["last_valid_pose"] = raw_action
+                                    
+                                    min_buffer = self.config["performance"]["min_buffer_for_classification"]
+                                    if len(status["pose_buffer"]) >= min_buffer:
+                                        # ✅ IMPROVED: Use mode but require consistency
+                                        counts = Counter(status["pose_buffer"])
+                                        most_common = counts.most_common(1)[0][0]
+                                        confidence_pct = counts[most_common] / len(status["pose_buffer"])
+                                        
+                                        # Accept action only if consistent (>50% agreement)
+                                        if confidence_pct > 0.5:
+                                            current_action = most_common
+                                        else:
+                                            # Low confidence - use last valid
+                                            current_action = status["last_valid_pose"] or "Standing"
+                                    else:
+                                        current_action = status["last_valid_pose"] or "Unknown"
+                            else:
+                                # Poor pose quality - use last valid pose
+                                current_action = status["last_valid_pose"] or "Standing"
+                            
+                            # Cache action for logging
+                            ctx.last_action_cache[name] = current_action
+
+                            if current_action == required_act:
+                                if self.is_alert_mode:
+                                    status["last_action_time"] = current_time
+                                    status["alert_triggered_state"] = False
+                                    # STOP ALERT SOUND when action is performed
+                                    if status["alert_stop_event"] is not None:
+                                        status["alert_stop_event"].set()  # Signal sound to stop
+                                        logger.info(f"Alert sound stopped for {name} - action performed: {required_act}")
+                                if self.is_logging and status["last_logged_action"] != required_act:
+                                    # Rate limiting: only log once per minute per target
+                                    time_since_last_log = current_time - status["last_log_time"]
+                                    if time_since_last_log > 60:
+                                        self.log_event(name, current_action, "Action Performed", "N/A", status["face_confidence"])
+                                        status["last_log_time"] = current_time
+                                    status["last_logged_action"] = required_act
+                            elif status["last_logged_action"] == required_act:
+                                status["last_logged_action"] = None
+                            
+                            # --- Dynamic Bounding Box Logic ---
+                            d_x1 = int(pose_box[0]) + bx1
+                            d_y1 = int(pose_box[1]) + by1
+                            d_x2 = int(pose_box[2]) + bx1
+                            d_y2 = int(pose_box[3]) + by1
+                            
+                            # Add padding
+                            d_x1 = max(0, d_x1 - 15)
+                            d_y1 = max(0, d_y1 - 15)
+                            d_x2 = min(frame_w, d_x2 + 15)
+                            d_y2 = min(frame_h, d_y2 + 15)
+                            
+                            # Draw Dynamic Box
+                            cv2.rectangle(frame, (d_x1, d_y1), (d_x2, d_y2), (0, 255, 0), 2)
+                            
+                            # ✅ IMPROVED: Show identification confidence with guard name
+                            face_conf = status.get("face_confidence", 0.0)
+                            pose_conf = status.get("pose_confidence", 0.0)
+                            
+                            # Color code based on identification confidence
+                            if face_conf > 0.85:
+                                id_color = (0, 255, 0)  # Green - high confidence
+                            elif face_conf > 0.65:
+                                id_color = (0, 165, 255)  # Orange - medium confidence
+                            else:
+                                id_color = (0, 0, 255)  # Red - low confidence
+                            
+                            # Display guard name with confidence
+                            info_text = f"{name} ({face_conf:.2f})"
+                            action_text = f"{current_action} (P:{pose_conf:.1%})"
+                            
+                            cv2.putText(frame, info_text, (d_x1, d_y1 - 25), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, id_color, 2)
+                            cv2.putText(frame, action_text, (d_x1, d_y1 - 8), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (100, 200, 255), 1)
+
+                # Ghost Box Removal Logic
+                if not pose_found_in_box:
+                    status["missing_pose_counter"] += 1
+                else:
+                    # Cache for later use
+                    if name not in ctx.last_action_cache:
+                        ctx.last_action_cache[name] = "Unknown"
+                    # If tracker says visible, but no pose for 30 frames (approx 1 sec) -> Kill Tracker
+                    if status["missing_pose_counter"] > 30:
+                        status["tracker"] = None
+                        status["visible"] = False
+            stopwatch.lap("overlay", guard=name)
+            
+            # --- Log Missing Guard Event (Independent of Alert Mode) ---
+            # Guard-level flags are shared by every camera stream; exactly one stream may act on a transition
+            with status["alert_lock"]:
+                guard_visible = visible_anywhere(status)
+                if guard_visible == False and not status.get("missing_logged", False):
+                    # Guard just became missing (transitioned from visible to not visible)
+                    if self.is_logging:
+                        self.log_guard_missing(name, "N/A")
+                        status["missing_logged"] = True
+                        logger.warning(f"🚨 {name} MISSING from frame - logged to CSV")
+                elif guard_visible == True and status.get("missing_logged", False):
+                    # Guard reappeared after being missing
+                    status["missing_logged"] = False
+                    logger.info(f"✓ {name} reappeared in frame")
+
+                # Alert Logic
+                if self.is_alert_mode:
+                    time_diff = current_time - status["last_action_time"]
+                    time_left = max(0, self.alert_interval - time_diff)
+                    y_offset = 50 + (list(ctx.targets_status.keys()).index(name) * 30)
+                    color = (0, 255, 0) if time_left > 3 else (0, 0, 255)
+                
+                    # Only show status on screen if target is genuinely lost or safe
+                    status_txt = "OK" if guard_visible else "MISSING"
+                    cv2.putText(frame, f"{name} ({status_txt}): {time_left:.1f}s", (frame_w - 300, y_offset), cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+
+                    # Multi-camera: a camera that does not see the guard leaves the alert to one that does
+                    if time_diff > self.alert_interval and (status["visible"] or not guard_visible):
+                        if (current_time - status["alert_cooldown"]) > 2.5:
+                            # ✅ ONLY play alert sound if Alert Mode is actually enabled
+                            if status["alert_stop_event"] is None:
+                                status["alert_stop_event"] = threading.Event()
+                            status["alert_stop_event"].clear()  # Reset stop flag
+                            # Play siren ONLY when alert mode is ON
+                            status["alert_sound_thread"] = self._play_siren(
+                                stop_event=status["alert_stop_event"], 
+                                duration_seconds=30
+                            )
+                            status["alert_cooldown"] = current_time
+                        
+                            img_path = "N/A"
+                            if status["visible"]:
+                                # Snapshot logic with rate limiting (use calculate_body_box helper)
+                                fx1, fy1, fx2, fy2 = status["face_box"]
+                                bx1, by1, bx2, by2 = calculate_body_box((fx1, fy1, fx2, fy2), frame_h, frame_w, expansion_factor=3.0)
+                                if bx1 < bx2:
+                                    snapshot_result = self.capture_alert_snapshot(frame[by1:by2, bx1:bx2], name, check_rate_limit=True)
+                                    img_path = snapshot_result if snapshot_result else "N/A"
+                            else:
+                                snapshot_result = self.capture_alert_snapshot(frame, name, check_rate_limit=True)
+                                img_path = snapshot_result if snapshot_result else "N/A"
+
+                            if self.is_logging:
+                                # Determine log status based on visibility and action
+                                if not status["visible"]:
+                                    log_s = "ALERT TRIGGERED - TARGET MISSING"
+                                    log_a = "MISSING"
+                                else:
+                                    log_s = "ALERT CONTINUED" if status["alert_triggered_state"] else "ALERT TRIGGERED"
+                                    log_a = ctx.last_action_cache.get(name, "Unknown")
+                            
+                                confidence = status.get("face_confidence", 0.0)
+                                self.log_event(name, log_a, log_s, img_path, confidence)
+                                status["alert_triggered_state"] = True
+                
+                    # LOG: Action NOT performed within alert interval
+                    elif time_diff > (self.alert_interval - 1) and time_diff <= self.alert_interval and (status["visible"] or not guard_visible):
+                        # Log when approaching or at the end of alert interval without action
+                        if self.is_logging and not status.get("alert_logged_timeout", False):
+                            if status["visible"]:
+                                log_s = "ACTION NOT PERFORMED (TIMEOUT)"
+                                log_a = ctx.last_action_cache.get(name, "Unknown")
+                                confidence = status.get("face_confidence", 0.0)
+                            else:
+                                log_s = "MISSING - NO ACTION"
+                                log_a = "MISSING"
+                                confidence = 0.0
+                        
+                            self.log_event(name, log_a, log_s, "N/A", confidence)
+                            status["alert_logged_timeout"] = True
+                
+                    # RESET: When action is performed or target reset
+                    if time_diff <= 0:
+                        status["alert_logged_timeout"] = False
+            stopwatch.lap("alerts", guard=name)
+
+        stopwatch.total("frame")
+        self.detection_stats.record(faces)
+        if faces.detector_calls > 1:
+            logger.debug(f"Face detector ran {faces.detector_calls}x in one frame")
+        return frame
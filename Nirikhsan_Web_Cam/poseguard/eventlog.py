@@ -0,0 +1,264 @@
+"""
+Structured event log.
+
+Guard, fugitive and PRO_Detection events used to be buffered in Python lists
+and appended to CSV files every `auto_flush_interval` rows or when a mode
+stopped, so a crash lost everything buffered and PRO tracking data lived in
+memory for the whole session. EventLog hands each event to a background
+writer thread that batches rows into an append-only SQLite database in WAL
+mode, committing when `flush_rows` events are pending or `flush_interval`
+seconds have passed, whichever comes first.
+
+fsync policy (PRAGMA synchronous):
+    full   - every batch commit is fsynced; nothing committed is lost
+    normal - WAL is fsynced at checkpoints; a power cut may lose the last
+             batches but never corrupts the database (default)
+    off    - no fsync; fastest, for replays and benchmarks
+
+Readers (the GUI, verify_improvements.py) use query()/counts() on their own
+connection, which WAL lets run concurrently with the writer.
+"""
+import os
+import csv
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger("PoseGuard")
+
+FSYNC_POLICIES = {"full": "FULL", "normal": "NORMAL", "off": "OFF"}
+
+# Columns exported to CSV, in the layout of the old events.csv
+CSV_HEADER = ["Timestamp", "Guard Name", "Action", "Status", "Image Path", "Confidence"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    guard TEXT NOT NULL,
+    action TEXT,
+    status TEXT,
+    image_path TEXT,
+    confidence REAL,
+    kind TEXT NOT NULL DEFAULT 'guard'
+);
+CREATE INDEX IF NOT EXISTS idx_events_guard_ts_status ON events (guard, ts, status);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS idx_events_status_ts ON events (status, ts);
+CREATE INDEX IF NOT EXISTS idx_events_kind_ts ON events (kind, ts);
+"""
+
+_STOP = object()
+
+
+def format_timestamp(ts):
+    """Epoch seconds -> 'YYYY-MM-DD HH:MM:SS' (local time, as the old CSV)."""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _epoch(value):
+    """Accept epoch seconds, a datetime or an ISO-like string for query bounds."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(str(value)).timestamp()
+
+
+class EventLog:
+    """
+    Append-only SQLite event store with a batching writer thread.
+
+    Args:
+        path: database file (created with its directory if missing)
+        flush_interval: seconds before pending events are committed
+        flush_rows: pending events that trigger an immediate commit
+        fsync: one of FSYNC_POLICIES
+    """
+
+    def __init__(self, path, flush_interval=1.0, flush_rows=50, fsync="normal"):
+        self.path = path
+        self.flush_interval = max(0.05, float(flush_interval))
+        self.flush_rows = max(1, int(flush_rows))
+        fsync = str(fsync).lower()
+        if fsync not in FSYNC_POLICIES:
+            logger.warning(f"Unknown event log fsync policy '{fsync}', using normal")
+            fsync = "normal"
+        self.fsync = fsync
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue = queue.Queue()
+        self.written = 0
+        self.failed = 0
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True, name="EventLogWriter")
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={FSYNC_POLICIES[self.fsync]}")
+        return conn
+
+    # --- writing ---
+
+    def log(self, guard, action, status, image_path="N/A", confidence=0.0, kind="guard", ts=None):
+        """
+        Record one event; returns immediately, the writer thread persists it.
+
+        Args:
+            guard: guard name (or fugitive / ReID person id)
+            action, status: what happened, as in the old CSV columns
+            image_path: snapshot path or "N/A"
+            confidence: match confidence (float or numeric string)
+            kind: event source ("guard", "fugitive", "pro_detection")
+            ts: epoch seconds (default: now)
+        """
+        row = (time.time() if ts is None else float(ts), str(guard), action, status,
+               image_path or "N/A", float(confidence or 0.0), kind)
+        self._queue.put(row)
+
+    def flush(self, timeout=5.0):
+        """Commit everything logged so far; blocks until done (or timeout)."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _writer_loop(self):
+        conn = self._connect()
+        pending, waiters = [], []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if isinstance(item, tuple):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+
+            due = item is None or stop or waiters or len(pending) >= self.flush_rows
+            if due and pending:
+                self._commit(conn, pending)
+                pending = []
+            if due:
+                deadline = None
+                for waiter in waiters:
+                    waiter.set()
+                waiters = []
+            if stop:
+                break
+        conn.close()
+
+    def _commit(self, conn, rows):
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO events (ts, guard, action, status, image_path, confidence, kind) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            self.failed += len(rows)
+            logger.error(f"Event log write failed ({len(rows)} events): {e}")
+
+    def close(self, timeout=5.0):
+        """Commit pending events and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    # --- reading ---
+
+    def query(self, guard=None, status=None, kind=None, since=None, until=None, limit=1000, newest_first=True):
+        """
+        Events matching every given filter.
+
+        Args:
+            guard, status, kind: exact matches (None = any)
+            since, until: bounds as epoch seconds, datetime or ISO string
+            limit: maximum rows (None = all)
+            newest_first: order by time descending
+
+        Returns:
+            list of dicts with id, ts, timestamp, guard, action, status,
+            image_path, confidence, kind
+        """
+        where, params = [], []
+        for column, value in (("guard", guard), ("status", status), ("kind", kind)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            where.append("ts < ?")
+            params.append(_epoch(until))
+        sql = "SELECT id, ts, guard, action, status, image_path, confidence, kind FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, id DESC" if newest_first else " ORDER BY ts, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            rows = [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+        for row in rows:
+            row["timestamp"] = format_timestamp(row["ts"])
+        return rows
+
+    def counts(self, by="status", since=None, kind=None):
+        """{value: event count} grouped by 'status', 'guard', 'action' or 'kind'."""
+        if by not in ("status", "guard", "action", "kind"):
+            raise ValueError(f"Cannot group events by {by!r}")
+        where, params = [], []
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(_epoch(since))
+        if kind is not None:
+            where.append("kind = ?")
+            params.append(kind)
+        sql = f"SELECT {by}, COUNT(*) FROM events"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY {by} ORDER BY COUNT(*) DESC"
+        conn = self._connect()
+        try:
+            return dict(conn.execute(sql, params).fetchall())
+        finally:
+            conn.close()
+
+    def export_csv(self, csv_path, **filters):
+        """
+        Write matching events (oldest first) to a CSV in the old events.csv layout.
+
+        Returns:
+            number of rows written
+        """
+        filters.setdefault("limit", None)
+        rows = self.query(newest_first=False, **filters)
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for row in rows:
+                writer.writerow([row["timestamp"], row["guard"], row["action"], row["status"],
+                                 row["image_path"], f"{row['confidence']:.2f}"])
+        return len(rows)
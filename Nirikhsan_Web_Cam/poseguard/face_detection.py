@@ -0,0 +1,99 @@
+"""
+Multi-resolution face detection.
+
+HOG/CNN face detection cost grows with pixel count, so on large frames the
+detector runs on a downscaled copy and the boxes are mapped back to full
+resolution (for tracker init and body crops). Encodings are computed on the
+full-resolution frame at the remapped boxes. When the small frame yields no
+face, an optional retry with the detector's own upsampling catches small or
+distant faces.
+"""
+import cv2
+
+
+def resolve_detection_scale(frame_w, scale=1.0, target_width=0):
+    """
+    Downscale factor for detection.
+
+    Args:
+        frame_w: full frame width in pixels
+        scale: fixed scale factor (detection.detection_scale)
+        target_width: if > 0, scale so the detection frame is this wide (never upscales)
+
+    Returns:
+        float in (0, 1]
+    """
+    if target_width and frame_w > 0:
+        scale = target_width / float(frame_w)
+    return min(1.0, max(0.05, float(scale or 1.0)))
+
+
+def scale_locations(locations, scale, frame_shape):
+    """
+    Map (top, right, bottom, left) boxes from a downscaled frame to full resolution.
+
+    Args:
+        locations: boxes detected on the scaled frame
+        scale: factor the frame was resized by
+        frame_shape: full-resolution frame shape (h, w, ...)
+    """
+    if scale == 1.0:
+        return list(locations)
+    h, w = frame_shape[:2]
+    inv = 1.0 / scale
+    mapped = []
+    for top, right, bottom, left in locations:
+        mapped.append((
+            max(0, int(round(top * inv))),
+            min(w, int(round(right * inv))),
+            min(h, int(round(bottom * inv))),
+            max(0, int(round(left * inv))),
+        ))
+    return mapped
+
+
+def detect_faces(rgb_frame, scale=1.0, upsample_on_miss=False, model="hog", encode=True):
+    """
+    Face locations (full-resolution coordinates) and optionally encodings.
+
+    Args:
+        rgb_frame: full-resolution RGB frame
+        scale: detection downscale factor (1.0 = detect on the full frame)
+        upsample_on_miss: if nothing is found on a downscaled frame, retry once with
+                          number_of_times_to_upsample=2 (recovers faces lost to downscaling;
+                          never applied at scale 1.0)
+        model: face_recognition detector ("hog" or "cnn")
+        encode: also compute 128-d encodings
+
+    Returns:
+        (locations, encodings) - encodings is [] when encode=False
+    """
+    import face_recognition  # dlib start-up is slow; only pay for it where detection runs
+
+    small = rgb_frame
+    if scale < 1.0:
+        small = cv2.resize(rgb_frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    locations = face_recognition.face_locations(small, model=model)
+    if not locations and upsample_on_miss and scale < 1.0:
+        locations = face_recognition.face_locations(small, number_of_times_to_upsample=2, model=model)
+
+    locations = scale_locations(locations, scale, rgb_frame.shape)
+    encodings = []
+    if encode and locations:
+        encodings = face_recognition.face_encodings(rgb_frame, locations)
+    return locations, encodings
+
+
+def encode_faces(rgb_frame, locations):
+    """128-d encodings for face locations found earlier in the same frame."""
+    import face_recognition
+    return face_recognition.face_encodings(rgb_frame, locations)
+
+
+def compute_face_encoding(image_path):
+    """First face encoding found in an image file, or None."""
+    import face_recognition
+    image = face_recognition.load_image_file(image_path)
+    encodings = face_recognition.face_encodings(image)
+    return encodings[0] if encodings else None
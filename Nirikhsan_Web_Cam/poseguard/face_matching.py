@@ -0,0 +1,98 @@
+"""
+Batched face matching.
+
+Enrolled guard encodings are kept as one contiguous (G, 128) matrix. Each
+re-detection computes the full (G, F) Euclidean distance matrix against the
+F detected faces in a single call, and faces are assigned to guards with
+the Hungarian algorithm (optimal total distance) instead of greedy sorting.
+"""
+import logging
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+logger = logging.getLogger("PoseGuard")
+
+ENCODING_SIZE = 128
+
+
+def encoding_matrix(encodings):
+    """
+    Stack face encodings into a contiguous (G, 128) float64 matrix.
+
+    Args:
+        encodings: iterable of 128-d encodings (may be empty)
+    """
+    encodings = list(encodings)
+    if not encodings:
+        return np.empty((0, ENCODING_SIZE), dtype=np.float64)
+    return np.ascontiguousarray(np.vstack(encodings), dtype=np.float64)
+
+
+def face_distance_matrix(known, unknown):
+    """
+    Euclidean distances between every known and every unknown encoding.
+
+    Same metric as face_recognition.face_distance, computed for all pairs at
+    once via |a|^2 + |b|^2 - 2ab.
+
+    Args:
+        known: (G, 128) guard encodings
+        unknown: (F, 128) or list of detected face encodings
+
+    Returns:
+        (G, F) float64 distance matrix
+    """
+    known = np.asarray(known, dtype=np.float64)
+    unknown = encoding_matrix(unknown) if not isinstance(unknown, np.ndarray) else unknown.astype(np.float64, copy=False)
+    if known.size == 0 or unknown.size == 0:
+        return np.empty((len(known), len(unknown)), dtype=np.float64)
+    sq = (np.einsum("ij,ij->i", known, known)[:, None]
+          + np.einsum("ij,ij->i", unknown, unknown)[None, :]
+          - 2.0 * known @ unknown.T)
+    return np.sqrt(np.maximum(sq, 0.0))
+
+
+def assign_faces(distances, tolerance):
+    """
+    Optimal one-to-one assignment of faces (columns) to guards (rows).
+
+    Pairs at or above `tolerance` are never assigned. Falls back to greedy
+    nearest-first assignment when SciPy is not installed.
+
+    Args:
+        distances: (G, F) distance matrix
+        tolerance: maximum accepted distance
+
+    Returns:
+        list of (guard_idx, face_idx, distance), best matches first
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    if distances.size == 0:
+        return []
+
+    if linear_sum_assignment is not None:
+        # Out-of-tolerance pairs get a cost no valid assignment can beat
+        cost = np.where(distances < tolerance, distances, tolerance + distances.max() + 1.0)
+        rows, cols = linear_sum_assignment(cost)
+        pairs = [(int(r), int(c), float(distances[r, c])) for r, c in zip(rows, cols)
+                 if distances[r, c] < tolerance]
+    else:
+        pairs = []
+        used_rows, used_cols = set(), set()
+        for flat in np.argsort(distances, axis=None):
+            r, c = np.unravel_index(flat, distances.shape)
+            if distances[r, c] >= tolerance:
+                break
+            if r in used_rows or c in used_cols:
+                continue
+            used_rows.add(r)
+            used_cols.add(c)
+            pairs.append((int(r), int(c), float(distances[r, c])))
+
+    pairs.sort(key=lambda p: p[2])
+    return pairs
@@ -0,0 +1,259 @@
+"""
+Recycled frame buffers.
+
+Every captured frame used to be a fresh allocation (cap.read()), plus a
+full copy for the snap button, an RGB conversion per processed frame and
+another for display: at 1080p/30fps hundreds of MB/s of allocator churn.
+A FramePool keeps same-shaped buffers for reuse:
+
+    - the capture thread decodes straight into a pooled buffer
+      (cap.read(buffer)); the ring buffer and every consumer hold a
+      reference, and the buffer returns to the pool when the last one is
+      released
+    - per-key scratch buffers take cv2.cvtColor(..., dst=...) output for
+      conversions that live no longer than one frame
+    - FrameSlots publish the latest frame to other threads as read-only
+      views that stay valid while borrowed
+
+bytes_allocated counts every buffer the pool had to allocate (or adopt
+from OpenCV); at steady state it stops growing. AllocationMeter turns it
+into bytes per frame for the status bar.
+"""
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+
+class PooledFrame:
+    """
+    A pooled buffer with a reference count (starts at 1).
+
+    The holder of a reference may read `array`; only the thread that
+    filled it writes to it. release() hands the buffer back to the pool
+    once nobody holds it.
+    """
+
+    __slots__ = ("array", "_pool", "_refs")
+
+    def __init__(self, pool, array):
+        self.array = array
+        self._pool = pool
+        self._refs = 1
+
+    def retain(self):
+        with self._pool._lock:
+            self._refs += 1
+        return self
+
+    def release(self):
+        with self._pool._lock:
+            self._refs -= 1
+            recycle = self._refs == 0
+        if recycle:
+            self._pool._recycle(self.array)
+
+    def readonly(self):
+        """Read-only view of the buffer (no copy)."""
+        view = self.array.view()
+        view.flags.writeable = False
+        return view
+
+
+class FramePool:
+    """
+    Same-shape buffer recycler with allocation accounting.
+
+    Args:
+        max_free: idle buffers kept per shape; extra released buffers are freed
+    """
+
+    def __init__(self, max_free=8):
+        self.max_free = max(1, int(max_free))
+        self._free = {}  # (shape, dtype) -> [arrays]
+        self._scratch = {}  # key -> (source shape, buffer)
+        self._lock = threading.Lock()
+        self.allocations = 0
+        self.bytes_allocated = 0
+        self.reuses = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Writable buffer of `shape` (reused when one is free)."""
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reuses += 1
+                return PooledFrame(self, free.pop())
+        array = np.empty(shape, dtype=dtype)
+        self._count(array)
+        return PooledFrame(self, array)
+
+    def adopt(self, array):
+        """Take over an array allocated elsewhere (e.g. by cap.read()) so it gets recycled."""
+        self._count(array)
+        return PooledFrame(self, array)
+
+    def copy_of(self, image):
+        """Pooled copy of `image`."""
+        pooled = self.acquire(image.shape, image.dtype)
+        np.copyto(pooled.array, image)
+        return pooled
+
+    def convert(self, key, image, code):
+        """
+        cv2.cvtColor(image, code) into the scratch buffer for `key`.
+
+        The result is overwritten by the next convert() with the same key,
+        so use one key per thread and purpose, and don't keep it past the
+        current frame.
+        """
+        with self._lock:
+            entry = self._scratch.get(key)
+        if entry is not None and entry[0] == image.shape:
+            entry[1].flags.writeable = True  # callers may have marked the last result read-only
+            return cv2.cvtColor(image, code, dst=entry[1])
+        converted = cv2.cvtColor(image, code)
+        self._count(converted)
+        with self._lock:
+            self._scratch[key] = (image.shape, converted)
+        return converted
+
+    def forget(self, key):
+        with self._lock:
+            self._scratch.pop(key, None)
+
+    def _count(self, array):
+        with self._lock:
+            self.allocations += 1
+            self.bytes_allocated += array.nbytes
+
+    def _recycle(self, array):
+        key = (array.shape, array.dtype.str)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_free:
+                free.append(array)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "allocations": self.allocations,
+                "bytes_allocated": self.bytes_allocated,
+                "reuses": self.reuses,
+                "free": sum(len(v) for v in self._free.values()),
+            }
+
+
+class FrameSlot:
+    """
+    The latest frame of one kind (display, last processed, raw), shared
+    between threads. Holds a reference to a PooledFrame (or a plain array
+    when pooling is off) until replaced. `version` increases on every put.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._frame = None
+        self.version = 0
+
+    def put(self, frame):
+        """Publish a PooledFrame, ndarray or None; a PooledFrame is retained (the caller keeps its own reference)."""
+        if isinstance(frame, PooledFrame):
+            frame.retain()
+        with self._lock:
+            old, self._frame = self._frame, frame
+            self.version += 1
+        if isinstance(old, PooledFrame):
+            old.release()
+
+    def share(self, other):
+        """Publish whatever `other` holds; False if it is empty."""
+        with other._lock:
+            frame = other._frame
+            if isinstance(frame, PooledFrame):
+                frame.retain()
+        if frame is None:
+            return False
+        self.put(frame)
+        if isinstance(frame, PooledFrame):
+            frame.release()
+        return True
+
+    def clear(self):
+        self.put(None)
+
+    @contextmanager
+    def borrow(self):
+        """Read-only view of the current frame (None if empty), valid inside the with block."""
+        with self._lock:
+            frame = self._frame
+            if isinstance(frame, PooledFrame):
+                frame.retain()
+        try:
+            if frame is None:
+                yield None
+            elif isinstance(frame, PooledFrame):
+                yield frame.readonly()
+            else:
+                view = frame.view()
+                view.flags.writeable = False
+                yield view
+        finally:
+            if isinstance(frame, PooledFrame):
+                frame.release()
+
+    def snapshot(self):
+        """Independent copy of the current frame (None if empty), for use outside the hot path."""
+        with self.borrow() as image:
+            return None if image is None else image.copy()
+
+
+class AllocationMeter:
+    """
+    Bytes allocated per processed frame, averaged over `window` frames.
+
+    Counts the pool's own allocations. With trace=True it also follows all
+    Python/numpy allocations through tracemalloc and reports the average
+    per-frame peak above the starting level (slower; for diagnosis).
+    """
+
+    def __init__(self, pool, window=30, trace=False):
+        self.pool = pool
+        self.window = max(1, int(window))
+        self.trace = trace
+        self.pool_bytes_per_frame = 0.0
+        self.traced_bytes_per_frame = 0.0
+        self._frames = 0
+        self._start_bytes = pool.bytes_allocated
+        self._traced_total = 0
+        self._lock = threading.Lock()
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def tick(self):
+        with self._lock:
+            if self.trace:
+                current, peak = tracemalloc.get_traced_memory()
+                self._traced_total += max(0, peak - current)
+                tracemalloc.reset_peak()
+            self._frames += 1
+            if self._frames >= self.window:
+                self.pool_bytes_per_frame = (self.pool.bytes_allocated - self._start_bytes) / self._frames
+                self.traced_bytes_per_frame = self._traced_total / self._frames
+                self._frames = 0
+                self._start_bytes = self.pool.bytes_allocated
+                self._traced_total = 0
+
+    def summary(self):
+        """Status-bar text, e.g. 'Alloc: 0.0 MB/frame'."""
+        text = f"Alloc: {self.pool_bytes_per_frame / 1e6:.1f} MB/frame"
+        if self.trace:
+            text += f" (traced {self.traced_bytes_per_frame / 1e6:.1f})"
+        return text
+
+    def close(self):
+        if self.trace and tracemalloc.is_tracing():
+            tracemalloc.stop()
@@ -0,0 +1,394 @@
+"""
+Process-pool inference back-end.
+
+Face detection/encoding and per-guard pose estimation run in worker processes,
+each owning its own MediaPipe models (one per guard, see
+pose_models.PoseModelPool). The RGB frame is written once per frame into
+shared memory and workers read it zero-copy.
+
+Guards are pinned to a worker (round-robin on first sight) so a guard's crop
+sequence always reaches the same Holistic instance and keeps its temporal
+tracking. Every submit returns a concurrent.futures.Future; the caller waits
+for all futures of a frame before merging, so results land in frame order.
+
+Tasks are fenced so a slow frame cannot poison later ones: each slot starts
+with the id of the frame it holds, and workers drop a task whose slot has
+since been overwritten, or whose deadline (wall clock, set by the caller)
+has already passed. A dead worker is respawned on the next submit to it.
+"""
+import os
+import time
+import itertools
+import threading
+import logging
+import multiprocessing as mp_proc
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from poseguard.face_detection import detect_faces
+from poseguard.pose_models import PoseModelPool, make_pose_model
+from poseguard.roi import CropResizer
+
+logger = logging.getLogger("PoseGuard")
+
+# Attached segments kept per worker (two slots per camera stream)
+_MAX_ATTACHED_SEGMENTS = 64
+
+# Each slot starts with the int64 id of the frame it holds (-1 while being written)
+_SLOT_HEADER_BYTES = 64
+
+# Seconds between respawns of the same worker (a worker that keeps crashing is not restarted in a tight loop)
+_RESPAWN_COOLDOWN = 5.0
+
+# Reference to a frame published in shared memory
+FrameRef = namedtuple("FrameRef", ["frame_id", "shm_name", "shape", "dtype"])
+
+# Drop-in replacement for MediaPipe's holistic results (same attribute names)
+PoseResults = namedtuple("PoseResults", ["pose_landmarks", "face_landmarks",
+                                         "left_hand_landmarks", "right_hand_landmarks"])
+
+_LANDMARK_FIELDS = PoseResults._fields
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+def _attach_shared_memory(name):
+    """Attach to a segment owned by the parent (the parent alone unlinks it)."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Spawned workers share the parent's resource tracker, so the duplicate
+        # registration made here is harmless
+        return shared_memory.SharedMemory(name=name)
+
+
+def _serialize_results(results):
+    """MediaPipe results are not picklable; ship the landmark protobufs as bytes."""
+    out = {}
+    for field in _LANDMARK_FIELDS:
+        lms = getattr(results, field, None)
+        out[field] = lms.SerializeToString() if lms is not None else None
+    return out
+
+
+def _worker_main(worker_id, task_queue, result_queue, model_spec, face_model, pool_options):
+    models = PoseModelPool(lambda: make_pose_model(**model_spec), **pool_options)
+    resizer = CropResizer()
+    attached = OrderedDict()  # shm name -> SharedMemory, least recently used first
+    tasks_done = 0
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        task_id, kind, frame_ref, payload = task
+        tasks_done += 1
+        if tasks_done % 100 == 0:
+            models.evict_idle()
+        try:
+            if kind == "evict":
+                models.discard(payload["key"])
+                resizer.forget(payload["key"])
+                result_queue.put((task_id, True, None))
+                continue
+
+            shm = attached.pop(frame_ref.shm_name, None)
+            if shm is None:
+                # Parent re-allocates slots when the frame size grows; drop the stalest ones
+                while len(attached) >= _MAX_ATTACHED_SEGMENTS:
+                    attached.popitem(last=False)[1].close()
+                shm = _attach_shared_memory(frame_ref.shm_name)
+            attached[frame_ref.shm_name] = shm
+            slot_frame_id = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+            deadline = payload.get("deadline")
+            if slot_frame_id[0] != frame_ref.frame_id or (deadline is not None and time.time() > deadline):
+                # The caller gave up on this frame or its slot now holds a newer one
+                result_queue.put((task_id, False, f"worker {worker_id}: stale task for frame {frame_ref.frame_id}"))
+                continue
+            frame = np.ndarray(frame_ref.shape, dtype=frame_ref.dtype, buffer=shm.buf, offset=_SLOT_HEADER_BYTES)
+
+            if kind == "faces":
+                result = detect_faces(frame, scale=payload.get("scale", 1.0),
+                                      upsample_on_miss=payload.get("upsample_on_miss", False),
+                                      model=face_model, encode=payload.get("encode", True))
+            elif kind == "encode":
+                import face_recognition
+                result = face_recognition.face_encodings(frame, payload["locations"])
+            elif kind == "pose":
+                resizer.max_side = payload.get("max_side", 0)
+                crop, _ = resizer.prepare(payload["key"], frame, payload["box"])
+                result = _serialize_results(models.get(payload["key"]).process(crop))
+            else:
+                raise ValueError(f"Unknown task kind: {kind}")
+            del frame
+            if slot_frame_id[0] != frame_ref.frame_id:
+                # Overwritten while we read it: the result may mix two frames
+                result_queue.put((task_id, False, f"worker {worker_id}: frame {frame_ref.frame_id} overwritten"))
+                continue
+            result_queue.put((task_id, True, result))
+        except Exception as e:
+            result_queue.put((task_id, False, f"worker {worker_id}: {e!r}"))
+
+    models.close_all()
+    for shm in attached.values():
+        shm.close()
+
+
+# ---------------------------------------------------------------------------
+# Parent side
+# ---------------------------------------------------------------------------
+def deserialize_results(data):
+    """Rebuild a PoseResults from worker output (usable by draw_styled_landmarks)."""
+    from mediapipe.framework.formats import landmark_pb2
+
+    fields = {}
+    for field in _LANDMARK_FIELDS:
+        raw = data.get(field)
+        fields[field] = landmark_pb2.NormalizedLandmarkList.FromString(raw) if raw else None
+    return PoseResults(**fields)
+
+
+class InferenceEngine:
+    """
+    Pool of inference worker processes.
+
+    Args:
+        num_workers: worker count (0/None = cpu_count - 2, at least 1)
+        holistic_options: kwargs shared by the Holistic/Pose models in each worker
+        face_model: face_recognition detector model ("hog" or "cnn")
+        max_models_per_worker: per-guard pose models kept alive per worker
+        model_idle_seconds: idle time after which a missing guard's model is closed
+        pose_model: "holistic", "pose_only" or "pose_lite" (see pose_models)
+        model_complexity: MediaPipe model_complexity for pose_only
+    """
+
+    def __init__(self, num_workers=None, holistic_options=None, face_model="hog",
+                 max_models_per_worker=8, model_idle_seconds=30.0,
+                 pose_model="holistic", model_complexity=1):
+        if not num_workers:
+            num_workers = max(1, (os.cpu_count() or 2) - 2)
+        self.num_workers = int(num_workers)
+        self.model_spec = {"mode": pose_model, "options": dict(holistic_options or {}),
+                           "model_complexity": model_complexity}
+        self.face_model = face_model
+        self.pool_options = {"max_size": max_models_per_worker, "idle_seconds": model_idle_seconds}
+
+        self._ctx = mp_proc.get_context("spawn")
+        self._workers = []
+        self._task_queues = []
+        self._spawned_at = []  # per worker, time.monotonic() of its last (re)spawn
+        self._result_queue = None
+        self._collector = None
+        self._futures = {}
+        self._pending = []  # in-flight task count per worker
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._frame_ids = itertools.count()
+        self._affinity = {}
+        self._next_worker = 0
+        self._slots = {}  # channel (camera stream) -> double-buffered shared-memory frame slots
+        self._channel_frames = {}  # channel -> frames published on it
+        self.running = False
+
+    # --- lifecycle ---
+    def start(self):
+        if self.running:
+            return self
+        self._result_queue = self._ctx.Queue()
+        for worker_id in range(self.num_workers):
+            proc, task_queue = self._spawn_worker(worker_id)
+            self._workers.append(proc)
+            self._task_queues.append(task_queue)
+            self._spawned_at.append(time.monotonic())
+            self._pending.append(0)
+        self.running = True
+        self._collector = threading.Thread(target=self._collect_results, name="InferenceCollector", daemon=True)
+        self._collector.start()
+        logger.warning(f"Inference engine started with {self.num_workers} worker processes")
+        return self
+
+    def _spawn_worker(self, worker_id):
+        task_queue = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._result_queue, self.model_spec,
+                  self.face_model, self.pool_options),
+            name=f"PoseGuardInference-{worker_id}",
+            daemon=True
+        )
+        proc.start()
+        return proc, task_queue
+
+    def _ensure_worker(self, worker):
+        """
+        Respawn `worker` if its process died (call with self._lock held).
+
+        Its in-flight futures fail at once instead of timing out frame after
+        frame; guards pinned to it keep their pinning and get fresh models.
+
+        Returns:
+            True if the worker is alive (possibly just respawned)
+        """
+        proc = self._workers[worker]
+        if proc.is_alive():
+            return True
+        if time.monotonic() - self._spawned_at[worker] < _RESPAWN_COOLDOWN:
+            return False
+        logger.error(f"Inference worker {worker} died (exit code {proc.exitcode}); respawning")
+        for task_id, (future, owner, _kind) in list(self._futures.items()):
+            if owner == worker:
+                del self._futures[task_id]
+                future.set_exception(RuntimeError(f"inference worker {worker} died"))
+        self._pending[worker] = 0
+        self._workers[worker], self._task_queues[worker] = self._spawn_worker(worker)
+        self._spawned_at[worker] = time.monotonic()
+        return True
+
+    def close(self):
+        if not self.running:
+            return
+        self.running = False
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for proc in self._workers:
+            proc.join(timeout=3.0)
+            if proc.is_alive():
+                proc.terminate()
+        self._result_queue.put(None)  # wake the collector
+        if self._collector is not None:
+            self._collector.join(timeout=2.0)
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+        for slots in self._slots.values():
+            for slot in slots:
+                if slot is not None:
+                    slot.close()
+                    slot.unlink()
+        self._slots = {}
+        self._channel_frames = {}
+        self._workers, self._task_queues, self._pending, self._spawned_at = [], [], [], []
+        self._affinity.clear()
+
+    # --- frame publishing ---
+    def publish_frame(self, rgb_frame, channel=0):
+        """
+        Copy an RGB frame into shared memory for the workers.
+
+        Each channel (camera stream) has its own pair of slots, used in turn.
+        Tasks still queued for the frame a slot held before are dropped by the
+        workers (see the module docstring) rather than reading this one.
+        """
+        frame_id = next(self._frame_ids)
+        with self._lock:
+            slots = self._slots.setdefault(channel, [None, None])
+            count = self._channel_frames.get(channel, 0)
+            self._channel_frames[channel] = count + 1
+        idx = count % len(slots)
+        slot = slots[idx]
+        size = _SLOT_HEADER_BYTES + rgb_frame.nbytes
+        if slot is None or slot.size < size:
+            if slot is not None:
+                slot.close()
+                slot.unlink()
+            slot = shared_memory.SharedMemory(create=True, size=size)
+            slots[idx] = slot
+        slot_frame_id = np.ndarray((1,), dtype=np.int64, buffer=slot.buf)
+        slot_frame_id[0] = -1  # fence off the previous frame before overwriting it
+        view = np.ndarray(rgb_frame.shape, dtype=rgb_frame.dtype, buffer=slot.buf, offset=_SLOT_HEADER_BYTES)
+        np.copyto(view, rgb_frame)
+        slot_frame_id[0] = frame_id
+        del view, slot_frame_id  # no exported buffers may outlive the slot (close() would fail)
+        return FrameRef(frame_id, slot.name, rgb_frame.shape, rgb_frame.dtype.str)
+
+    # --- task submission ---
+    def submit_faces(self, frame_ref, encode=True, scale=1.0, upsample_on_miss=False, deadline=None):
+        """
+        Face locations (+ encodings) -> Future[(locations, encodings)]
+
+        Detection runs at `scale` (see face_detection.detect_faces); locations
+        are always in full-frame coordinates. Tasks not started by `deadline`
+        (time.time() seconds) are dropped; the same applies to every submit_*.
+        """
+        with self._lock:
+            worker = min(range(self.num_workers), key=lambda i: self._pending[i])
+        return self._submit(worker, "faces", frame_ref,
+                            {"encode": encode, "scale": scale, "upsample_on_miss": upsample_on_miss,
+                             "deadline": deadline})
+
+    def submit_encodings(self, frame_ref, locations, deadline=None):
+        """Encodings for already-detected face locations -> Future[list]"""
+        with self._lock:
+            worker = min(range(self.num_workers), key=lambda i: self._pending[i])
+        return self._submit(worker, "encode", frame_ref, {"locations": [tuple(loc) for loc in locations],
+                                                          "deadline": deadline})
+
+    def submit_pose(self, frame_ref, key, box, max_side=0, deadline=None):
+        """
+        Pose model on frame[by1:by2, bx1:bx2], pinned to the worker owning `key` -> Future[PoseResults]
+
+        Crops whose long side exceeds max_side (if > 0) are downscaled first (poseguard.roi).
+        """
+        with self._lock:
+            worker = self._affinity.get(key)
+            if worker is None:
+                worker = self._next_worker % self.num_workers
+                self._next_worker += 1
+                self._affinity[key] = worker
+        return self._submit(worker, "pose", frame_ref,
+                            {"key": key, "box": tuple(int(v) for v in box), "max_side": int(max_side or 0),
+                             "deadline": deadline})
+
+    def forget(self, key):
+        """Drop a guard's worker pinning and close its pose model (guard removed)."""
+        with self._lock:
+            worker = self._affinity.pop(key, None)
+        if worker is not None:
+            self._submit(worker, "evict", None, {"key": key})
+
+    def _submit(self, worker, kind, frame_ref, payload):
+        future = Future()
+        if not self.running:
+            future.set_exception(RuntimeError("Inference engine is not running"))
+            return future
+        task_id = next(self._task_ids)
+        with self._lock:
+            if not self._ensure_worker(worker):
+                future.set_exception(RuntimeError(f"inference worker {worker} is down"))
+                return future
+            self._futures[task_id] = (future, worker, kind)
+            self._pending[worker] += 1
+            task_queue = self._task_queues[worker]
+        task_queue.put((task_id, kind, frame_ref, payload))
+        return future
+
+    def _collect_results(self):
+        while self.running:
+            try:
+                item = self._result_queue.get()
+            except (EOFError, OSError):
+                break
+            if item is None:
+                break
+            task_id, ok, result = item
+            with self._lock:
+                entry = self._futures.pop(task_id, None)
+                if entry is not None:
+                    self._pending[entry[1]] -= 1
+            if entry is None:
+                continue
+            future, _, kind = entry
+            if not ok:
+                future.set_exception(RuntimeError(result))
+            elif kind == "pose":
+                try:
+                    future.set_result(deserialize_results(result))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                future.set_result(result)
@@ -0,0 +1,170 @@
+"""
+Vectorized pose-landmark helpers.
+
+MediaPipe results are converted once into a (33, 4) float32 array of
+[x, y, z, visibility] (normalized coordinates). Visibility counts, bounding
+boxes and the action classifier then run as NumPy array operations and accept
+either one pose (33, 4) or a batch (N, 33, 4).
+"""
+import numpy as np
+
+NUM_POSE_LANDMARKS = 33
+
+# MediaPipe PoseLandmark indices
+NOSE = 0
+L_SHOULDER, R_SHOULDER = 11, 12
+L_ELBOW, R_ELBOW = 13, 14
+L_WRIST, R_WRIST = 15, 16
+L_HIP, R_HIP = 23, 24
+L_KNEE, R_KNEE = 25, 26
+
+X, Y, Z, VIS = 0, 1, 2, 3
+
+# Output labels; index 0 is the fallback for poor-quality poses
+ACTION_LABELS = np.array([
+    "Standing", "Hands Up", "Hands Crossed", "T-Pose",
+    "One Hand Raised (Left)", "One Hand Raised (Right)", "Sit", "Unknown"
+])
+_STANDING, _HANDS_UP, _CROSSED, _TPOSE, _ONE_LEFT, _ONE_RIGHT, _SIT, _UNKNOWN = range(len(ACTION_LABELS))
+
+
+def landmarks_to_array(landmarks):
+    """
+    Convert pose landmarks to a (33, 4) float32 array.
+
+    Args:
+        landmarks: ndarray, NormalizedLandmarkList (has .landmark) or a
+                   sequence of landmark objects with x/y/z/visibility
+
+    Returns:
+        np.ndarray of shape (33, 4): [x, y, z, visibility]
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks.astype(np.float32, copy=False)
+    if hasattr(landmarks, "landmark"):
+        landmarks = landmarks.landmark
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float32)
+
+
+def count_visible(poses, threshold=0.5):
+    """Number of landmarks with visibility > threshold -> int or (N,) array."""
+    return np.count_nonzero(poses[..., VIS] > threshold, axis=-1)
+
+
+def landmark_bbox(poses, w, h, min_visibility=None):
+    """
+    Pixel bounding box of the landmarks.
+
+    Args:
+        poses: (33, 4) or (N, 33, 4) array
+        w, h: image size the normalized coordinates refer to (scalars or (N,))
+        min_visibility: only include landmarks above this visibility
+
+    Returns:
+        (..., 4) float array of [x1, y1, x2, y2]; NaN where no landmark qualifies
+    """
+    xs = poses[..., X] * np.asarray(w, dtype=np.float32)[..., None]
+    ys = poses[..., Y] * np.asarray(h, dtype=np.float32)[..., None]
+    if min_visibility is None:
+        return np.stack([xs.min(-1), ys.min(-1), xs.max(-1), ys.max(-1)], -1)
+
+    keep = poses[..., VIS] > min_visibility
+    box = np.stack([np.where(keep, xs, np.inf).min(-1), np.where(keep, ys, np.inf).min(-1),
+                    np.where(keep, xs, -np.inf).max(-1), np.where(keep, ys, -np.inf).max(-1)], -1)
+    box[~keep.any(-1)] = np.nan
+    return box
+
+
+def classify_pose_batch(poses, h, w):
+    """
+    Classify actions for one pose or a batch of poses.
+
+    Same rules and thresholds as the original per-landmark classifier:
+    Hands Up, Hands Crossed, T-Pose, One Hand Raised (Left/Right), Sit, Standing.
+
+    Args:
+        poses: (33, 4) or (N, 33, 4) landmark array
+        h, w: crop height/width in pixels (scalars or (N,) arrays)
+
+    Returns:
+        (N,) array of label indices into ACTION_LABELS ((1,) for a single pose)
+    """
+    poses = np.asarray(poses, dtype=np.float32)
+    if poses.ndim == 2:
+        poses = poses[None]
+    if poses.ndim != 3 or poses.shape[1] < NUM_POSE_LANDMARKS or poses.shape[2] < 4:
+        raise ValueError(f"Expected (N, 33, 4) landmarks, got {poses.shape}")
+
+    h = np.broadcast_to(np.asarray(h, dtype=np.float32), poses.shape[:1])
+    w = np.broadcast_to(np.asarray(w, dtype=np.float32), poses.shape[:1])
+
+    px = poses[..., X] * w[:, None]
+    py = poses[..., Y] * h[:, None]
+    vis = poses[..., VIS]
+
+    nose_y = py[:, NOSE]
+    lw_x, rw_x = px[:, L_WRIST], px[:, R_WRIST]
+    lw_y, rw_y = py[:, L_WRIST], py[:, R_WRIST]
+    ls_x, rs_x = px[:, L_SHOULDER], px[:, R_SHOULDER]
+    ls_y, rs_y = py[:, L_SHOULDER], py[:, R_SHOULDER]
+    le_y, re_y = py[:, L_ELBOW], py[:, R_ELBOW]
+
+    lwv, rwv = vis[:, L_WRIST] > 0.70, vis[:, R_WRIST] > 0.70
+    lev, rev = vis[:, L_ELBOW] > 0.70, vis[:, R_ELBOW] > 0.70
+    lsv, rsv = vis[:, L_SHOULDER] > 0.70, vis[:, R_SHOULDER] > 0.70
+    lkv, rkv = vis[:, L_KNEE] > 0.70, vis[:, R_KNEE] > 0.70
+    lhv, rhv = vis[:, L_HIP] > 0.65, vis[:, R_HIP] > 0.65
+    nosev = vis[:, NOSE] > 0.6
+
+    # Quality check: at least 9 of 11 major joints visible
+    visible_joints = (lwv.astype(np.int8) + rwv + lev + rev + lsv + rsv + lkv + rkv + lhv + rhv + nosev)
+    good_quality = visible_joints >= 9
+
+    above_head = nose_y - 0.15 * h
+    l_up = lw_y < above_head
+    r_up = rw_y < above_head
+    both_wrists = lwv & rwv
+    wrists_shoulders = both_wrists & lsv & rsv
+    chest_y = (ls_y + rs_y) / 2
+    center_x = (ls_x + rs_x) / 2
+
+    hands_up = both_wrists & l_up & r_up
+
+    crossed = (wrists_shoulders &
+               (np.abs(lw_y - chest_y) < 0.25 * h) & (np.abs(rw_y - chest_y) < 0.25 * h) &
+               (((lw_x > center_x) & (rw_x < center_x)) | ((lw_x < center_x) & (rw_x > center_x))))
+
+    t_pose = (wrists_shoulders & lev & rev &
+              (np.abs(lw_y - ls_y) < 0.2 * h) & (np.abs(rw_y - rs_y) < 0.2 * h) &
+              (np.abs(le_y - ls_y) < 0.2 * h) & (np.abs(re_y - rs_y) < 0.2 * h) &
+              (lw_x < ls_x - 0.25 * w) & (rw_x > rs_x + 0.25 * w))
+
+    one_left = lwv & l_up & ~rwv
+    one_right = rwv & r_up & ~lwv
+    alt_left = wrists_shoulders & l_up & (rw_y > chest_y + 0.2 * h)
+    alt_right = wrists_shoulders & r_up & (lw_y > chest_y + 0.2 * h)
+
+    # Sit: thigh (hip -> knee) nearly horizontal, measured in normalized y
+    legs_visible = lkv & rkv & lhv & rhv
+    avg_thigh = (np.abs(poses[:, L_KNEE, Y] - poses[:, L_HIP, Y]) +
+                 np.abs(poses[:, R_KNEE, Y] - poses[:, R_HIP, Y])) / 2
+    sit = legs_visible & (avg_thigh < 0.12)
+
+    # First matching rule wins, in the original priority order
+    conditions = [~good_quality, hands_up, crossed, t_pose, one_left, one_right,
+                  alt_left, alt_right, sit]
+    choices = [_STANDING, _HANDS_UP, _CROSSED, _TPOSE, _ONE_LEFT, _ONE_RIGHT,
+               _ONE_LEFT, _ONE_RIGHT, _SIT]
+    labels = np.select(conditions, choices, default=_STANDING)
+
+    # Non-finite landmarks cannot be classified
+    labels[~np.isfinite(poses[:, :NUM_POSE_LANDMARKS, :]).all(axis=(1, 2))] = _UNKNOWN
+    return labels
+
+
+def classify_poses(poses, h, w):
+    """classify_pose_batch returning label strings (list for a batch, str for one pose)."""
+    labels = ACTION_LABELS[classify_pose_batch(poses, h, w)]
+    if np.ndim(poses) == 2:
+        return str(labels[0])
+    return [str(label) for label in labels]
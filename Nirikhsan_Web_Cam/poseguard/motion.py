@@ -0,0 +1,83 @@
+"""
+Motion gate for per-guard pose inference.
+
+Guards at static posts produce long runs of near-identical frames. The gate
+differences consecutive frames on a small blurred grayscale copy and reports,
+per guard body box, whether enough pixels changed to justify re-running pose
+estimation. A forced refresh every `refresh_frames` keeps cached actions from
+going stale.
+"""
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Frame-differencing motion detector evaluated per region.
+
+    Args:
+        width: width of the downsampled grayscale frame used for differencing
+        pixel_threshold: per-pixel intensity change counted as motion (0-255)
+        min_fraction: fraction of changed pixels in a box that counts as motion
+        refresh_frames: process a region at least every N frames regardless of motion
+    """
+
+    def __init__(self, width=160, pixel_threshold=15, min_fraction=0.01, refresh_frames=15):
+        self.width = int(width)
+        self.pixel_threshold = pixel_threshold
+        self.min_fraction = min_fraction
+        self.refresh_frames = max(1, int(refresh_frames))
+        self._prev = None
+        self._mask = None
+        self._scale = 1.0
+        self._since_processed = {}  # key -> frames since pose inference last ran
+        self._skip_ratio = {}       # key -> exponential moving average of skips
+
+    def update(self, frame):
+        """Feed the next BGR frame; computes the motion mask against the previous one."""
+        h, w = frame.shape[:2]
+        self._scale = min(1.0, self.width / float(w))
+        small = cv2.resize(frame, (max(1, int(w * self._scale)), max(1, int(h * self._scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        if self._prev is None or self._prev.shape != gray.shape:
+            self._mask = None  # first frame / resolution change: everything counts as motion
+        else:
+            self._mask = cv2.absdiff(gray, self._prev) > self.pixel_threshold
+        self._prev = gray
+
+    def motion_in(self, box):
+        """Fraction of changed pixels inside (x1, y1, x2, y2) given in full-frame coordinates."""
+        if self._mask is None:
+            return 1.0
+        x1, y1, x2, y2 = (int(v * self._scale) for v in box)
+        region = self._mask[max(0, y1):max(y1 + 1, y2), max(0, x1):max(x1 + 1, x2)]
+        return float(np.count_nonzero(region)) / region.size if region.size else 1.0
+
+    def should_process(self, key, box):
+        """
+        Decide whether `key`'s region needs pose inference this frame.
+
+        Returns True on motion or when the forced refresh interval is reached.
+        """
+        since = self._since_processed.get(key, self.refresh_frames)
+        process = since >= self.refresh_frames or self.motion_in(box) >= self.min_fraction
+        self._since_processed[key] = 0 if process else since + 1
+        self._skip_ratio[key] = self._skip_ratio.get(key, 0.0) * 0.95 + (0.0 if process else 0.05)
+        return process
+
+    def skip_ratio(self, key):
+        """Recent fraction of frames (moving average) on which `key` was skipped."""
+        return self._skip_ratio.get(key, 0.0)
+
+    def skip_ratios(self):
+        return dict(self._skip_ratio)
+
+    def forget(self, key):
+        self._since_processed.pop(key, None)
+        self._skip_ratio.pop(key, None)
+
+    def retain(self, keys):
+        keys = set(keys)
+        for key in [k for k in self._since_processed if k not in keys]:
+            self.forget(key)
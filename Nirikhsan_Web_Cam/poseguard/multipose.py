@@ -0,0 +1,177 @@
+"""
+Full-frame multi-person pose engine.
+
+The per-guard engine runs one pose model per guard crop, so cost grows with
+the roster. This engine runs a single MediaPipe PoseLandmarker pass (a
+multi-pose model loaded from a local .task file) over the whole frame and
+hands each guard the skeleton whose face region best overlaps the guard's
+tracked face box.
+
+Associated skeletons are re-expressed in the guard's crop coordinates and
+wrapped like the per-guard results (`.pose_landmarks` as a
+NormalizedLandmarkList), so drawing, the pose buffer and classify_action are
+unchanged.
+"""
+import os
+import time
+import logging
+from collections import namedtuple
+
+import numpy as np
+
+from poseguard.boxes import iou_matrix
+from poseguard.face_matching import assign_faces
+from poseguard.landmarks import NUM_POSE_LANDMARKS, X, Y, VIS
+
+logger = logging.getLogger("PoseGuard")
+
+# detection.pose_engine values
+POSE_ENGINES = ("per_guard", "multi_pose")
+
+# Nose, eyes, ears and mouth landmarks outline the face
+FACE_LANDMARKS = list(range(11))
+
+MultiPoseResult = namedtuple("MultiPoseResult", ["pose_landmarks"])
+
+
+def skeleton_face_boxes(poses, frame_w, frame_h, min_visibility=0.3):
+    """
+    Approximate face boxes (x1, y1, x2, y2) of full-frame skeletons.
+
+    The box spans the visible face landmarks, widened to a face-detector-like
+    aspect (about as tall as the ear-to-ear span). Skeletons without visible
+    face landmarks get an empty box.
+
+    Args:
+        poses: (N, 33, 4) landmarks normalized to the frame
+    """
+    boxes = np.zeros((len(poses), 4), dtype=np.float64)
+    for i, pose in enumerate(poses):
+        face = pose[FACE_LANDMARKS]
+        face = face[face[:, VIS] > min_visibility]
+        if len(face) < 2:
+            continue
+        xs, ys = face[:, X] * frame_w, face[:, Y] * frame_h
+        cx, cy = (xs.min() + xs.max()) / 2.0, (ys.min() + ys.max()) / 2.0
+        side = max(xs.max() - xs.min(), ys.max() - ys.min(), 1.0) * 1.3
+        boxes[i] = (cx - side / 2.0, cy - side / 2.0, cx + side / 2.0, cy + side / 2.0)
+    return boxes
+
+
+def to_crop_landmarks(pose, crop_box, frame_w, frame_h):
+    """
+    Re-express full-frame normalized landmarks relative to a crop.
+
+    Returns:
+        (33, 4) array normalized to crop_box (x1, y1, x2, y2)
+    """
+    bx1, by1, bx2, by2 = crop_box
+    local = pose.copy()
+    local[:, X] = (pose[:, X] * frame_w - bx1) / max(1, bx2 - bx1)
+    local[:, Y] = (pose[:, Y] * frame_h - by1) / max(1, by2 - by1)
+    return local
+
+
+def landmark_list(pose):
+    """(33, 4) array -> mediapipe NormalizedLandmarkList (what drawing_utils expects)."""
+    from mediapipe.framework.formats import landmark_pb2
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z, visibility in pose:
+        landmarks.landmark.add(x=float(x), y=float(y), z=float(z), visibility=float(visibility))
+    return landmarks
+
+
+class MultiPoseEngine:
+    """
+    One PoseLandmarker per camera stream in VIDEO mode (temporal tracking).
+
+    Args:
+        model_path: local pose_landmarker_*.task file
+        max_poses: maximum skeletons detected per frame
+        min_detection_confidence, min_tracking_confidence: PoseLandmarker thresholds
+        min_iou: minimum face-box IoU for a skeleton to be given to a guard
+    """
+
+    def __init__(self, model_path, max_poses=8, min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 min_iou=0.1):
+        if not os.path.isfile(model_path):
+            raise FileNotFoundError(f"Multi-pose model not found: {model_path}")
+        self.model_path = model_path
+        self.max_poses = max(1, int(max_poses))
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.min_iou = min_iou
+        self._landmarkers = {}  # stream key -> (landmarker, last timestamp ms)
+
+    def _landmarker(self, key):
+        entry = self._landmarkers.get(key)
+        if entry is None:
+            from mediapipe.tasks.python import BaseOptions, vision
+            options = vision.PoseLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=self.model_path),
+                running_mode=vision.RunningMode.VIDEO,
+                num_poses=self.max_poses,
+                min_pose_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence,
+            )
+            entry = (vision.PoseLandmarker.create_from_options(options), -1)
+            self._landmarkers[key] = entry
+        return entry
+
+    def detect(self, rgb_frame, key=None):
+        """
+        All skeletons in the frame.
+
+        Returns:
+            (N, 33, 4) float32 landmarks normalized to the full frame
+        """
+        import mediapipe as mp
+        landmarker, last_ts = self._landmarker(key)
+        # VIDEO mode needs strictly increasing timestamps per landmarker
+        timestamp = max(int(time.monotonic() * 1000), last_ts + 1)
+        self._landmarkers[key] = (landmarker, timestamp)
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb_frame))
+        result = landmarker.detect_for_video(image, timestamp)
+        poses = np.zeros((len(result.pose_landmarks), NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+        for i, landmarks in enumerate(result.pose_landmarks):
+            poses[i] = [(lm.x, lm.y, lm.z, lm.visibility if lm.visibility is not None else 0.0)
+                        for lm in landmarks]
+        return poses
+
+    def estimate(self, rgb_frame, face_boxes, crop_boxes, key=None):
+        """
+        One pose pass for the frame, skeletons assigned to guards.
+
+        Args:
+            rgb_frame: full RGB frame
+            face_boxes: {name: tracked face box (x1, y1, x2, y2)}
+            crop_boxes: {name: guard crop box}; landmarks are returned relative to it
+            key: camera stream id (each stream keeps its own landmarker)
+
+        Returns:
+            {name: MultiPoseResult or None} for every name in crop_boxes
+        """
+        results = {name: None for name in crop_boxes}
+        names = [name for name in crop_boxes if face_boxes.get(name) is not None]
+        if not names:
+            return results
+        frame_h, frame_w = rgb_frame.shape[:2]
+        poses = self.detect(rgb_frame, key)
+        if len(poses) == 0:
+            return results
+
+        ious = iou_matrix([face_boxes[name] for name in names], skeleton_face_boxes(poses, frame_w, frame_h))
+        for row, col, _ in assign_faces(1.0 - ious, 1.0 - self.min_iou):
+            name = names[row]
+            local = to_crop_landmarks(poses[col], crop_boxes[name], frame_w, frame_h)
+            results[name] = MultiPoseResult(landmark_list(local))
+        return results
+
+    def forget(self, key):
+        entry = self._landmarkers.pop(key, None)
+        if entry is not None:
+            entry[0].close()
+
+    def close(self):
+        for key in list(self._landmarkers):
+            self.forget(key)
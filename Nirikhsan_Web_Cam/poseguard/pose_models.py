@@ -0,0 +1,133 @@
+"""
+Per-guard pose model instances.
+
+MediaPipe's tracking mode (static_image_mode=False) assumes consecutive frames
+show the same subject. Sharing one model across guards forces a full detection
+pass on every crop, so each guard gets its own instance, created lazily and
+evicted least-recently-used when the pool is full or a guard stays missing.
+"""
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger("PoseGuard")
+
+
+# detection.model values:
+#   holistic  - pose + 468-point face mesh + both hands (needed for EAR/sleep or hand gestures)
+#   pose_only - mp.solutions.pose at the configured model_complexity
+#   pose_lite - mp.solutions.pose at model_complexity=0 (fastest)
+POSE_MODEL_MODES = ("holistic", "pose_only", "pose_lite")
+
+
+def resolve_pose_model_mode(mode, needs_face_or_hands=False):
+    """
+    Pick the model actually used for tracking crops.
+
+    Holistic is forced whenever a feature reads face or hand landmarks;
+    unknown modes fall back to holistic.
+    """
+    if needs_face_or_hands:
+        return "holistic"
+    if mode not in POSE_MODEL_MODES:
+        logger.warning(f"Unknown detection.model '{mode}', using holistic")
+        return "holistic"
+    return mode
+
+
+def make_pose_model(mode, options, model_complexity=1):
+    """
+    Create a MediaPipe model for `mode`.
+
+    Args:
+        mode: one of POSE_MODEL_MODES
+        options: kwargs shared by Holistic and Pose (confidences, static_image_mode)
+        model_complexity: 0, 1 or 2 for pose_only (pose_lite always uses 0)
+    """
+    import mediapipe as mp
+    if mode == "holistic":
+        return mp.solutions.holistic.Holistic(**options)
+    complexity = 0 if mode == "pose_lite" else model_complexity
+    return mp.solutions.pose.Pose(model_complexity=complexity, **options)
+
+
+class PoseModelPool:
+    """
+    LRU pool of pose models keyed by guard name.
+
+    Args:
+        factory: zero-argument callable returning a new model (must have close())
+        max_size: maximum live instances; the least recently used one is closed first
+        idle_seconds: instances unused for this long are closed by evict_idle()
+    """
+
+    def __init__(self, factory, max_size=16, idle_seconds=30.0):
+        self.factory = factory
+        self.max_size = max(1, int(max_size))
+        self.idle_seconds = idle_seconds
+        self._models = OrderedDict()  # key -> (model, last_used)
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def get(self, key):
+        """Return the model for `key`, creating it (and evicting LRU) if needed."""
+        with self._lock:
+            entry = self._models.pop(key, None)
+            if entry is None:
+                while len(self._models) >= self.max_size:
+                    old_key, (old_model, _) = self._models.popitem(last=False)
+                    self._close(old_key, old_model)
+                model = self.factory()
+                self.created += 1
+            else:
+                model = entry[0]
+            self._models[key] = (model, time.monotonic())
+            return model
+
+    def ensure(self, keys):
+        """Pre-create models for `keys` (up to max_size) so the first frame is not slowed down."""
+        for key in list(keys)[:self.max_size]:
+            self.get(key)
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._models.pop(key, None)
+            if entry is not None:
+                self._close(key, entry[0])
+
+    def retain(self, keys):
+        """Close every model whose key is not in `keys`."""
+        keys = set(keys)
+        for key in [k for k in list(self._models) if k not in keys]:
+            self.discard(key)
+
+    def evict_idle(self, now=None):
+        """Close models not used for idle_seconds (guards missing from the frame)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            stale = [k for k, (_, last_used) in self._models.items() if now - last_used > self.idle_seconds]
+            for key in stale:
+                model, _ = self._models.pop(key)
+                self._close(key, model)
+        return stale
+
+    def close_all(self):
+        with self._lock:
+            while self._models:
+                key, (model, _) = self._models.popitem(last=False)
+                self._close(key, model)
+
+    def _close(self, key, model):
+        self.evicted += 1
+        try:
+            model.close()
+        except Exception as e:
+            logger.debug(f"Pose model close error for {key}: {e}")
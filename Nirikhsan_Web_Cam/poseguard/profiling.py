@@ -0,0 +1,204 @@
+"""
+Per-stage latency profiling.
+
+The FPS/MEM label says how fast the pipeline runs, not where the time goes.
+StageProfiler times each stage of a processed frame (capture, colour
+conversion, face scans, trackers, per-guard pose inference, drawing, alerts,
+display) with a monotonic clock and keeps the last `window` samples per
+(stage, guard) so rolling p50/p95/p99 can be read at any time: as an overlay
+in the Tk app, as Prometheus text from the headless server (/metrics), or as
+a CSV dump.
+
+Recording is a deque append under a lock; percentiles are only computed when
+someone asks for them.
+"""
+import csv
+import time
+import threading
+import logging
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+logger = logging.getLogger("PoseGuard")
+
+# Pipeline order; snapshot() lists stages in this order, unknown stages after them
+STAGES = (
+    "capture",
+    "color_conversion",
+    "face_detection",  # nested: counted inside whichever stage first needs faces
+    "fugitive_scan",
+    "pro_scan",
+    "tracker_update",
+    "redetection",
+    "overlap",
+    "pose",  # total, and per guard
+    "classify",
+    "overlay",  # per guard
+    "alerts",  # per guard
+    "frame",  # whole process_tracking_frame_optimized call
+    "display",
+)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _StageSeries:
+    __slots__ = ("samples", "count", "total", "last")
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+
+
+class StageProfiler:
+    """
+    Rolling latency samples per pipeline stage (and per guard where it applies).
+
+    Args:
+        window: samples kept per (stage, guard) for the percentiles
+        enabled: when False, measure()/record() do nothing
+    """
+
+    def __init__(self, window=1000, enabled=True):
+        self.window = max(1, int(window))
+        self.enabled = enabled
+        self._series = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    @contextmanager
+    def measure(self, stage, guard=None):
+        """Time the body of a `with` block as one sample of `stage`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, guard)
+
+    def stopwatch(self):
+        return Stopwatch(self)
+
+    def record(self, stage, seconds, guard=None):
+        if not self.enabled:
+            return
+        key = (stage, guard)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _StageSeries(self.window)
+            series.samples.append(seconds)
+            series.count += 1
+            series.total += seconds
+            series.last = seconds
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+        self.started = time.time()
+
+    def snapshot(self):
+        """
+        Returns:
+            list of dicts (stage, guard, count, sum, last, mean, p50, p95, p99;
+            times in seconds over the rolling window, count/sum cumulative)
+        """
+        with self._lock:
+            items = [(key, list(s.samples), s.count, s.total, s.last) for key, s in self._series.items()]
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        items.sort(key=lambda item: (order.get(item[0][0], len(STAGES)), item[0][0], item[0][1] or ""))
+
+        rows = []
+        for (stage, guard), samples, count, total, last in items:
+            values = np.asarray(samples, dtype=np.float64)
+            p50, p95, p99 = np.percentile(values, [q * 100 for q in QUANTILES]) if values.size else (0.0, 0.0, 0.0)
+            rows.append({
+                "stage": stage,
+                "guard": guard,
+                "count": count,
+                "sum": total,
+                "last": last,
+                "mean": float(values.mean()) if values.size else 0.0,
+                "p50": float(p50),
+                "p95": float(p95),
+                "p99": float(p99),
+            })
+        return rows
+
+    def summary_text(self, per_guard=True):
+        """Fixed-width table (milliseconds) for an on-screen overlay."""
+        lines = [f"{'stage':<22}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for row in self.snapshot():
+            if row["guard"] is not None and not per_guard:
+                continue
+            label = row["stage"] if row["guard"] is None else f"  {row['stage']}:{row['guard']}"
+            lines.append(f"{label[:22]:<22}{row['p50'] * 1000:7.1f}{row['p95'] * 1000:7.1f}{row['p99'] * 1000:7.1f}")
+        if len(lines) == 1:
+            lines.append("(no samples yet)")
+        return "\n".join(lines)
+
+    def to_prometheus(self, prefix="poseguard"):
+        """Prometheus text exposition (a summary metric with stage/guard labels)."""
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Pipeline stage latency over the last {self.window} samples.",
+            f"# TYPE {name} summary",
+        ]
+        for row in self.snapshot():
+            labels = f'stage="{_escape_label(row["stage"])}"'
+            if row["guard"] is not None:
+                labels += f',guard="{_escape_label(row["guard"])}"'
+            for q in QUANTILES:
+                lines.append(f'{name}{{{labels},quantile="{q}"}} {row[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f"{name}_sum{{{labels}}} {row['sum']:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+    def export_csv(self, path):
+        """Write snapshot() to `path` (times in milliseconds); returns the row count."""
+        rows = self.snapshot()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "guard", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "last_ms"])
+            for row in rows:
+                writer.writerow([row["stage"], row["guard"] or "", row["count"],
+                                 f"{row['mean'] * 1000:.3f}", f"{row['p50'] * 1000:.3f}",
+                                 f"{row['p95'] * 1000:.3f}", f"{row['p99'] * 1000:.3f}",
+                                 f"{row['last'] * 1000:.3f}"])
+        logger.warning(f"Stage latency profile written to {path} ({len(rows)} series)")
+        return len(rows)
+
+
+class Stopwatch:
+    """
+    Back-to-back stage timing for straight-line code: lap(stage) records the
+    time since the previous lap (or restart()).
+    """
+
+    __slots__ = ("profiler", "start", "mark")
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.start = self.mark = time.perf_counter()
+
+    def restart(self):
+        self.mark = time.perf_counter()
+
+    def lap(self, stage, guard=None):
+        now = time.perf_counter()
+        self.profiler.record(stage, now - self.mark, guard)
+        self.mark = now
+
+    def total(self, stage):
+        """Record the time since the stopwatch was created."""
+        self.profiler.record(stage, time.perf_counter() - self.start)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
@@ -0,0 +1,163 @@
+"""
+Appearance features for PRO_Detection person re-identification.
+
+A person crop is summarised by colour histograms plus an edge histogram
+(a lightweight stand-in for a deep ReID embedding) and compared by cosine
+similarity.
+"""
+import time
+import logging
+
+import cv2
+import numpy as np
+
+# Deep ReID back-end (PRO_Detection is only offered when it is installed)
+try:
+    import torch
+    import torchvision.transforms as transforms
+    REID_AVAILABLE = True
+except ImportError:
+    REID_AVAILABLE = False
+    torch = None
+    transforms = None
+
+try:
+    from sklearn.metrics.pairwise import cosine_similarity
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    cosine_similarity = None
+
+logger = logging.getLogger("PoseGuard")
+
+
+def extract_appearance_features(frame, face_box):
+    """
+    Extract appearance features from a person's image using simple deep features.
+    
+    Args:
+        frame: Input image frame
+        face_box: Bounding box (x1, y1, x2, y2) for person region
+    
+    Returns:
+        Feature vector (numpy array) or None if extraction fails
+    """
+    try:
+        x1, y1, x2, y2 = face_box
+        x1, y1, x2, y2 = max(0, int(x1)), max(0, int(y1)), int(x2), int(y2)
+        
+        # Crop person region
+        person_crop = frame[y1:y2, x1:x2]
+        if person_crop.size == 0:
+            return None
+        
+        # Simple approach: use histogram of colors + histogram of edges as features
+        # This is a lightweight alternative to deep neural networks
+        h, w = person_crop.shape[:2]
+        
+        # Resize for consistent feature extraction
+        person_resized = cv2.resize(person_crop, (64, 128))
+        
+        # Color histogram features (3 channels × 8 bins each = 24 features)
+        color_features = []
+        for i in range(3):
+            hist = cv2.calcHist([person_resized], [i], None, [8], [0, 256])
+            color_features.extend(hist.flatten())
+        
+        # Edge detection features using Canny
+        gray = cv2.cvtColor(person_resized, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray, 100, 200)
+        edge_hist = cv2.calcHist([edges], [0], None, [16], [0, 256])
+        
+        # Combine all features into single vector
+        features = np.array(color_features + edge_hist.flatten(), dtype=np.float32)
+        
+        # Normalize features
+        features = features / (np.linalg.norm(features) + 1e-6)
+        
+        return features
+    except Exception as e:
+        logger.warning(f"Feature extraction error: {e}")
+        return None
+
+
+def calculate_feature_similarity(features1, features2):
+    """
+    Calculate similarity between two feature vectors using cosine similarity.
+    
+    Args:
+        features1: Feature vector 1
+        features2: Feature vector 2
+    
+    Returns:
+        Similarity score (0-1, higher = more similar)
+    """
+    if features1 is None or features2 is None:
+        return 0.0
+    
+    try:
+        if SKLEARN_AVAILABLE:
+            # Use scikit-learn's cosine similarity
+            similarity = cosine_similarity([features1], [features2])[0][0]
+        else:
+            # Fallback: manual cosine similarity
+            dot_product = np.dot(features1, features2)
+            norm1 = np.linalg.norm(features1)
+            norm2 = np.linalg.norm(features2)
+            similarity = dot_product / (norm1 * norm2 + 1e-6)
+        
+        return max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
+    except Exception as e:
+        logger.warning(f"Similarity calculation error: {e}")
+        return 0.0
+
+
+def match_person_identity(person_id, new_features, person_features_db, confidence_threshold=0.65):
+    """
+    Match a person's features against database to determine if same person.
+    
+    Args:
+        person_id: ID of person to match
+        new_features: New feature vector
+        person_features_db: Database of known person features
+        confidence_threshold: Minimum similarity for match
+    
+    Returns:
+        (matched_person_id, confidence) or (None, 0.0) if no match
+    """
+    try:
+        if person_id not in person_features_db:
+            # New person, store features
+            person_features_db[person_id] = {
+                'features': new_features,
+                'count': 1,
+                'last_seen': time.time()
+            }
+            return person_id, 1.0
+        
+        # Calculate similarity with stored features
+        stored_features = person_features_db[person_id]['features']
+        similarity = calculate_feature_similarity(new_features, stored_features)
+        
+        if similarity >= confidence_threshold:
+            # Update features with exponential moving average for stability
+            alpha = 0.3  # Learning rate
+            person_features_db[person_id]['features'] = (
+                alpha * new_features + 
+                (1 - alpha) * stored_features
+            )
+            person_features_db[person_id]['count'] += 1
+            person_features_db[person_id]['last_seen'] = time.time()
+            return person_id, similarity
+        else:
+            # Create new person identity
+            new_id = f"{person_id}_variant_{len(person_features_db)}"
+            person_features_db[new_id] = {
+                'features': new_features,
+                'count': 1,
+                'last_seen': time.time()
+            }
+            return new_id, similarity
+    except Exception as e:
+        logger.warning(f"Person matching error: {e}")
+        return None, 0.0
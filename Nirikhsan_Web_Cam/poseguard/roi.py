@@ -0,0 +1,98 @@
+"""
+Adaptive pose-crop resolution.
+
+calculate_body_box can produce crops covering most of a 1080p frame for a
+guard close to the camera, yet the pose models resize their input to a few
+hundred pixels internally. Crops whose long side exceeds a pixel budget are
+downscaled first, into a buffer preallocated per guard and reused while the
+crop size stays the same (crop sizes are quantized upstream, so it usually
+does).
+
+MediaPipe landmarks are normalized to the image they were computed on, and
+the downscale keeps the crop's aspect ratio, so normalized landmarks of the
+small crop map onto the original crop unchanged; rescale_landmarks converts
+them to original-crop pixels where pixel values are needed.
+"""
+import threading
+
+import cv2
+import numpy as np
+
+
+def budget_size(w, h, max_side):
+    """
+    Target (w, h) for a crop capped at `max_side` on its long side.
+
+    Returns the original size when max_side is 0/None or the crop already fits.
+    """
+    if not max_side or max(w, h) <= max_side:
+        return int(w), int(h)
+    scale = max_side / float(max(w, h))
+    return max(1, int(round(w * scale))), max(1, int(round(h * scale)))
+
+
+def rescale_landmarks(poses, crop_w, crop_h):
+    """
+    Normalized landmarks (33, 4) or (N, 33, 4) -> pixel x/y in the original crop.
+
+    Returns:
+        array of the same shape with x, y in pixels (z, visibility unchanged)
+    """
+    pixels = np.array(poses, dtype=np.float32, copy=True)
+    pixels[..., 0] *= crop_w
+    pixels[..., 1] *= crop_h
+    return pixels
+
+
+class CropResizer:
+    """
+    Per-guard preallocated resize buffers.
+
+    Args:
+        max_side: pixel budget for the crop's long side (0 = never resize)
+    """
+
+    def __init__(self, max_side=640):
+        self.max_side = int(max_side or 0)
+        self._buffers = {}  # key -> (h, w, 3) uint8 array
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def prepare(self, key, frame, box):
+        """
+        Pose-model input for frame[by1:by2, bx1:bx2].
+
+        Returns:
+            (image, scale): a contiguous read-only crop, downscaled into this
+            guard's buffer when it exceeds the budget; scale is small/original
+        """
+        bx1, by1, bx2, by2 = box
+        view = frame[by1:by2, bx1:bx2]
+        h, w = view.shape[:2]
+        tw, th = budget_size(w, h, self.max_side)
+        if (tw, th) == (w, h):
+            crop = np.ascontiguousarray(view)
+            crop.flags.writeable = False
+            return crop, 1.0
+
+        with self._lock:
+            buf = self._buffers.get(key)
+            if buf is None or buf.shape[:2] != (th, tw) or buf.shape[2:] != view.shape[2:]:
+                buf = np.empty((th, tw) + view.shape[2:], dtype=view.dtype)
+                self._buffers[key] = buf
+                self.allocations += 1
+        # The model only reads the buffer, and each guard is processed once per frame
+        buf.flags.writeable = True
+        cv2.resize(view, (tw, th), dst=buf, interpolation=cv2.INTER_AREA)
+        buf.flags.writeable = False
+        return buf, tw / float(w)
+
+    def forget(self, key):
+        with self._lock:
+            self._buffers.pop(key, None)
+
+    def retain(self, keys):
+        keys = set(keys)
+        with self._lock:
+            for key in [k for k in self._buffers if k not in keys]:
+                del self._buffers[key]
@@ -0,0 +1,463 @@
+"""
+Local HTTP/WebSocket API over a MonitorEngine.
+
+Lets a browser, a script or another process watch and drive a headless
+engine (`python -m poseguard serve`) without Tk. Standard library only:
+
+    GET  /api/status               engine and per-guard state (JSON)
+    GET  /api/guards               known guards and which are tracked
+    POST /api/guards/track         {"names": [...]} - track exactly these guards
+    POST /api/alert                {"enabled": bool, "interval": s, "action": "..."}
+    POST /api/start                {"source": ..., "replay": bool} (both optional)
+    POST /api/stop
+    GET  /api/events               ?guard=&status=&kind=&since=&until=&limit=
+    GET  /api/events/counts        ?by=status|guard|action|kind&since=&kind=
+    GET  /api/profile              per-stage / per-guard latency p50/p95/p99 (JSON)
+    GET  /metrics                  the same as Prometheus text, plus face
+                                   detector/encoder call counters
+    GET  /stream.mjpg              ?camera=cam0 - annotated preview (MJPEG)
+    GET  /snapshot.jpg             ?camera=cam0 - latest annotated frame
+    GET  /ws                       WebSocket: {"type": "status"} every
+                                   status_interval seconds and {"type": "event"}
+                                   for every logged event
+
+Preview frames are JPEG-encoded at most once per processed frame however many
+clients watch, and the stream is capped at server.preview_max_fps. The server
+binds to 127.0.0.1 unless configured otherwise; it has no authentication, so
+only expose it on a trusted network.
+"""
+import json
+import time
+import base64
+import hashlib
+import logging
+import queue
+import select
+import socket
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import cv2
+
+from poseguard.streams import tile_frames
+
+logger = logging.getLogger("PoseGuard")
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+MJPEG_BOUNDARY = "poseguardframe"
+
+
+def websocket_accept(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key (RFC 6455)."""
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode("ascii")).digest()).decode("ascii")
+
+
+def websocket_frame(payload, opcode=0x1):
+    """One unmasked, unfragmented server-to-client frame."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def read_websocket_frame(rfile):
+    """
+    Read one client frame.
+
+    Returns:
+        (opcode, payload bytes), or (None, b"") when the connection closed
+    """
+    header = rfile.read(2)
+    if len(header) < 2:
+        return None, b""
+    opcode = header[0] & 0x0F
+    masked = header[1] & 0x80
+    length = header[1] & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", rfile.read(8))[0]
+    mask = rfile.read(4) if masked else b""
+    payload = rfile.read(length)
+    if masked:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+def _json_default(value):
+    # numpy scalars, sets and the like
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def to_json(value):
+    return json.dumps(value, default=_json_default)
+
+
+class PreviewEncoder:
+    """
+    JPEG of the latest annotated frame, shared by all preview clients.
+
+    Args:
+        engine: MonitorEngine
+        quality: JPEG quality
+        max_width: frames wider than this are downscaled first (0 = never)
+    """
+
+    def __init__(self, engine, quality=70, max_width=960):
+        self.engine = engine
+        self.quality = int(quality)
+        self.max_width = int(max_width or 0)
+        self._lock = threading.Lock()
+        self._cache = {}  # camera -> (key, jpeg bytes)
+
+    def latest(self, camera=None):
+        """
+        Args:
+            camera: camera id from status()["cameras"]; None = all cameras (tiled)
+
+        Returns:
+            (key, jpeg bytes); key changes with every new frame. (None, None)
+            while no frame has been processed.
+        """
+        slots = self.engine.preview_slots()
+        if camera is not None:
+            slots = [(camera_id, slot) for camera_id, slot in slots if camera_id == camera]
+        if not slots:
+            return None, None
+        key = tuple((camera_id, slot.version) for camera_id, slot in slots)
+        with self._lock:
+            cached = self._cache.get(camera)
+            if cached is not None and cached[0] == key:
+                return cached
+            with self.engine.profiler.measure("display"):
+                jpeg = self._encode(slots)
+            if jpeg is None:
+                return None, None
+            self._cache[camera] = (key, jpeg)
+            return key, jpeg
+
+    def _encode(self, slots):
+        if len(slots) == 1:
+            with slots[0][1].borrow() as frame:
+                if frame is None:
+                    return None
+                image = self._fit(frame)
+                ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        else:
+            frames = [slot.snapshot() for _, slot in slots]
+            if all(frame is None for frame in frames):
+                return None
+            first = next(frame for frame in frames if frame is not None)
+            width = self.max_width or first.shape[1]
+            height = int(width * first.shape[0] / first.shape[1])
+            mosaic = tile_frames(frames, width, height, labels=[camera_id for camera_id, _ in slots])
+            ok, buffer = cv2.imencode(".jpg", mosaic, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        return buffer.tobytes() if ok else None
+
+    def _fit(self, frame):
+        h, w = frame.shape[:2]
+        if not self.max_width or w <= self.max_width:
+            return frame
+        return cv2.resize(frame, (self.max_width, int(h * self.max_width / w)), interpolation=cv2.INTER_AREA)
+
+
+class MonitorServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server bound to one engine.
+
+    Args:
+        engine: MonitorEngine
+        host, port: bind address
+        config: the "server" section of config.json
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, engine, host="127.0.0.1", port=8765, config=None):
+        config = config or {}
+        super().__init__((host, port), MonitorRequestHandler)
+        self.engine = engine
+        self.preview = PreviewEncoder(engine, quality=config.get("preview_jpeg_quality", 70),
+                                      max_width=config.get("preview_max_width", 960))
+        self.preview_max_fps = float(config.get("preview_max_fps", 10) or 0)
+        self.status_interval = float(config.get("status_interval", 1.0))
+        self.client_queue_size = int(config.get("websocket_queue_size", 256))
+        self.stopping = threading.Event()
+        self._clients_lock = threading.Lock()
+        self._clients = []  # per-WebSocket event queues
+        engine.add_listener(self._on_event)
+        if host not in ("127.0.0.1", "localhost", "::1"):
+            logger.warning(f"API server listening on {host}:{port} without authentication")
+
+    def _on_event(self, event):
+        """Engine listener: fan an event out to every WebSocket client (dropped if a client lags)"""
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                client.put_nowait(event)
+            except queue.Full:
+                pass
+
+    def register_client(self):
+        client = queue.Queue(maxsize=self.client_queue_size)
+        with self._clients_lock:
+            self._clients.append(client)
+        return client
+
+    def unregister_client(self, client):
+        with self._clients_lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def serve_in_thread(self):
+        """Serve on a daemon thread; returns the thread"""
+        thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.5},
+                                  name="MonitorServer", daemon=True)
+        thread.start()
+        host, port = self.server_address[:2]
+        logger.warning(f"API server on http://{host}:{port}")
+        return thread
+
+    def close(self):
+        self.stopping.set()
+        self.engine.remove_listener(self._on_event)
+        self.shutdown()
+        self.server_close()
+
+
+class MonitorRequestHandler(BaseHTTPRequestHandler):
+    server_version = "PoseGuard"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"API {self.address_string()} {format % args}")
+
+    # --- helpers ---
+    def _send_json(self, payload, status=200):
+        body = to_json(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, text, content_type="text/plain"):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send_json({"error": message}, status=status)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        payload = json.loads(self.rfile.read(length).decode("utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError("request body must be a JSON object")
+        return payload
+
+    def _query(self):
+        return {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    # --- routing ---
+    def do_GET(self):
+        engine = self.server.engine
+        path = urlparse(self.path).path.rstrip("/") or "/"
+        query = self._query()
+        try:
+            if path == "/api/status":
+                self._send_json(engine.status())
+            elif path == "/api/guards":
+                self._send_json({"known": sorted(engine.target_map), "tracked": list(engine.targets_status),
+                                 "guards": engine.guard_status()})
+            elif path == "/api/events":
+                engine.event_log.flush()
+                since, until = query.get("since"), query.get("until")
+                self._send_json(engine.event_log.query(
+                    guard=query.get("guard"), status=query.get("status"), kind=query.get("kind"),
+                    since=_number_or_text(since), until=_number_or_text(until),
+                    limit=int(query.get("limit", 200))))
+            elif path == "/api/events/counts":
+                engine.event_log.flush()
+                self._send_json(engine.event_log.counts(by=query.get("by", "status"),
+                                                        since=_number_or_text(query.get("since")),
+                                                        kind=query.get("kind")))
+            elif path == "/api/profile":
+                self._send_json({"window": engine.profiler.window, "stages": engine.profiler.snapshot()})
+            elif path == "/metrics":
+                self._send_text(engine.profiler.to_prometheus() + engine.detection_stats.to_prometheus(),
+                                "text/plain; version=0.0.4")
+            elif path == "/snapshot.jpg":
+                self._send_snapshot(query.get("camera"))
+            elif path == "/stream.mjpg":
+                self._stream_mjpeg(query.get("camera"))
+            elif path == "/ws":
+                self._websocket()
+            else:
+                self._error(404, f"no route for GET {path}")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except ValueError as e:
+            self._error(400, str(e))
+        except Exception as e:
+            logger.error(f"API error on GET {path}: {e}")
+            self._error(500, str(e))
+
+    def do_POST(self):
+        engine = self.server.engine
+        path = urlparse(self.path).path.rstrip("/")
+        try:
+            body = self._read_json()
+            if path == "/api/guards/track":
+                names = body.get("names")
+                if not isinstance(names, list):
+                    raise ValueError('"names" must be a list of guard names')
+                engine.load_targets()
+                unknown = [name for name in names if name not in engine.target_map]
+                count = engine.track_targets(names)
+                self._send_json({"tracked": list(engine.targets_status), "count": count, "unknown": unknown})
+            elif path == "/api/alert":
+                if "interval" in body:
+                    interval = float(body["interval"])
+                    if interval <= 0:
+                        raise ValueError("interval must be > 0")
+                    engine.alert_interval = interval
+                if "action" in body:
+                    engine.set_required_action(body["action"])
+                if "enabled" in body:
+                    engine.set_alert_mode(bool(body["enabled"]))
+                self._send_json({"alert_mode": engine.is_alert_mode, "alert_interval": engine.alert_interval,
+                                 "required_action": engine.required_action})
+            elif path == "/api/start":
+                started = engine.start(body.get("source"), body.get("replay"))
+                self._send_json({"running": engine.is_running}, status=200 if started else 409)
+            elif path == "/api/stop":
+                engine.stop()
+                self._send_json({"running": engine.is_running})
+            else:
+                self._error(404, f"no route for POST {path}")
+        except ValueError as e:
+            self._error(400, str(e))
+        except Exception as e:
+            logger.error(f"API error on POST {path}: {e}")
+            self._error(500, str(e))
+
+    # --- previews ---
+    def _send_snapshot(self, camera):
+        _, jpeg = self.server.preview.latest(camera)
+        if jpeg is None:
+            self._error(404, "no frame processed yet")
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(jpeg)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(jpeg)
+
+    def _stream_mjpeg(self, camera):
+        """multipart/x-mixed-replace stream; only new frames are sent, at most preview_max_fps per second"""
+        server = self.server
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        min_gap = 1.0 / server.preview_max_fps if server.preview_max_fps > 0 else 0.0
+        last_key = None
+        while not server.stopping.is_set():
+            started = time.monotonic()
+            key, jpeg = server.preview.latest(camera)
+            if jpeg is not None and key != last_key:
+                self.wfile.write(f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii"))
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+                self.wfile.flush()
+                last_key = key
+            # New frames are polled at the cap rate (or 50 Hz uncapped)
+            time.sleep(max(0.0, (min_gap or 0.02) - (time.monotonic() - started)))
+
+    # --- WebSocket ---
+    def _websocket(self):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if self.headers.get("Upgrade", "").lower() != "websocket" or not key:
+            self._error(400, "expected a WebSocket upgrade")
+            return
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", websocket_accept(key))
+        self.end_headers()
+        self.close_connection = True
+
+        server = self.server
+        client = server.register_client()
+        next_status = 0.0
+        try:
+            while not server.stopping.is_set():
+                now = time.monotonic()
+                if now >= next_status:
+                    self._ws_send({"type": "status", "data": server.engine.status()})
+                    next_status = now + server.status_interval
+                while True:
+                    try:
+                        event = client.get_nowait()
+                    except queue.Empty:
+                        break
+                    self._ws_send({"type": "event", "data": event})
+                # Wait for client frames (close/ping) or the next event poll
+                readable, _, _ = select.select([self.connection], [], [], 0.1)
+                if readable and not self._ws_handle_incoming():
+                    break
+        except (BrokenPipeError, ConnectionResetError, socket.error):
+            pass
+        finally:
+            server.unregister_client(client)
+
+    def _ws_send(self, message, opcode=0x1):
+        self.wfile.write(websocket_frame(to_json(message) if opcode == 0x1 else message, opcode))
+        self.wfile.flush()
+
+    def _ws_handle_incoming(self):
+        """Handle one client frame; False when the connection should close"""
+        opcode, payload = read_websocket_frame(self.rfile)
+        if opcode is None or opcode == 0x8:
+            if opcode == 0x8:
+                self._ws_send(payload[:2], opcode=0x8)
+            return False
+        if opcode == 0x9:
+            self._ws_send(payload, opcode=0xA)
+        return True
+
+
+def _number_or_text(value):
+    """Query-string time bound: epoch seconds when numeric, else passed on as an ISO string"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
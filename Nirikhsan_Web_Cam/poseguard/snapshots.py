@@ -0,0 +1,154 @@
+"""
+Asynchronous snapshot writer.
+
+Alert and capture snapshots used to be colour-converted, JPEG-encoded and
+written on the processing thread, stalling it for tens of milliseconds per
+image during an alert burst. The writer copies the image, reserves a unique
+path and returns at once; conversion, encoding and the (atomic) file write
+happen on a small thread pool. The queue is bounded: when it is full new
+snapshots are dropped rather than blocking the video loop, and the drops show
+up in stats() for the UI.
+"""
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+logger = logging.getLogger("PoseGuard")
+
+
+class SnapshotWriter:
+    """
+    Bounded, thread-pooled JPEG writer.
+
+    Args:
+        max_queue: snapshots waiting or being written before new ones are dropped
+        workers: writer threads
+        jpeg_quality: cv2.IMWRITE_JPEG_QUALITY (0-100)
+    """
+
+    def __init__(self, max_queue=32, workers=2, jpeg_quality=90):
+        self.max_queue = max(1, int(max_queue))
+        self.jpeg_quality = int(jpeg_quality)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="SnapshotWriter")
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._lock = threading.Lock()
+        self._reserved = set()
+        self.pending = 0
+        self.max_pending = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._encode_ms = 0.0
+
+    def reserve_path(self, path):
+        """
+        Claim a path no other snapshot will use: `path`, or `name_1.jpg`,
+        `name_2.jpg`, ... when it exists or is already queued.
+        """
+        root, ext = os.path.splitext(path)
+        with self._lock:
+            candidate, n = path, 0
+            while candidate in self._reserved or os.path.exists(candidate):
+                n += 1
+                candidate = f"{root}_{n}{ext}"
+            self._reserved.add(candidate)
+        return candidate
+
+    def submit(self, path, image, convert=None, on_done=None, overwrite=False):
+        """
+        Queue `image` for writing.
+
+        Args:
+            path: desired file path (a unique variant is reserved, see reserve_path)
+            image: array to save; copied before returning, so the caller may keep drawing on it
+            convert: optional cv2.cvtColor code applied on the writer thread
+            on_done: optional callable(path, ok) run on the writer thread
+            overwrite: write to `path` itself, replacing any existing file
+
+        Returns:
+            (reserved_path, future), or (None, None) when the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.dropped += 1
+            logger.warning(f"Snapshot queue full ({self.max_queue}); dropped {os.path.basename(path)}")
+            return None, None
+
+        if overwrite:
+            with self._lock:
+                self._reserved.add(path)
+        else:
+            path = self.reserve_path(path)
+        image = image.copy()
+        with self._lock:
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+        try:
+            future = self._executor.submit(self._write, path, image, convert, on_done)
+        except RuntimeError:
+            # Writer closed (shutting down)
+            self._release(path)
+            return None, None
+        return path, future
+
+    def write_now(self, path, image, convert=None):
+        """Encode and write synchronously (for files that are read back immediately)."""
+        return self._encode_and_write(path, image, convert)
+
+    def _write(self, path, image, convert, on_done):
+        ok = False
+        try:
+            ok = self._encode_and_write(path, image, convert)
+        except Exception as e:
+            logger.error(f"Snapshot write failed for {path}: {e}")
+        finally:
+            self._release(path, ok)
+        if on_done is not None:
+            on_done(path, ok)
+        return ok
+
+    def _encode_and_write(self, path, image, convert=None):
+        start = time.perf_counter()
+        if convert is not None:
+            image = cv2.cvtColor(image, convert)
+        ok, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError(f"JPEG encode failed for {path}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data.tobytes())
+        os.replace(tmp_path, path)  # readers never see a half-written file
+        with self._lock:
+            # Exponential moving average of encode + write time
+            elapsed = (time.perf_counter() - start) * 1000.0
+            self._encode_ms = elapsed if self._encode_ms == 0.0 else self._encode_ms * 0.9 + elapsed * 0.1
+        return True
+
+    def _release(self, path, ok=False):
+        with self._lock:
+            self._reserved.discard(path)
+            self.pending -= 1
+            if ok:
+                self.written += 1
+            else:
+                self.failed += 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": self.pending,
+                "max_pending": self.max_pending,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "encode_ms": self._encode_ms,
+            }
+
+    def close(self, wait=True):
+        """Stop accepting snapshots; with wait=True, finish writing the queued ones."""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,193 @@
+"""
+Multi-camera streams.
+
+Each CameraStream owns its capture, FrameGrabber, processing thread and
+per-camera tracker state. Guard-level state (alert timers, logging flags,
+face encoding) is shared by all streams: a stream's view of a guard is a
+StreamGuardStatus that keeps tracker keys local and routes everything else
+to the guard's shared status dict, so an action seen on any camera resets
+the alert timer for every camera.
+"""
+import threading
+from collections import deque
+from collections.abc import MutableMapping
+
+import cv2
+import numpy as np
+
+from poseguard.capture import RateMeter
+from poseguard.framepool import FrameSlot
+
+# Per-camera tracker state; all other status keys are shared across streams
+STREAM_LOCAL_KEYS = frozenset({
+    "tracker", "face_box", "visible", "missing_pose_counter", "face_confidence",
+    "pose_confidence", "pose_buffer", "face_encoding_history", "last_valid_pose", "last_pose",
+    "box_filter", "crop_size",
+})
+
+
+class StreamGuardStatus(MutableMapping):
+    """
+    One stream's view of a guard's status.
+
+    Args:
+        shared: the guard's status dict shared by all streams
+        local: this stream's values for STREAM_LOCAL_KEYS
+    """
+
+    __slots__ = ("shared", "local")
+
+    def __init__(self, shared, local):
+        self.shared = shared
+        self.local = local
+
+    def _target(self, key):
+        return self.local if key in STREAM_LOCAL_KEYS else self.shared
+
+    def __getitem__(self, key):
+        return self._target(key)[key]
+
+    def __setitem__(self, key, value):
+        self._target(key)[key] = value
+
+    def __delitem__(self, key):
+        del self._target(key)[key]
+
+    def __iter__(self):
+        yield from self.local
+        for key in self.shared:
+            if key not in STREAM_LOCAL_KEYS:
+                yield key
+
+    def __len__(self):
+        return len(self.local) + sum(1 for key in self.shared if key not in STREAM_LOCAL_KEYS)
+
+
+def make_stream_status(shared):
+    """Fresh per-stream view of a guard's shared status (empty tracker state, own pose buffer)."""
+    local = {}
+    for key in STREAM_LOCAL_KEYS:
+        value = shared.get(key)
+        if isinstance(value, deque):
+            value = deque(maxlen=value.maxlen)
+        elif key in ("tracker", "box_filter", "crop_size"):
+            value = None
+        local[key] = value
+    local["visible"] = False
+    local["missing_pose_counter"] = 0
+    local["face_confidence"] = 0.0
+    local["pose_confidence"] = 0.0
+    shared.setdefault("visible_streams", set())
+    return StreamGuardStatus(shared, local)
+
+
+def visible_anywhere(status):
+    """Guard visible on this stream or (multi-stream) on any other stream."""
+    return status["visible"] or bool(status.get("visible_streams"))
+
+
+class CameraStream:
+    """
+    Capture + tracker state for one camera.
+
+    Attribute names mirror the single-camera PoseApp fields so the tracking
+    pipeline can run against either.
+
+    Args:
+        stream_id: short label shown on the tile (e.g. "cam0")
+        source: device index, URL or file path
+        cap: opened cv2.VideoCapture
+    """
+
+    def __init__(self, stream_id, source, cap):
+        self.stream_id = stream_id
+        self.source = source
+        self.cap = cap
+        self.frame_grabber = None
+        self.processing_thread = None
+        self.lock = threading.RLock()
+        self.targets_status = {}
+        self.last_action_cache = {}
+        self.motion_gate = None
+        self.re_detect_counter = 0
+        self.frame_counter = 0
+        self.tracker_tick = 0
+        self.last_process_slot = FrameSlot()
+        self.fugitive_detected_log_done = False
+        self.display_slot = FrameSlot()
+        self.processing_meter = RateMeter()
+
+    def sync_targets(self, shared_statuses):
+        """Rebuild this stream's guard views after the tracked guard set changed."""
+        with self.lock:
+            old = self.targets_status
+            self.targets_status = {name: make_stream_status(shared) for name, shared in shared_statuses.items()}
+            for name in set(old) - set(shared_statuses):
+                self.last_action_cache.pop(name, None)
+            if self.motion_gate:
+                self.motion_gate.retain(shared_statuses)
+
+    def remove_target(self, name):
+        with self.lock:
+            self.targets_status.pop(name, None)
+            self.last_action_cache.pop(name, None)
+            if self.motion_gate:
+                self.motion_gate.forget(name)
+
+    def publish_visibility(self):
+        """Record on each guard's shared status whether this stream currently sees it."""
+        for status in self.targets_status.values():
+            streams = status["visible_streams"]
+            if status["visible"]:
+                streams.add(self.stream_id)
+            else:
+                streams.discard(self.stream_id)
+
+    def release(self):
+        if self.frame_grabber:
+            self.frame_grabber.stop()
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        self.last_process_slot.clear()
+        self.display_slot.clear()
+        for status in self.targets_status.values():
+            status["visible_streams"].discard(self.stream_id)
+            status["tracker"] = None
+            status["box_filter"] = None
+
+
+def tile_frames(frames, width, height, labels=None):
+    """
+    Arrange frames in a near-square grid that fits width x height.
+
+    Each frame is downscaled to its tile before being placed, so only the
+    final mosaic (at display size) is converted for Tk.
+
+    Args:
+        frames: list of BGR frames (None = empty tile)
+        width, height: mosaic size in pixels
+        labels: optional text drawn in each tile's corner
+
+    Returns:
+        BGR mosaic of shape (height, width, 3)
+    """
+    count = max(1, len(frames))
+    cols = int(np.ceil(np.sqrt(count)))
+    rows = int(np.ceil(count / float(cols)))
+    tile_w, tile_h = max(1, width // cols), max(1, height // rows)
+    mosaic = np.zeros((tile_h * rows, tile_w * cols, 3), dtype=np.uint8)
+
+    for i, frame in enumerate(frames):
+        r, c = divmod(i, cols)
+        x0, y0 = c * tile_w, r * tile_h
+        if frame is not None:
+            h, w = frame.shape[:2]
+            scale = min(tile_w / float(w), tile_h / float(h))
+            new_w, new_h = max(1, int(w * scale)), max(1, int(h * scale))
+            small = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+            ox, oy = x0 + (tile_w - new_w) // 2, y0 + (tile_h - new_h) // 2
+            mosaic[oy:oy + new_h, ox:ox + new_w] = small
+        if labels:
+            cv2.putText(mosaic, str(labels[i]), (x0 + 8, y0 + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    return mosaic
@@ -0,0 +1,239 @@
+"""
+Pluggable guard trackers.
+
+Each tracked guard holds a tracker handle in status["tracker"]; a
+TrackerBackend creates the handles and updates all of them for a frame.
+
+Backends (performance.tracker_backend):
+    csrt   - cv2 CSRT (default): most accurate, slowest, cost linear in guard count
+    kcf    - cv2 KCF: several times faster, fixed box size (opt-in)
+    mosse  - cv2 MOSSE (legacy): fastest correlation filter (opt-in)
+    sort   - SORT-style (opt-in): a constant-velocity Kalman filter per guard, corrected
+             every `detection_interval` frames by IoU association with the
+             frame's face detections; no per-frame image work at all
+
+Every backend applies the same jump rejection (a box that moved or resized
+too far in one frame means the tracker latched onto something else).
+"""
+import logging
+
+import cv2
+import numpy as np
+
+from poseguard.boxes import iou_matrix
+from poseguard.face_matching import assign_faces
+
+logger = logging.getLogger("PoseGuard")
+
+TRACKER_BACKENDS = ("csrt", "kcf", "mosse", "sort")
+OPENCV_TRACKERS = {"csrt": "TrackerCSRT_create", "kcf": "TrackerKCF_create", "mosse": "TrackerMOSSE_create"}
+
+
+def box_jump_rejected(old_box, new_box, max_step=0.2, tolerance=4.0):
+    """
+    True if the move from old_box to new_box is too large for one frame.
+
+    Movement (sum of corner shifts per axis) may be up to `tolerance` times
+    `max_step` of the larger box side, size change up to `tolerance` times
+    `max_step` of the box perimeter half.
+
+    Args:
+        old_box, new_box: (x1, y1, x2, y2)
+    """
+    old_x1, old_y1, old_x2, old_y2 = old_box
+    new_x1, new_y1, new_x2, new_y2 = new_box
+    dx = abs(new_x1 - old_x1) + abs(new_x2 - old_x2)
+    dy = abs(new_y1 - old_y1) + abs(new_y2 - old_y2)
+    old_w, old_h = old_x2 - old_x1, old_y2 - old_y1
+    size_change = abs((new_x2 - new_x1) - old_w) + abs((new_y2 - new_y1) - old_h)
+    max_movement = max(old_w, old_h) * max_step * tolerance
+    max_size_change = (old_w + old_h) * max_step * tolerance
+    return dx > max_movement or dy > max_movement or size_change > max_size_change
+
+
+def create_opencv_tracker(kind):
+    """cv2 tracker instance for `kind`, from cv2.legacy (contrib) or the main module."""
+    factory = OPENCV_TRACKERS[kind]
+    for module in (getattr(cv2, "legacy", None), cv2):
+        if module is not None and hasattr(module, factory):
+            return getattr(module, factory)()
+    raise RuntimeError(f"OpenCV build has no {factory} (install opencv-contrib-python)")
+
+
+class OpenCVTracker:
+    """Tracker handle around a cv2 tracker; `box` is the last accepted (x1, y1, x2, y2)."""
+
+    def __init__(self, kind, frame, box):
+        x1, y1, x2, y2 = box
+        self.tracker = create_opencv_tracker(kind)
+        self.tracker.init(frame, (int(x1), int(y1), int(x2 - x1), int(y2 - y1)))
+        self.box = tuple(int(v) for v in box)
+
+    def update(self, frame):
+        """(success, (x1, y1, x2, y2))"""
+        success, rect = self.tracker.update(frame)
+        if not success:
+            return False, None
+        x, y, w, h = [int(v) for v in rect]
+        return True, (x, y, x + w, y + h)
+
+
+class KalmanBoxFilter:
+    """
+    Constant-velocity Kalman filter over a box.
+
+    State is (cx, cy, w, h, vx, vy, vw, vh); measurements are boxes.
+
+    Args:
+        box: initial (x1, y1, x2, y2)
+        process_noise: variance added to the position terms per step
+        measurement_noise: variance of a measured box coordinate (pixels^2)
+    """
+
+    def __init__(self, box, process_noise=1.0, measurement_noise=4.0):
+        self.x = np.zeros(8)
+        self.x[:4] = self._to_state(box)
+        self.P = np.diag([measurement_noise] * 4 + [100.0] * 4)
+        self.F = np.eye(8)
+        self.F[:4, 4:] = np.eye(4)
+        self.Q = np.diag([process_noise] * 4 + [process_noise * 0.1] * 4)
+        self.R = np.eye(4) * measurement_noise
+
+    @staticmethod
+    def _to_state(box):
+        x1, y1, x2, y2 = box
+        return np.array([(x1 + x2) / 2.0, (y1 + y2) / 2.0, x2 - x1, y2 - y1], dtype=np.float64)
+
+    @property
+    def box(self):
+        cx, cy, w, h = self.x[:4]
+        w, h = max(1.0, w), max(1.0, h)
+        return (int(round(cx - w / 2)), int(round(cy - h / 2)), int(round(cx + w / 2)), int(round(cy + h / 2)))
+
+    def predict(self):
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        return self.box
+
+    def correct(self, box):
+        y = self._to_state(box) - self.x[:4]
+        S = self.P[:4, :4] + self.R
+        K = self.P[:, :4] @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = self.P - K @ self.P[:4, :]
+        return self.box
+
+
+class SortTrack:
+    """SORT tracker handle: Kalman-predicted box, lost after `max_misses` unmatched detections."""
+
+    def __init__(self, box):
+        self.kalman = KalmanBoxFilter(box)
+        self.box = tuple(int(v) for v in box)
+        self.since_detection = 0
+        self.misses = 0
+
+
+class TrackerBackend:
+    """
+    Creates and updates tracker handles for one tracker kind.
+
+    Args:
+        kind: one of TRACKER_BACKENDS
+        executor: optional thread pool; OpenCV trackers release the GIL, so
+                  several guards update in parallel
+        detection_interval: (sort) frames between detection-based corrections
+        iou_threshold: (sort) minimum IoU to associate a detection with a track
+        max_misses: (sort) consecutive detection rounds without a match before a track is lost
+    """
+
+    def __init__(self, kind="csrt", executor=None, detection_interval=5, iou_threshold=0.3, max_misses=2):
+        kind = str(kind).lower()
+        if kind not in TRACKER_BACKENDS:
+            logger.warning(f"Unknown tracker backend '{kind}', using csrt")
+            kind = "csrt"
+        if kind in OPENCV_TRACKERS:
+            try:
+                create_opencv_tracker(kind)
+            except RuntimeError as e:
+                logger.warning(f"{e}; falling back to the sort tracker backend")
+                kind = "sort"
+        self.kind = kind
+        self.executor = executor
+        self.detection_interval = max(1, int(detection_interval))
+        self.iou_threshold = iou_threshold
+        self.max_misses = max(1, int(max_misses))
+
+    def create(self, frame, box):
+        """New tracker handle for a guard first seen at box (x1, y1, x2, y2)."""
+        if self.kind == "sort":
+            return SortTrack(box)
+        return OpenCVTracker(self.kind, frame, box)
+
+    def update(self, frame, tracks, detect=None, reference=None):
+        """
+        Advance every tracker by one frame.
+
+        Args:
+            frame: BGR frame
+            tracks: {name: tracker handle}
+            detect: callable() -> list of (x1, y1, x2, y2) detections of this
+                    frame; only called by the sort backend when a correction is due
+            reference: optional {name: expected box} (e.g. a motion-model
+                       prediction) to measure jumps against instead of the
+                       tracker's previous box
+
+        Returns:
+            {name: (x1, y1, x2, y2)} for tracks still held, None for lost ones
+        """
+        if not tracks:
+            return {}
+        if self.kind == "sort":
+            raw = self._update_sort(tracks, detect)
+        else:
+            items = list(tracks.items())
+            if self.executor is not None and len(items) > 1:
+                updates = list(self.executor.map(lambda item: item[1].update(frame), items))
+            else:
+                updates = [handle.update(frame) for _, handle in items]
+            raw = {name: (box if success else None) for (name, _), (success, box) in zip(items, updates)}
+
+        reference = reference or {}
+        boxes = {}
+        for name, box in raw.items():
+            handle = tracks[name]
+            expected = reference.get(name, handle.box)
+            if box is not None and box_jump_rejected(expected, box):
+                logger.debug(f"{name}: Tracker movement too large ({expected} -> {box}) - resetting")
+                box = None
+            if box is not None:
+                handle.box = box
+            boxes[name] = box
+        return boxes
+
+    def _update_sort(self, tracks, detect):
+        names = list(tracks)
+        predicted = {name: tracks[name].kalman.predict() for name in names}
+        due = [name for name in names if tracks[name].since_detection + 1 >= self.detection_interval]
+        for name in names:
+            tracks[name].since_detection += 1
+        if not due or detect is None:
+            return predicted
+
+        detections = list(detect())
+        ious = iou_matrix([predicted[name] for name in due], detections)
+        matches = assign_faces(1.0 - ious, 1.0 - self.iou_threshold)
+        matched = set()
+        for row, col, _ in matches:
+            track = tracks[due[row]]
+            predicted[due[row]] = track.kalman.correct(detections[col])
+            track.misses = 0
+            matched.add(row)
+        for row, name in enumerate(due):
+            track = tracks[name]
+            track.since_detection = 0
+            if row not in matched:
+                track.misses += 1
+                if track.misses >= self.max_misses:
+                    predicted[name] = None
+        return predicted
@@ -0,0 +1,95 @@
+"""IoU matrix and overlap resolution against the original pairwise loops."""
+import numpy as np
+
+from poseguard.boxes import iou_matrix, overlap_conflicts
+
+
+def calculate_iou(box_a, box_b):
+    """Scalar IoU of two (x, y, w, h) boxes, as the scripts computed it."""
+    x_a, y_a = max(box_a[0], box_b[0]), max(box_a[1], box_b[1])
+    x_b = min(box_a[0] + box_a[2], box_b[0] + box_b[2])
+    y_b = min(box_a[1] + box_a[3], box_b[1] + box_b[3])
+    inter = max(0, x_b - x_a) * max(0, y_b - y_a)
+    return inter / float(box_a[2] * box_a[3] + box_b[2] * box_b[3] - inter + 1e-5)
+
+
+def xywh(box):
+    return (box[0], box[1], box[2] - box[0], box[3] - box[1])
+
+
+def independent_loop(boxes, scores, threshold, iou_weight):
+    """Main script's loop: every pair of the visible set at entry is judged, ties hide box i."""
+    hidden = set()
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            iou = calculate_iou(xywh(boxes[i]), xywh(boxes[j]))
+            if iou > threshold:
+                score_i = scores[i] + iou_weight * (1 - iou)
+                score_j = scores[j] + iou_weight * (1 - iou)
+                hidden.add(j if score_i > score_j else i)
+    return sorted(hidden)
+
+
+def sequential_loop(boxes, scores, threshold):
+    """Upgrads script's loop: hidden boxes drop out as it goes, ties keep both."""
+    visible = [True] * len(boxes)
+    for i in range(len(boxes)):
+        if not visible[i]:
+            continue
+        for j in range(i + 1, len(boxes)):
+            if not visible[j]:
+                continue
+            if calculate_iou(xywh(boxes[i]), xywh(boxes[j])) > threshold:
+                if scores[i] < scores[j]:
+                    visible[i] = False
+                elif scores[j] < scores[i]:
+                    visible[j] = False
+    return [k for k, shown in enumerate(visible) if not shown]
+
+
+def random_scene(rng):
+    n = int(rng.integers(2, 16))
+    xy = rng.integers(0, 200, size=(n, 2))
+    wh = rng.integers(20, 80, size=(n, 2))
+    boxes = [tuple(int(v) for v in (x, y, x + w, y + h)) for (x, y), (w, h) in zip(xy, wh)]
+    scores = [float(s) for s in rng.choice([0.2, 0.5, 0.8, 0.9], size=n)]
+    return boxes, scores
+
+
+def test_iou_matrix_matches_scalar_iou():
+    rng = np.random.default_rng(1)
+    boxes, _ = random_scene(rng)
+    expected = [[calculate_iou(xywh(a), xywh(b)) for b in boxes] for a in boxes]
+    np.testing.assert_allclose(iou_matrix(boxes, boxes), expected, rtol=1e-12)
+    assert iou_matrix([], boxes).shape == (0, len(boxes))
+
+
+def test_independent_mode_matches_pairwise_loop():
+    rng = np.random.default_rng(2)
+    for _ in range(1000):
+        boxes, scores = random_scene(rng)
+        losers, conflicts = overlap_conflicts(boxes, scores, 0.35, iou_weight=0.1)
+        assert losers == independent_loop(boxes, scores, 0.35, 0.1)
+        assert all(ls <= ws for _, _, _, ls, ws in conflicts)
+
+
+def test_sequential_mode_matches_loop_that_hides_as_it_goes():
+    rng = np.random.default_rng(3)
+    for _ in range(1000):
+        boxes, scores = random_scene(rng)
+        losers, _ = overlap_conflicts(boxes, scores, 0.3, keep_ties=True, sequential=True)
+        assert losers == sequential_loop(boxes, scores, 0.3)
+
+
+def test_chain_hides_only_the_middle_box_sequentially():
+    # A overlaps B, B overlaps C, A and C are apart; A > B > C
+    boxes = [(0, 0, 100, 100), (30, 0, 130, 100), (70, 0, 170, 100)]
+    scores = [0.9, 0.5, 0.1]
+    assert overlap_conflicts(boxes, scores, 0.3)[0] == [1, 2]
+    assert overlap_conflicts(boxes, scores, 0.3, sequential=True)[0] == [1]
+
+
+def test_ties():
+    boxes = [(0, 0, 100, 100), (10, 0, 110, 100)]
+    assert overlap_conflicts(boxes, [0.5, 0.5], 0.3)[0] == [0]
+    assert overlap_conflicts(boxes, [0.5, 0.5], 0.3, keep_ties=True) == ([], [])
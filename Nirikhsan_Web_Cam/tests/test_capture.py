@@ -0,0 +1,88 @@
+"""FrameRingBuffer: drop-oldest delivery for live sources, lossless delivery for replay."""
+import threading
+import time
+
+from poseguard.capture import CapturedFrame, FrameRingBuffer
+from poseguard.framepool import FramePool
+
+
+def pooled_frame(pool, index):
+    pooled = pool.acquire((4, 4, 3))
+    return CapturedFrame(index, time.monotonic(), pooled.array, pooled)
+
+
+def test_full_buffer_evicts_and_releases_the_oldest_frame():
+    pool = FramePool()
+    buffer = FrameRingBuffer(capacity=3)
+    frames = [pooled_frame(pool, index) for index in range(5)]
+    for captured in frames:
+        buffer.push(captured)
+    assert buffer.latest().index == 4
+    # Frames 0 and 1 were evicted and their buffers went back to the pool
+    assert pool.stats()["free"] == 2
+
+    buffer.clear()
+    assert buffer.latest() is None
+    assert pool.stats()["free"] == 5
+
+
+def test_live_consumer_gets_the_newest_frame_and_counts_skipped_ones():
+    buffer = FrameRingBuffer(capacity=4)
+    buffer.push(CapturedFrame(0, 0.0, None))
+    assert buffer.wait_next(timeout=1).index == 0
+    for index in range(1, 5):
+        buffer.push(CapturedFrame(index, 0.0, None))
+    assert buffer.wait_next(after_index=0, timeout=1).index == 4
+    assert buffer.dropped == 3
+    assert buffer.wait_next(after_index=4, timeout=0.05) is None
+
+
+def test_delivered_frame_stays_valid_until_the_consumer_releases_it():
+    pool = FramePool()
+    buffer = FrameRingBuffer(capacity=1)
+    buffer.push(pooled_frame(pool, 0))
+    held = buffer.wait_latest(timeout=1)
+    buffer.push(pooled_frame(pool, 1))
+    assert pool.stats()["free"] == 0
+    held.release()
+    assert pool.stats()["free"] == 1
+
+
+def test_lossless_buffer_delivers_every_frame_in_order():
+    buffer = FrameRingBuffer(capacity=2, lossless=True)
+    total = 20
+
+    def produce():
+        for index in range(total):
+            buffer.push(CapturedFrame(index, 0.0, None))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    received, last = [], -1
+    while last < total - 1:
+        captured = buffer.wait_next(after_index=last, timeout=2)
+        assert captured is not None
+        received.append(captured.index)
+        last = captured.index
+    producer.join(timeout=2)
+    assert received == list(range(total))
+    assert buffer.dropped == 0
+
+
+def test_lossless_push_waits_for_room_and_gives_up_on_stop():
+    pool = FramePool()
+    buffer = FrameRingBuffer(capacity=1, lossless=True)
+    buffer.push(pooled_frame(pool, 0))
+
+    stop = threading.Event()
+    blocked = threading.Thread(target=buffer.push, args=(pooled_frame(pool, 1), stop), daemon=True)
+    blocked.start()
+    blocked.join(timeout=0.2)
+    assert blocked.is_alive() and buffer.latest().index == 0
+
+    stop.set()
+    blocked.join(timeout=2)
+    assert not blocked.is_alive()
+    # The frame that never got in was released, frame 0 is still queued
+    assert buffer.latest().index == 0
+    assert pool.stats()["free"] == 1
@@ -0,0 +1,115 @@
+"""One face detection pass per frame, shared by every consumer."""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from poseguard.detection_context import DetectionStats, FaceDetectionContext
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.json")
+
+FACE = (40, 120, 120, 40)  # (top, right, bottom, left)
+
+
+def counting_context(locations=(FACE,)):
+    calls = {"detect": 0, "encode": 0}
+
+    def detect(encode):
+        calls["detect"] += 1
+        return list(locations), ([np.ones(128)] * len(locations) if encode else [])
+
+    def encode(found):
+        calls["encode"] += 1
+        return [np.ones(128)] * len(found)
+
+    return FaceDetectionContext(detect, encode), calls
+
+
+def test_detector_runs_once_and_later_lookups_hit_the_cache():
+    faces, calls = counting_context()
+    assert faces.locations() == [FACE]
+    locations, encodings = faces.faces()
+    faces.faces()
+    assert locations == [FACE] and len(encodings) == 1
+    # Encodings were not needed by the first lookup, so they are computed once, later
+    assert calls == {"detect": 1, "encode": 1}
+    assert (faces.detector_calls, faces.encoder_calls, faces.cache_hits) == (1, 1, 2)
+
+
+def test_no_faces_never_calls_the_encoder():
+    faces, calls = counting_context(locations=())
+    assert faces.faces() == ([], [])
+    assert faces.faces() == ([], [])
+    assert calls == {"detect": 1, "encode": 0}
+    assert faces.cache_hits == 1
+
+
+def test_stats_accumulate_per_frame_counts():
+    stats = DetectionStats()
+    for _ in range(3):
+        faces, _ = counting_context()
+        faces.locations()
+        faces.faces()
+        stats.record(faces)
+    assert stats.as_dict() == {
+        "frames": 3, "detector_calls": 3, "encoder_calls": 3, "cache_hits": 3,
+        "max_detector_calls_per_frame": 1, "last_detector_calls": 1,
+        "last_encoder_calls": 1, "last_cache_hits": 1,
+    }
+    assert "poseguard_face_detection_cache_hits_total 3" in stats.to_prometheus()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    pytest.importorskip("mediapipe")
+    from poseguard.encoding_cache import EncodingCache
+    from poseguard.engine import MonitorEngine
+
+    with open(CONFIG_PATH) as f:
+        config = json.load(f)
+    config["storage"].update(alert_snapshots_dir=str(tmp_path / "alert_snapshots"),
+                             pose_references_dir=str(tmp_path / "pose_references"),
+                             guard_profiles_dir=str(tmp_path / "guard_profiles"))
+    config["logging"]["log_directory"] = str(tmp_path / "logs")
+    config["alert"]["play_sound"] = False
+
+    class CountingEngine(MonitorEngine):
+        detect_calls = 0
+
+        def _detect_faces(self, rgb_frame, frame_ref, encode=True, deadline=None):
+            self.detect_calls += 1
+            # A stranger: matches neither the guard nor the fugitive
+            return [FACE], ([np.full(128, 5.0)] if encode else [])
+
+        def _encode_faces(self, rgb_frame, frame_ref, face_locations, deadline=None):
+            return [np.full(128, 5.0)] * len(face_locations)
+
+    os.makedirs(config["storage"]["guard_profiles_dir"])
+    profile = os.path.join(config["storage"]["guard_profiles_dir"], "target_Alice_face.jpg")
+    open(profile, "wb").close()
+    cache = EncodingCache(os.path.join(config["storage"]["guard_profiles_dir"], "encodings.npz"))
+    cache.put(profile, np.zeros(128))
+
+    engine = CountingEngine(config, encoding_cache=cache)
+    engine.load_targets()
+    engine.track_targets(["Alice"])
+    yield engine
+    engine.close()
+
+
+def test_fugitive_pro_and_redetect_share_one_detection(engine):
+    engine.start_fugitive(None, np.full(128, -5.0), name="Fugitive")
+    engine.reid_enabled = True  # PRO_Detection's features only need OpenCV
+    assert engine.start_pro_detection()
+    engine.re_detect_counter = engine.RE_DETECT_INTERVAL  # Alice is untracked: re-detect this frame
+    engine.replay_mode = True  # analyse every frame (no frame skipping)
+
+    engine.process_frame(np.zeros((240, 320, 3), np.uint8))
+
+    stats = engine.detection_stats.as_dict()
+    assert engine.detect_calls == 1
+    assert stats["last_detector_calls"] == 1
+    # Fugitive scan detects; PRO_Detection and re-detection reuse its result
+    assert stats["last_cache_hits"] == 2
+    assert engine.status()["detection"]["frames"] == 1
@@ -0,0 +1,93 @@
+"""EventLog batching writer, filtered queries, counts and CSV export."""
+import csv
+import time
+from datetime import datetime
+
+import pytest
+
+from poseguard.eventlog import CSV_HEADER, EventLog
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    log = EventLog(str(tmp_path / "logs" / "events.db"), flush_interval=60, flush_rows=1000, fsync="off")
+    yield log
+    log.close()
+
+
+def fill(log):
+    log.log("Alice", "Hands Up", "ACTION PERFORMED", confidence=0.9, ts=100)
+    log.log("Alice", "MISSING", "ALERT TRIGGERED - TARGET MISSING", ts=200)
+    log.log("Bob", "Standing", "ALERT TRIGGERED", image_path="alert_snapshots/bob.jpg", confidence="0.75", ts=300)
+    log.log("Person_001", "ReID_Detected", "PRO_DETECTION", confidence=0.7, kind="pro_detection", ts=400)
+    assert log.flush()
+
+
+def test_events_are_committed_on_flush(event_log):
+    event_log.log("Alice", "Hands Up", "ACTION PERFORMED")
+    assert event_log.query() == []  # still pending: neither flush_rows nor flush_interval reached
+    assert event_log.flush()
+    assert event_log.written == 1 and event_log.failed == 0
+    assert len(event_log.query()) == 1
+
+
+def test_row_threshold_commits_without_flush(tmp_path):
+    log = EventLog(str(tmp_path / "events.db"), flush_interval=60, flush_rows=2, fsync="off")
+    try:
+        log.log("Alice", "Hands Up", "ACTION PERFORMED", ts=1)
+        log.log("Alice", "Hands Up", "ACTION PERFORMED", ts=2)
+        for _ in range(100):
+            if log.written == 2:
+                break
+            time.sleep(0.01)
+        assert log.written == 2
+    finally:
+        log.close()
+
+
+def test_query_filters_and_order(event_log):
+    fill(event_log)
+    assert [row["ts"] for row in event_log.query()] == [400, 300, 200, 100]
+    assert [row["ts"] for row in event_log.query(newest_first=False, limit=2)] == [100, 200]
+
+    alice = event_log.query(guard="Alice")
+    assert [row["action"] for row in alice] == ["MISSING", "Hands Up"]
+    assert alice[1]["confidence"] == pytest.approx(0.9)
+    assert alice[0]["image_path"] == "N/A" and alice[0]["kind"] == "guard"
+
+    # since is inclusive, until exclusive; datetimes and ISO strings are accepted
+    assert [row["ts"] for row in event_log.query(since=200, until=400)] == [300, 200]
+    assert len(event_log.query(since=datetime.fromtimestamp(300))) == 2
+    assert len(event_log.query(until=datetime.fromtimestamp(200).isoformat())) == 1
+    assert [row["guard"] for row in event_log.query(kind="pro_detection")] == ["Person_001"]
+    assert event_log.query(status="ALERT TRIGGERED")[0]["confidence"] == pytest.approx(0.75)
+
+
+def test_counts(event_log):
+    fill(event_log)
+    assert event_log.counts(by="guard") == {"Alice": 2, "Bob": 1, "Person_001": 1}
+    assert event_log.counts(by="kind") == {"guard": 3, "pro_detection": 1}
+    assert event_log.counts(by="guard", since=200, kind="guard") == {"Alice": 1, "Bob": 1}
+    with pytest.raises(ValueError):
+        event_log.counts(by="image_path")
+
+
+def test_export_csv_uses_the_old_layout(event_log, tmp_path):
+    fill(event_log)
+    path = tmp_path / "events.csv"
+    assert event_log.export_csv(str(path), guard="Alice") == 2
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_HEADER
+    assert [row[2] for row in rows[1:]] == ["Hands Up", "MISSING"]
+    assert rows[1][5] == "0.90"
+
+
+def test_close_commits_pending_events(tmp_path):
+    path = str(tmp_path / "events.db")
+    log = EventLog(path, flush_interval=60, flush_rows=1000, fsync="full")
+    log.log("Alice", "Hands Up", "ACTION PERFORMED")
+    log.close()
+    reopened = EventLog(path, fsync="off")
+    assert len(reopened.query()) == 1
+    reopened.close()
@@ -0,0 +1,59 @@
+"""Batched face distances and tolerance-bounded one-to-one assignment."""
+import numpy as np
+import pytest
+
+from poseguard import face_matching
+from poseguard.face_matching import assign_faces, encoding_matrix, face_distance_matrix
+
+
+@pytest.fixture(params=["hungarian", "greedy"])
+def solver(request, monkeypatch):
+    if request.param == "greedy":
+        monkeypatch.setattr(face_matching, "linear_sum_assignment", None)
+    elif face_matching.linear_sum_assignment is None:
+        pytest.skip("SciPy not installed")
+    return request.param
+
+
+def test_distance_matrix_matches_pairwise_norm():
+    rng = np.random.default_rng(3)
+    known = encoding_matrix(rng.normal(size=(4, 128)))
+    unknown = [rng.normal(size=128) for _ in range(3)]
+    expected = np.array([[np.linalg.norm(k - u) for u in unknown] for k in known])
+    np.testing.assert_allclose(face_distance_matrix(known, unknown), expected, rtol=1e-9)
+    assert face_distance_matrix(known, []).shape == (4, 0)
+
+
+def test_pairs_at_or_above_tolerance_are_never_assigned(solver):
+    distances = np.array([[0.49, 0.50],
+                          [0.70, 0.51]])
+    assert assign_faces(distances, tolerance=0.5) == [(0, 0, 0.49)]
+    assert assign_faces(distances, tolerance=0.3) == []
+
+
+def test_each_guard_and_face_is_used_once(solver):
+    distances = np.array([[0.10, 0.20, 0.90],
+                          [0.15, 0.40, 0.90],
+                          [0.30, 0.35, 0.45]])
+    pairs = assign_faces(distances, tolerance=0.5)
+    assert len({g for g, _, _ in pairs}) == len({f for _, f, _ in pairs}) == len(pairs)
+    # Greedy strands guard 1 behind (0, 0) and (2, 1); the optimal assignment matches everyone
+    assert len(pairs) == (3 if solver == "hungarian" else 2)
+    assert [d for _, _, d in pairs] == sorted(d for _, _, d in pairs)
+
+
+def test_optimal_assignment_beats_greedy():
+    if face_matching.linear_sum_assignment is None:
+        pytest.skip("SciPy not installed")
+    # Greedy takes (0, 0) first and leaves guard 1 without an in-tolerance face
+    distances = np.array([[0.10, 0.20],
+                          [0.30, 0.60]])
+    pairs = assign_faces(distances, tolerance=0.5)
+    assert sorted((g, f) for g, f, _ in pairs) == [(0, 1), (1, 0)]
+
+
+def test_out_of_tolerance_pairs_do_not_block_valid_ones(solver):
+    distances = np.array([[0.90, 0.20, 0.90],
+                          [0.90, 0.90, 0.90]])
+    assert assign_faces(distances, tolerance=0.5) == [(0, 1, 0.20)]
+    assert assign_faces(np.empty((2, 0)), tolerance=0.5) == []
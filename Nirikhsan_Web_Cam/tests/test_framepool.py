@@ -0,0 +1,83 @@
+"""FramePool reference counting and FrameSlot publication."""
+import cv2
+import numpy as np
+import pytest
+
+from poseguard.framepool import FramePool, FrameSlot
+
+
+def test_buffer_is_recycled_only_after_the_last_release():
+    pool = FramePool()
+    frame = pool.acquire((8, 8, 3))
+    frame.retain()
+    frame.release()
+    assert pool.stats()["free"] == 0
+    frame.release()
+    assert pool.stats()["free"] == 1
+
+    again = pool.acquire((8, 8, 3))
+    assert again.array is frame.array
+    assert pool.stats()["reuses"] == 1 and pool.stats()["allocations"] == 1
+
+
+def test_buffers_are_pooled_per_shape_and_dtype():
+    pool = FramePool()
+    pool.acquire((8, 8, 3)).release()
+    other = pool.acquire((8, 8, 3), dtype=np.float32)
+    assert other.array.dtype == np.float32
+    assert pool.stats()["allocations"] == 2 and pool.stats()["reuses"] == 0
+
+
+def test_free_list_is_capped():
+    pool = FramePool(max_free=2)
+    frames = [pool.acquire((4, 4)) for _ in range(4)]
+    for frame in frames:
+        frame.release()
+    assert pool.stats()["free"] == 2
+
+
+def test_adopted_arrays_are_counted_and_recycled():
+    pool = FramePool()
+    array = np.zeros((4, 4, 3), np.uint8)
+    pool.adopt(array).release()
+    assert pool.stats()["bytes_allocated"] == array.nbytes
+    assert pool.acquire((4, 4, 3)).array is array
+
+
+def test_convert_reuses_the_scratch_buffer_per_key():
+    pool = FramePool()
+    image = np.random.default_rng(0).integers(0, 255, (6, 6, 3), dtype=np.uint8)
+    first = pool.convert("rgb", image, cv2.COLOR_BGR2RGB)
+    second = pool.convert("rgb", image[::-1].copy(), cv2.COLOR_BGR2RGB)
+    assert second is first
+    np.testing.assert_array_equal(second, cv2.cvtColor(image[::-1], cv2.COLOR_BGR2RGB))
+    assert pool.stats()["allocations"] == 1
+
+
+def test_slot_holds_a_reference_until_replaced():
+    pool = FramePool()
+    slot, frame = FrameSlot(), pool.acquire((4, 4))
+    slot.put(frame)
+    frame.release()
+    assert pool.stats()["free"] == 0
+
+    with slot.borrow() as view:
+        slot.clear()
+        # The borrowed view keeps the buffer alive and read-only
+        assert pool.stats()["free"] == 0
+        with pytest.raises(ValueError):
+            view[0, 0] = 1
+    assert pool.stats()["free"] == 1
+
+
+def test_share_publishes_the_same_buffer():
+    pool = FramePool()
+    source, target, frame = FrameSlot(), FrameSlot(), pool.acquire((4, 4))
+    assert not target.share(source)
+    source.put(frame)
+    frame.release()
+    assert target.share(source)
+    source.clear()
+    assert pool.stats()["free"] == 0
+    target.clear()
+    assert pool.stats()["free"] == 1
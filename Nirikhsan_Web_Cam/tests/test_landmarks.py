@@ -0,0 +1,161 @@
+"""classify_pose_batch against the original per-landmark rule chain."""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from poseguard.landmarks import (ACTION_LABELS, L_ELBOW, L_HIP, L_KNEE, L_SHOULDER, L_WRIST, NOSE,
+                                 NUM_POSE_LANDMARKS, R_ELBOW, R_HIP, R_KNEE, R_SHOULDER, R_WRIST,
+                                 classify_pose_batch, classify_poses, landmarks_to_array)
+
+H, W = 480, 640
+
+
+def reference_classify(landmarks, h, w):
+    """The scalar rule chain classify_action used before it was vectorized."""
+    nose = landmarks[NOSE]
+    l_wrist, r_wrist = landmarks[L_WRIST], landmarks[R_WRIST]
+    l_elbow, r_elbow = landmarks[L_ELBOW], landmarks[R_ELBOW]
+    l_shoulder, r_shoulder = landmarks[L_SHOULDER], landmarks[R_SHOULDER]
+    l_hip, r_hip = landmarks[L_HIP], landmarks[R_HIP]
+    l_knee, r_knee = landmarks[L_KNEE], landmarks[R_KNEE]
+
+    nose_y = nose.y * h
+    lw_y, rw_y = l_wrist.y * h, r_wrist.y * h
+    lw_x, rw_x = l_wrist.x * w, r_wrist.x * w
+    ls_y, rs_y = l_shoulder.y * h, r_shoulder.y * h
+    ls_x, rs_x = l_shoulder.x * w, r_shoulder.x * w
+
+    l_wrist_visible = l_wrist.visibility > 0.70
+    r_wrist_visible = r_wrist.visibility > 0.70
+    l_elbow_visible = l_elbow.visibility > 0.70
+    r_elbow_visible = r_elbow.visibility > 0.70
+    nose_visible = nose.visibility > 0.6
+    l_shoulder_visible = l_shoulder.visibility > 0.70
+    r_shoulder_visible = r_shoulder.visibility > 0.70
+    l_knee_visible = l_knee.visibility > 0.70
+    r_knee_visible = r_knee.visibility > 0.70
+    l_hip_visible = l_hip.visibility > 0.65
+    r_hip_visible = r_hip.visibility > 0.65
+
+    visible_joints = sum([
+        l_wrist_visible, r_wrist_visible, l_elbow_visible, r_elbow_visible,
+        l_shoulder_visible, r_shoulder_visible, l_knee_visible, r_knee_visible,
+        l_hip_visible, r_hip_visible, nose_visible
+    ])
+    if visible_joints < 9:
+        return "Standing"
+
+    if (l_wrist_visible and r_wrist_visible and
+            lw_y < (nose_y - 0.15 * h) and rw_y < (nose_y - 0.15 * h)):
+        return "Hands Up"
+
+    if l_wrist_visible and r_wrist_visible and l_shoulder_visible and r_shoulder_visible:
+        chest_y = (ls_y + rs_y) / 2
+        body_center_x = (ls_x + rs_x) / 2
+        if abs(lw_y - chest_y) < 0.25 * h and abs(rw_y - chest_y) < 0.25 * h:
+            if ((lw_x > body_center_x and rw_x < body_center_x) or
+                    (lw_x < body_center_x and rw_x > body_center_x)):
+                return "Hands Crossed"
+
+    if (l_wrist_visible and r_wrist_visible and l_elbow_visible and r_elbow_visible and
+            l_shoulder_visible and r_shoulder_visible):
+        if (abs(lw_y - ls_y) < 0.2 * h and abs(rw_y - rs_y) < 0.2 * h and
+                abs(l_elbow.y * h - ls_y) < 0.2 * h and abs(r_elbow.y * h - rs_y) < 0.2 * h):
+            if lw_x < (ls_x - 0.25 * w) and rw_x > (rs_x + 0.25 * w):
+                return "T-Pose"
+
+    if l_wrist_visible and lw_y < (nose_y - 0.15 * h) and not r_wrist_visible:
+        return "One Hand Raised (Left)"
+    if r_wrist_visible and rw_y < (nose_y - 0.15 * h) and not l_wrist_visible:
+        return "One Hand Raised (Right)"
+
+    if l_wrist_visible and r_wrist_visible and l_shoulder_visible and r_shoulder_visible:
+        chest_y = (ls_y + rs_y) / 2
+        if lw_y < (nose_y - 0.15 * h) and rw_y > (chest_y + 0.2 * h):
+            return "One Hand Raised (Left)"
+        if rw_y < (nose_y - 0.15 * h) and lw_y > (chest_y + 0.2 * h):
+            return "One Hand Raised (Right)"
+
+    if l_knee_visible and r_knee_visible and l_hip_visible and r_hip_visible:
+        avg_thigh_angle = (abs(l_knee.y - l_hip.y) + abs(r_knee.y - r_hip.y)) / 2
+        return "Sit" if avg_thigh_angle < 0.12 else "Standing"
+    return "Standing"
+
+
+def as_landmarks(pose):
+    return [SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v)) for x, y, z, v in pose]
+
+
+def random_poses(rng, n):
+    # Coordinates on a 1/128 grid keep float32 and float64 on the same side of every threshold
+    poses = rng.integers(0, 129, size=(n, NUM_POSE_LANDMARKS, 4)).astype(np.float32) / 128
+    poses[..., 3] = np.where(rng.random((n, NUM_POSE_LANDMARKS)) < 0.85, 0.9, 0.3)
+    return poses
+
+
+def standing_pose():
+    pose = np.zeros((NUM_POSE_LANDMARKS, 4), dtype=np.float32)
+    pose[:, 3] = 0.95
+    pose[NOSE, :2] = (0.5, 0.2)
+    pose[L_SHOULDER, :2], pose[R_SHOULDER, :2] = (0.4, 0.3), (0.6, 0.3)
+    pose[L_ELBOW, :2], pose[R_ELBOW, :2] = (0.38, 0.45), (0.62, 0.45)
+    pose[L_WRIST, :2], pose[R_WRIST, :2] = (0.37, 0.6), (0.63, 0.6)
+    pose[L_HIP, :2], pose[R_HIP, :2] = (0.45, 0.6), (0.55, 0.6)
+    pose[L_KNEE, :2], pose[R_KNEE, :2] = (0.45, 0.8), (0.55, 0.8)
+    return pose
+
+
+def test_batch_matches_reference_rule_chain():
+    rng = np.random.default_rng(7)
+    poses = random_poses(rng, 5000)
+    expected = [reference_classify(as_landmarks(pose), H, W) for pose in poses]
+    assert classify_poses(poses, H, W) == expected
+    # The random scenes must exercise more than the fallback rules
+    assert {"Standing", "Sit", "Hands Up", "Hands Crossed"} <= set(expected)
+
+
+def test_per_pose_crop_sizes():
+    rng = np.random.default_rng(11)
+    poses = random_poses(rng, 200)
+    hs = rng.choice([240, 480, 960], size=len(poses))
+    ws = rng.choice([320, 640, 1280], size=len(poses))
+    expected = [reference_classify(as_landmarks(p), h, w) for p, h, w in zip(poses, hs, ws)]
+    assert list(ACTION_LABELS[classify_pose_batch(poses, hs, ws)]) == expected
+
+
+@pytest.mark.parametrize("edit, label", [
+    ({}, "Standing"),
+    ({L_WRIST: (0.4, 0.0), R_WRIST: (0.6, 0.0)}, "Hands Up"),
+    ({L_WRIST: (0.65, 0.35), R_WRIST: (0.35, 0.35)}, "Hands Crossed"),
+    # Level shoulders would put a T-pose inside the (earlier) Hands Crossed rule
+    ({L_SHOULDER: (0.4, 0.2), R_SHOULDER: (0.6, 0.5), L_WRIST: (0.05, 0.05), L_ELBOW: (0.2, 0.2),
+      R_WRIST: (0.95, 0.5), R_ELBOW: (0.8, 0.5)}, "T-Pose"),
+    ({L_WRIST: (0.4, 0.0), R_WRIST: (0.6, 0.6)}, "One Hand Raised (Left)"),
+    ({R_WRIST: (0.6, 0.0), L_WRIST: (0.4, 0.6)}, "One Hand Raised (Right)"),
+    ({L_KNEE: (0.3, 0.62), R_KNEE: (0.7, 0.62)}, "Sit"),
+])
+def test_each_rule(edit, label):
+    pose = standing_pose()
+    for index, xy in edit.items():
+        pose[index, :2] = xy
+    assert classify_poses(pose, H, W) == label
+    assert reference_classify(as_landmarks(pose), H, W) == label
+
+
+def test_poor_quality_and_non_finite():
+    pose = standing_pose()
+    pose[[L_WRIST, R_WRIST, L_KNEE], 3] = 0.1
+    pose[[L_WRIST, R_WRIST], :2] = (0.5, 0.0)
+    assert classify_poses(pose, H, W) == "Standing"
+
+    pose = standing_pose()
+    pose[NOSE, 0] = np.nan
+    assert classify_poses(pose, H, W) == "Unknown"
+
+
+def test_landmarks_to_array_accepts_landmark_objects():
+    pose = standing_pose()
+    array = landmarks_to_array(SimpleNamespace(landmark=as_landmarks(pose)))
+    assert array.dtype == np.float32 and array.shape == (NUM_POSE_LANDMARKS, 4)
+    np.testing.assert_array_equal(array, pose)
@@ -0,0 +1,50 @@
+"""SnapshotWriter: unique paths, copy-on-submit and a bounded queue."""
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from poseguard.snapshots import SnapshotWriter
+
+
+def image(value=0):
+    return np.full((16, 16, 3), value, np.uint8)
+
+
+def test_snapshots_get_unique_paths_and_are_written(tmp_path):
+    writer = SnapshotWriter(max_queue=8, workers=2)
+    target = str(tmp_path / "alert.jpg")
+    paths = [writer.submit(target, image(v))[0] for v in (10, 20, 30)]
+    writer.close()
+    assert paths == [target, str(tmp_path / "alert_1.jpg"), str(tmp_path / "alert_2.jpg")]
+    assert all(os.path.exists(path) for path in paths)
+    assert writer.stats()["written"] == 3 and writer.stats()["pending"] == 0
+    assert not any(name.endswith(".tmp") for name in os.listdir(tmp_path))
+
+
+def test_image_is_copied_before_submit_returns(tmp_path):
+    writer = SnapshotWriter(workers=1)
+    frame = image(200)
+    path, future = writer.submit(str(tmp_path / "snap.jpg"), frame, convert=cv2.COLOR_RGB2BGR)
+    frame[:] = 0  # the caller keeps drawing on its frame
+    assert future.result(timeout=5)
+    writer.close()
+    assert cv2.imread(path).mean() > 150
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path, monkeypatch):
+    writer = SnapshotWriter(max_queue=1, workers=1)
+    gate = threading.Event()
+    write = writer._encode_and_write
+    monkeypatch.setattr(writer, "_encode_and_write", lambda *args: gate.wait(5) and write(*args))
+
+    path, future = writer.submit(str(tmp_path / "a.jpg"), image())
+    assert writer.submit(str(tmp_path / "b.jpg"), image()) == (None, None)
+    assert writer.stats()["dropped"] == 1 and writer.stats()["pending"] == 1
+    gate.set()
+    assert future.result(timeout=5)
+    writer.close()
+    assert os.path.exists(path) and not os.path.exists(tmp_path / "b.jpg")
+    # A closed writer refuses new snapshots
+    assert writer.submit(str(tmp_path / "c.jpg"), image()) == (None, None)
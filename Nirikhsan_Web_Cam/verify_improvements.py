@@ -1,23 +1,40 @@
 #!/usr/bin/env python3
 """
 Quick verification script for guard monitoring system improvements.
-Tests: CSV logging, memory optimization, overlap detection.
+Tests: event logging, memory optimization, overlap detection.
+
+Usage:
+    python verify_improvements.py
+    python verify_improvements.py --guard KD --export-csv logs/events.csv
 """
 
 import os
-import csv
 import sys
+import json
+import argparse
 from pathlib import Path
 
-def verify_logging_setup():
-    """Verify logging directory and CSV structure"""
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from poseguard.eventlog import EventLog
+
+def load_logging_config(base_dir):
+    try:
+        with open(base_dir / "config.json") as f:
+            return json.load(f).get("logging", {})
+    except Exception:
+        return {}
+
+
+def verify_logging_setup(guard=None, export_csv=None):
+    """Verify logging directory and event store"""
     print("=" * 60)
     print("🔍 VERIFICATION: Guard Monitoring System Improvements")
     print("=" * 60)
     
     base_dir = Path(__file__).parent
-    logs_dir = base_dir / "logs"
-    csv_file = logs_dir / "events.csv"
+    logging_cfg = load_logging_config(base_dir)
+    logs_dir = base_dir / logging_cfg.get("log_directory", "logs")
+    db_file = logs_dir / logging_cfg.get("event_db", "events.db")
     
     # Check 1: Directory exists
     print("\n✓ Check 1: Logging Directory")
@@ -28,32 +45,36 @@ def verify_logging_setup():
         logs_dir.mkdir(exist_ok=True)
         print(f"  ✅ Created: {logs_dir}")
     
-    # Check 2: CSV file exists
-    print("\n✓ Check 2: CSV File")
-    if csv_file.exists():
-        print(f"  ✅ events.csv exists at: {csv_file}")
-        file_size = csv_file.stat().st_size
-        print(f"  📊 File size: {file_size} bytes")
+    # Check 2: Event store exists
+    print("\n✓ Check 2: Event Store")
+    if db_file.exists():
+        print(f"  ✅ {db_file.name} exists at: {db_file}")
+        print(f"  📊 File size: {db_file.stat().st_size} bytes")
     else:
-        print(f"  ⚠️  events.csv missing, will be created on first log")
+        print(f"  ⚠️  {db_file.name} missing, will be created on first start")
     
-    # Check 3: CSV structure
-    print("\n✓ Check 3: CSV Header")
+    # Check 3: Event contents (query API)
+    print("\n✓ Check 3: Logged Events")
     try:
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)
-            if header:
-                print(f"  ✅ Header found: {header}")
-                expected_cols = ["Timestamp", "Name", "Action", "Status", "Image_Path", "Confidence"]
-                if "Timestamp" in header:
-                    print(f"  ✅ Column structure valid")
-                else:
-                    print(f"  ⚠️  Header mismatch - expected: {expected_cols}")
-            else:
-                print(f"  ℹ️  File empty, will initialize on first log")
+        event_log = EventLog(str(db_file), fsync=logging_cfg.get("fsync", "normal"))
+        counts = event_log.counts(by="status")
+        if counts:
+            print(f"  ✅ {sum(counts.values())} events")
+            for status, count in counts.items():
+                print(f"    {status}: {count}")
+            label = f" for {guard}" if guard else ""
+            print(f"  📝 Latest events{label}:")
+            for event in event_log.query(guard=guard, limit=5):
+                print(f"    {event['timestamp']}  {event['guard']}  {event['action']}  "
+                      f"{event['status']}  ({event['confidence']:.2f})")
+        else:
+            print(f"  ℹ️  No events yet, they are recorded while logging/alert mode is on")
+        if export_csv:
+            rows = event_log.export_csv(export_csv, guard=guard)
+            print(f"  💾 Exported {rows} events to {export_csv}")
+        event_log.close()
     except Exception as e:
-        print(f"  ⚠️  Error reading CSV: {e}")
+        print(f"  ⚠️  Error reading event store: {e}")
     
     # Check 4: Config file
     print("\n✓ Check 4: Configuration")
@@ -61,13 +82,14 @@ def verify_logging_setup():
     if config_file.exists():
         print(f"  ✅ config.json exists")
         try:
-            import json
             with open(config_file) as f:
                 config = json.load(f)
                 log_dir = config.get("logging", {}).get("log_directory", "logs")
-                flush_interval = config.get("logging", {}).get("auto_flush_interval", 50)
+                flush_rows = config.get("logging", {}).get("auto_flush_interval", 50)
+                flush_seconds = config.get("logging", {}).get("flush_interval_seconds", 1.0)
+                fsync = config.get("logging", {}).get("fsync", "normal")
                 print(f"  📝 Logging directory setting: {log_dir}")
-                print(f"  📝 Auto-flush interval: {flush_interval} entries")
+                print(f"  📝 Event flush: every {flush_rows} entries or {flush_seconds}s (fsync: {fsync})")
         except Exception as e:
             print(f"  ⚠️  Error reading config: {e}")
     else:
@@ -98,24 +120,27 @@ def verify_logging_setup():
         
         # Check for key improvements
         print("\n  🔎 Checking implemented improvements...")
-        with open(main_file, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-            
-            improvements = {
-                "Dynamic BB Box": "calculate_body_box",
-                "Logging Methods": "def log_action_performed",
-                "Auto-Flush Logs": "def auto_flush_logs",
-                "Memory Optimization": "def optimize_memory",
-                "Overlap Detection": "calculate_iou",
-                "Confidence-Based Resolution": "face_confidence",
-                "CSV Auto-Save": "os.makedirs(log_dir",
-            }
-            
-            for name, keyword in improvements.items():
-                if keyword in content:
-                    print(f"    ✅ {name}")
-                else:
-                    print(f"    ⚠️  {name} - check manually")
+        # The monitoring logic lives in the poseguard package the script builds on
+        content = ""
+        for source in [main_file] + sorted((base_dir / "poseguard").glob("*.py")):
+            with open(source, 'r', encoding='utf-8', errors='ignore') as f:
+                content += f.read()
+        
+        improvements = {
+            "Dynamic BB Box": "calculate_body_box",
+            "Logging Methods": "def log_action_performed",
+            "Event Log Store": "EventLog(",
+            "Memory Optimization": "def optimize_memory",
+            "Overlap Detection": "overlap_conflicts",
+            "Confidence-Based Resolution": "face_confidence",
+            "CSV Export": "export_csv(",
+        }
+        
+        for name, keyword in improvements.items():
+            if keyword in content:
+                print(f"    ✅ {name}")
+            else:
+                print(f"    ⚠️  {name} - check manually")
     else:
         print(f"  ❌ Basic+Mediapose.py not found!")
     
@@ -128,11 +153,15 @@ def verify_logging_setup():
     print("  2. Load guard profiles using GUI")
     print("  3. Enable logging: Click 'Toggle Logging'")
     print("  4. Enable alert mode: Click 'Toggle Alert'")
-    print("  5. Monitor guards - logs will auto-save to logs/events.csv")
+    print(f"  5. Monitor guards - events are saved to {db_file}")
     print("\n📊 View logs anytime:")
-    print(f"  - Open: {csv_file}")
-    print("  - Recommended: Use Excel/LibreOffice Calc for CSV viewing")
+    print("  - In the app: click '📜 Events'")
+    print(f"  - As CSV: python verify_improvements.py --export-csv {logs_dir / logging_cfg.get('event_log_file', 'events.csv')}")
     print("=" * 60)
 
 if __name__ == "__main__":
-    verify_logging_setup()
+    parser = argparse.ArgumentParser(description="Verify the guard monitoring setup and inspect the event log")
+    parser.add_argument("--guard", help="Only show/export events of this guard")
+    parser.add_argument("--export-csv", help="Export events to this CSV file")
+    args = parser.parse_args()
+    verify_logging_setup(args.guard, args.export_csv)